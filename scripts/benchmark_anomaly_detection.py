@@ -0,0 +1,93 @@
+"""Measure anomaly detector throughput and score detectors against NAB labels.
+
+By default a synthetic seasonal series with injected incidents is generated
+and its incident windows serve as labels. Point the script at a NAB data file
+and `labels/combined_windows.json` to score on the real benchmark instead.
+
+Usage (from repository root):
+
+    PYTHONPATH=src python scripts/benchmark_anomaly_detection.py --points 5000000
+
+    PYTHONPATH=src python scripts/benchmark_anomaly_detection.py \
+        --nab-csv data/raw/metrics/nab/realAWSCloudwatch/ec2_cpu_utilization_24ae8d.csv \
+        --nab-windows data/raw/metrics/nab/labels/combined_windows.json \
+        --series realAWSCloudwatch/ec2_cpu_utilization_24ae8d.csv --period 288
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import time
+from typing import List
+from typing import Tuple
+
+import numpy as np
+
+from it_ops_observability.anomalies import DETECTORS
+from it_ops_observability.anomalies import label_windows
+from it_ops_observability.anomalies import load_nab_windows
+from it_ops_observability.anomalies import nab_score
+from it_ops_observability.anomalies import score_series
+from it_ops_observability.anomalies import windows_to_detections
+
+
+def _synthetic_series(
+    points: int, period: int, incidents: int, seed: int
+) -> Tuple[np.ndarray, np.ndarray, List[Tuple[np.datetime64, np.datetime64]]]:
+    rng = np.random.default_rng(seed)
+    index = np.arange(points)
+    timestamps = np.datetime64("2024-01-01T00:00", "ns") + index.astype("timedelta64[m]") * 5
+    values = 50 + 15 * np.sin(2 * np.pi * index / period) + rng.normal(0, 2, points)
+    width = max(4, period // 4)
+    starts = np.sort(rng.choice(np.arange(period * 2, points - width), incidents, replace=False))
+    windows = []
+    for start in starts:
+        values[start : start + width] += rng.uniform(15, 30)
+        windows.append((timestamps[start], timestamps[start + width - 1]))
+    return timestamps, values, windows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=1_000_000, help="Synthetic series length.")
+    parser.add_argument("--incidents", type=int, default=20, help="Injected incidents in the synthetic series.")
+    parser.add_argument("--period", type=int, default=24, help="Seasonal period in points.")
+    parser.add_argument("--threshold", type=float, default=4.0, help="Score threshold for anomaly windows.")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--nab-csv", type=Path, default=None, help="NAB data file with timestamp,value columns.")
+    parser.add_argument("--nab-windows", type=Path, default=None, help="NAB labels/combined_windows.json.")
+    parser.add_argument("--series", default=None, help="Series key in the NAB windows file.")
+    args = parser.parse_args()
+
+    if args.nab_csv is not None:
+        import pandas as pd
+
+        frame = pd.read_csv(args.nab_csv)
+        timestamps = pd.to_datetime(frame["timestamp"]).to_numpy(dtype="datetime64[ns]")
+        values = frame["value"].to_numpy(dtype=float)
+        series = args.series or args.nab_csv.name
+        windows = load_nab_windows(args.nab_windows, series) if args.nab_windows else []
+    else:
+        timestamps, values, windows = _synthetic_series(args.points, args.period, args.incidents, args.seed)
+
+    params = {"zscore": {"window": args.period}, "ewma": {}, "seasonal": {"period": args.period}}
+    report = {"points": int(values.size), "label_windows": len(windows), "detectors": {}}
+    for detector in DETECTORS:
+        started = time.perf_counter()
+        scores = score_series(values, detector, **params[detector])
+        found = label_windows(timestamps, values, scores, threshold=args.threshold, detector=detector)
+        elapsed = time.perf_counter() - started
+        entry = {
+            "seconds": round(elapsed, 4),
+            "points_per_second": round(values.size / elapsed) if elapsed > 0 else None,
+            "windows_found": len(found),
+        }
+        if windows:
+            entry["nab"] = nab_score(timestamps, windows_to_detections(timestamps, found), windows)
+        report["detectors"][detector] = entry
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
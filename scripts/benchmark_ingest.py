@@ -0,0 +1,85 @@
+"""Measure `ingest.DirectoryIngester` throughput on one core.
+
+Usage (from repository root):
+
+    PYTHONPATH=src python scripts/benchmark_ingest.py --lines 1000000 --rounds 20
+
+Appends `--lines` log lines across four server files in `--rounds` rounds,
+rotating every file halfway through, and times only the ingester (`poll`
+plus the final `flush`, WAL fsync included). Exits non-zero when the rate
+falls below `--min-lines-per-s` (100K by default).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+from it_ops_observability.benchmarks import FIXTURE_SERVERS
+from it_ops_observability.ingest import DirectoryIngester
+
+
+def _append(source: Path, round_index: int, per_file: int) -> None:
+    for server_id in FIXTURE_SERVERS:
+        first = round_index * per_file
+        lines = "".join(
+            f"2024-01-01T00:00:{(first + i) % 60:02d}Z [INFO] {server_id}: request {first + i} served in {i % 97} ms\n"
+            for i in range(per_file)
+        )
+        with open(source / f"{server_id}.log", "a", encoding="utf-8") as handle:
+            handle.write(lines)
+
+
+def _rotate(source: Path) -> None:
+    for server_id in FIXTURE_SERVERS:
+        os.replace(source / f"{server_id}.log", source / f"{server_id}.log.1")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--min-lines-per-s", type=float, default=100_000)
+    args = parser.parse_args()
+    per_file = max(args.lines // (args.rounds * len(FIXTURE_SERVERS)), 1)
+
+    with tempfile.TemporaryDirectory(prefix="it_ops_ingest_") as tmp:
+        source, store = Path(tmp) / "source", Path(tmp) / "store"
+        source.mkdir()
+        ingester = DirectoryIngester(source, store)
+        elapsed = 0.0
+        for round_index in range(args.rounds):
+            if round_index == args.rounds // 2:
+                _rotate(source)
+            _append(source, round_index, per_file)
+            started = time.perf_counter()
+            ingester.poll()
+            elapsed += time.perf_counter() - started
+        started = time.perf_counter()
+        ingester.flush()
+        elapsed += time.perf_counter() - started
+        stats = ingester.stats
+
+    rate = stats.lines / elapsed if elapsed else 0.0
+    print(
+        json.dumps(
+            {
+                "lines": stats.lines,
+                "flushes": stats.flushes,
+                "rotations": stats.rotations,
+                "mb_read": round(stats.bytes_read / 1e6, 1),
+                "seconds": round(elapsed, 3),
+                "lines_per_s": round(rate),
+            },
+            indent=2,
+        )
+    )
+    return 0 if rate >= args.min_lines_per_s else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Compare the naive and sorted log parquet layouts: file size and `fetch_logs` latency.
+
+Usage (from repository root):
+
+    PYTHONPATH=src python scripts/benchmark_log_storage.py --sizes 10k 1m --repeat 20
+
+For each size, writes the benchmark log fixture (`server_id`, `message` in
+generation order), rewrites it with `storage.write_sorted_logs`, and times
+`fetch_logs` against both files for the default 4-hour window and for a
+window covering every line of one server. "Warm" reuses cached frames and
+footers; "cold" clears them before every call.
+"""
+from __future__ import annotations
+
+import argparse
+from functools import partial
+import json
+from pathlib import Path
+import tempfile
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+
+import pyarrow.parquet as pq
+
+from it_ops_observability import storage
+from it_ops_observability.benchmarks import FIXTURE_SERVERS
+from it_ops_observability.benchmarks import SIZES
+from it_ops_observability.benchmarks import write_fixtures
+from it_ops_observability.data_sources import DataConfig
+from it_ops_observability.data_sources import clear_frame_cache
+from it_ops_observability.data_sources import fetch_logs
+from it_ops_observability.stats import percentile
+
+
+def _clear_caches() -> None:
+    clear_frame_cache()
+    storage.clear_layout_cache()
+
+
+def _time(call: Callable[[], Any], repeat: int, *, cold: bool) -> Dict[str, float]:
+    call()
+    samples: List[float] = []
+    for _ in range(repeat):
+        if cold:
+            _clear_caches()
+        started = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {"p50_ms": round(percentile(samples, 50), 3), "p95_ms": round(percentile(samples, 95), 3)}
+
+
+def _layout(path: Path, config: DataConfig, windows: Dict[str, int], repeat: int) -> Dict[str, Any]:
+    metadata = pq.read_metadata(path)
+    result: Dict[str, Any] = {
+        "file_mb": round(path.stat().st_size / 1e6, 3),
+        "row_groups": metadata.num_row_groups,
+    }
+    for label, minutes in windows.items():
+        call = partial(fetch_logs, FIXTURE_SERVERS[0], window_minutes=minutes, config=config)
+        result[f"fetch_logs_{label}_warm"] = _time(call, repeat, cold=False)
+        result[f"fetch_logs_{label}_cold"] = _time(call, repeat, cold=True)
+    return result
+
+
+def run(size: str, repeat: int, workdir: Path) -> Dict[str, Any]:
+    fixture = write_fixtures(SIZES[size], workdir / size)
+    naive = fixture.config.logs_path
+    started = time.perf_counter()
+    sorted_path = storage.write_sorted_logs(pq.read_table(naive).to_pandas(), naive.with_name(f"sorted_{naive.name}"))
+    write_s = time.perf_counter() - started
+    sorted_config = DataConfig(logs_path=sorted_path, metrics_path=None, tickets_path=None, log_index_path=None)
+    windows = {"240m": 240, "all": fixture.rows * 5}
+    assert fetch_logs(FIXTURE_SERVERS[0], window_minutes=windows["all"], config=sorted_config) == fixture.log_text
+    return {
+        "rows": fixture.rows,
+        "naive": _layout(naive, fixture.config, windows, repeat),
+        "sorted": {**_layout(sorted_path, sorted_config, windows, repeat), "write_s": round(write_s, 3)},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", default=["10k"], choices=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", type=Path, default=None, help="Write the report JSON here.")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory(prefix="it_ops_storage_") as tmp:
+        report = {size: run(size, args.repeat, Path(tmp)) for size in args.sizes}
+    text = json.dumps(report, indent=2)
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Build a ticket index over a synthetic corpus and measure query latency.
+
+Usage (from repository root):
+
+    PYTHONPATH=src python scripts/benchmark_ticket_search.py --tickets 1000000
+
+Reports index build time, the size of the persisted index, load time from
+disk, and p50/p95 latency per search mode over a fixed query set.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import tempfile
+import time
+
+from it_ops_observability.stats import percentile
+from it_ops_observability.synthetic import generate_mock_tickets
+from it_ops_observability.ticket_index import TicketIndex
+
+QUERIES = (
+    "database connection pool exhausted",
+    "disk usage log volume",
+    "latency checkout SLO",
+    "circuit breaker payments rollback",
+    "certificate expiry load balancer",
+    "replica lag reporting database failover",
+    "node pressure evicting pods",
+    "vpn tunnel flapping",
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickets", type=int, default=100_000, help="Synthetic corpus size.")
+    parser.add_argument("--vector-dims", type=int, default=0, help="Also build a hashed vector index of this width.")
+    parser.add_argument("--repeat", type=int, default=20, help="Passes over the query set per mode.")
+    args = parser.parse_args()
+
+    frame = generate_mock_tickets(args.tickets)
+    texts = (frame["subject"] + " " + frame["body"]).tolist()
+    started = time.perf_counter()
+    index = TicketIndex.build(texts, vector_dims=args.vector_dims)
+    build_s = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = index.save(Path(tmp) / "tickets.npz")
+        size_mb = path.stat().st_size / 1e6
+        started = time.perf_counter()
+        index = TicketIndex.load(path)
+        load_s = time.perf_counter() - started
+
+    modes = ["bm25"] + (["vector", "hybrid"] if args.vector_dims else [])
+    report = {
+        "tickets": args.tickets,
+        "build_seconds": round(build_s, 2),
+        "index_mb": round(size_mb, 1),
+        "load_seconds": round(load_s, 3),
+        "modes": {},
+    }
+    for mode in modes:
+        latencies = []
+        for _ in range(args.repeat):
+            for query in QUERIES:
+                started = time.perf_counter()
+                index.search(query, 5, mode=mode)
+                latencies.append((time.perf_counter() - started) * 1000)
+        report["modes"][mode] = {"p50_ms": round(percentile(latencies, 50), 3), "p95_ms": round(percentile(latencies, 95), 3)}
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
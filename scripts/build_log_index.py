@@ -0,0 +1,117 @@
+"""Build or extend a time-partitioned log search index, then time sample queries.
+
+Sources (combine as needed):
+
+    # Backfill from the processed CloudFront-style parquet
+    PYTHONPATH=src python scripts/build_log_index.py data/processed/logs/index \
+        --from-parquet data/processed/logs/cloudfront_sample.parquet
+
+    # Append a raw log file for one server
+    PYTHONPATH=src python scripts/build_log_index.py data/processed/logs/index \
+        --from-text /var/log/app.log --server prod-app-01
+
+    # Benchmark: index 20M synthetic lines across 200 servers
+    PYTHONPATH=src python scripts/build_log_index.py /tmp/log-index \
+        --synthetic-lines 20000000 --servers 200
+
+Every run appends new segments, so repeated runs index incrementally.
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+import json
+from pathlib import Path
+import random
+import time
+from typing import Iterator
+from typing import Tuple
+
+from it_ops_observability.log_index import LogIndex
+from it_ops_observability.log_index import backfill_from_frame
+from it_ops_observability.stats import percentile
+
+QUERIES = ("circuit breaker open", "disk saturation", "database connection timeout", "replica lag", "health check")
+_MESSAGES = (
+    ("CRITICAL", "Disk saturation beyond 95% on volume {n}"),
+    ("ERROR", "Database connection timeout after {n}ms"),
+    ("ERROR", "Service mesh circuit breaker open for upstream {n}"),
+    ("WARN", "Replica lag increasing to {n}s"),
+    ("WARN", "Retrying connection to cache cluster node {n}"),
+    ("INFO", "Health check passed in {n}ms"),
+    ("INFO", "Autoscaler polling cycle {n} complete"),
+    ("INFO", "Background job {n} completed"),
+)
+
+
+def _synthetic_records(lines: int, servers: int, days: int, seed: int) -> Iterator[Tuple[datetime, str, str]]:
+    rng = random.Random(seed)
+    end = datetime.now(timezone.utc).replace(tzinfo=None)
+    step = timedelta(days=days) / max(lines, 1)
+    weights = [1, 4, 3, 6, 6, 40, 20, 20]
+    for position in range(lines):
+        stamp = end - timedelta(days=days) + step * position
+        level, template = rng.choices(_MESSAGES, weights=weights)[0]
+        server = f"prod-{position % servers:04d}"
+        yield stamp, server, f"{stamp.isoformat()}Z [{level}] {server}: {template.format(n=rng.randint(1, 999))}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("index", type=Path, help="Index directory (created if missing).")
+    parser.add_argument("--from-parquet", type=Path, default=None, help="Logs parquet with server_id and message columns.")
+    parser.add_argument("--from-text", type=Path, default=None, help="Raw log file to append.")
+    parser.add_argument("--server", default="unknown", help="Server ID for --from-text.")
+    parser.add_argument("--synthetic-lines", type=int, default=0, help="Synthetic lines to index for benchmarking.")
+    parser.add_argument("--servers", type=int, default=100, help="Servers in the synthetic fleet.")
+    parser.add_argument("--days", type=int, default=7, help="Days spanned by synthetic lines.")
+    parser.add_argument("--batch-size", type=int, default=1_000_000, help="Lines per append (segment batch).")
+    parser.add_argument("--partition-hours", type=int, default=24, help="Partition width for a new index.")
+    args = parser.parse_args()
+
+    index = LogIndex(args.index, partition_hours=args.partition_hours)
+    started = time.perf_counter()
+    added = 0
+    if args.from_parquet is not None:
+        import pandas as pd
+
+        added += backfill_from_frame(index, pd.read_parquet(args.from_parquet), batch_size=args.batch_size)
+    if args.from_text is not None:
+        added += index.append_text(args.server, args.from_text.read_text(encoding="utf-8", errors="replace"))
+    if args.synthetic_lines:
+        records = _synthetic_records(args.synthetic_lines, args.servers, args.days, seed=13)
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= args.batch_size:
+                added += index.append(batch)
+                batch = []
+        added += index.append(batch)
+    build_s = time.perf_counter() - started
+
+    latencies = {}
+    for query in QUERIES:
+        samples = []
+        for _ in range(5):
+            started = time.perf_counter()
+            result = index.search(query, limit=20)
+            samples.append((time.perf_counter() - started) * 1000)
+        latencies[query] = {"hits": result["total_hits"], "p50_ms": round(percentile(samples, 50), 2)}
+    print(
+        json.dumps(
+            {
+                "lines_added": added,
+                "build_seconds": round(build_s, 2),
+                "indexed_lines": index.line_count,
+                "segments": index.segment_count,
+                "queries": latencies,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
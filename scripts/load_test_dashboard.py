@@ -0,0 +1,103 @@
+"""Simulate concurrent dashboard users and report throughput, latency, CPU and RSS.
+
+Usage (from repository root):
+
+    # 1, 4, 16 and 32 users building snapshots in-process over 1M-row fixtures,
+    # through the shared cache as the Streamlit app does.
+    PYTHONPATH=src python scripts/load_test_dashboard.py --users 1 4 16 32 --fixture-rows 1000000 --shared-cache
+
+    # Against a local Streamlit server (start it first), sampling its CPU and RSS.
+    streamlit run ui/streamlit_app.py --server.port 8501 &
+    PYTHONPATH=src python scripts/load_test_dashboard.py --users 8 32 \
+        --url http://localhost:8501/_stcore/health --pid $!
+
+Every server is requested once before the first stage (unless --no-warm-up),
+then each user count runs for --duration seconds. The output lists one report per
+stage and `recommended_concurrency`: the most users any stage served with p95
+latency within --p95-budget-ms and under 1% errors. Use it as Cloud Run's
+`--concurrency`, and divide peak expected users by it for `--min-instances`.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+import tempfile
+
+from it_ops_observability.load_test import DEFAULT_WINDOWS
+from it_ops_observability.load_test import LoadTestConfig
+from it_ops_observability.load_test import http_target
+from it_ops_observability.load_test import recommend_concurrency
+from it_ops_observability.load_test import snapshot_target
+from it_ops_observability.load_test import sweep
+from it_ops_observability.load_test import warm_up
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 4, 16], help="Concurrent users per stage.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per stage.")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="Seconds over which users start.")
+    parser.add_argument("--think-time", type=float, default=1.0, help="Mean pause between a user's requests.")
+    parser.add_argument("--servers", nargs="+", default=None, help="Server IDs to mix (default: fixture servers).")
+    parser.add_argument("--windows", type=int, nargs="+", default=list(DEFAULT_WINDOWS), help="Lookback minutes to mix.")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="Seconds between CPU/RSS samples.")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--url", default=None, help="GET this URL instead of building snapshots in-process.")
+    parser.add_argument("--pid", type=int, default=None, help="Sample this process's CPU and RSS (e.g. the server).")
+    parser.add_argument(
+        "--fixture-rows", type=int, default=None,
+        help="Generate log/metric fixtures of this size instead of using the configured datasets.",
+    )
+    parser.add_argument("--shared-cache", action="store_true", help="Build snapshots through a fresh SharedCache.")
+    parser.add_argument("--no-warm-up", action="store_true", help="Include cold dataset loads in the first stage.")
+    parser.add_argument("--p95-budget-ms", type=float, default=1000.0)
+    parser.add_argument("--output", type=Path, default=None, help="Write the report JSON here.")
+    args = parser.parse_args()
+
+    config = LoadTestConfig(
+        duration_s=args.duration,
+        ramp_up_s=args.ramp_up,
+        think_time_s=args.think_time,
+        sample_interval_s=args.sample_interval,
+        seed=args.seed,
+        pid=args.pid,
+    )
+    config.windows = tuple(args.windows)
+    if args.servers:
+        config.servers = tuple(args.servers)
+    with tempfile.TemporaryDirectory() as scratch:
+        if args.url:
+            target, label = http_target(args.url), "http"
+        else:
+            data_config = None
+            if args.fixture_rows:
+                from it_ops_observability.benchmarks import write_fixtures
+
+                data_config = write_fixtures(args.fixture_rows, Path(scratch)).config
+            cache = None
+            if args.shared_cache:
+                from it_ops_observability.shared_cache import SharedCache
+
+                cache = SharedCache(Path(scratch) / "load_test.sqlite")
+            target, label = snapshot_target(data_config, cache=cache), "snapshot"
+        if not args.no_warm_up:
+            warm_up(target, config)
+        reports = sweep(target, args.users, config, label=label)
+
+    result = {
+        "target": args.url or label,
+        "p95_budget_ms": args.p95_budget_ms,
+        "recommended_concurrency": recommend_concurrency(reports, args.p95_budget_ms),
+        "stages": reports,
+    }
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,30 +13,50 @@ Set the environment variable `GOOGLE_API_KEY` (or configure your ADK
 credentials file) so Gemini requests succeed. Use `--verbose` to print tool
 call details, and `--quiet` to capture the returned events without console
 logging.
+
+Pass `--model offline` to swap Gemini for the deterministic scripted backend
+(no credentials needed); combine with `--offline-latency-ms` and
+`--offline-script` to benchmark orchestration overhead with reproducible timing.
 """
 from __future__ import annotations
 
 import argparse
 import asyncio
+import time
+from pathlib import Path
 from typing import Sequence
 
 from google.adk.runners import InMemoryRunner
 
 from it_ops_observability import AgentSettings
+from it_ops_observability import ResponseCache
+from it_ops_observability import Tracer
 from it_ops_observability import create_supervisor_agent
 
 
 async def _run_with_runner(
-    prompts: Sequence[str], *, verbose: bool, quiet: bool
+    prompts: Sequence[str],
+    *,
+    settings: AgentSettings,
+    verbose: bool,
+    quiet: bool,
+    trace_out: Path | None = None,
 ) -> None:
-    agent = create_supervisor_agent(AgentSettings())
+    if trace_out is not None:
+        settings.tracer = Tracer()
+    agent = create_supervisor_agent(settings)
     runner = InMemoryRunner(agent=agent)
     try:
+        started = time.perf_counter()
         events = await runner.run_debug(prompts, verbose=verbose, quiet=quiet)
+        elapsed = time.perf_counter() - started
         if quiet:
-            print(f"Captured {len(events)} events from the runner.")
+            print(f"Captured {len(events)} events from the runner in {elapsed:.3f}s.")
     finally:
         await runner.close()
+        if settings.tracer is not None and trace_out is not None:
+            settings.tracer.export_json(trace_out)
+            print(f"Wrote {len(settings.tracer.spans)} spans to {trace_out}.")
 
 
 def main() -> None:
@@ -59,9 +79,52 @@ def main() -> None:
         action="store_true",
         help="Suppress console transcripts and only report event counts.",
     )
+    parser.add_argument(
+        "--model",
+        default=AgentSettings.model_name,
+        help="Model for every agent; use 'offline' for the scripted stand-in backend.",
+    )
+    parser.add_argument(
+        "--offline-latency-ms",
+        type=float,
+        default=0.0,
+        help="Synthetic latency added to each offline model call.",
+    )
+    parser.add_argument(
+        "--offline-script",
+        type=Path,
+        default=None,
+        help="JSON file of per-agent tool calls and replies for the offline backend.",
+    )
+    parser.add_argument(
+        "--trace-out",
+        type=Path,
+        default=None,
+        help="Write agent/model/tool spans as OTLP JSON to this file.",
+    )
+    parser.add_argument(
+        "--response-cache",
+        type=Path,
+        default=None,
+        help="Directory for the on-disk model response cache (repeated briefings hit it).",
+    )
     args = parser.parse_args()
 
-    asyncio.run(_run_with_runner(args.prompts, verbose=args.verbose, quiet=args.quiet))
+    settings = AgentSettings(
+        model_name=args.model,
+        offline_script=args.offline_script,
+        offline_latency_ms=args.offline_latency_ms,
+        response_cache=ResponseCache(args.response_cache) if args.response_cache else None,
+    )
+    asyncio.run(
+        _run_with_runner(
+            args.prompts,
+            settings=settings,
+            verbose=args.verbose,
+            quiet=args.quiet,
+            trace_out=args.trace_out,
+        )
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,76 @@
+"""Run many supervisor scenarios in parallel under a model quota.
+
+Each scenario file is either a JSON list of prompts, a JSON object with
+`name` and `prompts`, or a text file with one prompt per line. Directories are
+scanned for both. Results are appended to a JSONL checkpoint so rerunning the
+same command after an interruption only executes the remaining scenarios.
+
+Usage (from repository root):
+
+    PYTHONPATH=src python scripts/run_batch_evaluation.py scenarios/ \
+        --concurrency 4 --rpm 15 --checkpoint reports/evaluation/batch.jsonl
+
+Without scenario paths the default leadership briefing is run `--repeat`
+times. Use `--model offline` to benchmark the harness without Gemini.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+
+from it_ops_observability import AgentSettings
+from it_ops_observability.batch_evaluation import DEFAULT_PROMPTS
+from it_ops_observability.batch_evaluation import Scenario
+from it_ops_observability.batch_evaluation import load_scenarios
+from it_ops_observability.batch_evaluation import make_supervisor_executor
+from it_ops_observability.batch_evaluation import run_batch
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", type=Path, help="Scenario files or directories.")
+    parser.add_argument("--repeat", type=int, default=1, help="Copies of the default scenario when no paths are given.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum scenarios running at once.")
+    parser.add_argument("--rpm", type=float, default=15.0, help="Model requests per minute allowed by the quota.")
+    parser.add_argument("--burst", type=float, default=None, help="Token bucket capacity (defaults to one second of quota).")
+    parser.add_argument("--calls-per-prompt", type=float, default=1.0, help="Quota tokens drawn per prompt.")
+    parser.add_argument("--max-attempts", type=int, default=5, help="Attempts per scenario on quota errors.")
+    parser.add_argument("--checkpoint", type=Path, default=None, help="JSONL file used to resume interrupted runs.")
+    parser.add_argument("--report", type=Path, default=None, help="Write the JSON report to this file.")
+    parser.add_argument("--model", default=AgentSettings.model_name, help="Model name, or 'offline'.")
+    parser.add_argument("--offline-latency-ms", type=float, default=0.0, help="Synthetic latency for the offline backend.")
+    args = parser.parse_args()
+
+    if args.paths:
+        scenarios = load_scenarios(args.paths)
+    else:
+        scenarios = [Scenario(f"default-{index:04d}", list(DEFAULT_PROMPTS)) for index in range(args.repeat)]
+
+    executor = make_supervisor_executor(
+        lambda: AgentSettings(model_name=args.model, offline_latency_ms=args.offline_latency_ms),
+        calls_per_prompt=args.calls_per_prompt,
+    )
+    report = asyncio.run(
+        run_batch(
+            scenarios,
+            executor,
+            requests_per_minute=args.rpm,
+            burst=args.burst,
+            max_concurrency=args.concurrency,
+            max_attempts=args.max_attempts,
+            checkpoint=args.checkpoint,
+        )
+    )
+    summary = {key: value for key, value in report.items() if key != "scenarios"}
+    print(json.dumps(summary, indent=2))
+    for result in report["scenarios"]:
+        print(f"{result['name']}: {result['status']} p50={result['p50_s']} p95={result['p95_s']} attempts={result['attempts']}")
+    if args.report is not None:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Run the hot-path benchmark suite and gate on regressions against a baseline.
+
+Usage (from repository root):
+
+    # Record a baseline (10K rows by default; add 1m/10m for larger fixtures).
+    PYTHONPATH=src python scripts/run_benchmarks.py run --sizes 10k 1m --output reports/benchmarks/baseline.json
+
+    # Re-run and fail (exit 1) when p50 latency or peak memory grew more than 20%.
+    PYTHONPATH=src python scripts/run_benchmarks.py compare --baseline reports/benchmarks/baseline.json
+
+    # Compare two stored reports without running anything.
+    PYTHONPATH=src python scripts/run_benchmarks.py compare --baseline old.json --current new.json
+
+Cases: fetch_logs (warm frame cache), fetch_logs_cold, parse_logs,
+summarize_utilization, and build_dashboard_snapshot.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+
+from it_ops_observability.benchmarks import CASES
+from it_ops_observability.benchmarks import DEFAULT_LATENCY_THRESHOLD_PCT
+from it_ops_observability.benchmarks import DEFAULT_MEMORY_THRESHOLD_PCT
+from it_ops_observability.benchmarks import SIZES
+from it_ops_observability.benchmarks import compare
+from it_ops_observability.benchmarks import load_report
+from it_ops_observability.benchmarks import regressions_to_dicts
+from it_ops_observability.benchmarks import run_suite
+from it_ops_observability.benchmarks import save_report
+
+
+def _add_run_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--sizes", nargs="+", default=["10k"], choices=list(SIZES), help="Fixture sizes to run.")
+    parser.add_argument("--cases", nargs="+", default=None, choices=[case.name for case in CASES])
+    parser.add_argument("--repeat", type=int, default=5, help="Timed calls per case after one warm-up.")
+    parser.add_argument("--output", type=Path, default=None, help="Write the report JSON here.")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    _add_run_arguments(commands.add_parser("run", help="Run the suite and print (or save) the report."))
+    gate = commands.add_parser("compare", help="Compare a run against a baseline; exit 1 on regression.")
+    _add_run_arguments(gate)
+    gate.add_argument("--baseline", type=Path, required=True)
+    gate.add_argument("--current", type=Path, default=None, help="Stored report to compare instead of running.")
+    gate.add_argument("--max-latency-regression-pct", type=float, default=DEFAULT_LATENCY_THRESHOLD_PCT)
+    gate.add_argument("--max-memory-regression-pct", type=float, default=DEFAULT_MEMORY_THRESHOLD_PCT)
+    args = parser.parse_args()
+
+    if args.command == "compare" and args.current is not None:
+        report = load_report(args.current)
+    else:
+        report = run_suite(args.sizes, cases=args.cases, repeat=args.repeat)
+    if args.output is not None:
+        save_report(report, args.output)
+
+    if args.command == "run":
+        print(json.dumps(report, indent=2))
+        return 0
+    regressions = compare(
+        report,
+        load_report(args.baseline),
+        latency_threshold_pct=args.max_latency_regression_pct,
+        memory_threshold_pct=args.max_memory_regression_pct,
+    )
+    print(json.dumps({"compared": sorted(report["results"]), "regressions": regressions_to_dicts(regressions)}, indent=2))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,76 @@
-"""Convenience exports for the IT observability package."""
-from .agent import AgentSettings
-from .agent import create_supervisor_agent
-from .data_sources import DataConfig
-from .tools import build_data_tools
-from .tools import fetch_incident_digest
-from .tools import fetch_server_logs
-from .tools import summarize_utilization
-from .tools import set_data_config
+"""Convenience exports for the IT observability package.
+
+Exports are resolved lazily on first attribute access so that importing a
+lightweight submodule (for example `synthetic` or `dashboard.parse_logs`) does
+not pull in `google.adk` or `pandas`.
+"""
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Dict
+from typing import List
+
+if TYPE_CHECKING:
+    from .agent import AgentSettings
+    from .agent import create_supervisor_agent
+    from .data_sources import DataConfig
+    from .profiling import Profiler
+    from .response_cache import ResponseCache
+    from .tools import build_data_tools
+    from .tools import fetch_incident_digest
+    from .tools import fetch_log_templates
+    from .tools import fetch_server_logs
+    from .tools import summarize_utilization
+    from .tools import set_data_config
+    from .tools import use_data_config
+    from .tracing import Tracer
+    from .warmup import warm_up
+
+_EXPORTS: Dict[str, str] = {
+    "AgentSettings": ".agent",
+    "create_supervisor_agent": ".agent",
+    "DataConfig": ".data_sources",
+    "Profiler": ".profiling",
+    "ResponseCache": ".response_cache",
+    "build_data_tools": ".tools",
+    "fetch_incident_digest": ".tools",
+    "fetch_log_templates": ".tools",
+    "fetch_server_logs": ".tools",
+    "summarize_utilization": ".tools",
+    "set_data_config": ".tools",
+    "use_data_config": ".tools",
+    "Tracer": ".tracing",
+    "warm_up": ".warmup",
+}
 
 __all__ = [
     "AgentSettings",
     "create_supervisor_agent",
     "DataConfig",
+    "Profiler",
+    "ResponseCache",
     "build_data_tools",
     "fetch_incident_digest",
+    "fetch_log_templates",
     "fetch_server_logs",
     "summarize_utilization",
     "set_data_config",
+    "use_data_config",
+    "Tracer",
+    "warm_up",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value  # cache so later lookups bypass __getattr__
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -2,13 +2,29 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
 from typing import Optional
+from typing import Union
 
 from google.adk.agents import Agent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.registry import LLMRegistry
 
+from .compaction import SessionCompactor
 from .tools import build_data_tools
-from .tools import set_data_config
 from .data_sources import DataConfig
+from .data_sources import DEFAULT_CONFIG
+from .offline_llm import ScriptedLlm
+from .offline_llm import is_offline_model
+from .offline_llm import load_script
+from .profiling import Profiler
+from .response_cache import CachedLlm
+from .response_cache import ResponseCache
+from .shared_cache import SharedCache
+from .tracing import Tracer
 
 
 DEFAULT_MODEL = "gemini-2.5-flash-lite"
@@ -20,6 +36,70 @@ class AgentSettings:
 
     model_name: str = DEFAULT_MODEL
     data_config: Optional[DataConfig] = None
+    # Only used when `model_name` selects the offline backend ("offline" or "offline/<label>").
+    offline_script: Optional[Path] = None
+    offline_latency_ms: float = 0.0
+    offline_latency_per_token_ms: float = 0.0
+    # Collects agent, model, and tool spans when set; use one tracer per run.
+    tracer: Optional[Tracer] = None
+    # Serves repeated requests over unchanged telemetry from disk when set.
+    response_cache: Optional[ResponseCache] = None
+    # Shares tool results across processes (keyed by arguments and data version) when set.
+    tool_cache: Optional[SharedCache] = None
+    # Digests and summarizes earlier turns once a request crosses its token threshold when set.
+    compactor: Optional[SessionCompactor] = None
+    # Profiles a sample of tool calls when set; defaults to the `IT_OPS_PROFILE` environment profiler.
+    profiler: Optional[Profiler] = None
+
+
+def _build_model(
+    settings: AgentSettings, agent_name: str, transfer_targets: List[str]
+) -> Union[str, BaseLlm]:
+    """Return the model for one agent: a Gemini model name or an offline stand-in.
+
+    With `settings.response_cache` set, the model is wrapped in `CachedLlm`.
+    """
+    model: Union[str, BaseLlm] = settings.model_name
+    if is_offline_model(settings.model_name):
+        model = ScriptedLlm(
+            model=settings.model_name,
+            agent_name=agent_name,
+            transfer_targets=transfer_targets,
+            script=load_script(settings.offline_script),
+            latency_ms=settings.offline_latency_ms,
+            latency_per_token_ms=settings.offline_latency_per_token_ms,
+        )
+    if settings.response_cache is None:
+        return model
+    inner = model if isinstance(model, BaseLlm) else LLMRegistry.new_llm(model)
+    return CachedLlm(
+        model=inner.model,
+        inner=inner,
+        cache=settings.response_cache,
+        data_config=settings.data_config or DEFAULT_CONFIG,
+    )
+
+
+def _agent_callbacks(settings: AgentSettings) -> Dict[str, Any]:
+    """Return callback keyword arguments shared by every agent in the tree."""
+    callbacks = {} if settings.tracer is None else settings.tracer.agent_callbacks()
+    if settings.compactor is not None:
+        # Compact first so model spans record the request size actually sent.
+        traced = callbacks.get("before_model_callback")
+        callbacks["before_model_callback"] = [settings.compactor.before_model] + ([traced] if traced else [])
+    return callbacks
+
+
+def _recall_tools(settings: AgentSettings) -> List[Any]:
+    """Return the compactor's `recall_tool_result` tool when compaction is enabled."""
+    if settings.compactor is None:
+        return []
+    from google.adk.tools.function_tool import FunctionTool
+
+    function = settings.compactor.recall_tool_result
+    if settings.tracer is not None:
+        function = settings.tracer.wrap_tool(function)
+    return [FunctionTool(function)]
 
 
 def create_supervisor_agent(settings: AgentSettings | None = None) -> Agent:
@@ -32,47 +112,91 @@ def create_supervisor_agent(settings: AgentSettings | None = None) -> Agent:
 
     Each specialist receives the FunctionTool wrappers defined in
     `build_data_tools`, giving the workflow resilient access to real or
-    synthetic datasets depending on the environment.
+    synthetic datasets depending on the environment. Setting
+    `settings.model_name` to `offline` swaps Gemini for `ScriptedLlm` so the
+    whole tree runs without credentials for benchmarks and load tests, and
+    `settings.tracer` records spans for every agent turn, model call, and tool.
+    `settings.compactor` shrinks earlier turns in long sessions and gives the
+    specialists `recall_tool_result` to re-fetch digested tool output.
     """
 
     settings = settings or AgentSettings()
-    set_data_config(settings.data_config)
-    log_tool, metric_tool, ticket_tool = build_data_tools()
+    (
+        log_tool,
+        metric_tool,
+        ticket_tool,
+        template_tool,
+        anomaly_tool,
+        forecast_tool,
+        ticket_search_tool,
+        log_search_tool,
+        correlation_tool,
+        slo_tool,
+        query_tool,
+    ) = build_data_tools(
+        settings.tracer,
+        config=settings.data_config or DEFAULT_CONFIG,
+        result_cache=settings.tool_cache,
+        profiler=settings.profiler,
+    )
+    callbacks = _agent_callbacks(settings)
+    recall_tools = _recall_tools(settings)
+    specialists = ["log_analyst", "metric_analyst", "operations_planner"]
 
     log_agent = Agent(
         name="log_analyst",
-        model=settings.model_name,
+        model=_build_model(settings, "log_analyst", specialists),
         instruction=(
             "You triage infrastructure logs to spot correlated errors,"
             " summarize bursts, and highlight root-cause clues with citations."
+            " Request compact log summaries for windows longer than an hour"
+            " and fetch raw lines only when you need exact messages."
+            " Use log templates to find new or dominant error patterns, and"
+            " full-text log search for questions spanning many hosts or days."
+            " Correlate log signals with metrics to rank root-cause candidates"
+            " before attributing an error burst to a resource spike."
+            " Answer counting and rate questions (errors per server, per hour)"
+            " with an aggregate telemetry query instead of reading raw lines."
         ),
-        tools=[log_tool],
+        tools=[log_tool, template_tool, log_search_tool, correlation_tool, query_tool, *recall_tools],
+        **callbacks,
     )
 
     metric_agent = Agent(
         name="metric_analyst",
-        model=settings.model_name,
+        model=_build_model(settings, "metric_analyst", specialists),
         instruction=(
             "You analyze CPU and memory time series to explain utilization,"
             " capacity risks, and SLA/SLO drift with quantitative evidence."
+            " Run anomaly detection to locate abnormal windows rather than"
+            " inferring them from raw samples, and forecast utilization for"
+            " capacity questions about the next day. Use signal correlation to"
+            " name the log patterns that move with a spike, and check SLO burn"
+            " rates before stating whether error budget is at risk."
+            " Use aggregate telemetry queries for percentiles or per-bucket"
+            " statistics the summary tools do not report."
         ),
-        tools=[metric_tool],
+        tools=[metric_tool, anomaly_tool, forecast_tool, correlation_tool, slo_tool, query_tool, *recall_tools],
+        **callbacks,
     )
 
     operations_agent = Agent(
         name="operations_planner",
-        model=settings.model_name,
+        model=_build_model(settings, "operations_planner", specialists),
         instruction=(
             "You design mitigation and communication plans by combining log"
             " anomalies, utilization trends, and stakeholder tickets."
             " Recommend windows, owners, and customer messaging."
+            " Search past incident tickets for the current symptoms to reuse"
+            " remediations that worked before."
         ),
-        tools=[metric_tool, ticket_tool],
+        tools=[metric_tool, ticket_tool, ticket_search_tool, *recall_tools],
+        **callbacks,
     )
 
     supervisor_agent = Agent(
         name="it_ops_supervisor",
-        model=settings.model_name,
+        model=_build_model(settings, "it_ops_supervisor", specialists),
         instruction=(
             "You coordinate observability specialists to answer leadership"
             " questions about reliability and customer impact. Trigger"
@@ -80,6 +204,7 @@ def create_supervisor_agent(settings: AgentSettings | None = None) -> Agent:
             " an actionable summary with next steps."
         ),
         sub_agents=[log_agent, metric_agent, operations_agent],
+        **callbacks,
     )
 
     return supervisor_agent
@@ -0,0 +1,591 @@
+"""Read-only aggregate queries over the processed parquet datasets.
+
+The fixed-shape tools answer fixed questions; anything else ("error rate by
+server over the last 6h", "p95 CPU per hour") used to mean several broad
+tool calls and reasoning over raw text. `query_telemetry` (see `tools.py`)
+instead accepts a small declarative query: aggregates, group keys, and
+filters drawn from a fixed vocabulary and validated against the dataset
+schema. Nothing can write, call arbitrary functions, or read outside the
+configured datasets.
+
+`QueryEngine` runs queries in-process with `pyarrow.dataset`:
+
+* filters on stored columns are pushed into the parquet scan, so row-group
+  statistics skip data (notably on the server-sorted layout from
+  `storage.py`); log datasets without `timestamp`/`severity` columns get
+  them parsed from the message text;
+* grouping uses Arrow's hash aggregation;
+* every query is bounded by a scan time limit, a scanned-row cap, and caps on
+  result rows and serialized bytes;
+* validated plans are cached by schema and query, and results by query and
+  the dataset's `data_sources.dataset_stamp`, so a new ingest flush or a
+  rewritten file is never answered from a stale entry.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+import json
+from pathlib import Path
+import re
+import threading
+import time
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from .data_sources import dataset_stamp
+
+
+DATASETS = ("logs", "metrics", "tickets")
+AGGREGATE_FUNCTIONS = (
+    "count", "count_distinct", "sum", "mean", "min", "max", "stddev", "p50", "p90", "p95", "p99", "rate",
+)
+FILTER_OPERATORS = ("=", "!=", ">", ">=", "<", "<=", "in", "contains")
+DEFAULT_LIMIT = 20
+MAX_RESULT_ROWS = 200
+MAX_RESULT_BYTES = 32_000
+MAX_SCAN_ROWS = 50_000_000
+DEFAULT_TIMEOUT_S = 5.0
+DEFAULT_CACHE_ENTRIES = 256
+TIME_COLUMN = "timestamp"
+
+_PERCENTILES = {"p50": 0.5, "p90": 0.9, "p95": 0.95, "p99": 0.99}
+_NUMERIC_FUNCTIONS = frozenset({"sum", "mean", "stddev", *_PERCENTILES})
+_BUCKET = re.compile(r"^bucket:(\d+)([mhd])$")
+_BUCKET_UNITS = {"m": "minute", "h": "hour", "d": "day"}
+_FILTER = re.compile(
+    r"^\s*([A-Za-z_]\w*)\s*(!=|>=|<=|=|>|<|\s+in\s+|\s+contains\s+)\s*(.*?)\s*$", re.IGNORECASE
+)
+# Columns parsed from `<timestamp> [<LEVEL>] <message>` lines when a log dataset does not store them.
+_DERIVED_LOG_COLUMNS = {"timestamp": pa.timestamp("us", "UTC"), "severity": pa.string()}
+_ISO_PREFIX = r"^\d{4}-\d{2}-\d{2}T"
+
+
+class QueryError(ValueError):
+    """A query that is invalid for its dataset or exceeds a limit."""
+
+
+@dataclass(frozen=True)
+class AggregateQuery:
+    """A normalized query; the plan compiler validates it against a schema."""
+
+    dataset: str
+    aggregates: Tuple[str, ...] = ("count",)
+    group_by: Tuple[str, ...] = ()
+    filters: Tuple[str, ...] = ()
+    since_hours: Optional[float] = None
+    order_by: Optional[str] = None
+    limit: int = DEFAULT_LIMIT
+
+    @classmethod
+    def parse(
+        cls,
+        dataset: str,
+        aggregates: Optional[Sequence[str]] = None,
+        group_by: Optional[Sequence[str]] = None,
+        filters: Optional[Sequence[str]] = None,
+        since_hours: Optional[float] = None,
+        order_by: Optional[str] = None,
+        limit: int = DEFAULT_LIMIT,
+    ) -> "AggregateQuery":
+        """Normalize tool arguments (whitespace, duplicates, limits) into a hashable query."""
+
+        def _clean(items: Optional[Sequence[str]]) -> Tuple[str, ...]:
+            cleaned = [" ".join(str(item).split()) for item in items or ()]
+            return tuple(dict.fromkeys(item for item in cleaned if item))
+
+        if dataset not in DATASETS:
+            raise QueryError(f"Unknown dataset {dataset!r}; choose one of {', '.join(DATASETS)}")
+        if since_hours is not None and since_hours <= 0:
+            raise QueryError("since_hours must be positive")
+        return cls(
+            dataset=dataset,
+            aggregates=_clean(aggregates) or ("count",),
+            group_by=_clean(group_by),
+            filters=_clean(filters),
+            since_hours=float(since_hours) if since_hours is not None else None,
+            order_by=order_by.strip() if order_by else None,
+            limit=max(1, min(int(limit), MAX_RESULT_ROWS)),
+        )
+
+
+@dataclass(frozen=True)
+class DatasetSource:
+    """An opened dataset plus the stamp its cached results are keyed by."""
+
+    name: str
+    key: str
+    stamp: Any
+    dataset: ds.Dataset
+
+
+@dataclass
+class QueryPlan:
+    """A query compiled against one schema; reusable until the schema changes."""
+
+    stored_columns: List[str]
+    derive: Tuple[str, ...]
+    scan_filter: Optional[pc.Expression]
+    row_filter: Optional[pc.Expression]
+    projection: Dict[str, pc.Expression]
+    keys: List[str]
+    aggregations: List[Tuple[Any, ...]]
+    outputs: List[Tuple[str, str]]  # (output name, Arrow aggregate column name)
+    time_type: Optional[pa.DataType]
+    time_stored: bool
+    order_by: str
+    descending: bool
+
+
+# -- Plan compilation --------------------------------------------------------
+
+
+def _schema_columns(name: str, schema: pa.Schema) -> Dict[str, pa.DataType]:
+    columns = {item.name: item.type for item in schema}
+    if name == "logs" and "message" in columns:
+        for column, dtype in _DERIVED_LOG_COLUMNS.items():
+            columns.setdefault(column, dtype)
+    return columns
+
+
+def _value_type(dtype: pa.DataType) -> pa.DataType:
+    return dtype.value_type if pa.types.is_dictionary(dtype) else dtype
+
+
+def _ref(column: str, dtype: pa.DataType) -> pc.Expression:
+    # String kernels have no dictionary overloads, so compare dictionary columns as plain strings.
+    return pc.field(column).cast(dtype.value_type) if pa.types.is_dictionary(dtype) else pc.field(column)
+
+
+def _time_scalar(value: datetime, dtype: pa.DataType) -> pa.Scalar:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    if getattr(dtype, "tz", None) is None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return pa.scalar(value, type=dtype)
+
+
+def _coerce(column: str, raw: str, dtype: pa.DataType) -> Any:
+    text = raw.strip().strip("'\"")
+    dtype = _value_type(dtype)
+    try:
+        if pa.types.is_integer(dtype) or pa.types.is_floating(dtype):
+            number = float(text)
+            return int(number) if pa.types.is_integer(dtype) and number.is_integer() else number
+        if pa.types.is_timestamp(dtype):
+            return _time_scalar(datetime.fromisoformat(text.replace("Z", "+00:00")), dtype)
+        if pa.types.is_boolean(dtype):
+            return text.lower() in ("true", "1", "yes")
+    except ValueError as exc:
+        raise QueryError(f"Value {text!r} does not match column {column!r} ({dtype})") from exc
+    return text
+
+
+def _compile_filter(text: str, columns: Dict[str, pa.DataType]) -> Tuple[str, pc.Expression]:
+    match = _FILTER.match(text)
+    if match is None:
+        raise QueryError(
+            f"Cannot parse filter {text!r}; use '<column> <op> <value>' with op in {', '.join(FILTER_OPERATORS)}"
+        )
+    column, op, raw = match.group(1), match.group(2).strip().lower(), match.group(3)
+    if column not in columns:
+        raise QueryError(f"Unknown column {column!r}")
+    dtype = columns[column]
+    ref = _ref(column, dtype)
+    if op == "in":
+        values = [_coerce(column, item, dtype) for item in raw.split(",") if item.strip()]
+        return column, ref.isin(values)
+    if op == "contains":
+        if not pa.types.is_string(_value_type(dtype)) and not pa.types.is_large_string(_value_type(dtype)):
+            raise QueryError(f"'contains' needs a text column; {column!r} is {dtype}")
+        return column, pc.match_substring(ref, raw.strip().strip("'\""))
+    value = _coerce(column, raw, dtype)
+    comparisons = {
+        "=": ref.__eq__, "!=": ref.__ne__, ">": ref.__gt__, ">=": ref.__ge__, "<": ref.__lt__, "<=": ref.__le__,
+    }
+    return column, comparisons[op](value)
+
+
+def _combine(expressions: List[pc.Expression]) -> Optional[pc.Expression]:
+    combined: Optional[pc.Expression] = None
+    for expression in expressions:
+        combined = expression if combined is None else combined & expression
+    return combined
+
+
+def compile_plan(query: AggregateQuery, name: str, schema: pa.Schema) -> QueryPlan:
+    """Validate `query` against `schema` and compile its scan, projection, and aggregations."""
+    columns = _schema_columns(name, schema)
+    stored = set(schema.names)
+    used: List[str] = []
+    scan_filters: List[pc.Expression] = []
+    row_filters: List[pc.Expression] = []
+    for text in query.filters:
+        column, expression = _compile_filter(text, columns)
+        used.append(column)
+        (scan_filters if column in stored else row_filters).append(expression)
+
+    projection: Dict[str, pc.Expression] = {}
+    keys: List[str] = []
+    for key in query.group_by:
+        bucket = _BUCKET.match(key)
+        if bucket is not None:
+            if TIME_COLUMN not in columns:
+                raise QueryError(f"Dataset {name!r} has no {TIME_COLUMN!r} column to bucket")
+            multiple, unit = int(bucket.group(1)), _BUCKET_UNITS[bucket.group(2)]
+            if multiple <= 0:
+                raise QueryError(f"Invalid time bucket {key!r}")
+            projection["bucket"] = pc.floor_temporal(pc.field(TIME_COLUMN), multiple=multiple, unit=unit)
+            used.append(TIME_COLUMN)
+            keys.append("bucket")
+        elif key in columns:
+            projection[key] = _ref(key, columns[key])
+            used.append(key)
+            keys.append(key)
+        else:
+            raise QueryError(f"Unknown group_by column {key!r}; use a column name or bucket:<N>m|h|d")
+
+    aggregations: List[Tuple[Any, ...]] = []
+    outputs: List[Tuple[str, str]] = []
+    for index, spec in enumerate(query.aggregates):
+        function, _, argument = spec.partition(":")
+        function = function.strip().lower()
+        if function == "count" and not argument:
+            aggregations.append(([], "count_all"))
+            outputs.append((spec, "count_all"))
+            continue
+        if function == "rate":
+            column, condition = _compile_filter(argument, columns)
+            used.append(column)
+            flag = f"__rate{index}"
+            projection[flag] = condition.cast(pa.float64())
+            aggregations.append((flag, "mean"))
+            outputs.append((spec, f"{flag}_mean"))
+            continue
+        if function not in AGGREGATE_FUNCTIONS or not argument:
+            raise QueryError(
+                f"Unknown aggregate {spec!r}; use count, rate:<filter>, or <fn>:<column> with fn in "
+                + ", ".join(item for item in AGGREGATE_FUNCTIONS if item not in ("count", "rate"))
+            )
+        column = argument.strip()
+        if column not in columns:
+            raise QueryError(f"Unknown column {column!r}")
+        dtype = _value_type(columns[column])
+        if function in _NUMERIC_FUNCTIONS and not (pa.types.is_integer(dtype) or pa.types.is_floating(dtype)):
+            raise QueryError(f"{function} needs a numeric column; {column!r} is {dtype}")
+        source = f"__arg{index}"
+        projection[source] = _ref(column, columns[column])
+        used.append(column)
+        if function in _PERCENTILES:
+            aggregations.append((source, "tdigest", pc.TDigestOptions(q=[_PERCENTILES[function]])))
+            outputs.append((spec, f"{source}_tdigest"))
+        else:
+            aggregations.append((source, function))
+            outputs.append((spec, f"{source}_{function}"))
+
+    time_type = columns.get(TIME_COLUMN)
+    if query.since_hours is not None:
+        if time_type is None:
+            raise QueryError(f"Dataset {name!r} has no {TIME_COLUMN!r} column for since_hours")
+        used.append(TIME_COLUMN)
+
+    order_by, descending = query.order_by or outputs[0][0], query.order_by is None
+    if order_by.startswith("-"):
+        order_by, descending = order_by[1:], True
+    if order_by not in {output for output, _ in outputs} | set(keys):
+        raise QueryError(f"order_by must name an output column: {', '.join([*keys, *(o for o, _ in outputs)])}")
+
+    if not projection:
+        # An empty projection loses the row count, so `count` alone needs a placeholder column.
+        projection["__row"] = pc.scalar(True)
+    derive = tuple(column for column in _DERIVED_LOG_COLUMNS if column in used and column not in stored)
+    needed = [column for column in dict.fromkeys(used) if column in stored]
+    if derive and "message" not in needed:
+        needed.append("message")
+    return QueryPlan(
+        stored_columns=needed,
+        derive=derive,
+        scan_filter=_combine(scan_filters),
+        row_filter=_combine(row_filters),
+        projection=projection,
+        keys=keys,
+        aggregations=aggregations,
+        outputs=outputs,
+        time_type=time_type,
+        time_stored=TIME_COLUMN in stored,
+        order_by=order_by,
+        descending=descending,
+    )
+
+
+# -- Execution ---------------------------------------------------------------
+
+
+def _derive_log_columns(table: pa.Table, derive: Tuple[str, ...]) -> pa.Table:
+    """Append `timestamp`/`severity` parsed from the `message` column."""
+    message = table.column("message")
+    if pa.types.is_dictionary(message.type):
+        message = message.cast(message.type.value_type)
+    pieces = pc.split_pattern(message, " ", max_splits=2)
+    if "timestamp" in derive:
+        head = pc.list_element(pieces, 0)
+        head = pc.if_else(pc.match_substring_regex(head, _ISO_PREFIX), head, pa.scalar(None, pa.string()))
+        try:
+            stamps = head.cast(_DERIVED_LOG_COLUMNS["timestamp"])
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            stamps = pa.chunked_array(
+                [[_parse_stamp(value) for value in head.to_pylist()]], type=_DERIVED_LOG_COLUMNS["timestamp"]
+            )
+        table = table.append_column("timestamp", stamps)
+    if "severity" in derive:
+        level = pc.list_element(pieces, 1)
+        bracketed = pc.and_(pc.starts_with(level, "["), pc.ends_with(level, "]"))
+        level = pc.if_else(bracketed, pc.utf8_upper(pc.utf8_trim(level, "[]")), pa.scalar("UNKNOWN"))
+        table = table.append_column("severity", level)
+    return table
+
+
+def _parse_stamp(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, float):
+        return round(value, 4)
+    return value
+
+
+class _LRU:
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class QueryEngine:
+    """Executes `AggregateQuery`s with plan and result caches and per-query limits."""
+
+    def __init__(
+        self,
+        *,
+        timeout_s: float = DEFAULT_TIMEOUT_S,
+        max_scan_rows: int = MAX_SCAN_ROWS,
+        max_result_bytes: int = MAX_RESULT_BYTES,
+        cache_entries: int = DEFAULT_CACHE_ENTRIES,
+    ) -> None:
+        self.timeout_s = timeout_s
+        self.max_scan_rows = max_scan_rows
+        self.max_result_bytes = max_result_bytes
+        self.plans = _LRU(cache_entries)
+        self.results = _LRU(cache_entries)
+        self._sources = _LRU(cache_entries)
+        self._newest = _LRU(cache_entries)
+
+    # Sources ------------------------------------------------------------------
+
+    def open_path(self, name: str, path: Path) -> DatasetSource:
+        """Open a parquet file or directory of parts, reusing it while `dataset_stamp` is unchanged."""
+        stamp = dataset_stamp(path)
+        cached = self._sources.get((name, str(path)))
+        if cached is not None and cached.stamp == stamp:
+            return cached
+        files = sorted(str(item) for item in path.glob("*.parquet")) if path.is_dir() else [str(path)]
+        if not files:
+            raise QueryError(f"No parquet files under {path}")
+        source = DatasetSource(name=name, key=str(path), stamp=stamp, dataset=ds.dataset(files, format="parquet"))
+        self._sources.put((name, str(path)), source)
+        return source
+
+    @staticmethod
+    def from_table(name: str, key: str, table: pa.Table, stamp: Any = None) -> DatasetSource:
+        return DatasetSource(name=name, key=key, stamp=stamp, dataset=ds.dataset(table))
+
+    @staticmethod
+    def describe(source: DatasetSource) -> Dict[str, str]:
+        """Return the queryable columns of `source` and their types."""
+        return {column: str(dtype) for column, dtype in _schema_columns(source.name, source.dataset.schema).items()}
+
+    # Execution ----------------------------------------------------------------
+
+    def plan(self, query: AggregateQuery, source: DatasetSource) -> Tuple[QueryPlan, bool]:
+        schema = source.dataset.schema
+        key = (source.name, tuple((item.name, str(item.type)) for item in schema), query)
+        plan = self.plans.get(key)
+        if plan is not None:
+            return plan, True
+        plan = compile_plan(query, source.name, schema)
+        self.plans.put(key, plan)
+        return plan, False
+
+    def execute(self, query: AggregateQuery, source: DatasetSource) -> Dict[str, Any]:
+        """Run `query` against `source`; raises `QueryError` for invalid queries and exceeded limits."""
+        started = time.perf_counter()
+        result_key = (source.key, source.stamp, query)
+        cached = self.results.get(result_key) if source.stamp is not None else None
+        if cached is not None:
+            return {**cached, "cached": True, "took_ms": round((time.perf_counter() - started) * 1000, 2)}
+        plan, plan_cached = self.plan(query, source)
+        deadline = started + self.timeout_s
+        window: Dict[str, Any] = {}
+        scan_filter, row_filter = plan.scan_filter, plan.row_filter
+        if query.since_hours is not None:
+            newest = self._newest_timestamp(source, plan, deadline)
+            if newest is not None:
+                start = newest - timedelta(hours=query.since_hours)
+                window = {"start": start.isoformat(), "end": newest.isoformat(), "since_hours": query.since_hours}
+                recent = pc.field(TIME_COLUMN) >= _time_scalar(start, plan.time_type)
+                if plan.time_stored:
+                    scan_filter = recent if scan_filter is None else scan_filter & recent
+                else:
+                    row_filter = recent if row_filter is None else row_filter & recent
+
+        table, scanned = self._scan(source, plan, scan_filter, row_filter, deadline)
+        grouped = table.group_by(plan.keys).aggregate(plan.aggregations)
+        renamed = {arrow_name: output for output, arrow_name in plan.outputs}
+        grouped = grouped.rename_columns([renamed.get(name, name) for name in grouped.column_names])
+        names = [*plan.keys, *(output for output, _ in plan.outputs)]
+        grouped = grouped.select(names)
+        for position, name in enumerate(names):
+            if pa.types.is_fixed_size_list(grouped.schema.field(name).type):  # one-quantile tdigest
+                grouped = grouped.set_column(position, name, pc.list_flatten(grouped.column(name)))
+        groups = grouped.num_rows
+        grouped = grouped.sort_by([(plan.order_by, "descending" if plan.descending else "ascending")])
+        rows = [{key: _jsonable(value) for key, value in row.items()} for row in grouped.slice(0, query.limit).to_pylist()]
+        truncated = groups > len(rows)
+        while rows and len(json.dumps(rows, default=str)) > self.max_result_bytes:
+            rows = rows[: len(rows) // 2]
+            truncated = True
+        result = {
+            "dataset": source.name,
+            "columns": names,
+            "rows": rows,
+            "groups": groups,
+            "truncated": truncated,
+            "matched_rows": table.num_rows,
+            "scanned_rows": scanned,
+            "window": window or None,
+            "plan_cached": plan_cached,
+        }
+        if source.stamp is not None:
+            self.results.put(result_key, result)
+        return {**result, "cached": False, "took_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+    def _batches(
+        self, source: DatasetSource, plan: QueryPlan, scan_filter: Optional[pc.Expression], deadline: float
+    ) -> Any:
+        scanner = source.dataset.scanner(columns=plan.stored_columns, filter=scan_filter)
+        scanned = 0
+        for batch in scanner.to_batches():
+            scanned += batch.num_rows
+            if scanned > self.max_scan_rows:
+                raise QueryError(
+                    f"Query matched more than {self.max_scan_rows:,} rows before aggregation; add filters or shorten since_hours"
+                )
+            if time.perf_counter() > deadline:
+                raise QueryError(
+                    f"Query exceeded the {self.timeout_s:g}s time limit after scanning {scanned:,} rows;"
+                    " add filters or shorten since_hours"
+                )
+            yield batch
+
+    def _scan(
+        self,
+        source: DatasetSource,
+        plan: QueryPlan,
+        scan_filter: Optional[pc.Expression],
+        row_filter: Optional[pc.Expression],
+        deadline: float,
+    ) -> Tuple[pa.Table, int]:
+        """Return the filtered, projected rows ready for aggregation and the number of rows scanned."""
+        pieces: List[pa.Table] = []
+        scanned = 0
+        for batch in self._batches(source, plan, scan_filter, deadline):
+            scanned += batch.num_rows
+            table = pa.Table.from_batches([batch])
+            if plan.derive:
+                table = _derive_log_columns(table, plan.derive)
+            pieces.append(ds.dataset(table).to_table(columns=plan.projection, filter=row_filter))
+        if not pieces:
+            empty = ds.dataset(pa.Table.from_batches([], schema=source.dataset.schema).select(plan.stored_columns))
+            if plan.derive:
+                empty = ds.dataset(_derive_log_columns(empty.to_table(), plan.derive))
+            return empty.to_table(columns=plan.projection), 0
+        return pa.concat_tables(pieces), scanned
+
+    def _newest_timestamp(self, source: DatasetSource, plan: QueryPlan, deadline: float) -> Optional[datetime]:
+        """Return the newest row time, so `since_hours` is relative to the data rather than the clock."""
+        key = (source.key, source.stamp)
+        cached = self._newest.get(key) if source.stamp is not None else None
+        if cached is not None:
+            return cached
+        columns = [TIME_COLUMN] if plan.time_stored else ["message"]
+        probe = QueryPlan(
+            stored_columns=columns, derive=() if plan.time_stored else ("timestamp",), scan_filter=None,
+            row_filter=None, projection={}, keys=[], aggregations=[], outputs=[], time_type=plan.time_type,
+            time_stored=plan.time_stored, order_by="", descending=False,
+        )
+        newest = None
+        for batch in self._batches(source, probe, None, deadline):
+            table = pa.Table.from_batches([batch])
+            if probe.derive:
+                table = _derive_log_columns(table, probe.derive)
+            value = pc.max(table.column(TIME_COLUMN)).as_py()
+            if value is not None and (newest is None or value > newest):
+                newest = value
+        if newest is not None and source.stamp is not None:
+            self._newest.put(key, newest)
+        return newest
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "plan_hits": self.plans.hits,
+            "plan_misses": self.plans.misses,
+            "result_hits": self.results.hits,
+            "result_misses": self.results.misses,
+        }
+
+    def clear(self) -> None:
+        for cache in (self.plans, self.results, self._sources, self._newest):
+            cache.clear()
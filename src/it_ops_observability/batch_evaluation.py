@@ -0,0 +1,263 @@
+"""Rate-limit-aware batch evaluation of many supervisor scenarios.
+
+Scenarios run with bounded concurrency. Every prompt first draws from a
+token bucket sized to the model quota (requests per minute), quota errors are
+retried with exponential backoff and full jitter, and each finished scenario is
+appended to a JSONL checkpoint so an interrupted batch resumes where it stopped.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+import json
+from pathlib import Path
+import random
+import time
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from .agent import AgentSettings
+from .agent import create_supervisor_agent
+from .stats import percentile
+
+
+DEFAULT_PROMPTS: List[str] = [
+    "Give me an ops briefing: what happened overnight, what are the top risks, and what should leadership do next?",
+    "Investigate prod-app-01 with the default window and summarize key log anomalies.",
+    "Provide the utilization stats and risks.",
+    "Draft the leadership summary and actions.",
+]
+
+
+@dataclass
+class Scenario:
+    """A named sequence of prompts that share one runner session."""
+
+    name: str
+    prompts: List[str]
+
+
+@dataclass
+class ScenarioResult:
+    """Outcome of one scenario, as stored in the checkpoint file."""
+
+    name: str
+    status: str
+    attempts: int
+    latencies_s: List[float] = field(default_factory=list)
+    error: Optional[str] = None
+    p50_s: Optional[float] = None
+    p95_s: Optional[float] = None
+
+
+class TokenBucket:
+    """Async token bucket: `rate_per_minute` refill with a burst of `capacity`."""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None) -> None:
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_minute / 60.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until `tokens` are available, then consume them.
+
+        Requests larger than `capacity` are drawn in capacity-sized slices, so
+        they wait for the refill rather than failing.
+        """
+        async with self._lock:
+            remaining = tokens
+            while remaining > 0:
+                wanted = min(remaining, self.capacity)
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate_per_second
+                )
+                self._updated = now
+                if self._tokens >= wanted:
+                    self._tokens -= wanted
+                    remaining -= wanted
+                    continue
+                await asyncio.sleep((wanted - self._tokens) / self.rate_per_second)
+
+
+ScenarioExecutor = Callable[[Scenario, TokenBucket], Awaitable[List[float]]]
+
+
+def is_quota_error(exc: BaseException) -> bool:
+    """Return True for Gemini rate-limit/quota failures worth retrying."""
+    if type(exc).__name__ == "_ResourceExhaustedError":
+        return True
+    code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    return code == 429
+
+
+def backoff_delay(attempt: int, *, base_s: float = 2.0, cap_s: float = 60.0) -> float:
+    """Full-jitter exponential backoff for retry number `attempt` (1-based)."""
+    return random.uniform(0, min(cap_s, base_s * 2 ** (attempt - 1)))
+
+
+def load_scenarios(paths: Iterable[Path]) -> List[Scenario]:
+    """Load scenarios from files or directories.
+
+    `.json` files hold a list of prompts or `{"name": ..., "prompts": [...]}`;
+    `.txt` files hold one prompt per line. Directories are scanned (sorted)
+    for both formats. Scenario names default to the file stem.
+    """
+    scenarios: List[Scenario] = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            files = sorted(p for p in path.iterdir() if p.suffix in {".json", ".txt"})
+            scenarios.extend(load_scenarios(files))
+            continue
+        if path.suffix == ".json":
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            if isinstance(payload, dict):
+                scenarios.append(Scenario(payload.get("name", path.stem), list(payload["prompts"])))
+            else:
+                scenarios.append(Scenario(path.stem, list(payload)))
+        else:
+            prompts = [line.strip() for line in path.read_text(encoding="utf-8").splitlines()]
+            scenarios.append(Scenario(path.stem, [prompt for prompt in prompts if prompt]))
+    return scenarios
+
+
+def load_checkpoint(path: Optional[Path]) -> Dict[str, ScenarioResult]:
+    """Return successful results already recorded in the JSONL checkpoint."""
+    if path is None or not Path(path).exists():
+        return {}
+    completed: Dict[str, ScenarioResult] = {}
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue  # torn final line from an interrupted write
+        if record.get("status") == "ok":
+            completed[record["name"]] = ScenarioResult(**record)
+    return completed
+
+
+def make_supervisor_executor(
+    settings_factory: Callable[[], AgentSettings] = AgentSettings,
+    *,
+    calls_per_prompt: float = 1.0,
+) -> ScenarioExecutor:
+    """Build an executor that runs each scenario through a fresh supervisor runner.
+
+    `calls_per_prompt` is the number of quota tokens drawn per prompt; raise it
+    to the typical model calls per prompt when the quota is per model request.
+    """
+    from google.adk.runners import InMemoryRunner
+
+    async def _execute(scenario: Scenario, bucket: TokenBucket) -> List[float]:
+        runner = InMemoryRunner(agent=create_supervisor_agent(settings_factory()))
+        latencies: List[float] = []
+        try:
+            for prompt in scenario.prompts:
+                await bucket.acquire(calls_per_prompt)
+                started = time.perf_counter()
+                await runner.run_debug(prompt, session_id=f"batch-{scenario.name}", quiet=True)
+                latencies.append(time.perf_counter() - started)
+        finally:
+            await runner.close()
+        return latencies
+
+    return _execute
+
+
+async def run_batch(
+    scenarios: Sequence[Scenario],
+    execute: ScenarioExecutor,
+    *,
+    requests_per_minute: float = 15.0,
+    burst: Optional[float] = None,
+    max_concurrency: int = 4,
+    max_attempts: int = 5,
+    backoff_base_s: float = 2.0,
+    backoff_cap_s: float = 60.0,
+    checkpoint: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """Run `scenarios` and return a throughput/latency report.
+
+    Scenarios already marked `ok` in `checkpoint` are skipped and reported as
+    resumed. Quota errors retry the whole scenario (fresh session) after a
+    jittered backoff; other errors, or exhausting `max_attempts`, mark it failed.
+    """
+    bucket = TokenBucket(requests_per_minute, burst)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    completed = load_checkpoint(checkpoint)
+    pending = [scenario for scenario in scenarios if scenario.name not in completed]
+    write_lock = asyncio.Lock()
+    results: List[ScenarioResult] = []
+
+    async def _record(result: ScenarioResult) -> None:
+        results.append(result)
+        if checkpoint is None:
+            return
+        async with write_lock:
+            Path(checkpoint).parent.mkdir(parents=True, exist_ok=True)
+            with Path(checkpoint).open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(asdict(result)) + "\n")
+
+    async def _run_one(scenario: Scenario) -> None:
+        async with semaphore:
+            attempt = 0
+            while True:
+                attempt += 1
+                try:
+                    latencies = await execute(scenario, bucket)
+                except Exception as exc:  # noqa: BLE001 - every failure is recorded
+                    if is_quota_error(exc) and attempt < max_attempts:
+                        await asyncio.sleep(
+                            backoff_delay(attempt, base_s=backoff_base_s, cap_s=backoff_cap_s)
+                        )
+                        continue
+                    await _record(
+                        ScenarioResult(scenario.name, "failed", attempt, error=f"{type(exc).__name__}: {exc}")
+                    )
+                    return
+                await _record(
+                    ScenarioResult(
+                        scenario.name,
+                        "ok",
+                        attempt,
+                        latencies_s=latencies,
+                        p50_s=percentile(latencies, 50),
+                        p95_s=percentile(latencies, 95),
+                    )
+                )
+                return
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_run_one(scenario) for scenario in pending))
+    wall_s = time.perf_counter() - started
+
+    ok = [result for result in results if result.status == "ok"]
+    prompt_latencies = [latency for result in ok for latency in result.latencies_s]
+    return {
+        "scenarios_total": len(scenarios),
+        "scenarios_resumed": len(scenarios) - len(pending),
+        "scenarios_ok": len(ok),
+        "scenarios_failed": len(results) - len(ok),
+        "retries": sum(result.attempts - 1 for result in results),
+        "wall_time_s": round(wall_s, 3),
+        "scenarios_per_s": round(len(ok) / wall_s, 3) if wall_s > 0 else None,
+        "prompts_per_s": round(len(prompt_latencies) / wall_s, 3) if wall_s > 0 else None,
+        "prompt_p50_s": percentile(prompt_latencies, 50),
+        "prompt_p95_s": percentile(prompt_latencies, 95),
+        "scenarios": [asdict(result) for result in results],
+    }
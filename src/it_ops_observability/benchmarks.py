@@ -0,0 +1,259 @@
+"""Benchmark suite with JSON baselines for the data and dashboard hot paths.
+
+`run_suite` writes generated log and metric parquet fixtures at each
+requested size (`10k`, `1m`, `10m` rows), then times every case in `CASES`:
+`repeat` timed calls after one warm-up call give latency percentiles and
+throughput, and one extra call under `tracemalloc` gives peak Python-heap
+memory (NumPy and pandas buffers included; Arrow's own allocator is not).
+
+Results are plain JSON. `compare` checks a run against a stored baseline and
+returns one `Regression` per case whose p50 latency or peak memory grew by
+more than the configured percentage, which `scripts/run_benchmarks.py`
+turns into a non-zero exit status.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timezone
+import json
+from pathlib import Path
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from .dashboard import build_dashboard_snapshot
+from .dashboard import parse_logs
+from .data_sources import DataConfig
+from .data_sources import clear_frame_cache
+from .data_sources import fetch_logs
+from .stats import percentile
+from .tools import summarize_utilization
+from .tools import use_data_config
+
+
+SIZES: Dict[str, int] = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+FIXTURE_SERVERS = ("prod-app-01", "prod-app-02", "prod-db-01", "prod-edge-01")
+DEFAULT_LATENCY_THRESHOLD_PCT = 20.0
+DEFAULT_MEMORY_THRESHOLD_PCT = 20.0
+_MESSAGES = {
+    "CRITICAL": ("Database connection timeout", "Disk saturation beyond 95%"),
+    "ERROR": ("Latency spike detected on API Gateway", "Service mesh circuit breaker open"),
+    "WARN": ("Retrying connection to cache cluster", "Replica lag increasing"),
+    "INFO": ("Health check passed", "Autoscaler polling", "Background job completed"),
+}
+
+
+@dataclass
+class Fixture:
+    """Generated datasets for one size, plus the raw log text of one server."""
+
+    rows: int
+    config: DataConfig
+    log_text: str
+
+
+@dataclass
+class BenchmarkCase:
+    """A hot path: `run(fixture)` is timed; `prepare` runs untimed before each call."""
+
+    name: str
+    run: Callable[[Fixture], Any]
+    prepare: Optional[Callable[[], None]] = None
+
+
+@dataclass
+class Regression:
+    """A case whose measurement exceeded the allowed growth over its baseline."""
+
+    case: str
+    measure: str
+    baseline: float
+    current: float
+    change_pct: float
+
+
+def write_fixtures(rows: int, directory: Path, *, seed: int = 7) -> Fixture:
+    """Write `rows` log lines and `rows` metric samples as parquet under `directory`."""
+    import numpy as np
+    import pandas as pd
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("2024-01-01T00:00:00", "s")
+    levels = np.array(list(_MESSAGES))
+    level_codes = rng.choice(len(levels), size=rows, p=[0.05, 0.15, 0.3, 0.5])
+    severity = levels[level_codes]
+    # Flatten the message pools and pick a message within each line's severity pool.
+    pool = np.array([message for messages in _MESSAGES.values() for message in messages], dtype=object)
+    sizes = np.array([len(messages) for messages in _MESSAGES.values()])
+    offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    message = pool[offsets[level_codes] + rng.integers(0, 6, size=rows) % sizes[level_codes]]
+    servers = np.array(FIXTURE_SERVERS)[rng.integers(0, len(FIXTURE_SERVERS), size=rows)]
+    # One line per server every 5 minutes, matching the window arithmetic in `fetch_logs`.
+    stamps = np.datetime_as_string(start + (np.arange(rows) // len(FIXTURE_SERVERS)) * 300, unit="s")
+    lines = (
+        pd.Series(stamps, dtype=object) + "Z [" + pd.Series(severity, dtype=object) + "] "
+        + pd.Series(servers, dtype=object) + ": " + pd.Series(message, dtype=object)
+    )
+    logs_path = directory / f"logs_{rows}.parquet"
+    pd.DataFrame({"server_id": servers, "message": lines}).to_parquet(logs_path, index=False)
+
+    index = np.arange(rows)
+    metrics_path = directory / f"metrics_{rows}.parquet"
+    pd.DataFrame(
+        {
+            "timestamp": pd.to_datetime(start + index * 60),
+            "cpu_pct": 55 + 15 * np.sin(2 * np.pi * index / 1440) + rng.normal(0, 5, rows),
+            "memory_pct": 63 + rng.normal(0, 8, rows),
+        }
+    ).to_parquet(metrics_path, index=False)
+
+    config = DataConfig(logs_path=logs_path, metrics_path=metrics_path, tickets_path=None, log_index_path=None)
+    log_text = "\n".join(lines[servers == FIXTURE_SERVERS[0]].tolist())
+    return Fixture(rows=rows, config=config, log_text=log_text)
+
+
+def _window_minutes(fixture: Fixture) -> int:
+    # Covers every line of one server: `fetch_logs` keeps `window_minutes // 5` rows.
+    return fixture.rows * 5
+
+
+CASES: List[BenchmarkCase] = [
+    BenchmarkCase(
+        "fetch_logs",
+        lambda f: fetch_logs(FIXTURE_SERVERS[0], window_minutes=_window_minutes(f), config=f.config),
+    ),
+    BenchmarkCase(
+        "fetch_logs_cold",
+        lambda f: fetch_logs(FIXTURE_SERVERS[0], window_minutes=_window_minutes(f), config=f.config),
+        prepare=clear_frame_cache,
+    ),
+    BenchmarkCase("parse_logs", lambda f: parse_logs(f.log_text)),
+    BenchmarkCase(
+        "summarize_utilization",
+        lambda f: _with_config(f, lambda: summarize_utilization(hours=f.rows)),
+    ),
+    BenchmarkCase(
+        "build_dashboard_snapshot",
+        lambda f: build_dashboard_snapshot(FIXTURE_SERVERS[0], _window_minutes(f), config=f.config),
+    ),
+]
+
+
+def _with_config(fixture: Fixture, call: Callable[[], Any]) -> Any:
+    with use_data_config(fixture.config):
+        return call()
+
+
+def measure(case: BenchmarkCase, fixture: Fixture, *, repeat: int = 5) -> Dict[str, Any]:
+    """Time `repeat` calls of `case` after a warm-up call and record peak traced memory."""
+    if case.prepare:
+        case.prepare()
+    case.run(fixture)
+    latencies: List[float] = []
+    for _ in range(repeat):
+        if case.prepare:
+            case.prepare()
+        started = time.perf_counter()
+        case.run(fixture)
+        latencies.append(time.perf_counter() - started)
+
+    if case.prepare:
+        case.prepare()
+    tracemalloc.start()
+    try:
+        case.run(fixture)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    p50 = percentile(latencies, 50)
+    return {
+        "case": case.name,
+        "rows": fixture.rows,
+        "repeat": repeat,
+        "p50_ms": round(p50 * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "rows_per_s": round(fixture.rows / p50) if p50 > 0 else None,
+        "peak_mb": round(peak / 1e6, 3),
+    }
+
+
+def run_suite(
+    sizes: Sequence[str] = ("10k",),
+    *,
+    cases: Optional[Sequence[str]] = None,
+    repeat: int = 5,
+    workdir: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """Run the selected cases at each size; results are keyed `<case>@<size>`."""
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        raise ValueError(f"Unknown sizes {unknown}; choose from {', '.join(SIZES)}")
+    selected = [case for case in CASES if cases is None or case.name in cases]
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="it_ops_bench_") as tmp:
+        root = Path(workdir) if workdir is not None else Path(tmp)
+        for size in sizes:
+            fixture = write_fixtures(SIZES[size], root / size)
+            for case in selected:
+                results[f"{case.name}@{size}"] = measure(case, fixture, repeat=repeat)
+    clear_frame_cache()
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def save_report(report: Dict[str, Any], path: Path) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return path
+
+
+def load_report(path: Path) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    *,
+    latency_threshold_pct: float = DEFAULT_LATENCY_THRESHOLD_PCT,
+    memory_threshold_pct: float = DEFAULT_MEMORY_THRESHOLD_PCT,
+) -> List[Regression]:
+    """Return regressions of p50 latency or peak memory for cases present in both reports."""
+    limits = {"p50_ms": latency_threshold_pct, "peak_mb": memory_threshold_pct}
+    regressions: List[Regression] = []
+    for key, result in current["results"].items():
+        reference = baseline["results"].get(key)
+        if reference is None:
+            continue
+        for measure_name, limit in limits.items():
+            before, after = reference[measure_name], result[measure_name]
+            if before <= 0:
+                continue
+            change = (after - before) / before * 100
+            if change > limit:
+                regressions.append(Regression(key, measure_name, before, after, round(change, 1)))
+    return regressions
+
+
+def regressions_to_dicts(regressions: Sequence[Regression]) -> List[Dict[str, Any]]:
+    return [asdict(regression) for regression in regressions]
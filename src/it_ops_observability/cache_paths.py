@@ -0,0 +1,19 @@
+"""Location of the on-disk caches (responses, profiles, indexes, shared cache).
+
+The root is read from `IT_OPS_CACHE_DIR` each time a cache is opened rather
+than at import, so an app or test that sets it after importing the package
+still redirects every cache. This module has no dependencies.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+
+CACHE_DIR_ENV_VAR = "IT_OPS_CACHE_DIR"
+
+
+def cache_dir(name: str = "") -> Path:
+    """Return `$IT_OPS_CACHE_DIR/<name>`, defaulting the root to `~/.cache/it_ops_observability`."""
+    root = os.environ.get(CACHE_DIR_ENV_VAR) or Path.home() / ".cache" / "it_ops_observability"
+    return Path(root) / name if name else Path(root)
@@ -0,0 +1,426 @@
+"""Session history compaction for long multi-prompt supervisor runs.
+
+Every model call re-sends the whole session, so by the last prompt of
+`DEFAULT_SCENARIO` each agent receives every earlier log dump, metric table,
+and reply again. `SessionCompactor.before_model` runs ahead of each model
+call and, once the request crosses `threshold_tokens`, rewrites the history
+from earlier prompts (the current prompt and its tool calls stay verbatim):
+
+1. large tool outputs, both the agent's own function responses and results
+   relayed from other agents, become structured digests (line and severity
+   counts plus top templates for log text, scalars and list lengths for
+   dicts) carrying a `ref`;
+2. if the request is still over the threshold, the earlier turns collapse
+   into one summary message listing each prompt, the tools it used (by
+   `ref`), and a clipped final answer.
+
+Replaced content is kept in a bounded store owned by the compactor, and
+its `recall_tool_result` tool returns it by `ref` when an agent needs the
+full text again; sessions with different compactors never see each other's
+outputs. The session itself is never modified; only the outgoing request
+is rewritten. `turn_report()` lists prompt tokens before and after compaction
+for each prompt.
+"""
+from __future__ import annotations
+
+import ast
+from collections import OrderedDict
+from dataclasses import asdict
+from dataclasses import dataclass
+import hashlib
+import json
+import re
+import threading
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from google.genai import types
+
+from .log_summary import collapse_log_lines
+from .log_summary import estimate_tokens
+from .log_summary import split_log_line
+
+
+DEFAULT_THRESHOLD_TOKENS = 4_000
+# Tool outputs below this size are cheaper to keep than to digest.
+DEFAULT_DIGEST_MIN_TOKENS = 128
+DEFAULT_STORE_ENTRIES = 512
+_TOP_TEMPLATES = 3
+_PREVIEW_CHARS = 160
+_ANSWER_CHARS = 300
+_PROMPT_CHARS = 200
+
+# ADK relays other agents' turns as user content led by this preamble, with
+# each payload fenced by these markers.
+_CONTEXT_PREAMBLE = "For context:"
+_QUOTE_BEGIN = "<<<BEGIN_QUOTED_AGENT_CONTENT>>>"
+_QUOTE_END = "<<<END_QUOTED_AGENT_CONTENT>>>"
+_RELAYED_RESULT = re.compile(r"^\[(?P<agent>[^\]]+)\] `(?P<tool>[^`]+)` tool returned result:\n")
+_RELAYED_REPLY = re.compile(r"^\[(?P<agent>[^\]]+)\] said:\n")
+# Control tools carry no telemetry worth listing in a turn summary.
+_CONTROL_TOOLS = frozenset({"transfer_to_agent", "recall_tool_result"})
+
+
+# -- Result store ------------------------------------------------------------
+
+
+class _ResultStore:
+    """Bounded, thread-safe map from `ref` to the full content it replaced."""
+
+    def __init__(self, max_entries: int = DEFAULT_STORE_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, Any, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, tool: str, value: Any) -> Tuple[str, Dict[str, Any]]:
+        """Store `value` and return `(ref, digest)`; identical outputs share a ref."""
+        rendered = json.dumps(value, sort_keys=True, default=str)
+        ref = "tr-" + hashlib.sha1(f"{tool}\0{rendered}".encode("utf-8")).hexdigest()[:12]
+        with self._lock:
+            entry = self._entries.get(ref)
+            if entry is not None:
+                self._entries.move_to_end(ref)
+                return ref, entry[2]
+        digest = digest_result(value)
+        with self._lock:
+            self._entries[ref] = (tool, value, digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return ref, digest
+
+    def get(self, ref: str) -> Optional[Tuple[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(ref)
+        return None if entry is None else (entry[0], entry[1])
+
+    def refs(self) -> List[Dict[str, str]]:
+        with self._lock:
+            return [{"ref": ref, "tool": entry[0]} for ref, entry in self._entries.items()]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# -- Digests -----------------------------------------------------------------
+
+
+def _looks_like_logs(lines: List[str]) -> bool:
+    sample = lines[:20]
+    return bool(sample) and sum(split_log_line(line)[1] != "UNKNOWN" for line in sample) * 2 >= len(sample)
+
+
+def _digest_text(text: str) -> Dict[str, Any]:
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not _looks_like_logs(lines):
+        preview = text if len(text) <= _PREVIEW_CHARS else text[:_PREVIEW_CHARS] + "…"
+        return {"type": "text", "chars": len(text), "lines": len(lines), "preview": preview}
+    rows = collapse_log_lines("\n".join(lines))
+    severity_counts: Dict[str, int] = {}
+    for row in rows:
+        severity_counts[row.severity] = severity_counts.get(row.severity, 0) + row.count
+    return {
+        "type": "log_lines",
+        "lines": len(lines),
+        "first_seen": split_log_line(lines[0])[0],
+        "last_seen": split_log_line(lines[-1])[0],
+        "severity_counts": severity_counts,
+        "top_templates": [
+            {"severity": row.severity, "count": row.count, "template": row.template}
+            for row in rows[:_TOP_TEMPLATES]
+        ],
+    }
+
+
+def digest_result(value: Any) -> Dict[str, Any]:
+    """Summarize a tool output into a small structured digest."""
+    if isinstance(value, dict) and set(value) == {"result"}:
+        # ADK wraps non-dict tool returns as {"result": value}.
+        value = value["result"]
+    if isinstance(value, str):
+        return _digest_text(value)
+    if isinstance(value, dict):
+        scalars: Dict[str, Any] = {}
+        sizes: Dict[str, int] = {}
+        for key, item in value.items():
+            if isinstance(item, (list, tuple, dict)):
+                sizes[key] = len(item)
+            elif isinstance(item, str) and len(item) > _PREVIEW_CHARS:
+                sizes[key] = len(item)
+            else:
+                scalars[key] = item
+        return {"type": "object", "fields": scalars, "sizes": sizes}
+    if isinstance(value, (list, tuple)):
+        return {"type": "list", "items": len(value)}
+    return {"type": type(value).__name__, "preview": str(value)[:_PREVIEW_CHARS]}
+
+
+def _compacted(ref: str, digest: Dict[str, Any]) -> Dict[str, Any]:
+    return {"compacted": True, "ref": ref, "recall_with": "recall_tool_result", "digest": digest}
+
+
+def _unquote(text: str) -> str:
+    start, end = text.find(_QUOTE_BEGIN), text.rfind(_QUOTE_END)
+    if start < 0 or end < start:
+        return text
+    return text[start + len(_QUOTE_BEGIN):end].strip("\n")
+
+
+def _relayed_value(payload: str) -> Any:
+    # Relayed results are the `str()` of the response dict.
+    try:
+        return ast.literal_eval(payload)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return payload
+
+
+# -- Compactor ---------------------------------------------------------------
+
+
+@dataclass
+class CompactionRecord:
+    """Prompt size of one model call before and after compaction."""
+
+    agent: str
+    invocation_id: str
+    turn: int
+    tokens_before: int
+    tokens_after: int
+    digested: int = 0
+    summarized_turns: int = 0
+
+
+def _part_tokens(part: types.Part) -> int:
+    return estimate_tokens(json.dumps(part.to_json_dict(), default=str))
+
+
+def _request_tokens(contents: List[types.Content]) -> int:
+    return sum(_part_tokens(part) for content in contents for part in content.parts or [])
+
+
+def _is_prompt(content: types.Content) -> bool:
+    """True for a real user prompt (not a relayed agent turn or a tool response)."""
+    if content.role != "user" or not content.parts:
+        return False
+    texts = [part.text for part in content.parts if part.text]
+    if not texts or any(part.function_response for part in content.parts):
+        return False
+    return not texts[0].startswith(_CONTEXT_PREAMBLE)
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit] + "…"
+
+
+class SessionCompactor:
+    """Before-model callback that keeps long sessions under a prompt token threshold.
+
+    Attach with `AgentSettings(compactor=SessionCompactor())`; use one
+    compactor per session so `turn_report()` and the outputs
+    `recall_tool_result` can return cover just that session.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold_tokens: int = DEFAULT_THRESHOLD_TOKENS,
+        digest_min_tokens: int = DEFAULT_DIGEST_MIN_TOKENS,
+        keep_turns: int = 1,
+        store_entries: int = DEFAULT_STORE_ENTRIES,
+    ) -> None:
+        self.threshold_tokens = threshold_tokens
+        self.digest_min_tokens = digest_min_tokens
+        self.keep_turns = max(1, keep_turns)
+        self.records: List[CompactionRecord] = []
+        self.results = _ResultStore(store_entries)
+        self._lock = threading.Lock()
+
+    def recall_tool_result(self, ref: str = "") -> Dict[str, Any]:
+        """Return the full tool output that session compaction replaced with a digest.
+
+        Args:
+            ref: The `ref` shown in a compacted tool result. When empty, the
+                refs currently available are listed instead.
+
+        Returns:
+            A dictionary with the tool name and its original output, or an
+            `error` entry when the ref is unknown or has been evicted.
+        """
+        if not ref:
+            return {"available": self.results.refs()}
+        entry = self.results.get(ref)
+        if entry is None:
+            return {"error": f"Unknown or expired ref {ref!r}; re-run the tool instead."}
+        tool, value = entry
+        return {"ref": ref, "tool": tool, "result": value}
+
+    def before_model(self, callback_context: Any, llm_request: Any) -> None:
+        contents: List[types.Content] = list(llm_request.contents or [])
+        prompts = [index for index, content in enumerate(contents) if _is_prompt(content)]
+        before = _request_tokens(contents)
+        record = CompactionRecord(
+            agent=callback_context.agent_name,
+            invocation_id=callback_context.invocation_id,
+            turn=len(prompts),
+            tokens_before=before,
+            tokens_after=before,
+        )
+        # Everything before the last `keep_turns` prompts is stale.
+        boundary = prompts[-self.keep_turns] if len(prompts) >= self.keep_turns else 0
+        if before > self.threshold_tokens and boundary > 0:
+            stale, recent = contents[:boundary], contents[boundary:]
+            stale, record.digested = self._digest_contents(stale)
+            if _request_tokens(stale + recent) > self.threshold_tokens:
+                stale = [self._summarize_turns(stale)]
+                record.summarized_turns = sum(_is_prompt(content) for content in contents[:boundary])
+            llm_request.contents = stale + recent
+            record.tokens_after = _request_tokens(llm_request.contents)
+        with self._lock:
+            self.records.append(record)
+        return None
+
+    def _digest_contents(self, contents: List[types.Content]) -> Tuple[List[types.Content], int]:
+        """Return copies of `contents` with large tool outputs replaced by digests."""
+        digested = 0
+        result: List[types.Content] = []
+        for content in contents:
+            parts: List[types.Part] = []
+            changed = False
+            for part in content.parts or []:
+                replacement = self._digest_part(part)
+                if replacement is not None:
+                    parts.append(replacement)
+                    changed = True
+                    digested += 1
+                else:
+                    parts.append(part)
+            # Parts may be shared with session events, so changed contents are rebuilt rather than edited.
+            result.append(types.Content(role=content.role, parts=parts) if changed else content)
+        return result, digested
+
+    def _digest_part(self, part: types.Part) -> Optional[types.Part]:
+        if part.function_response is not None:
+            response = part.function_response
+            if (response.response or {}).get("compacted") or _part_tokens(part) < self.digest_min_tokens:
+                return None
+            ref, digest = self.results.put(response.name or "", response.response)
+            return types.Part(
+                function_response=types.FunctionResponse(
+                    id=response.id,
+                    name=response.name,
+                    response=_compacted(ref, digest),
+                )
+            )
+        match = _RELAYED_RESULT.match(part.text or "")
+        if match is None or _part_tokens(part) < self.digest_min_tokens:
+            return None
+        tool = match.group("tool")
+        ref, digest = self.results.put(tool, _relayed_value(_unquote(part.text)))
+        body = json.dumps(_compacted(ref, digest), default=str)
+        return types.Part(text=f"{match.group(0)}{_QUOTE_BEGIN}\n{body}\n{_QUOTE_END}")
+
+    def _summarize_turns(self, contents: List[types.Content]) -> types.Content:
+        """Collapse stale turns into a single user message that keeps prompts, refs, and answers."""
+        lines = [
+            "Summary of earlier turns in this session (compacted; call recall_tool_result with a ref"
+            " for the full tool output):"
+        ]
+        turn: Dict[str, Any] = {}
+
+        def _flush() -> None:
+            if not turn:
+                return
+            lines.append(f"- Prompt: {turn['prompt']}")
+            if turn["tools"]:
+                lines.append("  Tools: " + ", ".join(turn["tools"]))
+            if turn["answer"]:
+                lines.append(f"  Answer: {turn['answer']}")
+
+        for content in contents:
+            if _is_prompt(content):
+                _flush()
+                text = " ".join(part.text for part in content.parts if part.text)
+                turn = {"prompt": _clip(text, _PROMPT_CHARS), "tools": [], "answer": ""}
+                continue
+            if not turn:
+                turn = {"prompt": "(session start)", "tools": [], "answer": ""}
+            for part in content.parts or []:
+                tool_ref = self._tool_ref(part)
+                if tool_ref is not None:
+                    if tool_ref and tool_ref not in turn["tools"]:
+                        turn["tools"].append(tool_ref)
+                    continue
+                answer = self._answer_text(content.role, part)
+                if answer:
+                    turn["answer"] = _clip(answer, _ANSWER_CHARS)
+        _flush()
+        return types.Content(role="user", parts=[types.Part(text="\n".join(lines))])
+
+    def _tool_ref(self, part: types.Part) -> Optional[str]:
+        """Return "<tool> (ref <ref>)" for a tool output, "" for control tools, None otherwise."""
+        if part.function_response is not None:
+            name = part.function_response.name or ""
+            if name in _CONTROL_TOOLS:
+                return ""
+            response = part.function_response.response or {}
+            ref = response.get("ref") if response.get("compacted") else self.results.put(name, response)[0]
+            return f"{name} (ref {ref})"
+        match = _RELAYED_RESULT.match(part.text or "")
+        if match is None:
+            return None
+        if match.group("tool") in _CONTROL_TOOLS:
+            return ""
+        payload = _relayed_value(_unquote(part.text))
+        if isinstance(payload, dict) and payload.get("compacted"):
+            ref = payload["ref"]
+        else:
+            ref = self.results.put(match.group("tool"), payload)[0]
+        return f"{match.group('tool')} (ref {ref})"
+
+    @staticmethod
+    def _answer_text(role: Optional[str], part: types.Part) -> str:
+        if not part.text or part.thought:
+            return ""
+        if role == "model":
+            return part.text
+        match = _RELAYED_REPLY.match(part.text)
+        if match is None:
+            return ""
+        text = _unquote(part.text[match.end():])
+        prefix = f"[{match.group('agent')}]"
+        return text if text.startswith(prefix) else f"{prefix} {text}"
+
+    def turn_report(self) -> List[Dict[str, Any]]:
+        """Return prompt tokens per user prompt, summed over that turn's model calls."""
+        with self._lock:
+            records = list(self.records)
+        turns: Dict[int, Dict[str, Any]] = {}
+        for record in records:
+            row = turns.setdefault(
+                record.turn,
+                {
+                    "turn": record.turn,
+                    "model_calls": 0,
+                    "tokens_before": 0,
+                    "tokens_after": 0,
+                    "peak_tokens_before": 0,
+                    "peak_tokens_after": 0,
+                    "digested": 0,
+                },
+            )
+            row["model_calls"] += 1
+            row["tokens_before"] += record.tokens_before
+            row["tokens_after"] += record.tokens_after
+            row["peak_tokens_before"] = max(row["peak_tokens_before"], record.tokens_before)
+            row["peak_tokens_after"] = max(row["peak_tokens_after"], record.tokens_after)
+            row["digested"] += record.digested
+        return [turns[key] for key in sorted(turns)]
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        """Return one dict per model call (for tables and JSON export)."""
+        with self._lock:
+            return [asdict(record) for record in self.records]
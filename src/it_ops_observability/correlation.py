@@ -0,0 +1,185 @@
+"""Cross-signal correlation between log bursts and metric spikes.
+
+Log events (keyed by severity or message template) and metric samples are
+bucketed onto one shared time grid with `np.bincount`, giving a count matrix
+(`log signals x buckets`) and a mean matrix (`metrics x buckets`). Every log
+signal is then scored against every metric at once:
+
+* lagged Pearson correlation for lags in `[-max_lag, max_lag]` buckets
+  (positive lag: the log signal leads the metric), computed as one matrix
+  product per lag;
+* co-occurrence of log bursts with metric spikes within `tolerance` buckets,
+  reported as support counts, precision (P(spike | burst)) and lift.
+
+`rank_evidence` combines both into `score = max(correlation, 0) * precision`
+and returns the strongest pairs, so agents receive a short list of
+precomputed root-cause candidates instead of two raw telemetry blobs.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class TimeGrid:
+    """Half-open buckets `[start + i * step, start + (i + 1) * step)` for `i < size`."""
+
+    start_ns: int
+    step_ns: int
+    size: int
+
+    @classmethod
+    def covering(cls, end: np.datetime64, *, hours: float, bucket_minutes: int) -> "TimeGrid":
+        step = int(bucket_minutes * 60 * 1e9)
+        size = max(1, int(round(hours * 60 / bucket_minutes)))
+        end_ns = int(np.datetime64(end, "ns").astype(np.int64)) + 1
+        return cls(end_ns - size * step, step, size)
+
+    def bucket(self, timestamps: Any) -> np.ndarray:
+        """Bucket index per timestamp; -1 for timestamps outside the grid."""
+        stamps = np.asarray(timestamps, dtype="datetime64[ns]").astype(np.int64)
+        index = (stamps - self.start_ns) // self.step_ns
+        return np.where((index >= 0) & (index < self.size), index, -1)
+
+
+def count_matrix(grid: TimeGrid, timestamps: Any, keys: np.ndarray, n_keys: int) -> np.ndarray:
+    """Count events per (key, bucket)."""
+    buckets = grid.bucket(timestamps)
+    keep = buckets >= 0
+    flat = np.asarray(keys)[keep] * grid.size + buckets[keep]
+    return np.bincount(flat, minlength=n_keys * grid.size).reshape(n_keys, grid.size).astype(np.float64)
+
+
+def mean_matrix(grid: TimeGrid, timestamps: Any, values: np.ndarray, series: np.ndarray, n_series: int) -> np.ndarray:
+    """Mean value per (series, bucket), forward/back-filling empty buckets."""
+    buckets = grid.bucket(timestamps)
+    keep = (buckets >= 0) & ~np.isnan(values)
+    flat = np.asarray(series)[keep] * grid.size + buckets[keep]
+    sums = np.bincount(flat, weights=values[keep], minlength=n_series * grid.size)
+    counts = np.bincount(flat, minlength=n_series * grid.size)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = (sums / counts).reshape(n_series, grid.size)
+    # Forward-fill then back-fill along time so coarse metrics span fine buckets.
+    source = np.where(np.isnan(means), 0, np.arange(grid.size))
+    np.maximum.accumulate(source, axis=1, out=source)
+    means = np.take_along_axis(means, source, axis=1)
+    first = np.take_along_axis(means, np.argmax(~np.isnan(means), axis=1)[:, np.newaxis], axis=1)
+    means = np.where(np.isnan(means), first, means)
+    return np.nan_to_num(means, nan=0.0)
+
+
+def _standardize(matrix: np.ndarray) -> np.ndarray:
+    centered = matrix - matrix.mean(axis=1, keepdims=True)
+    std = centered.std(axis=1, keepdims=True)
+    return np.divide(centered, std, out=np.zeros_like(centered), where=std > 0)
+
+
+def lagged_correlation(x: np.ndarray, y: np.ndarray, max_lag: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Best Pearson correlation (and its lag) between each row of `x` and each row of `y`.
+
+    A positive lag pairs `x[t]` with `y[t + lag]`, i.e. `x` leads `y`.
+    """
+    length = x.shape[1]
+    best = np.full((x.shape[0], y.shape[0]), -np.inf)
+    best_lag = np.zeros(best.shape, dtype=np.int64)
+    for lag in range(-max_lag, max_lag + 1):
+        if lag >= 0:
+            xs, ys = x[:, : length - lag], y[:, lag:]
+        else:
+            xs, ys = x[:, -lag:], y[:, : length + lag]
+        overlap = xs.shape[1]
+        if overlap < 3:
+            continue
+        corr = _standardize(xs) @ _standardize(ys).T / overlap
+        better = corr > best
+        best[better] = corr[better]
+        best_lag[better] = lag
+    best[np.isinf(best)] = 0.0
+    return best, best_lag
+
+
+def _dilate(mask: np.ndarray, tolerance: int) -> np.ndarray:
+    """True where any original True lies within `tolerance` buckets."""
+    if tolerance <= 0:
+        return mask
+    padded = np.pad(mask.astype(np.int64), ((0, 0), (tolerance + 1, tolerance)))
+    window = np.cumsum(padded, axis=1)
+    return (window[:, 2 * tolerance + 1 :] - window[:, : -2 * tolerance - 1]) > 0
+
+
+def co_occurrence(
+    log_counts: np.ndarray,
+    metric_means: np.ndarray,
+    *,
+    tolerance: int = 1,
+    burst_z: float = 1.0,
+    spike_z: float = 1.5,
+) -> Dict[str, np.ndarray]:
+    """Co-occurrence of log bursts and metric spikes for every (log, metric) pair."""
+    mean = log_counts.mean(axis=1, keepdims=True)
+    std = log_counts.std(axis=1, keepdims=True)
+    bursts = (log_counts > 0) & (log_counts >= np.maximum(1.0, mean + burst_z * std))
+    spikes = _standardize(metric_means) >= spike_z
+    near_spike = _dilate(spikes, tolerance)
+    both = bursts.astype(np.int64) @ near_spike.T.astype(np.int64)
+    burst_counts = bursts.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        precision = np.where(burst_counts[:, None] > 0, both / burst_counts[:, None], 0.0)
+        base_rate = near_spike.mean(axis=1)
+        lift = np.where(base_rate[None, :] > 0, precision / base_rate[None, :], 0.0)
+    return {
+        "both": both,
+        "bursts": burst_counts,
+        "spikes": spikes.sum(axis=1),
+        "precision": precision,
+        "lift": lift,
+    }
+
+
+def rank_evidence(
+    log_labels: Sequence[str],
+    metric_labels: Sequence[str],
+    log_counts: np.ndarray,
+    metric_means: np.ndarray,
+    *,
+    bucket_minutes: int,
+    max_lag: int,
+    tolerance: int = 1,
+    scope: str = "fleet",
+    min_events: int = 3,
+) -> List[Dict[str, Any]]:
+    """Score every (log signal, metric) pair and return them best first."""
+    active = log_counts.sum(axis=1) >= min_events
+    if not active.any() or metric_means.size == 0:
+        return []
+    counts = log_counts[active]
+    labels = [label for label, keep in zip(log_labels, active) if keep]
+    corr, lag = lagged_correlation(counts, metric_means, max_lag)
+    stats = co_occurrence(counts, metric_means, tolerance=tolerance)
+    score = np.maximum(corr, 0.0) * stats["precision"]
+    pairs = []
+    for row, col in zip(*np.unravel_index(np.argsort(-score, axis=None), score.shape)):
+        pairs.append(
+            {
+                "scope": scope,
+                "log_signal": labels[row],
+                "metric": metric_labels[col],
+                "score": round(float(score[row, col]), 4),
+                "correlation": round(float(corr[row, col]), 3),
+                "lag_minutes": int(lag[row, col]) * bucket_minutes,
+                "log_events": int(counts[row].sum()),
+                "log_bursts": int(stats["bursts"][row]),
+                "metric_spikes": int(stats["spikes"][col]),
+                "co_occurrences": int(stats["both"][row, col]),
+                "precision": round(float(stats["precision"][row, col]), 3),
+                "lift": round(float(stats["lift"][row, col]), 2),
+            }
+        )
+    return pairs
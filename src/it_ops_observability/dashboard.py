@@ -1,48 +1,83 @@
 """Utilities for assembling observability dashboards."""
 from __future__ import annotations
 
-from collections import Counter
-from typing import Dict, List
-
-from .tools import fetch_incident_digest, fetch_server_logs, summarize_utilization
-
-
-def parse_logs(raw: str) -> List[Dict[str, str]]:
-    """Convert newline-delimited log text into structured entries."""
-    entries: List[Dict[str, str]] = []
-    for line in raw.splitlines():
-        if not line.strip():
-            continue
-        parts = line.split(" ", 2)
-        if len(parts) < 3:
-            continue
-        timestamp, level_part, remainder = parts
-        level = level_part.strip("[]").upper()
-        message = remainder.strip()
-        component = ""
-        if ": " in message:
-            component, message = message.split(": ", 1)
-        entries.append(
-            {
-                "timestamp": timestamp,
-                "level": level,
-                "component": component.strip(),
-                "message": message.strip(),
-            }
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Dict, Optional
+
+from .data_sources import DataConfig, data_version
+from .log_records import LogBatch
+from .profiling import Profiler, default_profiler
+from .tools import (
+    check_slo_burn,
+    fetch_incident_digest,
+    fetch_server_logs,
+    get_data_config,
+    summarize_utilization,
+    use_data_config,
+)
+
+if TYPE_CHECKING:
+    from .shared_cache import SharedCache
+
+SNAPSHOT_TTL_S = 60.0
+
+
+def parse_logs(raw: str) -> LogBatch:
+    """Convert newline-delimited log text into a compact `LogBatch`.
+
+    Rows read as `{"timestamp", "level", "component", "message"}` dicts.
+    """
+    return LogBatch.from_text(raw)
+
+
+def snapshot_cache_key(server_id: str, window_minutes: int, config: Optional[DataConfig] = None) -> str:
+    """Shared-cache key of a snapshot; it changes whenever the data version does."""
+    from .shared_cache import cache_key
+
+    active = config or get_data_config()
+    return cache_key("snapshot", server_id, window_minutes, str(active), data_version(active))
+
+
+def build_dashboard_snapshot(
+    server_id: str,
+    window_minutes: int,
+    config: Optional[DataConfig] = None,
+    cache: Optional["SharedCache"] = None,
+    ttl_s: float = SNAPSHOT_TTL_S,
+    profiler: Optional[Profiler] = None,
+) -> Dict[str, object]:
+    """Fetch utilization, logs, digest, and SLO burn data for the dashboard.
+
+    `config` scopes the reads to one dataset without touching other sessions;
+    without it, the context's active configuration (`set_data_config`) is used.
+    With a `cache`, snapshots are shared across processes for `ttl_s` seconds
+    and keyed by the data version, so new data is picked up immediately.
+    A sample of computed snapshots is profiled by `profiler`, or by the
+    `IT_OPS_PROFILE` environment profiler when none is given.
+    """
+    if cache is not None:
+        key = snapshot_cache_key(server_id, window_minutes, config)
+        return cache.get_or_compute(
+            key, lambda: build_dashboard_snapshot(server_id, window_minutes, config, profiler=profiler), ttl_s=ttl_s
         )
-    return entries
+    profiler = profiler or default_profiler()
+    if profiler is not None:
+        return profiler.call("build_dashboard_snapshot", _build_snapshot, server_id, window_minutes, config)
+    return _build_snapshot(server_id, window_minutes, config)
 
 
-def build_dashboard_snapshot(server_id: str, window_minutes: int) -> Dict[str, object]:
-    """Fetch utilization, logs, and digest data for the dashboard."""
-    summary = summarize_utilization(hours=24)
-    logs_text = fetch_server_logs(server_id=server_id, window_minutes=window_minutes)
-    digest = fetch_incident_digest()
+def _build_snapshot(server_id: str, window_minutes: int, config: Optional[DataConfig]) -> Dict[str, object]:
+    # Without an explicit config, honour the caller's `set_data_config`/`use_data_config`.
+    with use_data_config(config) if config is not None else nullcontext():
+        summary = summarize_utilization(hours=24)
+        logs_text = fetch_server_logs(server_id=server_id, window_minutes=window_minutes)
+        digest = fetch_incident_digest()
+        slo = check_slo_burn()
     parsed_logs = parse_logs(logs_text)
-    severity_counts = Counter(entry["level"] for entry in parsed_logs)
     return {
         "summary": summary,
         "logs": parsed_logs,
         "digest": digest,
-        "severity_counts": dict(severity_counts),
+        "severity_counts": parsed_logs.level_counts(),
+        "slo": slo.get("slos", []),
     }
@@ -2,13 +2,22 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from dataclasses import fields
+import json
 from pathlib import Path
+import threading
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Dict
+from typing import List
 from typing import Optional
-
-import pandas as pd
+from typing import Tuple
 
 from . import synthetic
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 @dataclass
 class DataConfig:
@@ -22,6 +31,13 @@ class DataConfig:
     logs_path: Optional[Path] = None
     metrics_path: Optional[Path] = None
     tickets_path: Optional[Path] = None
+    # Directory of a `log_index.LogIndex`; built from `logs_path` when absent.
+    log_index_path: Optional[Path] = None
+    # JSON list of `slo.SLODefinition` fields; `slo.DEFAULT_SLOS` when absent.
+    slo_path: Optional[Path] = None
+    # `http://host:port` or `unix:///path.sock` of a `query_service` process;
+    # log, metric, and ticket reads go there first and fall back to the paths.
+    service_url: Optional[str] = None
 
 
 DEFAULT_DATA_ROOT = Path(__file__).resolve().parents[2] / "data"
@@ -29,6 +45,7 @@ DEFAULT_CONFIG = DataConfig(
     logs_path=DEFAULT_DATA_ROOT / "processed" / "logs" / "cloudfront_sample.parquet",
     metrics_path=DEFAULT_DATA_ROOT / "processed" / "metrics" / "nab_sample.parquet",
     tickets_path=DEFAULT_DATA_ROOT / "processed" / "communications" / "tickets_sample.parquet",
+    log_index_path=DEFAULT_DATA_ROOT / "processed" / "logs" / "index",
 )
 
 
@@ -40,12 +57,145 @@ def _resolve_path(path: Optional[Path]) -> Optional[Path]:
     return None
 
 
+# Name of the JSON file an ingest store (see `ingest.py`) rewrites after every
+# flush; its `version` counter increments each time new rows become readable.
+DATA_VERSION_FILE = "_version"
+
+
+def read_data_version(root: Path) -> Optional[int]:
+    """Return the data version published under an ingest store `root`, or None."""
+    try:
+        return int(json.loads((root / DATA_VERSION_FILE).read_text(encoding="utf-8"))["version"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def dataset_stamp(path: Path) -> Tuple[Any, ...]:
+    """Return a value that changes whenever the dataset at `path` does.
+
+    Files are stamped by (mtime, size). Dataset directories inside an ingest
+    store are stamped by the store's data version, so readers invalidate as
+    soon as the ingester publishes a flush; other directories fall back to
+    their own mtime, which changes when part files are added or removed.
+    """
+    if path.is_dir():
+        version = read_data_version(path.parent)
+        if version is not None:
+            return ("version", version)
+    stat = path.stat()
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+_VERSIONED_PATHS = ("logs_path", "metrics_path", "tickets_path", "log_index_path", "slo_path")
+
+
+def data_version(config: DataConfig = DEFAULT_CONFIG) -> Tuple[Any, ...]:
+    """Stamp every dataset of `config` together (missing or synthetic sources stamp as None).
+
+    A service-backed config also carries the service's own data version, so
+    results cached by its clients change when the service's datasets do.
+    """
+    stamps: List[Any] = []
+    for name in _VERSIONED_PATHS:
+        resolved = _resolve_path(getattr(config, name))
+        stamps.append(dataset_stamp(resolved) if resolved is not None else None)
+    if config.service_url:
+        try:
+            remote = _service_client(config).version()["data_version"]
+        except Exception:
+            remote = None
+        stamps.append(("service", json.dumps(remote, sort_keys=True)))
+    return tuple(stamps)
+
+
+# Parsed parquet frames keyed by path and validated against `dataset_stamp`, so
+# repeated tool calls skip disk I/O until the data changes. Cached frames are
+# shared: callers must derive new frames rather than mutate them in place.
+_FRAME_CACHE: Dict[Path, Tuple[Tuple[Any, ...], pd.DataFrame, Tuple[str, ...]]] = {}
+_FRAME_LOCK = threading.Lock()
+
+
+def _read_parts(path: Path, cached: Optional[Tuple[Any, ...]]) -> Tuple[pd.DataFrame, Tuple[str, ...]]:
+    """Read a directory of parquet parts, reusing the cached frame when parts were only appended."""
+    import pandas as pd
+
+    parts = tuple(sorted(item.name for item in path.glob("*.parquet")))
+    previous: Tuple[str, ...] = cached[2] if cached is not None else ()
+    if previous and parts[: len(previous)] == previous:
+        frames = [cached[1]] + [pd.read_parquet(path / name) for name in parts[len(previous):]]
+    else:
+        frames = [pd.read_parquet(path / name) for name in parts]
+    if not frames:
+        return pd.DataFrame(), parts
+    return (frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)), parts
+
+
+def read_frame(path: Path) -> pd.DataFrame:
+    """Return the parquet file (or directory of parts) at `path`, cached while it is unchanged."""
+    import pandas as pd
+
+    stamp = dataset_stamp(path)
+    with _FRAME_LOCK:
+        cached = _FRAME_CACHE.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    if path.is_dir():
+        df, parts = _read_parts(path, cached)
+    else:
+        df, parts = pd.read_parquet(path), ()
+    with _FRAME_LOCK:
+        _FRAME_CACHE[path] = (stamp, df, parts)
+    return df
+
+
+def clear_frame_cache() -> None:
+    with _FRAME_LOCK:
+        _FRAME_CACHE.clear()
+
+
+def preload_datasets(config: DataConfig = DEFAULT_CONFIG) -> List[Path]:
+    """Read every available dataset in `config` into the frame cache; return the paths loaded."""
+    loaded: List[Path] = []
+    for item in fields(config):
+        value = getattr(config, item.name)
+        path = _resolve_path(value) if isinstance(value, Path) else None
+        if path is None or path.is_dir():
+            continue
+        try:
+            read_frame(path)
+        except Exception:
+            continue
+        loaded.append(path)
+    return loaded
+
+
+def _service_client(config: DataConfig) -> Any:
+    from .query_service import client_for
+
+    return client_for(config.service_url)
+
+
 def fetch_logs(server_id: str, *, window_minutes: int = 240, config: DataConfig = DEFAULT_CONFIG) -> str:
     """Return log events for the requested server, falling back to synthetic data."""
+    if config.service_url:
+        try:
+            return _service_client(config).fetch_logs(server_id, window_minutes=window_minutes)
+        except Exception:
+            # Service unreachable: read the datasets in-process instead.
+            pass
     logs_path = _resolve_path(config.logs_path)
     if logs_path is not None:
         try:
-            df = pd.read_parquet(logs_path)
+            if logs_path.suffix == ".parquet":
+                from .storage import log_layout
+                from .storage import read_server_tail
+
+                if log_layout(logs_path).sorted_by_server:
+                    lines = read_server_tail(logs_path, server_id, window_minutes // 5)
+                    if lines:
+                        return "\n".join(lines)
+                    return synthetic.generate_mock_logs(server_id, window_minutes=window_minutes)
+            df = read_frame(logs_path)
             df = df[df["server_id"].eq(server_id)].tail(window_minutes // 5)
             if not df.empty:
                 return "\n".join(df["message"].tolist())
@@ -55,13 +205,34 @@ def fetch_logs(server_id: str, *, window_minutes: int = 240, config: DataConfig
     return synthetic.generate_mock_logs(server_id, window_minutes=window_minutes)
 
 
+def latest_hours(df: pd.DataFrame, hours: float) -> pd.DataFrame:
+    """Return the rows within `hours` of the newest timestamp (the last `hours` rows without one).
+
+    The window is by time, not row count, so every server in a long-format
+    multi-server table keeps its full history.
+    """
+    import pandas as pd
+
+    if df.empty or "timestamp" not in df.columns:
+        return df.tail(int(hours))
+    stamps = pd.to_datetime(df["timestamp"], utc=True, errors="coerce")
+    newest = stamps.max()
+    if pd.isna(newest):
+        return df.tail(int(hours))
+    return df[(stamps > newest - pd.Timedelta(hours=hours)).to_numpy()]
+
+
 def summarize_metrics(*, hours: int = 24, config: DataConfig = DEFAULT_CONFIG) -> pd.DataFrame:
-    """Return metric data frame, either from disk or synthetic generation."""
+    """Return the last `hours` of metric data, either from disk or synthetic generation."""
+    if config.service_url:
+        try:
+            return _service_client(config).summarize_metrics(hours=hours)
+        except Exception:
+            pass
     metrics_path = _resolve_path(config.metrics_path)
     if metrics_path is not None:
         try:
-            df = pd.read_parquet(metrics_path)
-            latest = df.tail(hours)
+            latest = latest_hours(read_frame(metrics_path), hours)
             if not latest.empty:
                 return latest
         except Exception:
@@ -71,10 +242,15 @@ def summarize_metrics(*, hours: int = 24, config: DataConfig = DEFAULT_CONFIG) -
 
 def fetch_recent_ticket(*, config: DataConfig = DEFAULT_CONFIG) -> str:
     """Return the latest support ticket/incident email."""
+    if config.service_url:
+        try:
+            return _service_client(config).fetch_recent_ticket()
+        except Exception:
+            pass
     tickets_path = _resolve_path(config.tickets_path)
     if tickets_path is not None:
         try:
-            df = pd.read_parquet(tickets_path)
+            df = read_frame(tickets_path)
             if not df.empty:
                 row = df.sample(1).iloc[0]
                 subject = row.get("subject", "Support Ticket")
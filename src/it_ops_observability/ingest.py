@@ -0,0 +1,436 @@
+"""Live ingestion of a directory of rotating log and metric files.
+
+`DirectoryIngester` tails every `<server_id>.log` and `<name>.csv` file in a
+source directory and appends what it reads to an *ingest store*:
+
+    <store>/logs/part-<seq>.parquet      server_id, message (one row per line)
+    <store>/metrics/part-<seq>.parquet   the CSV columns (a header row is required)
+    <store>/index/                       optional `log_index.LogIndex`
+    <store>/_version                     {"version": n, ...}, rewritten per flush
+    <store>/_wal/<seq>.wal               write-ahead buffer of unflushed reads
+    <store>/_ingest_state.json           per-file cursors as of the last flush
+
+Each `poll` reads the bytes appended since the file's cursor, up to the last
+complete line, and appends them to the write-ahead file before buffering
+them. Rotation (a new inode at the path) is handled by draining the old inode
+from its sibling (e.g. `app.log.1`) before starting the new file at offset 0;
+truncation (a file shorter than its cursor, or one whose bytes before the
+cursor changed) restarts the file at 0.
+
+`flush` turns the buffer into one part per dataset named after the WAL
+sequence number, bumps the published data version, saves the cursors, and
+only then deletes the WAL file. After a crash, `recover` replays the WAL:
+rewriting a part under the same name is idempotent, so lines are neither lost
+nor duplicated. `data_sources.dataset_stamp` reads the version file, so
+`read_frame` and the tool caches pick up each flush on their next call, and
+`store_config` returns a `DataConfig` pointing at the store.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timezone
+import io
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from .data_sources import DATA_VERSION_FILE
+from .data_sources import DataConfig
+from .data_sources import read_data_version
+
+LOG_SUFFIX = ".log"
+METRIC_SUFFIX = ".csv"
+STATE_FILE = "_ingest_state.json"
+WAL_DIR = "_wal"
+DEFAULT_BATCH_LINES = 100_000
+DEFAULT_FLUSH_INTERVAL_S = 1.0
+# Upper bound on bytes read from one file per poll, so a large backlog is
+# buffered (and flushed) in slices rather than all at once.
+MAX_READ_BYTES = 64 * 1024 * 1024
+_TAIL_BYTES = 64
+
+
+def store_config(store: Path, **overrides: Any) -> DataConfig:
+    """Return a `DataConfig` that reads the logs, metrics, and index of an ingest store."""
+    store = Path(store)
+    values: Dict[str, Any] = {
+        "logs_path": store / "logs",
+        "metrics_path": store / "metrics",
+        "tickets_path": None,
+        "log_index_path": store / "index",
+    }
+    values.update(overrides)
+    return DataConfig(**values)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+@dataclass
+class _Cursor:
+    """Read position in one watched file.
+
+    `tail` holds the last bytes consumed; if they no longer sit just before
+    `offset`, the file was truncated and rewritten between two polls.
+    """
+
+    inode: int
+    offset: int = 0
+    header: Optional[bytes] = None
+    tail: bytes = b""
+    mtime_ns: int = 0
+
+    def to_json(self) -> List[Any]:
+        header = self.header.decode("utf-8") if self.header is not None else None
+        return [self.inode, self.offset, header, self.tail.hex(), self.mtime_ns]
+
+    @classmethod
+    def from_json(cls, values: List[Any]) -> "_Cursor":
+        inode, offset, header, tail, mtime_ns = values
+        return cls(inode, offset, header.encode("utf-8") if header is not None else None, bytes.fromhex(tail), mtime_ns)
+
+
+@dataclass
+class IngestStats:
+    """Counters since the ingester was created."""
+
+    lines: int = 0
+    metric_rows: int = 0
+    bytes_read: int = 0
+    flushes: int = 0
+    rotations: int = 0
+    truncations: int = 0
+
+
+class DirectoryIngester:
+    """Tail a directory of log and metric files into an ingest store."""
+
+    def __init__(
+        self,
+        source: Path,
+        store: Path,
+        *,
+        batch_lines: int = DEFAULT_BATCH_LINES,
+        flush_interval_s: float = DEFAULT_FLUSH_INTERVAL_S,
+        fsync: bool = True,
+        index: bool = False,
+    ) -> None:
+        self.source = Path(source)
+        self.store = Path(store)
+        self.batch_lines = batch_lines
+        self.flush_interval_s = flush_interval_s
+        self.fsync = fsync
+        self.index = index
+        self.stats = IngestStats()
+        self._lock = threading.Lock()
+        self._logs: List[Tuple[str, bytes]] = []
+        self._metrics: List[Tuple[bytes, bytes]] = []
+        self._buffered = 0
+        self._buffered_since: Optional[float] = None
+        for name in ("logs", "metrics", WAL_DIR):
+            (self.store / name).mkdir(parents=True, exist_ok=True)
+        state = self._read_state()
+        self.seq: int = state.get("seq", 0)
+        self.cursors: Dict[str, _Cursor] = {
+            name: _Cursor.from_json(values) for name, values in state.get("cursors", {}).items()
+        }
+        self.version: int = read_data_version(self.store) or 0
+        self._wal: Optional[Any] = None
+        self.recover()
+
+    # -- State and write-ahead log ---------------------------------------------
+
+    def _read_state(self) -> Dict[str, Any]:
+        try:
+            return json.loads((self.store / STATE_FILE).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save_state(self) -> None:
+        cursors = {name: cursor.to_json() for name, cursor in self.cursors.items()}
+        _write_atomic(self.store / STATE_FILE, json.dumps({"seq": self.seq, "cursors": cursors}).encode("utf-8"))
+
+    def _wal_path(self, seq: int) -> Path:
+        return self.store / WAL_DIR / f"{seq:08d}.wal"
+
+    def _wal_append(self, kind: str, name: str, cursor: _Cursor, payload: bytes) -> None:
+        if self._wal is None:
+            self._wal = open(self._wal_path(self.seq), "ab")
+        record = json.dumps([kind, name, cursor.to_json(), len(payload)])
+        self._wal.write(record.encode("utf-8") + b"\n" + payload)
+
+    def _wal_sync(self) -> None:
+        if self._wal is not None:
+            self._wal.flush()
+            if self.fsync:
+                os.fsync(self._wal.fileno())
+
+    def recover(self) -> int:
+        """Replay write-ahead files left by a previous run; returns the lines recovered."""
+        recovered = 0
+        for path in sorted((self.store / WAL_DIR).glob("*.wal")):
+            seq = int(path.stem)
+            if seq < self.seq:
+                path.unlink()  # flushed before the crash; only the delete was lost
+                continue
+            self.seq = seq
+            data = path.read_bytes()
+            position = 0
+            while True:
+                end = data.find(b"\n", position)
+                if end < 0:
+                    break
+                kind, name, cursor, size = json.loads(data[position:end])
+                payload = data[end + 1 : end + 1 + size]
+                if len(payload) < size:
+                    break  # torn final record: the cursor was not advanced past it
+                position = end + 1 + size
+                self.cursors[name] = _Cursor.from_json(cursor)
+                recovered += self._buffer(kind, name, self.cursors[name], payload)
+            self._wal = open(path, "ab")
+            self._wal.truncate(position)
+            self.flush()
+        return recovered
+
+    # -- Tailing -------------------------------------------------------------
+
+    def _buffer(self, kind: str, name: str, cursor: _Cursor, payload: bytes) -> int:
+        lines = payload.count(b"\n")
+        if kind == "log":
+            self._logs.append((name[: -len(LOG_SUFFIX)], payload))
+        else:
+            self._metrics.append((cursor.header or b"", payload))
+        self._buffered += lines
+        if self._buffered_since is None:
+            self._buffered_since = time.monotonic()
+        return lines
+
+    @staticmethod
+    def _read(path: Path, offset: int, *, final: bool) -> bytes:
+        """Read complete lines after `offset`; `final` also takes an unterminated last line."""
+        with open(path, "rb") as handle:
+            handle.seek(offset)
+            data = handle.read(MAX_READ_BYTES)
+        if final:
+            return data if not data or data.endswith(b"\n") else data + b"\n"
+        return data[: data.rfind(b"\n") + 1]
+
+    def _consume(self, kind: str, name: str, cursor: _Cursor, path: Path, *, final: bool = False) -> int:
+        data = self._read(path, cursor.offset, final=final)
+        if not data:
+            return 0
+        consumed = len(data)
+        cursor.tail = (cursor.tail + data)[-_TAIL_BYTES:]
+        if kind == "metric" and cursor.offset == 0:
+            split = data.find(b"\n")
+            cursor.header, data = data[:split].rstrip(b"\r"), data[split + 1 :]
+        cursor.offset += consumed
+        self.stats.bytes_read += consumed
+        if not data:
+            return 0
+        self._wal_append(kind, name, cursor, data)
+        return self._buffer(kind, name, cursor, data)
+
+    @staticmethod
+    def _tail_matches(entry: os.DirEntry, cursor: _Cursor) -> bool:
+        if not cursor.tail:
+            return True
+        with open(entry.path, "rb") as handle:
+            handle.seek(cursor.offset - len(cursor.tail))
+            return handle.read(len(cursor.tail)) == cursor.tail
+
+    def _drain_rotated(self, kind: str, name: str, cursor: _Cursor, entries: Dict[int, Path]) -> int:
+        """Read what is left of a rotated file, found among the directory entries by inode."""
+        rotated = entries.get(cursor.inode)
+        if rotated is None:
+            return 0  # deleted before its tail could be read
+        lines = 0
+        while True:
+            before = cursor.offset
+            lines += self._consume(kind, name, cursor, rotated, final=True)
+            if cursor.offset == before:
+                return lines
+
+    def poll(self) -> int:
+        """Read newly appended lines from every watched file; returns the lines read."""
+        with self._lock:
+            entries: Dict[int, Path] = {}
+            watched: List[Tuple[str, str, os.DirEntry]] = []
+            with os.scandir(self.source) as scan:
+                for entry in scan:
+                    if not entry.is_file():
+                        continue
+                    entries[entry.inode()] = Path(entry.path)
+                    if entry.name.endswith(LOG_SUFFIX):
+                        watched.append(("log", entry.name, entry))
+                    elif entry.name.endswith(METRIC_SUFFIX):
+                        watched.append(("metric", entry.name, entry))
+            lines = 0
+            for kind, name, entry in sorted(watched, key=lambda item: item[1]):
+                stat = entry.stat()
+                inode, size = entry.inode(), stat.st_size
+                cursor = self.cursors.get(name)
+                if cursor is not None and cursor.inode != inode:
+                    lines += self._drain_rotated(kind, name, cursor, entries)
+                    self.stats.rotations += 1
+                    cursor = None
+                if cursor is None:
+                    cursor = self.cursors[name] = _Cursor(inode)
+                elif size < cursor.offset or (stat.st_mtime_ns != cursor.mtime_ns and not self._tail_matches(entry, cursor)):
+                    cursor.offset, cursor.header, cursor.tail = 0, None, b""
+                    self.stats.truncations += 1
+                cursor.mtime_ns = stat.st_mtime_ns
+                if size > cursor.offset:
+                    lines += self._consume(kind, name, cursor, Path(entry.path))
+            self._wal_sync()
+            if self._due():
+                self._flush_locked()
+            return lines
+
+    def _due(self) -> bool:
+        if not self._buffered:
+            return False
+        if self._buffered >= self.batch_lines:
+            return True
+        return time.monotonic() - (self._buffered_since or 0.0) >= self.flush_interval_s
+
+    # -- Flushing ------------------------------------------------------------
+
+    def flush(self) -> bool:
+        """Write buffered lines to the store and publish a new data version."""
+        with self._lock:
+            return self._flush_locked()
+
+    def _flush_locked(self) -> bool:
+        if not self._buffered:
+            self._close_wal(delete=True)
+            return False
+        part = f"part-{self.seq:08d}.parquet"
+        logs = self._log_table()
+        if logs is not None:
+            self._write_part(logs, self.store / "logs" / part)
+            if self.index:
+                self._append_index(logs)
+        metrics = self._metric_table()
+        if metrics is not None:
+            self._write_part(metrics, self.store / "metrics" / part)
+        self.version += 1
+        self.stats.lines += logs.num_rows if logs is not None else 0
+        self.stats.metric_rows += metrics.num_rows if metrics is not None else 0
+        self.stats.flushes += 1
+        published = {"version": self.version, "seq": self.seq, "updated": datetime.now(timezone.utc).isoformat()}
+        _write_atomic(self.store / DATA_VERSION_FILE, json.dumps(published).encode("utf-8"))
+        self.seq += 1
+        self._save_state()
+        self._close_wal(delete=True, seq=self.seq - 1)
+        self._logs, self._metrics = [], []
+        self._buffered, self._buffered_since = 0, None
+        return True
+
+    def _close_wal(self, *, delete: bool, seq: Optional[int] = None) -> None:
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
+        if delete:
+            self._wal_path(self.seq if seq is None else seq).unlink(missing_ok=True)
+
+    def _log_table(self) -> Any:
+        import pyarrow as pa
+
+        servers: List[str] = []
+        messages: List[str] = []
+        for server_id, payload in self._logs:
+            lines = [line.rstrip("\r") for line in payload.decode("utf-8", "replace").split("\n") if line.strip()]
+            messages.extend(lines)
+            servers.extend([server_id] * len(lines))
+        if not messages:
+            return None
+        return pa.table({"server_id": pa.array(servers, pa.string()), "message": pa.array(messages, pa.string())})
+
+    def _metric_table(self) -> Any:
+        import pyarrow as pa
+        import pyarrow.csv as pv
+
+        tables = [
+            pv.read_csv(io.BytesIO(header + b"\n" + payload))
+            for header, payload in self._metrics
+            if header and payload.strip()
+        ]
+        if not tables:
+            return None
+        return pa.concat_tables(tables, promote_options="permissive")
+
+    def _write_part(self, table: Any, path: Path) -> None:
+        import pyarrow.parquet as pq
+
+        tmp = path.with_name(path.name + ".tmp")
+        pq.write_table(table, tmp, compression="zstd")
+        os.replace(tmp, path)
+
+    def _append_index(self, logs: Any) -> None:
+        from .log_index import LogIndex
+
+        index = LogIndex(self.store / "index")
+        index.append(zip([None] * logs.num_rows, logs["server_id"].to_pylist(), logs["message"].to_pylist()))
+
+    # -- Daemon loop ---------------------------------------------------------
+
+    def run(self, *, poll_interval_s: float = 0.25, stop: Optional[threading.Event] = None) -> None:
+        """Poll until `stop` is set (or forever), then flush what is buffered."""
+        stop = stop or threading.Event()
+        try:
+            while not stop.is_set():
+                started = time.monotonic()
+                self.poll()
+                stop.wait(max(poll_interval_s - (time.monotonic() - started), 0.0))
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._wal_sync()
+            self._flush_locked()
+            self._close_wal(delete=False)
+
+
+def main() -> None:
+    """Tail SOURCE into the ingest store STORE: `python -m it_ops_observability.ingest SOURCE STORE`."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("source", type=Path)
+    parser.add_argument("store", type=Path)
+    parser.add_argument("--poll-interval", type=float, default=0.25, help="Seconds between directory scans.")
+    parser.add_argument("--flush-interval", type=float, default=DEFAULT_FLUSH_INTERVAL_S)
+    parser.add_argument("--batch-lines", type=int, default=DEFAULT_BATCH_LINES)
+    parser.add_argument("--index", action="store_true", help="Also append lines to <store>/index for search_logs.")
+    parser.add_argument("--no-fsync", action="store_true", help="Skip fsync of the write-ahead buffer.")
+    args = parser.parse_args()
+    ingester = DirectoryIngester(
+        args.source,
+        args.store,
+        batch_lines=args.batch_lines,
+        flush_interval_s=args.flush_interval,
+        fsync=not args.no_fsync,
+        index=args.index,
+    )
+    try:
+        ingester.run(poll_interval_s=args.poll_interval)
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps({"version": ingester.version, **ingester.stats.__dict__}))
+
+
+if __name__ == "__main__":
+    main()
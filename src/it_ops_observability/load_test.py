@@ -0,0 +1,295 @@
+"""Concurrent-user load generator for the dashboard path.
+
+`run_load_test` simulates `users` concurrent viewers, each a thread (as
+Streamlit runs each session's script on its own thread) that repeatedly
+requests a dashboard for a random server and lookback window from the mix,
+pausing a jittered think time between requests. Users start staggered over
+`ramp_up_s`. Two targets are provided:
+
+* `snapshot_target` calls `build_dashboard_snapshot` in-process, optionally
+  through a `SharedCache` as the Streamlit app's `_load_dashboard_snapshot`
+  does;
+* `http_target` issues GET requests against a locally running Streamlit
+  server. Streamlit renders over a websocket, so this measures the server's
+  HTTP responsiveness under load (health check and page shell), not script
+  reruns; pass the server's `pid` to sample its CPU and RSS instead of the
+  generator's.
+
+The report gives throughput, p50/p95/p99 latency overall and per lookback
+window, error counts, and a timeline of per-interval throughput, p95, CPU
+(percent of one core) and RSS. `sweep` runs increasing user counts, and
+`recommend_concurrency` picks the largest one that kept p95 within a budget,
+which is the per-instance concurrency to configure on Cloud Run.
+
+Run `scripts/load_test_dashboard.py` for the command-line harness.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import replace
+import os
+from pathlib import Path
+import random
+import statistics
+import threading
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from .data_sources import DataConfig
+from .stats import percentile
+
+
+# Same servers as the benchmark fixtures (`benchmarks.FIXTURE_SERVERS`).
+DEFAULT_SERVERS = ("prod-app-01", "prod-app-02", "prod-db-01", "prod-edge-01")
+DEFAULT_WINDOWS = (60, 240, 720)
+DEFAULT_SAMPLE_INTERVAL_S = 1.0
+# Error share above which a stage is never recommended, whatever its latency.
+MAX_ERROR_RATE = 0.01
+
+Target = Callable[[str, int], Any]
+
+
+@dataclass
+class LoadTestConfig:
+    """Shape of one load-test stage."""
+
+    users: int = 8
+    duration_s: float = 30.0
+    ramp_up_s: float = 0.0
+    # Mean pause between a user's requests; each pause is jittered by +/-50%.
+    think_time_s: float = 1.0
+    servers: Sequence[str] = DEFAULT_SERVERS
+    windows: Sequence[int] = DEFAULT_WINDOWS
+    sample_interval_s: float = DEFAULT_SAMPLE_INTERVAL_S
+    seed: Optional[int] = None
+    # Process whose CPU and RSS are sampled; defaults to this one.
+    pid: Optional[int] = None
+
+
+@dataclass
+class _Request:
+    started_s: float
+    latency_s: float
+    window: int
+    error: Optional[str] = None
+
+
+@dataclass
+class _Recorder:
+    requests: List[_Request] = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def add(self, request: _Request) -> None:
+        with self.lock:
+            self.requests.append(request)
+
+    def since(self, start: int) -> List[_Request]:
+        with self.lock:
+            return self.requests[start:]
+
+
+# -- Targets -----------------------------------------------------------------
+
+
+def snapshot_target(config: Optional[DataConfig] = None, cache: Any = None) -> Target:
+    """Return a target that builds dashboard snapshots in-process (through `cache` when given)."""
+    from .dashboard import build_dashboard_snapshot
+
+    def _request(server_id: str, window_minutes: int) -> Any:
+        return build_dashboard_snapshot(server_id, window_minutes, config, cache=cache)
+
+    return _request
+
+
+def http_target(url: str, *, timeout_s: float = 30.0) -> Target:
+    """Return a target that GETs `url` (e.g. `http://localhost:8501/_stcore/health`)."""
+    import urllib.request
+
+    def _request(server_id: str, window_minutes: int) -> Any:
+        with urllib.request.urlopen(url, timeout=timeout_s) as response:
+            return response.read()
+
+    return _request
+
+
+# -- Resource sampling -------------------------------------------------------
+
+
+def process_usage(pid: Optional[int] = None) -> Tuple[float, Optional[float]]:
+    """Return `(cpu_seconds, rss_mb)` for `pid` (default: this process); RSS is None when unknown.
+
+    Reads `/proc` where available (Linux, including Cloud Run); elsewhere
+    only this process can be sampled, with peak rather than current RSS.
+    """
+    proc = Path("/proc") / str(pid or os.getpid())
+    try:
+        fields = (proc / "stat").read_text().rsplit(")", 1)[1].split()
+        ticks = os.sysconf("SC_CLK_TCK")
+        cpu_s = (int(fields[11]) + int(fields[12])) / ticks
+        rss_pages = int((proc / "statm").read_text().split()[1])
+        return cpu_s, rss_pages * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, IndexError, ValueError):
+        if pid not in (None, os.getpid()):
+            raise
+    times = os.times()
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KiB on Linux and bytes on macOS.
+        rss_mb: Optional[float] = peak / 1e6 if os.uname().sysname == "Darwin" else peak / 1e3
+    except ImportError:
+        rss_mb = None
+    return times.user + times.system, rss_mb
+
+
+def _timeline_row(
+    elapsed_s: float, interval_s: float, requests: List[_Request], cpu_s: float, rss_mb: Optional[float]
+) -> Dict[str, Any]:
+    latencies = [request.latency_s for request in requests if request.error is None]
+    p95 = percentile(latencies, 95)
+    return {
+        "t_s": round(elapsed_s, 2),
+        "requests": len(requests),
+        "errors": sum(request.error is not None for request in requests),
+        "rps": round(len(requests) / interval_s, 2) if interval_s > 0 else None,
+        "p95_ms": round(p95 * 1000, 2) if p95 is not None else None,
+        "cpu_pct": round(cpu_s / interval_s * 100, 1) if interval_s > 0 else None,
+        "rss_mb": round(rss_mb, 1) if rss_mb is not None else None,
+    }
+
+
+# -- Runner ------------------------------------------------------------------
+
+
+def _latency_summary(latencies: Sequence[float]) -> Dict[str, Optional[float]]:
+    if not latencies:
+        return {"p50": None, "p95": None, "p99": None, "mean": None, "max": None}
+    return {
+        "p50": round(percentile(latencies, 50) * 1000, 2),
+        "p95": round(percentile(latencies, 95) * 1000, 2),
+        "p99": round(percentile(latencies, 99) * 1000, 2),
+        "mean": round(statistics.fmean(latencies) * 1000, 2),
+        "max": round(max(latencies) * 1000, 2),
+    }
+
+
+def run_load_test(target: Target, config: LoadTestConfig, *, label: str = "snapshot") -> Dict[str, Any]:
+    """Drive `target` with `config.users` concurrent users for `config.duration_s` seconds."""
+    if config.users < 1:
+        raise ValueError("users must be at least 1")
+    recorder = _Recorder()
+    stop = threading.Event()
+    started = time.perf_counter()
+    deadline = started + config.duration_s
+    seeds = random.Random(config.seed)
+
+    def _user(index: int, rng: random.Random) -> None:
+        delay = config.ramp_up_s * index / config.users
+        if delay and stop.wait(delay):
+            return
+        while time.perf_counter() < deadline and not stop.is_set():
+            server_id, window = rng.choice(list(config.servers)), rng.choice(list(config.windows))
+            request_started = time.perf_counter()
+            error = None
+            try:
+                target(server_id, window)
+            except Exception as exc:  # failures are measured, not raised
+                error = type(exc).__name__
+            finished = time.perf_counter()
+            recorder.add(_Request(request_started - started, finished - request_started, window, error))
+            if config.think_time_s > 0:
+                stop.wait(config.think_time_s * rng.uniform(0.5, 1.5))
+
+    timeline: List[Dict[str, Any]] = []
+
+    def _sample() -> None:
+        previous_cpu, _ = process_usage(config.pid)
+        previous_at, seen = started, 0
+        while True:
+            finished = stop.wait(config.sample_interval_s)
+            now = time.perf_counter()
+            cpu_s, rss_mb = process_usage(config.pid)
+            fresh = recorder.since(seen)
+            seen += len(fresh)
+            timeline.append(_timeline_row(now - started, now - previous_at, fresh, cpu_s - previous_cpu, rss_mb))
+            previous_cpu, previous_at = cpu_s, now
+            if finished:
+                return
+
+    users = [
+        threading.Thread(target=_user, args=(index, random.Random(seeds.random())), name=f"load-user-{index}", daemon=True)
+        for index in range(config.users)
+    ]
+    sampler = threading.Thread(target=_sample, name="load-sampler", daemon=True)
+    sampler.start()
+    for thread in users:
+        thread.start()
+    for thread in users:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    sampler.join()
+
+    requests = recorder.since(0)
+    succeeded = [request for request in requests if request.error is None]
+    errors: Dict[str, int] = {}
+    for request in requests:
+        if request.error is not None:
+            errors[request.error] = errors.get(request.error, 0) + 1
+    by_window = {
+        str(window): {
+            "requests": len(matching),
+            **_latency_summary([request.latency_s for request in matching]),
+        }
+        for window in config.windows
+        for matching in [[request for request in succeeded if request.window == window]]
+    }
+    cpu_samples = [row["cpu_pct"] for row in timeline if row["cpu_pct"] is not None]
+    rss_samples = [row["rss_mb"] for row in timeline if row["rss_mb"] is not None]
+    return {
+        "target": label,
+        "users": config.users,
+        "duration_s": round(elapsed, 2),
+        "think_time_s": config.think_time_s,
+        "requests": len(requests),
+        "errors": errors,
+        "error_rate": round(len(requests) and (len(requests) - len(succeeded)) / len(requests), 4),
+        "throughput_rps": round(len(succeeded) / elapsed, 2) if elapsed > 0 else None,
+        "latency_ms": _latency_summary([request.latency_s for request in succeeded]),
+        "latency_ms_by_window": by_window,
+        "cpu_pct_mean": round(statistics.fmean(cpu_samples), 1) if cpu_samples else None,
+        "cpu_pct_max": max(cpu_samples) if cpu_samples else None,
+        "rss_mb_max": max(rss_samples) if rss_samples else None,
+        "timeline": timeline,
+    }
+
+
+def warm_up(target: Target, config: LoadTestConfig) -> None:
+    """Request every server once so the first stage does not pay for cold dataset loads."""
+    for server_id in config.servers:
+        target(server_id, max(config.windows))
+
+
+def sweep(target: Target, user_counts: Sequence[int], config: LoadTestConfig, *, label: str = "snapshot") -> List[Dict[str, Any]]:
+    """Run one stage per user count (same shape otherwise) and return their reports."""
+    return [run_load_test(target, replace(config, users=users), label=label) for users in user_counts]
+
+
+def recommend_concurrency(reports: Sequence[Dict[str, Any]], p95_budget_ms: float) -> Optional[int]:
+    """Return the most users any stage served within the p95 budget and error ceiling, or None."""
+    passing = [
+        report["users"]
+        for report in reports
+        if report["latency_ms"]["p95"] is not None
+        and report["latency_ms"]["p95"] <= p95_budget_ms
+        and report["error_rate"] <= MAX_ERROR_RATE
+    ]
+    return max(passing) if passing else None
@@ -0,0 +1,446 @@
+"""Persistent, time-partitioned inverted index for full-text log search.
+
+Lines are appended in batches (at ingestion or from a parquet backfill). Each
+batch becomes an immutable *segment* inside the partition directory for its
+time bucket (one day by default), and `manifest.json` records every segment's
+time range, servers, and line count so searches skip segments that cannot
+match. Appends take an exclusive lock on the directory and merge the manifest
+on disk, so several processes can write to one index. A segment is a directory of `.npy` arrays loaded with `mmap_mode="r"`:
+
+* per line: timestamp (ns), server code, severity code, and byte offsets
+  into `text.bin`, which holds the raw lines;
+* postings in CSR form: for every term, the sorted line ids containing it.
+
+Terms come from the message after variable fragments (numbers, IPs, hex IDs)
+are masked with `log_summary.to_template`, which keeps the vocabulary small.
+Multi-term queries intersect postings (all terms) or union them (any term).
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from datetime import timezone
+import json
+import os
+from pathlib import Path
+import re
+import threading
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+
+try:  # POSIX only; elsewhere a single writer per index is assumed.
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from .log_summary import split_log_line
+from .log_summary import to_template
+
+
+MANIFEST_NAME = "manifest.json"
+LOCK_NAME = ".lock"
+DEFAULT_PARTITION_HOURS = 24
+SEVERITIES: Tuple[str, ...] = ("CRITICAL", "ERROR", "WARN", "INFO", "DEBUG", "UNKNOWN")
+_TERM_PATTERN = re.compile(r"[a-z][a-z0-9_]*")
+_SEGMENT_CACHE_SIZE = 256
+_NS_PER_HOUR = 3_600_000_000_000
+
+
+def index_terms(message: str) -> List[str]:
+    """Return the distinct searchable terms of a log message."""
+    return sorted(set(_TERM_PATTERN.findall(to_template(message).lower())))
+
+
+def parse_timestamp(value: Any) -> Optional[np.datetime64]:
+    """Parse an ISO-8601 timestamp (a trailing `Z` is accepted) to UTC nanoseconds."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, np.datetime64):
+        return value.astype("datetime64[ns]")
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return np.datetime64(value, "ns")
+    text = str(value).strip()
+    if text.endswith("Z"):
+        text = text[:-1]
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    return parse_timestamp(parsed)
+
+
+class _Segment:
+    """Read-only view over one segment directory."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.timestamps = np.load(path / "timestamps.npy", mmap_mode="r")
+        self.servers = np.load(path / "servers.npy", mmap_mode="r")
+        self.severities = np.load(path / "severities.npy", mmap_mode="r")
+        self.offsets = np.load(path / "offsets.npy", mmap_mode="r")
+        self.indptr = np.load(path / "indptr.npy", mmap_mode="r")
+        self.postings = np.load(path / "postings.npy", mmap_mode="r")
+        meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+        self.server_names: List[str] = meta["servers"]
+        self.term_ids: Dict[str, int] = {term: i for i, term in enumerate(meta["terms"])}
+        self._text = path / "text.bin"
+
+    def __len__(self) -> int:
+        return int(self.timestamps.shape[0])
+
+    def postings_for(self, term: str) -> Optional[np.ndarray]:
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            return None
+        return self.postings[self.indptr[term_id] : self.indptr[term_id + 1]]
+
+    def lines(self, rows: Iterable[int]) -> List[str]:
+        with self._text.open("rb") as handle:
+            out = []
+            for row in rows:
+                start, end = int(self.offsets[row]), int(self.offsets[row + 1])
+                handle.seek(start)
+                out.append(handle.read(end - start).decode("utf-8", errors="replace"))
+            return out
+
+
+def _write_segment(
+    path: Path,
+    timestamps: np.ndarray,
+    servers: Sequence[str],
+    severities: Sequence[str],
+    lines: Sequence[str],
+    messages: Sequence[str],
+) -> Dict[str, Any]:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.mkdir(parents=True, exist_ok=False)
+    server_names = sorted(set(servers))
+    server_codes = {name: code for code, name in enumerate(server_names)}
+    severity_codes = {name: code for code, name in enumerate(SEVERITIES)}
+
+    vocabulary: Dict[str, int] = {}
+    term_ids: List[int] = []
+    counts: List[int] = []
+    for message in messages:
+        terms = index_terms(message)
+        term_ids.extend(vocabulary.setdefault(term, len(vocabulary)) for term in terms)
+        counts.append(len(terms))
+    n = len(lines)
+    docs = np.repeat(np.arange(n, dtype=np.int64), counts)
+    order = np.lexsort((docs, np.asarray(term_ids, dtype=np.int64)))
+    postings = docs[order].astype(np.int32)
+    indptr = np.concatenate(([0], np.cumsum(np.bincount(term_ids, minlength=len(vocabulary))))).astype(np.int64)
+
+    encoded = [line.encode("utf-8") for line in lines]
+    offsets = np.concatenate(([0], np.cumsum([len(item) for item in encoded]))).astype(np.int64)
+    (tmp / "text.bin").write_bytes(b"".join(encoded))
+    np.save(tmp / "offsets.npy", offsets)
+    np.save(tmp / "timestamps.npy", timestamps.astype("datetime64[ns]").astype(np.int64))
+    np.save(tmp / "servers.npy", np.array([server_codes[name] for name in servers], dtype=np.int32))
+    np.save(
+        tmp / "severities.npy",
+        np.array([severity_codes.get(level, severity_codes["UNKNOWN"]) for level in severities], dtype=np.int8),
+    )
+    np.save(tmp / "indptr.npy", indptr)
+    np.save(tmp / "postings.npy", postings)
+    (tmp / "meta.json").write_text(
+        json.dumps({"servers": server_names, "terms": list(vocabulary)}), encoding="utf-8"
+    )
+    os.replace(tmp, path)
+    return {
+        "min_ns": int(timestamps.min().astype(np.int64)),
+        "max_ns": int(timestamps.max().astype(np.int64)),
+        "servers": server_names,
+        "lines": n,
+    }
+
+
+class LogIndex:
+    """Append-only, time-partitioned log index rooted at a directory."""
+
+    def __init__(self, root: Path, *, partition_hours: int = DEFAULT_PARTITION_HOURS) -> None:
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._segments: "OrderedDict[str, _Segment]" = OrderedDict()
+        self._manifest_mtime: Optional[int] = None
+        manifest = self._read_manifest()
+        self.partition_hours = manifest.get("partition_hours", partition_hours)
+        self._entries: List[Dict[str, Any]] = manifest.get("segments", [])
+
+    # -- Manifest ------------------------------------------------------------
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            return json.loads((self.root / MANIFEST_NAME).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _write_manifest(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / (MANIFEST_NAME + ".tmp")
+        tmp.write_text(
+            json.dumps({"partition_hours": self.partition_hours, "segments": self._entries}), encoding="utf-8"
+        )
+        os.replace(tmp, self.root / MANIFEST_NAME)
+        self._manifest_mtime = (self.root / MANIFEST_NAME).stat().st_mtime_ns
+
+    @contextmanager
+    def _writer_lock(self) -> Iterator[None]:
+        """Hold an exclusive lock on the index directory so appends from other processes serialize."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / LOCK_NAME, "a+b") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def refresh(self) -> None:
+        """Reload the manifest if another writer (e.g. the ingester) has appended segments."""
+        try:
+            mtime = (self.root / MANIFEST_NAME).stat().st_mtime_ns
+        except OSError:
+            return
+        with self._lock:
+            if mtime == self._manifest_mtime:
+                return
+            self._manifest_mtime = mtime
+            self._entries = self._read_manifest().get("segments", [])
+
+    @property
+    def line_count(self) -> int:
+        return sum(entry["lines"] for entry in self._entries)
+
+    @property
+    def segment_count(self) -> int:
+        return len(self._entries)
+
+    # -- Ingestion -----------------------------------------------------------
+
+    def append(self, records: Iterable[Tuple[Any, str, str]]) -> int:
+        """Index `(timestamp, server_id, line)` records; returns the number of lines added.
+
+        Lines are `<timestamp> [<LEVEL>] <message>`; the explicit timestamp wins
+        and falls back to the one parsed from the line, then to the current time.
+        """
+        partitions: Dict[int, Dict[str, list]] = {}
+        now = np.datetime64(datetime.now(timezone.utc).replace(tzinfo=None), "ns")
+        for timestamp, server_id, line in records:
+            line_time, level, message = split_log_line(line)
+            stamp = parse_timestamp(timestamp)
+            if stamp is None:
+                stamp = parse_timestamp(line_time)
+            if stamp is None:
+                stamp = now
+            bucket = int(stamp.astype(np.int64)) // (self.partition_hours * _NS_PER_HOUR)
+            batch = partitions.setdefault(
+                bucket, {"timestamps": [], "servers": [], "severities": [], "lines": [], "messages": []}
+            )
+            batch["timestamps"].append(stamp)
+            batch["servers"].append(str(server_id))
+            batch["severities"].append(level)
+            batch["lines"].append(line.rstrip("\n"))
+            batch["messages"].append(message)
+
+        added = 0
+        with self._lock, self._writer_lock():
+            # Merge segments other writers (e.g. the ingester) added since our last read.
+            self._entries = self._read_manifest().get("segments", self._entries)
+            for bucket, batch in sorted(partitions.items()):
+                started = datetime.fromtimestamp(bucket * self.partition_hours * 3600, tz=timezone.utc)
+                partition = started.strftime("%Y%m%d%H")
+                sequence = sum(1 for entry in self._entries if entry["partition"] == partition)
+                # The random suffix avoids a half-written directory left by a crashed writer.
+                relative = f"{partition}/seg-{sequence:06d}-{os.urandom(3).hex()}"
+                (self.root / partition).mkdir(parents=True, exist_ok=True)
+                entry = _write_segment(
+                    self.root / relative,
+                    np.array(batch["timestamps"], dtype="datetime64[ns]"),
+                    batch["servers"],
+                    batch["severities"],
+                    batch["lines"],
+                    batch["messages"],
+                )
+                self._entries.append({"partition": partition, "path": relative, **entry})
+                added += entry["lines"]
+            if added:
+                self._write_manifest()
+        return added
+
+    def append_text(self, server_id: str, raw: str) -> int:
+        """Index newline-delimited log text for one server."""
+        return self.append((None, server_id, line) for line in raw.splitlines() if line.strip())
+
+    # -- Search --------------------------------------------------------------
+
+    def _segment(self, relative: str) -> _Segment:
+        with self._lock:
+            segment = self._segments.get(relative)
+            if segment is not None:
+                self._segments.move_to_end(relative)
+                return segment
+        segment = _Segment(self.root / relative)
+        with self._lock:
+            self._segments[relative] = segment
+            if len(self._segments) > _SEGMENT_CACHE_SIZE:
+                self._segments.popitem(last=False)
+        return segment
+
+    def search(
+        self,
+        query: str,
+        *,
+        servers: Optional[Sequence[str]] = None,
+        start: Any = None,
+        end: Any = None,
+        severities: Optional[Sequence[str]] = None,
+        limit: int = 20,
+        match: str = "all",
+    ) -> Dict[str, Any]:
+        """Return match counts per server and severity plus the `limit` most recent hits."""
+        terms = index_terms(query)
+        start_ns = parse_timestamp(start)
+        end_ns = parse_timestamp(end)
+        start_i = int(start_ns.astype(np.int64)) if start_ns is not None else None
+        end_i = int(end_ns.astype(np.int64)) if end_ns is not None else None
+        wanted_servers = set(servers) if servers else None
+        wanted_levels = {SEVERITIES.index(level.upper()) for level in severities or [] if level.upper() in SEVERITIES}
+
+        server_counts: Dict[str, int] = {}
+        server_last: Dict[str, int] = {}
+        severity_counts: Dict[str, int] = {}
+        candidates: List[Tuple[np.ndarray, int, np.ndarray]] = []  # (timestamps, entry index, rows)
+        scanned = 0
+        with self._lock:
+            entries = list(self._entries) if terms else []
+        for position, entry in enumerate(entries):
+            if start_i is not None and entry["max_ns"] < start_i:
+                continue
+            if end_i is not None and entry["min_ns"] > end_i:
+                continue
+            if wanted_servers is not None and not wanted_servers.intersection(entry["servers"]):
+                continue
+            segment = self._segment(entry["path"])
+            scanned += 1
+            rows = self._match(segment, terms, match)
+            if rows is None or rows.size == 0:
+                continue
+            stamps = np.asarray(segment.timestamps[rows])
+            keep = np.ones(rows.size, dtype=bool)
+            if start_i is not None:
+                keep &= stamps >= start_i
+            if end_i is not None:
+                keep &= stamps <= end_i
+            codes = np.asarray(segment.servers[rows])
+            if wanted_servers is not None:
+                allowed = [code for code, name in enumerate(segment.server_names) if name in wanted_servers]
+                keep &= np.isin(codes, allowed)
+            levels = np.asarray(segment.severities[rows])
+            if wanted_levels:
+                keep &= np.isin(levels, list(wanted_levels))
+            rows, stamps, codes, levels = rows[keep], stamps[keep], codes[keep], levels[keep]
+            if rows.size == 0:
+                continue
+            code_counts = np.bincount(codes, minlength=len(segment.server_names))
+            code_latest = np.full(len(segment.server_names), np.iinfo(np.int64).min)
+            np.maximum.at(code_latest, codes, stamps)
+            for code in np.flatnonzero(code_counts).tolist():
+                name = segment.server_names[code]
+                server_counts[name] = server_counts.get(name, 0) + int(code_counts[code])
+                server_last[name] = max(server_last.get(name, int(code_latest[code])), int(code_latest[code]))
+            level_counts = np.bincount(levels, minlength=len(SEVERITIES))
+            for level in np.flatnonzero(level_counts).tolist():
+                severity_counts[SEVERITIES[level]] = severity_counts.get(SEVERITIES[level], 0) + int(level_counts[level])
+            candidates.append((stamps, position, rows))
+
+        hits = self._latest_hits(entries, candidates, limit)
+        return {
+            "query": query,
+            "terms": terms,
+            "total_hits": sum(server_counts.values()),
+            "segments_scanned": scanned,
+            "servers": [
+                {
+                    "server_id": name,
+                    "count": count,
+                    "last_seen": str(np.datetime64(server_last[name], "ns").astype("datetime64[s]")),
+                }
+                for name, count in sorted(server_counts.items(), key=lambda item: (-item[1], item[0]))
+            ],
+            "severities": severity_counts,
+            "hits": hits,
+        }
+
+    @staticmethod
+    def _match(segment: _Segment, terms: Sequence[str], match: str) -> Optional[np.ndarray]:
+        lists = [segment.postings_for(term) for term in terms]
+        if match == "any":
+            present = [np.asarray(item) for item in lists if item is not None]
+            return np.unique(np.concatenate(present)) if present else None
+        if any(item is None for item in lists):
+            return None
+        lists.sort(key=len)
+        if len(lists) == 1:
+            return np.asarray(lists[0])
+        if len(lists[0]) * 16 < len(segment):
+            rows = np.asarray(lists[0])
+            for other in lists[1:]:
+                rows = rows[np.isin(rows, other, assume_unique=True)]
+            return rows
+        # Dense path: count term hits per row when postings cover much of the segment.
+        counts = np.zeros(len(segment), dtype=np.uint8)
+        for item in lists:
+            counts[item] += 1
+        return np.flatnonzero(counts == len(lists))
+
+    def _latest_hits(
+        self,
+        entries: List[Dict[str, Any]],
+        candidates: List[Tuple[np.ndarray, int, np.ndarray]],
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        if not candidates or limit <= 0:
+            return []
+        stamps = np.concatenate([item[0] for item in candidates])
+        owners = np.concatenate([np.full(item[0].size, index) for index, item in enumerate(candidates)])
+        rows = np.concatenate([item[2] for item in candidates])
+        top = min(limit, stamps.size)
+        best = np.argpartition(-stamps, top - 1)[:top]
+        best = best[np.argsort(-stamps[best], kind="stable")]
+        hits = []
+        for pick in best.tolist():
+            _, position, _ = candidates[owners[pick]]
+            segment = self._segment(entries[position]["path"])
+            row = int(rows[pick])
+            hits.append(
+                {
+                    "timestamp": str(np.datetime64(int(stamps[pick]), "ns").astype("datetime64[s]")),
+                    "server_id": segment.server_names[int(segment.servers[row])],
+                    "severity": SEVERITIES[int(segment.severities[row])],
+                    "line": segment.lines([row])[0],
+                }
+            )
+        return hits
+
+
+def backfill_from_frame(index: LogIndex, frame: Any, *, batch_size: int = 500_000) -> int:
+    """Index a logs DataFrame with `server_id` and `message` (and optional `timestamp`) columns."""
+    added = 0
+    for start in range(0, len(frame), batch_size):
+        chunk = frame.iloc[start : start + batch_size]
+        stamps = chunk["timestamp"].tolist() if "timestamp" in chunk.columns else [None] * len(chunk)
+        added += index.append(zip(stamps, chunk["server_id"].astype(str), chunk["message"].astype(str)))
+    return added
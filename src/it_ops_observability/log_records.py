@@ -0,0 +1,254 @@
+"""Compact, dictionary-encoded storage for parsed log lines.
+
+`LogBatch` keeps one row per line in four flat `array` columns instead of
+one dict of four strings per line: timestamps as int64 microseconds since the
+epoch, and level, component, and message as int32 codes into per-batch
+dictionaries of distinct values. Logs repeat a handful of levels, hosts, and
+message texts, so a row costs about 20 bytes instead of several hundred.
+
+Rows still read as `{"timestamp", "level", "component", "message"}` dicts
+through indexing and iteration, so callers of the old list-of-dicts
+`parse_logs` keep working; `to_frame` builds a pandas frame with categorical
+columns directly from the codes. Only the standard library is imported here
+so the dashboard parser stays cheap to import.
+"""
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+import sys
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Tuple
+from typing import Union
+
+# Rows whose timestamp could not be parsed hold this value in `timestamps_us`.
+MISSING_TIMESTAMP = -(2**63)
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_COLUMNS = ("timestamp", "level", "component", "message")
+
+
+def _parse_timestamp_us(text: str) -> int:
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return MISSING_TIMESTAMP
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    delta = parsed - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def format_timestamp_us(value: int) -> str:
+    """Render epoch microseconds as the `...Z` ISO-8601 form used by the log sources."""
+    moment = _EPOCH + timedelta(microseconds=value)
+    spec = "microseconds" if value % 1_000_000 else "seconds"
+    return moment.replace(tzinfo=None).isoformat(timespec=spec) + "Z"
+
+
+class _Dictionary:
+    """Append-only string dictionary: value <-> dense int code."""
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def encode(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __getstate__(self) -> Any:
+        # A one-item tuple is always truthy, so pickle calls `__setstate__` even when empty.
+        return (self.values,)
+
+    def __setstate__(self, state: Any) -> None:
+        (values,) = state
+        self.values = values
+        self._codes = {value: code for code, value in enumerate(values)}
+
+
+class LogBatch:
+    """Array-backed log rows with dictionary-encoded level, component, and message."""
+
+    __slots__ = ("timestamps_us", "_levels", "_components", "_messages", "_level_dict", "_component_dict", "_message_dict", "_raw_timestamps")
+
+    def __init__(self) -> None:
+        self.timestamps_us = array("q")
+        self._levels = array("i")
+        self._components = array("i")
+        self._messages = array("i")
+        self._level_dict = _Dictionary()
+        self._component_dict = _Dictionary()
+        self._message_dict = _Dictionary()
+        # Timestamp text that does not round-trip through `format_timestamp_us`, by row.
+        self._raw_timestamps: Dict[int, str] = {}
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> "LogBatch":
+        batch = cls()
+        for line in lines:
+            batch.append_line(line)
+        return batch
+
+    @classmethod
+    def from_text(cls, raw: str) -> "LogBatch":
+        return cls.from_lines(raw.splitlines())
+
+    def append_line(self, line: str) -> bool:
+        """Parse `<timestamp> [<LEVEL>] [<component>: ]<message>`; return False for skipped lines."""
+        if not line.strip():
+            return False
+        parts = line.split(" ", 2)
+        if len(parts) < 3:
+            return False
+        timestamp, level_part, message = parts
+        message = message.strip()
+        component = ""
+        if ": " in message:
+            component, message = message.split(": ", 1)
+        self.append(timestamp, level_part.strip("[]").upper(), component.strip(), message.strip())
+        return True
+
+    def append(self, timestamp: str, level: str, component: str, message: str) -> None:
+        value = _parse_timestamp_us(timestamp)
+        if value == MISSING_TIMESTAMP or format_timestamp_us(value) != timestamp:
+            self._raw_timestamps[len(self.timestamps_us)] = timestamp
+        self.timestamps_us.append(value)
+        self._levels.append(self._level_dict.encode(level))
+        self._components.append(self._component_dict.encode(component))
+        self._messages.append(self._message_dict.encode(message))
+
+    # -- Raw buffers ----------------------------------------------------------
+
+    def to_buffers(self) -> Tuple[Any, ...]:
+        """Return the columns as bytes plus the dictionaries, for compact serialization."""
+        return (
+            self.timestamps_us.tobytes(),
+            self._levels.tobytes(),
+            self._components.tobytes(),
+            self._messages.tobytes(),
+            list(self._level_dict.values),
+            list(self._component_dict.values),
+            list(self._message_dict.values),
+            [[row, text] for row, text in self._raw_timestamps.items()],
+        )
+
+    @classmethod
+    def from_buffers(cls, buffers: Iterable[Any]) -> "LogBatch":
+        """Rebuild a batch from `to_buffers` output without re-parsing any text."""
+        stamps, levels, components, messages, level_values, component_values, message_values, raw = buffers
+        batch = cls()
+        batch.timestamps_us.frombytes(stamps)
+        batch._levels.frombytes(levels)
+        batch._components.frombytes(components)
+        batch._messages.frombytes(messages)
+        batch._level_dict.__setstate__((list(level_values),))
+        batch._component_dict.__setstate__((list(component_values),))
+        batch._message_dict.__setstate__((list(message_values),))
+        batch._raw_timestamps = {int(row): text for row, text in raw}
+        return batch
+
+    # -- Row access -----------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.timestamps_us)
+
+    def timestamp_text(self, row: int) -> str:
+        raw = self._raw_timestamps.get(row)
+        return raw if raw is not None else format_timestamp_us(self.timestamps_us[row])
+
+    def row(self, row: int) -> Dict[str, str]:
+        return {
+            "timestamp": self.timestamp_text(row),
+            "level": self._level_dict.values[self._levels[row]],
+            "component": self._component_dict.values[self._components[row]],
+            "message": self._message_dict.values[self._messages[row]],
+        }
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self.row(row) for row in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("LogBatch index out of range")
+        return self.row(index)
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        for row in range(len(self)):
+            yield self.row(row)
+
+    def to_records(self) -> List[Dict[str, str]]:
+        return list(self)
+
+    # -- Columnar access ------------------------------------------------------
+
+    def column(self, name: str) -> List[str]:
+        """Decode one column (`timestamp`, `level`, `component`, or `message`) to strings."""
+        if name == "timestamp":
+            return [self.timestamp_text(row) for row in range(len(self))]
+        codes, dictionary = self._encoded(name)
+        values = dictionary.values
+        return [values[code] for code in codes]
+
+    def _encoded(self, name: str) -> Any:
+        if name == "level":
+            return self._levels, self._level_dict
+        if name == "component":
+            return self._components, self._component_dict
+        if name == "message":
+            return self._messages, self._message_dict
+        raise KeyError(f"Unknown column {name!r}; choose from {', '.join(_COLUMNS)}")
+
+    def codes(self, name: str) -> array:
+        """Per-row dictionary codes of an encoded column."""
+        return self._encoded(name)[0]
+
+    def categories(self, name: str) -> List[str]:
+        """Distinct values of an encoded column, indexed by code."""
+        return list(self._encoded(name)[1].values)
+
+    def level_counts(self) -> Dict[str, int]:
+        values = self._level_dict.values
+        return {values[code]: count for code, count in Counter(self._levels).items()}
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns, dictionaries, and timestamp overrides."""
+        arrays = (self.timestamps_us, self._levels, self._components, self._messages)
+        total = sum(column.itemsize * len(column) for column in arrays)
+        for dictionary in (self._level_dict, self._component_dict, self._message_dict):
+            total += sum(sys.getsizeof(value) for value in dictionary.values)
+        total += sum(sys.getsizeof(value) for value in self._raw_timestamps.values())
+        return total
+
+    def to_frame(self, *, utc: bool = True) -> Any:
+        """Return a pandas frame with a datetime `timestamp` and categorical text columns."""
+        import numpy as np
+        import pandas as pd
+
+        stamps = np.frombuffer(self.timestamps_us, dtype=np.int64)
+        nanos = stamps * 1000
+        nanos[stamps == MISSING_TIMESTAMP] = MISSING_TIMESTAMP  # pandas reads int64 min as NaT
+        timestamps = pd.to_datetime(nanos)
+        if utc:
+            timestamps = timestamps.tz_localize("UTC")
+        columns: Dict[str, Any] = {"timestamp": timestamps}
+        for name in _COLUMNS[1:]:
+            codes, dictionary = self._encoded(name)
+            columns[name] = pd.Categorical.from_codes(
+                np.frombuffer(codes, dtype=np.int32),
+                categories=pd.Index(dictionary.values, dtype=object),
+            )
+        return pd.DataFrame(columns)
@@ -0,0 +1,155 @@
+"""Token-budgeted summaries of raw log text for LLM-facing tools."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import math
+import re
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+
+DEFAULT_TOKEN_BUDGET = 600
+
+# Rough heuristic for Gemini tokenization of English log text; good enough to
+# keep prompt sizes flat without calling the tokenizer on every tool response.
+_CHARS_PER_TOKEN = 4
+_SEVERITY_PRIORITY: Dict[str, int] = {"CRITICAL": 0, "ERROR": 1, "WARN": 2, "INFO": 3}
+_ALWAYS_KEEP = frozenset({"CRITICAL", "ERROR"})
+_VARIABLE_PATTERN = re.compile(
+    r"(?<![\w-])(?:\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?"  # IPv4 with optional port
+    r"|0x[0-9a-fA-F]+"  # hex literals
+    r"|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"  # UUIDs
+    r"|\d+(?:\.\d+)?[a-zA-Z%]*)(?![\w-])"  # numbers, optionally with a unit suffix
+)
+
+
+@dataclass
+class TemplateRow:
+    """A group of log lines that share a severity and message template."""
+
+    template: str
+    severity: str
+    count: int
+    first_seen: str
+    last_seen: str
+    exemplar: str
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the number of model tokens needed to send `text`."""
+    if not text:
+        return 0
+    return math.ceil(len(text) / _CHARS_PER_TOKEN)
+
+
+def to_template(message: str) -> str:
+    """Mask variable fragments (numbers, IPs, hex IDs) so similar messages group."""
+    return _VARIABLE_PATTERN.sub("<*>", message.strip())
+
+
+def split_log_line(line: str) -> Tuple[str, str, str]:
+    """Split `<timestamp> [<LEVEL>] <message>` into its parts (level UNKNOWN if absent)."""
+    parts = line.split(" ", 2)
+    if len(parts) < 3 or not parts[1].startswith("["):
+        return "", "UNKNOWN", line.strip()
+    timestamp, level_part, message = parts
+    return timestamp, level_part.strip("[]").upper(), message.strip()
+
+
+def collapse_log_lines(raw: str) -> List[TemplateRow]:
+    """Group newline-delimited log text into per-template rows.
+
+    Rows are ordered by severity (CRITICAL first) and then by descending count
+    so the most important and most frequent patterns lead the output.
+    """
+    rows: Dict[Tuple[str, str], TemplateRow] = {}
+    for line in raw.splitlines():
+        if not line.strip():
+            continue
+        timestamp, severity, message = split_log_line(line)
+        key = (severity, to_template(message))
+        row = rows.get(key)
+        if row is None:
+            rows[key] = TemplateRow(
+                template=key[1],
+                severity=severity,
+                count=1,
+                first_seen=timestamp,
+                last_seen=timestamp,
+                exemplar=line.strip(),
+            )
+            continue
+        row.count += 1
+        if timestamp and (not row.first_seen or timestamp < row.first_seen):
+            row.first_seen = timestamp
+        if timestamp > row.last_seen:
+            row.last_seen = timestamp
+    return sorted(
+        rows.values(),
+        key=lambda row: (_SEVERITY_PRIORITY.get(row.severity, len(_SEVERITY_PRIORITY)), -row.count),
+    )
+
+
+def _format_row(row: TemplateRow) -> str:
+    return f"{row.count} | {row.severity} | {row.first_seen} | {row.last_seen} | {row.template}"
+
+
+def _omitted_note(omitted: int, token_budget: int) -> str:
+    return f"# {omitted} entries omitted to fit the {token_budget}-token budget"
+
+
+def summarize_log_text(raw: str, *, token_budget: int = DEFAULT_TOKEN_BUDGET) -> str:
+    """Collapse raw log text into a compact table that fits within `token_budget`.
+
+    CRITICAL/ERROR templates and one raw exemplar line for each are kept first;
+    lower-severity rows are added while budget remains, and anything dropped is
+    reported in a trailing note so the model knows the summary is partial.
+    """
+    rows = collapse_log_lines(raw)
+    total_lines = sum(row.count for row in rows)
+    header = [
+        f"# {total_lines} log lines collapsed into {len(rows)} templates",
+        "count | severity | first_seen | last_seen | template",
+    ]
+    priority_rows = [row for row in rows if row.severity in _ALWAYS_KEEP]
+    other_rows = [row for row in rows if row.severity not in _ALWAYS_KEEP]
+
+    body: List[str] = [_format_row(row) for row in priority_rows]
+    exemplars: List[str] = []
+    if priority_rows:
+        exemplars.append("# CRITICAL/ERROR exemplars")
+        exemplars.extend(row.exemplar for row in priority_rows)
+
+    everything = header + body + [_format_row(row) for row in other_rows] + exemplars
+    if estimate_tokens("\n".join(everything)) <= token_budget:
+        return "\n".join(everything)
+
+    # Something has to go: reserve room for the trailing "omitted" note first.
+    budget = token_budget - estimate_tokens(_omitted_note(len(rows) * 2, token_budget)) - 1
+    used = estimate_tokens("\n".join(header + body + exemplars))
+    omitted = 0
+    if used > budget:
+        # Even the high-severity material overflows; trim exemplars, then rows.
+        while len(exemplars) > 1 and used > budget:
+            exemplars.pop()
+            omitted += 1
+            used = estimate_tokens("\n".join(header + body + exemplars))
+        if len(exemplars) == 1:
+            exemplars.clear()
+        while body and used > budget:
+            body.pop()
+            omitted += 1
+            used = estimate_tokens("\n".join(header + body + exemplars))
+        omitted += len(other_rows)
+    else:
+        for index, row in enumerate(other_rows):
+            line = _format_row(row)
+            cost = estimate_tokens(line) + 1
+            if used + cost > budget:
+                omitted += len(other_rows) - index
+                break
+            body.append(line)
+            used += cost
+
+    return "\n".join(header + body + exemplars + [_omitted_note(omitted, token_budget)])
@@ -0,0 +1,190 @@
+"""Streaming log template mining (Drain-style) for novelty and frequency queries."""
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from dataclasses import field
+from datetime import datetime
+from datetime import timezone
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from .log_summary import split_log_line
+from .log_summary import to_template
+
+
+WILDCARD = "<*>"
+
+
+@dataclass
+class LogTemplate:
+    """A mined message template with its running counts."""
+
+    template_id: int
+    tokens: List[str]
+    count: int = 0
+    first_seen: Optional[datetime] = None
+    last_seen: Optional[datetime] = None
+    severity_counts: Counter = field(default_factory=Counter)
+    bucket_counts: Dict[int, int] = field(default_factory=dict)
+    bucket_severities: Dict[int, Counter] = field(default_factory=dict)
+
+    @property
+    def template(self) -> str:
+        return " ".join(self.tokens)
+
+
+@dataclass
+class _Node:
+    children: Dict[str, "_Node"] = field(default_factory=dict)
+    clusters: List[LogTemplate] = field(default_factory=list)
+
+
+def _parse_timestamp(value: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class LogTemplateMiner:
+    """Assign log messages to templates using a fixed-depth parse tree.
+
+    Messages are routed by token count and their first `depth` tokens, so each
+    line only compares against the handful of clusters stored in one leaf; the
+    per-line cost stays roughly constant as the number of templates grows.
+    Within a leaf, the most similar cluster absorbs the message when at least
+    `similarity_threshold` of its tokens match, widening differing positions to
+    `<*>`; otherwise a new template is created.
+    """
+
+    def __init__(
+        self,
+        *,
+        depth: int = 2,
+        similarity_threshold: float = 0.5,
+        max_children: int = 64,
+        bucket_minutes: int = 5,
+    ) -> None:
+        self.depth = depth
+        self.similarity_threshold = similarity_threshold
+        self.max_children = max_children
+        self.bucket_minutes = bucket_minutes
+        self._root = _Node()
+        self._templates: List[LogTemplate] = []
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    @property
+    def templates(self) -> List[LogTemplate]:
+        return list(self._templates)
+
+    def add(
+        self,
+        message: str,
+        *,
+        timestamp: Optional[datetime] = None,
+        severity: Optional[str] = None,
+    ) -> LogTemplate:
+        """Mine a single message and return the template it was assigned to."""
+        tokens = to_template(message).split()
+        leaf = self._leaf_for(tokens)
+        cluster = self._best_match(leaf.clusters, tokens)
+        if cluster is None:
+            cluster = LogTemplate(template_id=len(self._templates) + 1, tokens=tokens)
+            leaf.clusters.append(cluster)
+            self._templates.append(cluster)
+        else:
+            cluster.tokens = [
+                existing if existing == incoming else WILDCARD
+                for existing, incoming in zip(cluster.tokens, tokens)
+            ]
+        self._record(cluster, timestamp, severity)
+        return cluster
+
+    def add_text(self, raw: str) -> None:
+        """Mine newline-delimited `<timestamp> [<LEVEL>] <message>` log text."""
+        for line in raw.splitlines():
+            if not line.strip():
+                continue
+            timestamp, severity, message = split_log_line(line)
+            self.add(message, timestamp=_parse_timestamp(timestamp), severity=severity)
+
+    def top(self, n: int = 5, *, since: Optional[datetime] = None) -> List[LogTemplate]:
+        """Return the `n` most frequent templates, optionally counting only after `since`."""
+        if since is None:
+            return sorted(self._templates, key=lambda t: t.count, reverse=True)[:n]
+        ranked = [(self.count_since(t, since), t) for t in self._templates]
+        ranked = [item for item in ranked if item[0] > 0]
+        ranked.sort(key=lambda item: item[0], reverse=True)
+        return [template for _, template in ranked[:n]]
+
+    def novel(self, since: datetime) -> List[LogTemplate]:
+        """Return templates whose first occurrence is at or after `since`."""
+        return [
+            template
+            for template in self._templates
+            if template.first_seen is not None and template.first_seen >= since
+        ]
+
+    def count_since(self, template: LogTemplate, since: datetime) -> int:
+        """Count occurrences of `template` in time buckets starting at or after `since`."""
+        start = self._bucket(since)
+        return sum(count for bucket, count in template.bucket_counts.items() if bucket >= start)
+
+    def severities_since(self, template: LogTemplate, since: datetime) -> Counter:
+        """Count severities of `template` in time buckets starting at or after `since`."""
+        start = self._bucket(since)
+        totals: Counter = Counter()
+        for bucket, counts in template.bucket_severities.items():
+            if bucket >= start:
+                totals.update(counts)
+        return totals
+
+    def _bucket(self, timestamp: datetime) -> int:
+        return int(timestamp.timestamp() // (self.bucket_minutes * 60))
+
+    def _record(self, cluster: LogTemplate, timestamp: Optional[datetime], severity: Optional[str]) -> None:
+        cluster.count += 1
+        if severity:
+            cluster.severity_counts[severity] += 1
+        if timestamp is None:
+            return
+        if cluster.first_seen is None or timestamp < cluster.first_seen:
+            cluster.first_seen = timestamp
+        if cluster.last_seen is None or timestamp > cluster.last_seen:
+            cluster.last_seen = timestamp
+        bucket = self._bucket(timestamp)
+        cluster.bucket_counts[bucket] = cluster.bucket_counts.get(bucket, 0) + 1
+        if severity:
+            cluster.bucket_severities.setdefault(bucket, Counter())[severity] += 1
+
+    def _leaf_for(self, tokens: List[str]) -> _Node:
+        node = self._root.children.setdefault(str(len(tokens)), _Node())
+        for token in tokens[: self.depth]:
+            key = WILDCARD if any(char.isdigit() for char in token) else token
+            if key not in node.children and len(node.children) >= self.max_children:
+                key = WILDCARD
+            node = node.children.setdefault(key, _Node())
+        return node
+
+    def _best_match(self, clusters: List[LogTemplate], tokens: List[str]) -> Optional[LogTemplate]:
+        best: Optional[LogTemplate] = None
+        best_score = -1.0
+        for cluster in clusters:
+            matches = sum(
+                1 for existing, incoming in zip(cluster.tokens, tokens) if existing == incoming
+            )
+            score = matches / len(tokens) if tokens else 1.0
+            if score > best_score:
+                best, best_score = cluster, score
+        if best is not None and best_score >= self.similarity_threshold:
+            return best
+        return None
@@ -0,0 +1,218 @@
+"""Deterministic offline model backend for benchmarking the agent tree without Gemini.
+
+`ScriptedLlm` stands in for Gemini wherever `AgentSettings.model_name` starts
+with `offline`. It either replays a JSON script of tool calls and replies per
+agent or, when no script is supplied, follows a fixed policy: agents with data
+tools call each of them once (required string arguments such as a search
+`query` get the latest user prompt; tools needing other required arguments are
+skipped) and then summarize the tool responses, while the
+supervisor (or a specialist holding a prompt meant for a peer) transfers to the
+specialist chosen by keywords in the latest user prompt. A fixed
+synthetic latency (plus an optional per-output-token cost) is applied to every
+call so orchestration overhead can be measured with reproducible timing.
+
+Script format (`offline_script`)::
+
+    {
+      "it_ops_supervisor": [{"transfer": "log_analyst"}],
+      "log_analyst": [
+        {"tool_calls": [{"name": "fetch_server_logs", "args": {"compact": true}}]},
+        {"text": "Disk saturation is the leading risk."}
+      ]
+    }
+
+Each agent consumes its own steps in order and wraps around when exhausted.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+from typing import AsyncGenerator
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+from pydantic import Field
+from pydantic import PrivateAttr
+
+from .log_summary import estimate_tokens
+
+
+OFFLINE_MODEL_PREFIX = "offline"
+TRANSFER_TOOL_NAME = "transfer_to_agent"
+
+# Keyword routing used by the default supervisor policy, checked in order.
+_ROUTES: tuple[tuple[tuple[str, ...], str], ...] = (
+    (("log", "anomal", "error", "investigate"), "log_analyst"),
+    (("utilization", "cpu", "memory", "capacity", "metric"), "metric_analyst"),
+)
+_FALLBACK_ROUTE = "operations_planner"
+_SUMMARY_CHARS = 240
+
+
+def is_offline_model(model_name: str) -> bool:
+    """Return True when `model_name` selects the offline scripted backend."""
+    return model_name == OFFLINE_MODEL_PREFIX or model_name.startswith(f"{OFFLINE_MODEL_PREFIX}/")
+
+
+def load_script(path: Optional[Path]) -> Dict[str, List[Dict[str, Any]]]:
+    """Load a per-agent step script from JSON; `None` yields the default policy."""
+    if path is None:
+        return {}
+    with Path(path).open("r", encoding="utf-8") as handle:
+        script = json.load(handle)
+    if not isinstance(script, dict):
+        raise ValueError(f"Offline script {path} must map agent names to step lists.")
+    return script
+
+
+class ScriptedLlm(BaseLlm):
+    """Replay scripted tool calls and replies with configurable synthetic latency."""
+
+    model: str = OFFLINE_MODEL_PREFIX
+    agent_name: str = ""
+    transfer_targets: List[str] = Field(default_factory=list)
+    script: Dict[str, List[Dict[str, Any]]] = Field(default_factory=dict)
+    latency_ms: float = 0.0
+    latency_per_token_ms: float = 0.0
+
+    _cursor: int = PrivateAttr(default=0)
+
+    @classmethod
+    def supported_models(cls) -> list[str]:
+        return [rf"{OFFLINE_MODEL_PREFIX}(/.*)?"]
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        parts = self._next_parts(llm_request)
+        output_tokens = sum(estimate_tokens(part.text or "") for part in parts) + 8 * sum(
+            1 for part in parts if part.function_call
+        )
+        delay_ms = self.latency_ms + self.latency_per_token_ms * output_tokens
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+        prompt_tokens = sum(
+            estimate_tokens(str(part.to_json_dict()))
+            for content in llm_request.contents
+            for part in content.parts or []
+        )
+        yield LlmResponse(
+            content=types.Content(role="model", parts=parts),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=prompt_tokens,
+                candidates_token_count=output_tokens,
+                total_token_count=prompt_tokens + output_tokens,
+            ),
+            turn_complete=True,
+        )
+
+    def _next_parts(self, llm_request: LlmRequest) -> List[types.Part]:
+        steps = self.script.get(self.agent_name)
+        if steps:
+            step = steps[self._cursor % len(steps)]
+            self._cursor += 1
+            return self._parts_for_step(step)
+        return self._default_policy(llm_request)
+
+    def _parts_for_step(self, step: Dict[str, Any]) -> List[types.Part]:
+        if "transfer" in step:
+            return [
+                types.Part.from_function_call(
+                    name=TRANSFER_TOOL_NAME, args={"agent_name": step["transfer"]}
+                )
+            ]
+        if "tool_calls" in step:
+            return [
+                types.Part.from_function_call(name=call["name"], args=call.get("args", {}))
+                for call in step["tool_calls"]
+            ]
+        return [types.Part.from_text(text=str(step.get("text", "")))]
+
+    def _default_policy(self, llm_request: LlmRequest) -> List[types.Part]:
+        last = llm_request.contents[-1] if llm_request.contents else None
+        responses = [part.function_response for part in (last.parts or [])] if last else []
+        responses = [response for response in responses if response is not None]
+        if responses:
+            return [types.Part.from_text(text=self._summarize(responses))]
+
+        if TRANSFER_TOOL_NAME in llm_request.tools_dict and self.transfer_targets:
+            target = self._route(_latest_user_text(llm_request))
+            if target != self.agent_name:
+                return [
+                    types.Part.from_function_call(
+                        name=TRANSFER_TOOL_NAME, args={"agent_name": target}
+                    )
+                ]
+        prompt = _latest_user_text(llm_request)
+        calls = []
+        for name, tool in llm_request.tools_dict.items():
+            if name == TRANSFER_TOOL_NAME:
+                continue
+            args = _required_args(tool, prompt)
+            if args is not None:
+                calls.append(types.Part.from_function_call(name=name, args=args))
+        if calls:
+            return calls
+        return [types.Part.from_text(text=f"[{self.agent_name}] No tools available; nothing to report.")]
+
+    def _route(self, prompt: str) -> str:
+        lowered = prompt.lower()
+        for keywords, target in _ROUTES:
+            if target in self.transfer_targets and any(word in lowered for word in keywords):
+                return target
+        if _FALLBACK_ROUTE in self.transfer_targets:
+            return _FALLBACK_ROUTE
+        return self.transfer_targets[0]
+
+    def _summarize(self, responses: List[types.FunctionResponse]) -> str:
+        lines = [f"[{self.agent_name}] Offline summary of {len(responses)} tool result(s):"]
+        for response in responses:
+            payload = json.dumps(response.response, default=str, sort_keys=True)
+            if len(payload) > _SUMMARY_CHARS:
+                payload = payload[:_SUMMARY_CHARS] + "…"
+            lines.append(f"- {response.name}: {payload}")
+        return "\n".join(lines)
+
+
+# Placeholder values for required parameters, by JSON schema type.
+_REQUIRED_PLACEHOLDERS: Dict[str, Any] = {"integer": 1, "number": 1.0, "boolean": False, "array": []}
+
+
+def _required_args(tool: Any, prompt: str) -> Optional[Dict[str, Any]]:
+    """Return minimal valid arguments for `tool`'s required parameters, or None if they cannot be filled."""
+    declaration = tool._get_declaration()
+    if declaration is None:
+        return {}
+    schema = declaration.parameters_json_schema
+    if schema is None and declaration.parameters is not None:
+        schema = declaration.parameters.model_dump(mode="json", exclude_none=True)
+    schema = schema or {}
+    properties = schema.get("properties") or {}
+    args: Dict[str, Any] = {}
+    for name in schema.get("required") or []:
+        kind = str((properties.get(name) or {}).get("type", "")).lower()
+        if kind == "string" and prompt:
+            args[name] = prompt
+        elif kind in _REQUIRED_PLACEHOLDERS:
+            args[name] = _REQUIRED_PLACEHOLDERS[kind]
+        else:
+            return None
+    return args
+
+
+def _latest_user_text(llm_request: LlmRequest) -> str:
+    for content in reversed(llm_request.contents):
+        if content.role != "user":
+            continue
+        texts = [part.text for part in content.parts or [] if part.text]
+        # ADK replays other agents' turns as user content led by "For context:".
+        if texts and not texts[0].startswith("For context:"):
+            return "\n".join(texts)
+    return ""
@@ -0,0 +1,250 @@
+"""Opt-in, sampled cProfile and tracemalloc profiling for tools and dashboard builds.
+
+Spans from `tracing.py` say which tool call was slow; a profile says why:
+parquet decode, pandas filtering, or string joining. A `Profiler` profiles a
+random sample of calls, so it is safe to leave on under load:
+
+* each sampled call runs under `cProfile` and, with `memory=True`, under
+  `tracemalloc` (which slows the call noticeably, so it is a separate switch);
+* only one call is profiled at a time per process; calls that arrive while
+  another is being profiled run unprofiled and count as skipped;
+* every profile writes `<stem>.prof` (pstats format, for `python -m pstats` or
+  snakeviz) and `<stem>.txt` (the top functions by cumulative time and,
+  with memory tracing, the top allocation sites) to `directory`, keeping at
+  most `max_files` of each; if they cannot be written, the call still
+  returns normally and the failure is counted in `write_errors`.
+
+Enable it per process with environment variables, which `build_data_tools`
+and `build_dashboard_snapshot` read when no profiler is passed:
+
+    IT_OPS_PROFILE=0.05          # sample rate; 1/true/on profiles every call
+    IT_OPS_PROFILE_MEMORY=1      # also record allocations
+    IT_OPS_PROFILE_DIR=/tmp/prof # default: $IT_OPS_CACHE_DIR/profiles
+
+or pass one explicitly, e.g. `AgentSettings(profiler=Profiler(sample_rate=0.1))`.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import functools
+import io
+import os
+from pathlib import Path
+import random
+import re
+import threading
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from .cache_paths import cache_dir
+
+
+PROFILE_ENV_VAR = "IT_OPS_PROFILE"
+PROFILE_MEMORY_ENV_VAR = "IT_OPS_PROFILE_MEMORY"
+PROFILE_DIR_ENV_VAR = "IT_OPS_PROFILE_DIR"
+DEFAULT_TOP_N = 25
+DEFAULT_MAX_FILES = 200
+_MAX_RECORDS = 100
+_ARGS_CHARS = 240
+_TRUTHY = {"1", "true", "yes", "on"}
+
+
+@dataclass
+class ProfileRecord:
+    """One sampled call and the files its profile was written to."""
+
+    name: str
+    duration_ms: float
+    profile_path: Path
+    report_path: Path
+    peak_alloc_kb: Optional[float] = None
+
+
+def _sample_rate(value: str) -> float:
+    value = value.strip().lower()
+    if value in _TRUTHY:
+        return 1.0
+    try:
+        rate = float(value)
+    except ValueError:
+        return 0.0
+    return min(max(rate, 0.0), 1.0)
+
+
+class Profiler:
+    """Profiles a random `sample_rate` share of the calls routed through it."""
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        *,
+        sample_rate: float = 1.0,
+        memory: bool = False,
+        top_n: int = DEFAULT_TOP_N,
+        max_files: int = DEFAULT_MAX_FILES,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.directory = Path(directory) if directory is not None else cache_dir("profiles")
+        self.sample_rate = sample_rate
+        self.memory = memory
+        self.top_n = top_n
+        self.max_files = max_files
+        self.sampled = 0
+        self.skipped = 0
+        self.write_errors = 0
+        self.records: List[ProfileRecord] = []
+        self._random = random.Random(seed)
+        self._active = threading.Lock()
+        self._lock = threading.Lock()
+        self._sequence = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["Profiler"]:
+        """Return a profiler configured by `IT_OPS_PROFILE*`, or None when profiling is off."""
+        rate = _sample_rate(os.environ.get(PROFILE_ENV_VAR, ""))
+        if rate <= 0:
+            return None
+        return cls(
+            Path(os.environ.get(PROFILE_DIR_ENV_VAR) or cache_dir("profiles")),
+            sample_rate=rate,
+            memory=os.environ.get(PROFILE_MEMORY_ENV_VAR, "").strip().lower() in _TRUTHY,
+        )
+
+    def _should_sample(self) -> bool:
+        with self._lock:
+            return self.sample_rate >= 1.0 or self._random.random() < self.sample_rate
+
+    def call(self, name: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run `func(*args, **kwargs)`, profiling it when this call is sampled."""
+        if not self._should_sample():
+            return func(*args, **kwargs)
+        # cProfile and tracemalloc are process-wide hooks in practice; one profiled call at a time.
+        if not self._active.acquire(blocking=False):
+            with self._lock:
+                self.skipped += 1
+            return func(*args, **kwargs)
+        try:
+            return self._profiled(name, func, args, kwargs)
+        finally:
+            self._active.release()
+
+    def wrap(self, func: Callable[..., Any], name: Optional[str] = None) -> Callable[..., Any]:
+        """Return `func` routed through `call`; the signature is preserved for FunctionTool."""
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def _profiled(*args: Any, **kwargs: Any) -> Any:
+            return self.call(label, func, *args, **kwargs)
+
+        return _profiled
+
+    def _profiled(self, name: str, func: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        import cProfile
+        import tracemalloc
+
+        started_tracing = False
+        before = None
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        try:
+            return profile.runcall(func, *args, **kwargs)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            allocations = None
+            if before is not None:
+                after = tracemalloc.take_snapshot()
+                peak = tracemalloc.get_traced_memory()[1]
+                allocations = (after.compare_to(before, "lineno")[: self.top_n], peak)
+                if started_tracing:
+                    tracemalloc.stop()
+            try:
+                self._write(name, args, kwargs, profile, duration_ms, allocations)
+            except OSError:
+                # An unwritable profile directory must never fail the profiled call.
+                with self._lock:
+                    self.write_errors += 1
+
+    def _write(
+        self,
+        name: str,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+        profile: Any,
+        duration_ms: float,
+        allocations: Optional[Tuple[List[Any], int]],
+    ) -> None:
+        import pstats
+
+        with self._lock:
+            self._sequence += 1
+            self.sampled += 1
+            sequence = self._sequence
+        safe_name = re.sub(r"[^\w.-]+", "_", name)
+        stem = f"{time.strftime('%Y%m%dT%H%M%S')}-{safe_name}-{os.getpid()}-{sequence:05d}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profile_path = self.directory / f"{stem}.prof"
+        report_path = self.directory / f"{stem}.txt"
+        profile.dump_stats(profile_path)
+
+        arguments = ", ".join([*(repr(arg) for arg in args), *(f"{key}={value!r}" for key, value in kwargs.items())])
+        if len(arguments) > _ARGS_CHARS:
+            arguments = arguments[:_ARGS_CHARS] + "…"
+        stream = io.StringIO()
+        stream.write(f"{name}({arguments})\nduration_ms: {duration_ms:.2f}\n\n")
+        stats = pstats.Stats(profile, stream=stream)
+        stats.sort_stats("cumulative").print_stats(self.top_n)
+        peak_kb = None
+        if allocations is not None:
+            differences, peak = allocations
+            peak_kb = round(peak / 1024, 1)
+            stream.write(f"\nallocations: peak {peak_kb} KiB; top {len(differences)} sites by growth\n")
+            for difference in differences:
+                stream.write(f"  {difference}\n")
+        report_path.write_text(stream.getvalue(), encoding="utf-8")
+
+        record = ProfileRecord(
+            name=name,
+            duration_ms=round(duration_ms, 3),
+            profile_path=profile_path,
+            report_path=report_path,
+            peak_alloc_kb=peak_kb,
+        )
+        with self._lock:
+            self.records.append(record)
+            del self.records[:-_MAX_RECORDS]
+        self._prune()
+
+    def _prune(self) -> None:
+        """Delete the oldest profiles beyond `max_files` (stems sort by time)."""
+        profiles = sorted(self.directory.glob("*.prof"))
+        for path in profiles[: max(0, len(profiles) - self.max_files)]:
+            for stale in (path, path.with_suffix(".txt")):
+                try:
+                    stale.unlink()
+                except FileNotFoundError:
+                    pass
+
+
+_ENV_PROFILER: Optional[Tuple[Tuple[str, ...], Optional[Profiler]]] = None
+_ENV_LOCK = threading.Lock()
+
+
+def default_profiler() -> Optional[Profiler]:
+    """Return the process-wide profiler configured by the environment (None when off)."""
+    global _ENV_PROFILER
+    key = tuple(os.environ.get(name, "") for name in (PROFILE_ENV_VAR, PROFILE_MEMORY_ENV_VAR, PROFILE_DIR_ENV_VAR))
+    with _ENV_LOCK:
+        if _ENV_PROFILER is None or _ENV_PROFILER[0] != key:
+            _ENV_PROFILER = (key, Profiler.from_env())
+        return _ENV_PROFILER[1]
@@ -0,0 +1,370 @@
+"""Local telemetry query service shared by UI and agent worker processes.
+
+Without it, every Streamlit worker and runner process loads the datasets
+itself through `data_sources`, so N replicas hold N copies of the frames and
+start with N cold caches. `QueryService` serves the `fetch_logs`,
+`summarize_metrics`, and ticket reads of one `DataConfig` from a single
+process and its warm frame cache, over a small keep-alive HTTP/1.1 server
+on asyncio (TCP or a Unix socket):
+
+    GET /v1/logs?server_id=prod-app-01&window_minutes=240   text/plain
+    GET /v1/metrics?hours=24                                 Arrow IPC stream
+    GET /v1/ticket                                           text/plain
+    GET /v1/version                                          JSON
+    GET /healthz
+
+`QueryClient` keeps a pool of persistent connections, so a request costs one
+round trip rather than a TCP (or socket) handshake. Setting
+`DataConfig.service_url` makes the `data_sources` helpers, and through them
+the agent tools and dashboard, go through `client_for(url)`; when the service
+is unreachable they read the datasets in-process as before.
+
+Run `python -m it_ops_observability.query_service --port 8765` (or
+`--unix /tmp/it_ops.sock`) and set `service_url="http://127.0.0.1:8765"` (or
+`"unix:///tmp/it_ops.sock"`).
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+import http.client
+import json
+from pathlib import Path
+import socket
+import threading
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from urllib.parse import parse_qs
+from urllib.parse import urlencode
+from urllib.parse import urlsplit
+
+from .data_sources import DEFAULT_CONFIG
+from .data_sources import DataConfig
+from .data_sources import data_version
+from .data_sources import fetch_logs
+from .data_sources import fetch_recent_ticket
+from .data_sources import preload_datasets
+from .data_sources import summarize_metrics
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+DEFAULT_PORT = 8765
+DEFAULT_POOL_SIZE = 8
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class QueryServiceError(RuntimeError):
+    """The query service answered with a non-200 status."""
+
+
+def _frame_to_arrow(frame: Any) -> bytes:
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(frame)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _arrow_to_frame(body: bytes) -> Any:
+    import pyarrow as pa
+
+    with pa.ipc.open_stream(body) as reader:
+        return reader.read_pandas()
+
+
+# -- Server ------------------------------------------------------------------
+
+
+class QueryService:
+    """Asyncio HTTP server answering data-source queries from one process-wide cache."""
+
+    def __init__(
+        self,
+        config: DataConfig = DEFAULT_CONFIG,
+        *,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        unix_path: Optional[Path] = None,
+    ) -> None:
+        # The service reads the datasets itself; never forward to another service.
+        self.config = replace(config, service_url=None)
+        self.host = host
+        self.port = port
+        self.unix_path = Path(unix_path) if unix_path is not None else None
+        self.requests = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+
+    @property
+    def url(self) -> str:
+        if self.unix_path is not None:
+            return f"unix://{self.unix_path}"
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        await asyncio.to_thread(preload_datasets, self.config)
+        if self.unix_path is not None:
+            self.unix_path.unlink(missing_ok=True)
+            self._server = await asyncio.start_unix_server(self._handle, path=str(self.unix_path))
+        else:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port)
+            # Port 0 asks the OS for a free port; report the one it picked.
+            self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writers.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", "0") or 0)
+                if length:
+                    await reader.readexactly(length)
+                status, content_type, body = await self._dispatch(method, target)
+                close = headers.get("connection", "").lower() == "close"
+                head = (
+                    f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+                    f"Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+                    f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n"
+                )
+                writer.write(head.encode("latin-1") + body)
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _dispatch(self, method: str, target: str) -> Tuple[int, str, bytes]:
+        if method != "GET":
+            return 405, "application/json", b'{"error": "only GET is supported"}'
+        parts = urlsplit(target)
+        params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        self.requests += 1
+        try:
+            if parts.path == "/v1/logs":
+                if not params.get("server_id"):
+                    return 400, "application/json", b'{"error": "server_id is required"}'
+                text = await asyncio.to_thread(
+                    fetch_logs,
+                    params["server_id"],
+                    window_minutes=int(params.get("window_minutes", 240)),
+                    config=self.config,
+                )
+                return 200, "text/plain; charset=utf-8", text.encode("utf-8")
+            if parts.path == "/v1/metrics":
+                frame = await asyncio.to_thread(summarize_metrics, hours=int(params.get("hours", 24)), config=self.config)
+                return 200, ARROW_STREAM, await asyncio.to_thread(_frame_to_arrow, frame)
+            if parts.path == "/v1/ticket":
+                text = await asyncio.to_thread(fetch_recent_ticket, config=self.config)
+                return 200, "text/plain; charset=utf-8", text.encode("utf-8")
+            if parts.path == "/v1/version":
+                version = await asyncio.to_thread(data_version, self.config)
+                payload = {"data_version": version, "requests": self.requests}
+                return 200, "application/json", json.dumps(payload, default=str).encode("utf-8")
+            if parts.path == "/healthz":
+                return 200, "text/plain", b"ok"
+        except ValueError as exc:
+            return 400, "application/json", json.dumps({"error": str(exc)}).encode("utf-8")
+        except Exception as exc:
+            return 500, "application/json", json.dumps({"error": f"{type(exc).__name__}: {exc}"}).encode("utf-8")
+        return 404, "application/json", json.dumps({"error": f"unknown path {parts.path}"}).encode("utf-8")
+
+    # -- Background thread (Streamlit, tests) ----------------------------------
+
+    def start_in_thread(self) -> str:
+        """Serve from a daemon thread with its own event loop; returns the service URL."""
+        ready = threading.Event()
+        failure: List[BaseException] = []
+
+        def run() -> None:
+            loop = self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self.start())
+            except BaseException as exc:
+                failure.append(exc)
+                ready.set()
+                return
+            ready.set()
+            loop.run_forever()
+            self._server.close()
+            # Closing idle keep-alive connections lets their handlers see EOF and return.
+            for writer in list(self._writers):
+                writer.close()
+            loop.run_until_complete(asyncio.gather(*asyncio.all_tasks(loop), return_exceptions=True))
+            loop.run_until_complete(self._server.wait_closed())
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name="it-ops-query-service", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if failure:
+            raise failure[0]
+        return self.url
+
+    def stop(self) -> None:
+        if self._loop is not None and self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = self._thread = None
+
+
+# -- Client ------------------------------------------------------------------
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self._path = path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self._path)
+        self.sock = sock
+
+
+class QueryClient:
+    """Thread-safe client for a `QueryService`, reusing up to `pool_size` idle connections."""
+
+    def __init__(self, url: str, *, pool_size: int = DEFAULT_POOL_SIZE, timeout: float = 10.0) -> None:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "unix"):
+            raise ValueError(f"Unsupported query service URL {url!r}; use http://host:port or unix:///path")
+        self.url = url
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._parts = parts
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self._parts.scheme == "unix":
+            return _UnixHTTPConnection(self._parts.path, self.timeout)
+        return http.client.HTTPConnection(self._parts.hostname, self._parts.port or DEFAULT_PORT, timeout=self.timeout)
+
+    def _acquire(self) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._connect(), False
+
+    def _release(self, connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    def get(self, path: str, **params: Any) -> Tuple[str, bytes]:
+        """GET `path` and return `(content_type, body)`; raises `QueryServiceError` on errors."""
+        target = f"{path}?{urlencode(params)}" if params else path
+        connection, reused = self._acquire()
+        try:
+            try:
+                connection.request("GET", target)
+                response = connection.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                if not reused:
+                    raise
+                # The server closed an idle keep-alive connection; retry on a fresh one.
+                connection.close()
+                connection = self._connect()
+                connection.request("GET", target)
+                response = connection.getresponse()
+            body = response.read()
+        except BaseException:
+            connection.close()
+            raise
+        self._release(connection)
+        if response.status != 200:
+            raise QueryServiceError(f"{path} returned {response.status}: {body[:200].decode('utf-8', 'replace')}")
+        return response.getheader("Content-Type", ""), body
+
+    def fetch_logs(self, server_id: str, *, window_minutes: int = 240) -> str:
+        return self.get("/v1/logs", server_id=server_id, window_minutes=window_minutes)[1].decode("utf-8")
+
+    def summarize_metrics(self, *, hours: int = 24) -> Any:
+        return _arrow_to_frame(self.get("/v1/metrics", hours=hours)[1])
+
+    def fetch_recent_ticket(self) -> str:
+        return self.get("/v1/ticket")[1].decode("utf-8")
+
+    def version(self) -> Dict[str, Any]:
+        return json.loads(self.get("/v1/version")[1])
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+
+_CLIENTS: Dict[str, QueryClient] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def client_for(url: str) -> QueryClient:
+    """Return the process-wide pooled client for `url`."""
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(url)
+        if client is None:
+            client = _CLIENTS[url] = QueryClient(url)
+        return client
+
+
+def main() -> None:
+    """Serve telemetry queries: `python -m it_ops_observability.query_service --port 8765`."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", type=Path, default=None, help="Listen on this Unix socket instead of TCP.")
+    parser.add_argument("--store", type=Path, default=None, help="Serve an `ingest` store instead of the default datasets.")
+    args = parser.parse_args()
+    config = DEFAULT_CONFIG
+    if args.store is not None:
+        from .ingest import store_config
+
+        config = store_config(args.store)
+    service = QueryService(config, host=args.host, port=args.port, unix_path=args.unix)
+
+    async def serve() -> None:
+        await service.start()
+        print(f"Serving {service.url}", flush=True)
+        await service.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Exact-match, tool-state-aware disk cache for model responses.
+
+`CachedLlm` wraps the model used by each agent. A request's cache key covers
+the model name, system instruction, available tools, the full content history
+(including tool results, with ADK's random call IDs stripped) and a fingerprint
+of the configured datasets, so a repeated briefing over unchanged telemetry is
+answered from disk while any change in data or tool output misses the cache.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+import threading
+from typing import Any
+from typing import AsyncGenerator
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+from .cache_paths import cache_dir
+from .data_sources import DataConfig
+from .data_sources import data_version
+
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def data_fingerprint(config: Optional[DataConfig]) -> List[Any]:
+    """Describe the configured datasets by path and `data_version` stamp.
+
+    The stamp is the one the tool-result and snapshot caches key on, so every
+    cache invalidates on the same signal (including ingest-store flushes and
+    service-backed data).
+    """
+    if config is None:
+        return []
+    return [str(config), list(data_version(config))]
+
+
+def _strip_call_ids(value: Any) -> Any:
+    # Function calls/responses carry a per-run random `id` next to their `name`.
+    if isinstance(value, dict):
+        return {
+            key: _strip_call_ids(item)
+            for key, item in value.items()
+            if not (key == "id" and ("name" in value))
+        }
+    if isinstance(value, list):
+        return [_strip_call_ids(item) for item in value]
+    return value
+
+
+class ResponseCache:
+    """Size-bounded directory of JSON responses with least-recently-used eviction."""
+
+    def __init__(self, directory: Optional[Path] = None, *, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = Path(directory) if directory is not None else cache_dir("responses")
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def key_for(self, llm_request: LlmRequest, *, model: str, data_config: Optional[DataConfig]) -> str:
+        """Return the SHA-256 cache key for `llm_request`."""
+        config = llm_request.config
+        payload = {
+            "model": model,
+            "system_instruction": str(config.system_instruction) if config else None,
+            "tools": sorted(llm_request.tools_dict),
+            "contents": _strip_call_ids(
+                [content.model_dump(mode="json", exclude_none=True) for content in llm_request.contents]
+            ),
+            "data": data_fingerprint(data_config),
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self.directory / f"{key}.json"
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)  # refresh recency for LRU eviction
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return payload
+
+    def put(self, key: str, payload: Dict[str, Any]) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+        # Write-then-rename keeps concurrent readers from seeing partial files.
+        handle, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(handle, "wb") as tmp:
+            tmp.write(data)
+        os.replace(tmp_name, self.directory / f"{key}.json")
+        self._evict()
+
+    def size_bytes(self) -> int:
+        return sum(path.stat().st_size for path in self.directory.glob("*.json"))
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = []
+            for path in self.directory.glob("*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
+
+
+class CachedLlm(BaseLlm):
+    """Serve repeated model requests from a `ResponseCache`, delegating misses to `inner`."""
+
+    inner: BaseLlm
+    cache: ResponseCache
+    data_config: Optional[DataConfig] = None
+
+    @property
+    def capabilities(self):  # type: ignore[override]
+        return self.inner.capabilities
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        key = self.cache.key_for(llm_request, model=self.inner.model, data_config=self.data_config)
+        cached = self.cache.get(key)
+        if cached is not None:
+            response = LlmResponse.model_validate(cached)
+            response.custom_metadata = {**(response.custom_metadata or {}), "response_cache": "hit"}
+            yield response
+            return
+
+        async for response in self.inner.generate_content_async(llm_request, stream=stream):
+            # Store before yielding: ADK may close this generator right after a
+            # function-call response (e.g. an agent transfer) without resuming it.
+            if not response.partial and response.content is not None and not response.error_code:
+                self.cache.put(key, response.model_dump(mode="json", exclude_none=True))
+            yield response
@@ -0,0 +1,270 @@
+"""Cross-process cache for dashboard snapshots and tool results.
+
+`st.cache_data` and in-process memoization are per process, so every Cloud
+Run instance and Streamlit worker recomputes the same snapshot and tool
+outputs. `SharedCache` keeps them in one SQLite file (WAL mode, so readers
+never block the writer) that every process on the host opens:
+
+* writes are single transactions, so readers see an entry completely or not
+  at all;
+* every entry carries an expiry; expired entries miss and are deleted;
+* the total payload size is capped, evicting the least recently read
+  entries first.
+
+Values are plain containers (dict, list, str, numbers, None, bytes) plus
+`LogBatch`, which is stored as its raw column buffers and dictionaries
+(`LogBatch.to_buffers`) rather than as row dicts, so a hit rebuilds the log
+table with a few `memcpy`s instead of re-parsing text. The payload codec is
+msgpack when it is installed and the standard-library `marshal` otherwise;
+values either codec cannot represent are simply not cached.
+
+`build_dashboard_snapshot(..., cache=...)` caches snapshots, and
+`build_data_tools(..., result_cache=...)` (or `AgentSettings.tool_cache`)
+caches tool results, both keyed by the arguments, the `DataConfig`, and
+`data_sources.data_version` so new data is never served from a stale key.
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import marshal
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+from .cache_paths import cache_dir
+from .log_records import LogBatch
+
+try:  # optional: faster and more compact than marshal for large payloads
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+CACHE_FILE_NAME = "shared_cache.sqlite3"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_TTL_S = 300.0
+_LOG_BATCH_EXT = 1
+_LOG_BATCH_TAG = "__it_ops_log_batch__"
+# Reads refresh `accessed_at` at most this often, so hot keys do not turn every hit into a write.
+_TOUCH_INTERVAL_S = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at);
+"""
+
+
+# -- Codec -------------------------------------------------------------------
+
+
+def _pack_batch(batch: LogBatch) -> bytes:
+    return marshal.dumps(batch.to_buffers())
+
+
+def _tag_batches(value: Any) -> Any:
+    """Replace `LogBatch` values with tagged buffers for codecs without extension types."""
+    if isinstance(value, LogBatch):
+        return {_LOG_BATCH_TAG: list(value.to_buffers())}
+    if isinstance(value, dict):
+        return {key: _tag_batches(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_tag_batches(item) for item in value]
+    return value
+
+
+def _untag_batches(value: Any) -> Any:
+    if isinstance(value, dict):
+        if len(value) == 1 and _LOG_BATCH_TAG in value:
+            return LogBatch.from_buffers(value[_LOG_BATCH_TAG])
+        return {key: _untag_batches(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_untag_batches(item) for item in value]
+    return value
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, LogBatch):
+        return msgpack.ExtType(_LOG_BATCH_EXT, _pack_batch(value))
+    raise TypeError(f"Cannot cache {type(value).__name__}")
+
+
+def _msgpack_ext(code: int, data: bytes) -> Any:
+    if code == _LOG_BATCH_EXT:
+        return LogBatch.from_buffers(marshal.loads(data))
+    return msgpack.ExtType(code, data)
+
+
+def encode_value(value: Any) -> Tuple[str, bytes]:
+    """Serialize `value`; returns `(codec, payload)` or raises TypeError/ValueError."""
+    if msgpack is not None:
+        return "msgpack", msgpack.packb(value, default=_msgpack_default, use_bin_type=True)
+    # marshal's format is tied to the interpreter, so the codec name records the version.
+    return f"marshal-{marshal.version}", marshal.dumps(_tag_batches(value))
+
+
+def decode_value(codec: str, payload: bytes) -> Any:
+    if codec == "msgpack":
+        if msgpack is None:
+            raise ValueError("msgpack is not installed")
+        return msgpack.unpackb(payload, ext_hook=_msgpack_ext, raw=False, strict_map_key=False)
+    if codec == f"marshal-{marshal.version}":
+        return _untag_batches(marshal.loads(payload))
+    raise ValueError(f"Unknown cache codec {codec!r}")
+
+
+def cache_key(namespace: str, *parts: Any) -> str:
+    """Return a stable key for `parts` (JSON-rendered, non-JSON values via `str`)."""
+    digest = hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+# -- Store -------------------------------------------------------------------
+
+
+class SharedCache:
+    """SQLite-backed key-value cache shared by every process that opens `path`."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        default_ttl_s: float = DEFAULT_TTL_S,
+    ) -> None:
+        self.path = Path(path) if path is not None else cache_dir(CACHE_FILE_NAME)
+        self.max_bytes = max_bytes
+        self.default_ttl_s = default_ttl_s
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections are per thread; each thread opens its own.
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _count(self, hit: bool) -> None:
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for `key`, or None when absent, expired, or unreadable."""
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT codec, value, expires_at, accessed_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        now = time.time()
+        if row is None or row[2] <= now:
+            if row is not None:
+                connection.execute("DELETE FROM entries WHERE key = ? AND expires_at <= ?", (key, now))
+            self._count(False)
+            return None
+        try:
+            value = decode_value(row[0], row[1])
+        except (ValueError, TypeError, EOFError):
+            self._count(False)
+            return None
+        if now - row[3] >= _TOUCH_INTERVAL_S:
+            connection.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        self._count(True)
+        return value
+
+    def put(self, key: str, value: Any, *, ttl_s: Optional[float] = None) -> bool:
+        """Store `value` under `key`; returns False when it cannot be encoded or is too large."""
+        try:
+            codec, payload = encode_value(value)
+        except (TypeError, ValueError):
+            return False
+        if len(payload) > self.max_bytes:
+            return False
+        now = time.time()
+        expires_at = now + (self.default_ttl_s if ttl_s is None else ttl_s)
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (key, codec, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, codec, payload, len(payload), expires_at, now),
+            )
+            self._evict(connection, now)
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+        return True
+
+    def _evict(self, connection: sqlite3.Connection, now: float) -> None:
+        connection.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+        (total,) = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if total <= self.max_bytes:
+            return
+        for key, size in connection.execute("SELECT key, size FROM entries ORDER BY accessed_at").fetchall():
+            connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def delete(self, key: str) -> None:
+        self._connection().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], *, ttl_s: Optional[float] = None) -> Any:
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value, ttl_s=ttl_s)
+        return value
+
+    def wrap_tool(
+        self,
+        func: Callable[..., Any],
+        *,
+        context: Optional[Callable[[], Any]] = None,
+        ttl_s: Optional[float] = None,
+    ) -> Callable[..., Any]:
+        """Return `func` with results cached by name, arguments, and `context()`; the signature is preserved."""
+
+        @functools.wraps(func)
+        def _cached(*args: Any, **kwargs: Any) -> Any:
+            key = cache_key(f"tool:{func.__name__}", list(args), kwargs, context() if context else None)
+            return self.get_or_compute(key, lambda: func(*args, **kwargs), ttl_s=ttl_s)
+
+        return _cached
+
+    def size_bytes(self) -> int:
+        (total,) = self._connection().execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return int(total)
+
+    def __len__(self) -> int:
+        return int(self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0])
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self), "size_bytes": self.size_bytes(), "hits": self.hits, "misses": self.misses}
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM entries")
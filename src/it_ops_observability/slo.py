@@ -0,0 +1,283 @@
+"""Service level objectives with incrementally maintained multi-window burn rates.
+
+An `SLODefinition` declares which events are "bad": log lines at an error
+severity, or metric samples above a threshold. Each SLO owns a
+`BurnRateTracker`, a ring buffer of per-minute `(total, bad)` counts sized for
+the longest window plus running sums for every window in `WINDOWS`. New
+events are added with `np.bincount`; advancing time subtracts only the
+minutes that slid out of each window, so reading burn rates never rescans
+history.
+
+The burn rate of a window is its bad-event ratio divided by the error budget
+`1 - objective`: 1.0 spends the budget exactly over the SLO period, 14.4
+spends a 30-day budget in about two days. `SLOEngine` re-evaluates the
+multi-window alert policies in `ALERT_POLICIES` whenever events arrive, so
+`status` is a lookup of precomputed results.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from dataclasses import fields
+import json
+from pathlib import Path
+import threading
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+
+
+# Window name -> length in minutes.
+WINDOWS: Dict[str, int] = {"5m": 5, "1h": 60, "6h": 360, "3d": 3 * 24 * 60}
+# (long window, short window, burn-rate threshold, alert severity): both windows
+# must burn faster than the threshold, so alerts fire fast and reset fast.
+ALERT_POLICIES: Tuple[Tuple[str, str, float, str], ...] = (
+    ("1h", "5m", 14.4, "page"),
+    ("6h", "1h", 6.0, "page"),
+    ("3d", "6h", 1.0, "ticket"),
+)
+SLO_SOURCES = ("logs", "metrics")
+_MINUTE_NS = 60 * 1_000_000_000
+
+
+@dataclass(frozen=True)
+class SLODefinition:
+    """Declarative SLO: at least `objective` of a source's events must be good."""
+
+    name: str
+    source: str
+    objective: float = 0.99
+    # Log SLOs: lines at these severities are bad.
+    bad_severities: Tuple[str, ...] = ("CRITICAL", "ERROR")
+    # Metric SLOs: samples of `metric` above `threshold` are bad.
+    metric: Optional[str] = None
+    threshold: Optional[float] = None
+    server_id: Optional[str] = None
+    description: str = ""
+
+    def __post_init__(self) -> None:
+        if self.source not in SLO_SOURCES:
+            raise ValueError(f"SLO {self.name!r}: unknown source {self.source!r}; choose from {', '.join(SLO_SOURCES)}")
+        if not 0 < self.objective < 1:
+            raise ValueError(f"SLO {self.name!r}: objective must be between 0 and 1")
+        if self.source == "metrics" and (self.metric is None or self.threshold is None):
+            raise ValueError(f"SLO {self.name!r}: metric SLOs need `metric` and `threshold`")
+
+    @classmethod
+    def from_dict(cls, raw: Mapping[str, Any]) -> "SLODefinition":
+        known = {item.name for item in fields(cls)}
+        unknown = set(raw) - known
+        if unknown:
+            raise ValueError(f"Unknown SLO fields: {', '.join(sorted(unknown))}")
+        values = dict(raw)
+        if "bad_severities" in values:
+            values["bad_severities"] = tuple(str(level).upper() for level in values["bad_severities"])
+        return cls(**values)
+
+
+DEFAULT_SLOS: Tuple[SLODefinition, ...] = (
+    SLODefinition(
+        "log-error-ratio",
+        "logs",
+        objective=0.9,
+        description="At most 10% of log lines across the fleet are ERROR or CRITICAL.",
+    ),
+    SLODefinition(
+        "cpu-saturation",
+        "metrics",
+        objective=0.95,
+        metric="cpu_pct",
+        threshold=90.0,
+        description="CPU stays at or below 90% in 95% of samples.",
+    ),
+    SLODefinition(
+        "memory-saturation",
+        "metrics",
+        objective=0.95,
+        metric="memory_pct",
+        threshold=90.0,
+        description="Memory stays at or below 90% in 95% of samples.",
+    ),
+)
+
+
+def load_slo_definitions(path: Path) -> List[SLODefinition]:
+    """Read SLO definitions from a JSON list (or `{"slos": [...]}`) of objects."""
+    raw = json.loads(Path(path).read_text(encoding="utf-8"))
+    if isinstance(raw, dict):
+        raw = raw.get("slos", [])
+    return [SLODefinition.from_dict(item) for item in raw]
+
+
+class BurnRateTracker:
+    """Per-minute event counts in a ring buffer with running sums per window."""
+
+    def __init__(self, objective: float, windows: Mapping[str, int] = WINDOWS) -> None:
+        self.objective = objective
+        self.names = list(windows)
+        self.spans = np.array([windows[name] for name in self.names], dtype=np.int64)
+        self.capacity = int(self.spans.max())
+        self._total = np.zeros(self.capacity, dtype=np.int64)
+        self._bad = np.zeros(self.capacity, dtype=np.int64)
+        self._sums = np.zeros((len(self.names), 2), dtype=np.int64)  # (total, bad) per window
+        self.head: Optional[int] = None  # newest minute, counted from the epoch
+
+    def observe(self, timestamps: Any, bad: Any) -> None:
+        minutes = np.asarray(timestamps, dtype="datetime64[ns]").astype(np.int64) // _MINUTE_NS
+        bad = np.asarray(bad, dtype=bool)
+        if minutes.size == 0:
+            return
+        newest = int(minutes.max())
+        if self.head is None:
+            self.head = newest
+        elif newest > self.head:
+            self._advance(newest)
+        keep = minutes > self.head - self.capacity  # older events fell out of every window
+        minutes, bad = minutes[keep], bad[keep]
+        slots = minutes % self.capacity
+        self._total += np.bincount(slots, minlength=self.capacity)
+        self._bad += np.bincount(slots[bad], minlength=self.capacity)
+        in_window = (self.head - minutes)[np.newaxis, :] < self.spans[:, np.newaxis]
+        self._sums[:, 0] += in_window.sum(axis=1)
+        self._sums[:, 1] += (in_window & bad).sum(axis=1)
+
+    def _advance(self, new_head: int) -> None:
+        head = self.head
+        for row, span in enumerate(self.spans):
+            # Minutes (head - span, new_head - span] leave this window.
+            start, stop = head - span + 1, min(new_head - span, head) + 1
+            if stop > start:
+                slots = np.arange(start, stop) % self.capacity
+                self._sums[row] -= (self._total[slots].sum(), self._bad[slots].sum())
+        if new_head - head >= self.capacity:
+            self._total[:] = 0
+            self._bad[:] = 0
+        else:
+            slots = np.arange(head + 1, new_head + 1) % self.capacity
+            self._total[slots] = 0
+            self._bad[slots] = 0
+        self.head = new_head
+
+    def counts(self) -> Dict[str, Tuple[int, int]]:
+        return {name: (int(total), int(bad)) for name, (total, bad) in zip(self.names, self._sums)}
+
+    def burn_rates(self) -> Dict[str, Optional[float]]:
+        """Bad-event ratio over the error budget per window; None for windows without events."""
+        budget = 1.0 - self.objective
+        return {
+            name: (bad / total / budget if total else None)
+            for name, (total, bad) in zip(self.names, self._sums.tolist())
+        }
+
+
+class SLOEngine:
+    """Track several SLOs from log and metric events and keep their alert state current."""
+
+    def __init__(
+        self,
+        definitions: Sequence[SLODefinition] = DEFAULT_SLOS,
+        *,
+        windows: Mapping[str, int] = WINDOWS,
+        policies: Sequence[Tuple[str, str, float, str]] = ALERT_POLICIES,
+    ) -> None:
+        self.definitions = {definition.name: definition for definition in definitions}
+        self.policies = [policy for policy in policies if policy[0] in windows and policy[1] in windows]
+        self._trackers = {name: BurnRateTracker(d.objective, windows) for name, d in self.definitions.items()}
+        self._windows = dict(windows)
+        self._status: Dict[str, Dict[str, Any]] = {name: self._evaluate(name) for name in self.definitions}
+        self._lock = threading.Lock()
+
+    def _valid(self, timestamps: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """Return event times and a mask of events with a usable timestamp."""
+        stamps = np.asarray(timestamps, dtype="datetime64[ns]")
+        return stamps, ~np.isnat(stamps)
+
+    def reset(self, source: str) -> None:
+        """Forget every event counted from `source`, e.g. before rescanning a rewritten dataset."""
+        with self._lock:
+            for name, definition in self.definitions.items():
+                if definition.source == source:
+                    self._trackers[name] = BurnRateTracker(definition.objective, self._windows)
+                    self._status[name] = self._evaluate(name)
+
+    def _matches_server(self, definition: SLODefinition, servers: Optional[Any], size: int) -> np.ndarray:
+        if definition.server_id is None or servers is None:
+            return np.ones(size, dtype=bool)
+        return np.asarray(servers).astype(str) == definition.server_id
+
+    def ingest_logs(self, timestamps: Any, severities: Any, servers: Optional[Any] = None) -> int:
+        """Count log lines (in any order); return how many had a timestamp.
+
+        Events are counted every time they are passed in, so callers feed each
+        line once (`tools` tracks the dataset rows it has consumed).
+        """
+        with self._lock:
+            stamps, fresh = self._valid(timestamps)
+            levels = np.char.upper(np.asarray(severities).astype(str))
+            for name, definition in self.definitions.items():
+                if definition.source != "logs":
+                    continue
+                mask = fresh & self._matches_server(definition, servers, stamps.size)
+                bad = np.isin(levels[mask], definition.bad_severities)
+                self._trackers[name].observe(stamps[mask], bad)
+                self._status[name] = self._evaluate(name)
+            return int(fresh.sum())
+
+    def ingest_metrics(self, timestamps: Any, columns: Mapping[str, Any], servers: Optional[Any] = None) -> int:
+        """Count metric samples (in any order, fed once each); return how many had a timestamp."""
+        with self._lock:
+            stamps, fresh = self._valid(timestamps)
+            for name, definition in self.definitions.items():
+                if definition.source != "metrics" or definition.metric not in columns:
+                    continue
+                values = np.asarray(columns[definition.metric], dtype=np.float64)
+                mask = fresh & ~np.isnan(values) & self._matches_server(definition, servers, stamps.size)
+                self._trackers[name].observe(stamps[mask], values[mask] > definition.threshold)
+                self._status[name] = self._evaluate(name)
+            return int(fresh.sum())
+
+    def _evaluate(self, name: str) -> Dict[str, Any]:
+        definition = self.definitions[name]
+        tracker = self._trackers[name]
+        rates = tracker.burn_rates()
+        alerts = []
+        for long_window, short_window, threshold, severity in self.policies:
+            long_rate, short_rate = rates[long_window], rates[short_window]
+            if long_rate is not None and short_rate is not None and min(long_rate, short_rate) >= threshold:
+                alerts.append(
+                    {
+                        "severity": severity,
+                        "windows": [long_window, short_window],
+                        "threshold": threshold,
+                        "burn_rates": [round(long_rate, 2), round(short_rate, 2)],
+                    }
+                )
+        longest = tracker.names[int(tracker.spans.argmax())]
+        return {
+            "name": name,
+            "source": definition.source,
+            "objective": definition.objective,
+            "description": definition.description,
+            "burn_rates": {window: (round(rate, 3) if rate is not None else None) for window, rate in rates.items()},
+            "events": {window: {"total": total, "bad": bad} for window, (total, bad) in tracker.counts().items()},
+            "budget_remaining_pct": (
+                round((1.0 - rates[longest]) * 100, 1) if rates[longest] is not None else None
+            ),
+            "budget_window": longest,
+            "alerts": alerts,
+            "burning": bool(alerts),
+            "as_of": (
+                str(np.datetime64(tracker.head, "m")) if tracker.head is not None else None
+            ),
+        }
+
+    def status(self, name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return precomputed burn rates and alerts for one SLO or all of them."""
+        if name is not None:
+            return [self._status[name]]
+        return list(self._status.values())
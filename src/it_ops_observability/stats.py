@@ -0,0 +1,15 @@
+"""Dependency-free summary statistics shared by the evaluation and benchmark harnesses."""
+from __future__ import annotations
+
+import math
+from typing import Optional
+from typing import Sequence
+
+
+def percentile(values: Sequence[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile (`pct` in 0-100); `None` for empty input."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
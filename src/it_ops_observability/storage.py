@@ -0,0 +1,195 @@
+"""Sorted, dictionary-encoded parquet layout for processed logs.
+
+`write_sorted_logs` rewrites a `server_id`/`message` log table so readers can
+rely on its layout:
+
+* rows sorted by `(server_id, timestamp)`, recorded as parquet sorting
+  columns and in the `it_ops.layout` key-value metadata;
+* `server_id`, `severity`, and the masked message `template` dictionary
+  encoded (a handful of distinct values each), raw `message` text zstd
+  compressed;
+* row groups sized so each server spans several of them, with min/max
+  statistics, a page index, and a bloom filter on `server_id`.
+
+`read_server_tail` uses that layout: it selects the row groups whose
+`server_id` statistics cover the requested server and reads them newest
+first, stopping once it has enough lines. `fetch_logs` takes this path for
+sorted files, so a recent-window request touches one or two row groups
+instead of the whole file.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+import threading
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+LAYOUT_KEY = b"it_ops.layout"
+SORTED_LAYOUT = b"sorted:server_id,timestamp/v1"
+DICTIONARY_COLUMNS = ("server_id", "severity", "template")
+MIN_ROW_GROUP_ROWS = 8_192
+MAX_ROW_GROUP_ROWS = 131_072
+
+
+def choose_row_group_rows(n_rows: int, n_servers: int) -> int:
+    """Aim for about eight row groups per server so tail reads stay small."""
+    per_server = n_rows / max(n_servers, 1)
+    return int(min(max(per_server / 8, MIN_ROW_GROUP_ROWS), MAX_ROW_GROUP_ROWS))
+
+
+def _log_columns(frame: Any) -> Any:
+    """Add `timestamp`, `severity`, and `template` columns derived from the raw lines."""
+    import pandas as pd
+
+    from .log_summary import to_template
+
+    parts = frame["message"].astype(str).str.split(" ", n=2, expand=True).reindex(columns=range(3))
+    columns = {"server_id": frame["server_id"].astype(str), "message": frame["message"].astype(str)}
+    if "timestamp" in frame.columns:
+        columns["timestamp"] = pd.to_datetime(frame["timestamp"], utc=True, errors="coerce")
+    else:
+        columns["timestamp"] = pd.to_datetime(parts[0], utc=True, errors="coerce", format="ISO8601")
+    columns["severity"] = parts[1].fillna("").str.strip("[]").str.upper()
+    body = parts[2].fillna("").str.split(": ", n=1).str[-1]
+    # Template the distinct bodies only; logs repeat a small set of texts.
+    codes, uniques = pd.factorize(body)
+    templates = pd.Index([to_template(text) for text in uniques], dtype=object)
+    columns["template"] = templates.take(codes).to_numpy()
+    return pd.DataFrame({name: pd.Series(values).to_numpy() for name, values in columns.items()})
+
+
+def write_sorted_logs(
+    frame: Any,
+    path: Path,
+    *,
+    row_group_rows: Optional[int] = None,
+    compression: str = "zstd",
+) -> Path:
+    """Write logs (`server_id`, `message`, optional `timestamp`) in the sorted layout."""
+    table_frame = _log_columns(frame).sort_values(["server_id", "timestamp"], kind="stable", na_position="first")
+    n_servers = int(table_frame["server_id"].nunique())
+    rows = row_group_rows or choose_row_group_rows(len(table_frame), n_servers)
+    table = pa.Table.from_pandas(table_frame, preserve_index=False)
+    schema = table.schema.with_metadata({**(table.schema.metadata or {}), LAYOUT_KEY: SORTED_LAYOUT})
+    table = table.replace_schema_metadata(schema.metadata)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    pq.write_table(
+        table,
+        tmp,
+        row_group_size=rows,
+        compression=compression,
+        use_dictionary=list(DICTIONARY_COLUMNS),
+        write_statistics=True,
+        write_page_index=True,
+        sorting_columns=[
+            pq.SortingColumn(table.schema.get_field_index("server_id")),
+            pq.SortingColumn(table.schema.get_field_index("timestamp"), nulls_first=True),
+        ],
+        bloom_filter_options={"server_id": {"ndv": max(n_servers, 1), "fpp": 0.01}},
+    )
+    tmp.replace(path)
+    return path
+
+
+@dataclass(frozen=True)
+class LogFileLayout:
+    """Footer facts needed to plan a read: sort order and per-row-group server ranges."""
+
+    sorted_by_server: bool
+    server_ranges: Tuple[Tuple[Optional[str], Optional[str], int], ...]
+    metadata: Any
+
+
+_LAYOUTS: Dict[Path, Tuple[Tuple[int, int], LogFileLayout]] = {}
+_LAYOUT_LOCK = threading.Lock()
+
+
+def _stat_range(stats: Any) -> Tuple[Optional[str], Optional[str]]:
+    if stats is None or not stats.has_min_max:
+        return None, None
+    return _as_text(stats.min), _as_text(stats.max)
+
+
+def _as_text(value: Any) -> Any:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def log_layout(path: Path) -> LogFileLayout:
+    """Return the layout of the parquet file at `path`, cached until the file changes."""
+    path = Path(path)
+    stat = path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _LAYOUT_LOCK:
+        cached = _LAYOUTS.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    metadata = pq.read_metadata(path)
+    key_values = metadata.metadata or {}
+    names = metadata.schema.names
+    ranges: List[Tuple[Optional[str], Optional[str], int]] = []
+    if "server_id" in names:
+        column = names.index("server_id")
+        for index in range(metadata.num_row_groups):
+            group = metadata.row_group(index)
+            ranges.append((*_stat_range(group.column(column).statistics), group.num_rows))
+    layout = LogFileLayout(key_values.get(LAYOUT_KEY) == SORTED_LAYOUT, tuple(ranges), metadata)
+    with _LAYOUT_LOCK:
+        _LAYOUTS[path] = (stamp, layout)
+    return layout
+
+
+def clear_layout_cache() -> None:
+    with _LAYOUT_LOCK:
+        _LAYOUTS.clear()
+
+
+def read_server_tail(path: Path, server_id: str, limit: int) -> List[str]:
+    """Return the last `limit` lines of `server_id` from a sorted log file, oldest first."""
+    layout = log_layout(path)
+    if not layout.sorted_by_server:
+        raise ValueError(f"{path} is not in the sorted log layout")
+    candidates = [
+        index
+        for index, (low, high, _) in enumerate(layout.server_ranges)
+        if low is None or high is None or low <= server_id <= high
+    ]
+    handle = pq.ParquetFile(path, metadata=layout.metadata)
+    chunks: List[List[str]] = []
+    collected = 0
+    for index in reversed(candidates):
+        if collected >= limit:
+            break
+        table = handle.read_row_group(index, columns=["server_id", "message"])
+        messages = table["message"].filter(pc.equal(table["server_id"], server_id)).to_pylist()
+        chunks.append(messages)
+        collected += len(messages)
+    lines = [line for chunk in reversed(chunks) for line in chunk]
+    return lines[-limit:] if limit > 0 else []
+
+
+def main() -> None:
+    """Rewrite an existing logs parquet into the sorted layout: `python -m it_ops_observability.storage SRC DST`."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("source", type=Path)
+    parser.add_argument("destination", type=Path)
+    parser.add_argument("--row-group-rows", type=int, default=None)
+    args = parser.parse_args()
+    written = write_sorted_logs(pq.read_table(args.source).to_pandas(), args.destination, row_group_rows=args.row_group_rows)
+    metadata = pq.read_metadata(written)
+    print(f"{written}: {metadata.num_rows} rows in {metadata.num_row_groups} row groups, {written.stat().st_size / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Incremental event streaming from the supervisor runner for live transcripts."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+from typing import Any
+from typing import AsyncIterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from google.adk.runners import Runner
+from google.genai import types
+
+
+_PREVIEW_CHARS = 400
+
+
+@dataclass
+class StreamItem:
+    """One renderable piece of a runner event: agent text, a tool call, or a tool result."""
+
+    prompt_index: int
+    author: str
+    kind: str
+    text: str
+
+
+def _preview(value: Any) -> str:
+    rendered = value if isinstance(value, str) else json.dumps(value, default=str)
+    if len(rendered) > _PREVIEW_CHARS:
+        return rendered[:_PREVIEW_CHARS] + "…"
+    return rendered
+
+
+def describe_event(event: Any, prompt_index: int = 0) -> List[StreamItem]:
+    """Split a runner event into stream items (partial streaming chunks are skipped)."""
+    if getattr(event, "partial", False):
+        return []
+    content = getattr(event, "content", None)
+    parts = getattr(content, "parts", None) if content else None
+    if not parts:
+        return []
+    author = str(getattr(event, "author", None) or "agent")
+    items: List[StreamItem] = []
+    texts = [part.text for part in parts if getattr(part, "text", None)]
+    if texts and "".join(texts).strip():
+        items.append(StreamItem(prompt_index, author, "text", "\n\n".join(texts)))
+    for part in parts:
+        call = getattr(part, "function_call", None)
+        if call is not None:
+            items.append(StreamItem(prompt_index, author, "tool_call", f"{call.name}({_preview(call.args or {})})"))
+        response = getattr(part, "function_response", None)
+        if response is not None:
+            items.append(StreamItem(prompt_index, author, "tool_result", f"{response.name} → {_preview(response.response)}"))
+    return items
+
+
+async def stream_supervisor_items(
+    runner: Runner,
+    prompts: Sequence[str],
+    *,
+    user_id: str = "streamlit_user",
+    session_id: Optional[str] = None,
+) -> AsyncIterator[StreamItem]:
+    """Send `prompts` through one session and yield items as each event arrives.
+
+    Unlike `runner.run_debug`, which returns only after every prompt finishes,
+    this yields the first agent turn as soon as the first model hop completes.
+    """
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id=user_id, session_id=session_id
+    )
+    for index, prompt in enumerate(prompts):
+        message = types.Content(role="user", parts=[types.Part.from_text(text=prompt)])
+        async for event in runner.run_async(user_id=user_id, session_id=session.id, new_message=message):
+            for item in describe_event(event, index):
+                yield item
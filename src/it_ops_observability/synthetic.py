@@ -4,9 +4,10 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import random
-from typing import Iterable, Literal
+from typing import TYPE_CHECKING, Iterable, Literal
 
-import pandas as pd
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 @dataclass(frozen=True)
@@ -81,6 +82,8 @@ def generate_mock_metrics(
     seed: int | None = SyntheticConfig.seed,
 ) -> pd.DataFrame:
     """Return hourly CPU/memory stats with spikes to trigger SLA alerts."""
+    import pandas as pd
+
     _seed_if_needed(seed)
     now = datetime.utcnow()
     timestamps: Iterable[datetime] = (now - timedelta(hours=h) for h in range(hours))
@@ -96,6 +99,57 @@ def generate_mock_metrics(
     return df
 
 
+_TICKET_SYMPTOMS: tuple[str, ...] = (
+    "API latency above SLO for checkout requests",
+    "Database connection pool exhausted on primary",
+    "Disk usage above 95% on log volume",
+    "Service mesh circuit breaker opened for payments",
+    "Cache cluster evictions spiking after deploy",
+    "VPN tunnel flapping between regions",
+    "Certificate expiry warning on edge load balancer",
+    "Replica lag growing on reporting database",
+    "Kubernetes node pressure evicting pods",
+    "Batch job missed its completion window",
+)
+_TICKET_ACTIONS: tuple[str, ...] = (
+    "Rolled back the latest deployment.",
+    "Scaled out the affected node pool.",
+    "Failed over to the standby instance.",
+    "Rotated credentials and restarted the service.",
+    "Purged old log archives to free disk space.",
+    "Raised connection limits and recycled workers.",
+    "Escalated to the vendor for investigation.",
+)
+
+
+def generate_mock_tickets(
+    count: int = 1000,
+    *,
+    seed: int | None = SyntheticConfig.seed,
+) -> pd.DataFrame:
+    """Return `count` historical support tickets with subject, body, severity, and service."""
+    import pandas as pd
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    rows = []
+    for number in range(count):
+        incident = rng.choice(_INCIDENT_TYPES)
+        symptom = rng.choice(_TICKET_SYMPTOMS)
+        server = f"prod-{rng.choice(('app', 'db', 'edge', 'cache'))}-{rng.randint(1, 40):02d}"
+        rows.append(
+            {
+                "ticket_id": f"TCK-{number:07d}",
+                "created_at": now - timedelta(hours=rng.randint(1, 24 * 365)),
+                "severity": rng.choice(("SEV1", "SEV2", "SEV3")),
+                "service": incident,
+                "subject": f"{incident}: {symptom}",
+                "body": f"{symptom} on {server}. {rng.choice(_TICKET_ACTIONS)}",
+            }
+        )
+    return pd.DataFrame(rows)
+
+
 def generate_incident_email(
     severity: Literal["SEV1", "SEV2", "SEV3"],
     *,
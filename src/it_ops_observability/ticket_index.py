@@ -0,0 +1,273 @@
+"""Offline-built search index over support tickets.
+
+`TicketIndex` holds two structures built once per ticket dataset:
+
+* A BM25 inverted index in CSR form: for each term, the ids of documents that
+  contain it and the precomputed BM25 weight of the term in each document.
+  A query gathers the posting slices of its terms and sums weights per
+  document, so cost scales with postings touched, not corpus size.
+* An optional vector index of L2-normalized hashed unigram/bigram features
+  (or vectors from a caller-supplied `embed` function), searched by a single
+  matrix-vector product.
+
+Indexes are persisted as `.npz` files keyed by the dataset's path, size, and
+mtime, so a process start only memory-loads a previously built index.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+import re
+import threading
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+import zlib
+
+import numpy as np
+
+from .cache_paths import cache_dir
+
+
+INDEX_DIR_NAME = "ticket_index"
+SEARCH_MODES: Tuple[str, ...] = ("bm25", "vector", "hybrid")
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the this to was were will with".split()
+)
+_RRF_K = 60
+# Bump when tokenization or the on-disk layout changes so stale indexes are rebuilt.
+_INDEX_FORMAT = 1
+
+Embedder = Callable[[Sequence[str]], np.ndarray]
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN_PATTERN.findall(text.lower()) if token not in _STOPWORDS]
+
+
+def _hashed_vectors(texts: Sequence[str], dims: int) -> np.ndarray:
+    """Feature-hash unigrams and bigrams into `dims` buckets with signed counts."""
+    rows: List[int] = []
+    cols: List[int] = []
+    signs: List[float] = []
+    for row, text in enumerate(texts):
+        tokens = tokenize(text)
+        for feature in tokens + [f"{a}_{b}" for a, b in zip(tokens, tokens[1:])]:
+            digest = zlib.crc32(feature.encode("utf-8"))
+            rows.append(row)
+            cols.append(digest % dims)
+            signs.append(1.0 if digest & 0x80000000 else -1.0)
+    matrix = np.zeros((len(texts), dims), dtype=np.float32)
+    np.add.at(matrix, (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)), signs)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def _top_k(scores: np.ndarray, candidates: np.ndarray, k: int) -> List[Tuple[int, float]]:
+    if scores.size == 0:
+        return []
+    k = min(k, scores.size)
+    best = np.argpartition(-scores, k - 1)[:k]
+    best = best[np.argsort(-scores[best], kind="stable")]
+    return [(int(candidates[i]), float(scores[i])) for i in best if scores[i] > 0]
+
+
+class TicketIndex:
+    """BM25 inverted index with an optional vector index over the same documents."""
+
+    def __init__(
+        self,
+        vocabulary: Dict[str, int],
+        indptr: np.ndarray,
+        doc_ids: np.ndarray,
+        weights: np.ndarray,
+        n_docs: int,
+        vectors: Optional[np.ndarray] = None,
+    ) -> None:
+        self.vocabulary = vocabulary
+        self.indptr = indptr
+        self.doc_ids = doc_ids
+        self.weights = weights
+        self.n_docs = n_docs
+        self.vectors = vectors
+        self.embed: Optional[Embedder] = None
+
+    @classmethod
+    def build(
+        cls,
+        texts: Sequence[str],
+        *,
+        k1: float = 1.2,
+        b: float = 0.75,
+        vector_dims: int = 0,
+        embed: Optional[Embedder] = None,
+    ) -> "TicketIndex":
+        """Index `texts`; set `vector_dims` (hashed features) or `embed` to add a vector index."""
+        vocabulary: Dict[str, int] = {}
+        term_ids: List[int] = []
+        lengths = np.zeros(len(texts), dtype=np.float32)
+        offsets = [0]
+        for position, text in enumerate(texts):
+            tokens = tokenize(text)
+            lengths[position] = len(tokens)
+            term_ids.extend(vocabulary.setdefault(token, len(vocabulary)) for token in tokens)
+            offsets.append(len(term_ids))
+        terms = np.asarray(term_ids, dtype=np.int64)
+        docs = np.repeat(np.arange(len(texts), dtype=np.int64), np.diff(offsets))
+
+        # One (term, doc) pair per posting with its term frequency, sorted by term.
+        pairs, tf = np.unique(terms * len(texts) + docs, return_counts=True)
+        posting_terms = pairs // max(len(texts), 1)
+        posting_docs = (pairs % max(len(texts), 1)).astype(np.int32)
+        df = np.bincount(posting_terms, minlength=len(vocabulary))
+        idf = np.log1p((len(texts) - df + 0.5) / (df + 0.5))
+        avg_length = float(lengths.mean()) if len(texts) else 0.0
+        norm = k1 * (1 - b + b * lengths[posting_docs] / max(avg_length, 1e-9))
+        weights = (idf[posting_terms] * tf * (k1 + 1) / (tf + norm)).astype(np.float32)
+        indptr = np.concatenate(([0], np.cumsum(df))).astype(np.int64)
+
+        vectors = None
+        if embed is not None:
+            vectors = np.asarray(embed(texts), dtype=np.float32)
+        elif vector_dims > 0:
+            vectors = _hashed_vectors(texts, vector_dims)
+        index = cls(vocabulary, indptr, posting_docs, weights, len(texts), vectors)
+        index.embed = embed
+        return index
+
+    # -- Search --------------------------------------------------------------
+
+    def search_bm25(self, query: str, k: int = 5) -> List[Tuple[int, float]]:
+        slices = [
+            (self.indptr[term], self.indptr[term + 1])
+            for term in {self.vocabulary.get(token) for token in tokenize(query)}
+            if term is not None
+        ]
+        if not slices:
+            return []
+        docs = np.concatenate([self.doc_ids[start:end] for start, end in slices])
+        weights = np.concatenate([self.weights[start:end] for start, end in slices])
+        if len(slices) == 1:
+            return _top_k(weights, docs, k)
+        if docs.size * 8 >= self.n_docs:
+            # Dense accumulation avoids sorting when the postings cover much of the corpus.
+            scores = np.bincount(docs, weights=weights, minlength=self.n_docs)
+            return _top_k(scores, np.arange(self.n_docs), k)
+        candidates, inverse = np.unique(docs, return_inverse=True)
+        return _top_k(np.bincount(inverse, weights=weights), candidates, k)
+
+    def search_vector(self, query: str, k: int = 5) -> List[Tuple[int, float]]:
+        if self.vectors is None:
+            raise ValueError("This ticket index was built without a vector index.")
+        if self.embed is not None:
+            vector = np.asarray(self.embed([query]), dtype=np.float32)[0]
+            vector /= np.linalg.norm(vector) or 1.0
+        else:
+            vector = _hashed_vectors([query], self.vectors.shape[1])[0]
+        scores = self.vectors @ vector
+        return _top_k(scores, np.arange(self.n_docs), k)
+
+    def search(self, query: str, k: int = 5, mode: str = "bm25") -> List[Tuple[int, float]]:
+        """Return `(document_position, score)` pairs, best first."""
+        if mode == "bm25":
+            return self.search_bm25(query, k)
+        if mode == "vector":
+            return self.search_vector(query, k)
+        if mode == "hybrid":
+            # Reciprocal rank fusion of both result lists.
+            fused: Dict[int, float] = {}
+            for results in (self.search_bm25(query, k * 4), self.search_vector(query, k * 4)):
+                for rank, (doc, _) in enumerate(results):
+                    fused[doc] = fused.get(doc, 0.0) + 1.0 / (_RRF_K + rank + 1)
+            return sorted(fused.items(), key=lambda item: item[1], reverse=True)[:k]
+        raise ValueError(f"Unknown search mode {mode!r}; choose from {', '.join(SEARCH_MODES)}")
+
+    # -- Persistence ---------------------------------------------------------
+
+    def save(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays: Dict[str, Any] = {
+            "indptr": self.indptr,
+            "doc_ids": self.doc_ids,
+            "weights": self.weights,
+            "n_docs": np.array(self.n_docs),
+            "vocabulary": np.frombuffer(json.dumps(self.vocabulary).encode("utf-8"), dtype=np.uint8),
+        }
+        if self.vectors is not None:
+            arrays["vectors"] = self.vectors
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("wb") as handle:
+            np.savez(handle, **arrays)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "TicketIndex":
+        with np.load(Path(path)) as data:
+            vocabulary = json.loads(data["vocabulary"].tobytes().decode("utf-8"))
+            vectors = data["vectors"] if "vectors" in data.files else None
+            return cls(
+                vocabulary,
+                data["indptr"],
+                data["doc_ids"],
+                data["weights"],
+                int(data["n_docs"]),
+                vectors,
+            )
+
+
+_INDEXES: Dict[str, TicketIndex] = {}
+_INDEX_LOCK = threading.Lock()
+_MAX_LOADED_INDEXES = 4
+
+
+def dataset_key(path: Optional[Path], *, vector_dims: int = 0, synthetic_count: int = 0) -> str:
+    """Identify a ticket corpus by path, size, and mtime (or by synthetic corpus size)."""
+    suffix = f"f{_INDEX_FORMAT}-v{vector_dims}"
+    if path is None:
+        return f"synthetic-{synthetic_count}-{suffix}"
+    stat = Path(path).stat()
+    raw = f"{Path(path).resolve()}:{stat.st_size}:{stat.st_mtime_ns}:{suffix}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:24]
+
+
+def load_or_build(
+    key: str,
+    texts: Callable[[], Sequence[str]],
+    *,
+    vector_dims: int = 0,
+    index_dir: Optional[Path] = None,
+) -> TicketIndex:
+    """Return the index for `key` from memory, then disk, building (and persisting) it last.
+
+    Indexes persist under `index_dir`, by default `$IT_OPS_CACHE_DIR/ticket_index`.
+    """
+    with _INDEX_LOCK:
+        index = _INDEXES.get(key)
+        if index is not None:
+            return index
+        cached = Path(index_dir if index_dir is not None else cache_dir(INDEX_DIR_NAME)) / f"{key}.npz"
+        if cached.exists():
+            try:
+                index = TicketIndex.load(cached)
+            except (OSError, ValueError, KeyError):
+                index = None
+        if index is None:
+            index = TicketIndex.build(texts(), vector_dims=vector_dims)
+            try:
+                index.save(cached)
+            except OSError:
+                pass
+        if len(_INDEXES) >= _MAX_LOADED_INDEXES:
+            _INDEXES.pop(next(iter(_INDEXES)))  # drop the oldest loaded index
+        _INDEXES[key] = index
+        return index
@@ -1,40 +1,112 @@
 """Tool wrappers that make data access functions available to ADK agents."""
 from __future__ import annotations
 
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+import functools
+import hashlib
+import json
+from pathlib import Path
+import shutil
+import tempfile
+import threading
+import time
+from typing import TYPE_CHECKING
 from typing import Any
+from typing import Callable
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Optional
 
-from google.adk.tools.function_tool import FunctionTool
-
+from .cache_paths import cache_dir
 from .data_sources import DataConfig
 from .data_sources import DEFAULT_CONFIG
+from .data_sources import _resolve_path
+from .data_sources import data_version
+from .data_sources import dataset_stamp
 from .data_sources import fetch_logs
 from .data_sources import fetch_recent_ticket
+from .data_sources import read_frame
 from .data_sources import summarize_metrics
+from .log_summary import DEFAULT_TOKEN_BUDGET
+from .log_summary import summarize_log_text
+from .log_templates import LogTemplate
+from .log_templates import LogTemplateMiner
+from .profiling import Profiler
+from .profiling import default_profiler
+from .synthetic import generate_mock_logs
+from .tracing import Tracer
+
+if TYPE_CHECKING:
+    from google.adk.tools.function_tool import FunctionTool
+
+    from .shared_cache import SharedCache
 
 
-_ACTIVE_CONFIG: DataConfig = DEFAULT_CONFIG
+# Context-local so concurrent sessions, threads, and asyncio tasks that run
+# differently configured agent trees never read each other's datasets.
+_ACTIVE_CONFIG: ContextVar[DataConfig] = ContextVar("it_ops_data_config", default=DEFAULT_CONFIG)
 
 
 def set_data_config(config: Optional[DataConfig]) -> None:
-    """Override the data configuration used by the tool wrappers."""
-    global _ACTIVE_CONFIG
-    _ACTIVE_CONFIG = config or DEFAULT_CONFIG
+    """Override the data configuration used by the tool wrappers in the current context.
+
+    The override is scoped to the calling thread or asyncio task (and contexts
+    copied from it). Prefer `build_data_tools(config=...)`, which binds the
+    configuration to the tools themselves, or `use_data_config` for a block.
+    """
+    _ACTIVE_CONFIG.set(config or DEFAULT_CONFIG)
+
+
+def get_data_config() -> DataConfig:
+    """Return the data configuration the tool wrappers use in the current context."""
+    return _ACTIVE_CONFIG.get()
+
+
+@contextmanager
+def use_data_config(config: Optional[DataConfig]) -> Iterator[DataConfig]:
+    """Temporarily apply `config` to tool calls made inside the `with` block."""
+    token = _ACTIVE_CONFIG.set(config or DEFAULT_CONFIG)
+    try:
+        yield _ACTIVE_CONFIG.get()
+    finally:
+        _ACTIVE_CONFIG.reset(token)
+
+
+def _bind_config(func: Callable[..., Any], config: DataConfig) -> Callable[..., Any]:
+    @functools.wraps(func)
+    def _bound(*args: Any, **kwargs: Any) -> Any:
+        with use_data_config(config):
+            return func(*args, **kwargs)
 
+    return _bound
 
-def fetch_server_logs(server_id: str = "prod-app-01", window_minutes: int = 240) -> str:
+
+def fetch_server_logs(
+    server_id: str = "prod-app-01",
+    window_minutes: int = 240,
+    compact: bool = False,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+) -> str:
     """Retrieve recent log entries for `server_id` as newline-delimited text.
 
     Use this when you need raw operational telemetry, including timestamps and
     severity levels, to explain an outage or anomaly. Provide the server ID (for
     example `prod-app-01`) and optionally adjust the lookback window in minutes.
+    Set `compact=True` for long windows: repeated messages are collapsed into
+    `count | severity | first_seen | last_seen | template` rows, every
+    CRITICAL/ERROR pattern keeps a raw exemplar line, and the response stays
+    within roughly `token_budget` tokens regardless of log volume.
     The tool loads curated CloudFront-style logs when present and otherwise
     falls back to synthetic events so the agent always receives context.
     """
 
-    return fetch_logs(server_id, window_minutes=window_minutes, config=_ACTIVE_CONFIG)
+    raw = fetch_logs(server_id, window_minutes=window_minutes, config=_ACTIVE_CONFIG.get())
+    if compact:
+        return summarize_log_text(raw, token_budget=token_budget)
+    return raw
 
 
 def summarize_utilization(hours: int = 24, include_recent: int = 6) -> Dict[str, Any]:
@@ -47,7 +119,7 @@ def summarize_utilization(hours: int = 24, include_recent: int = 6) -> Dict[str,
     deterministic synthetic metrics, keeping outputs consistent across runs.
     """
 
-    df = summarize_metrics(hours=hours, config=_ACTIVE_CONFIG)
+    df = summarize_metrics(hours=hours, config=_ACTIVE_CONFIG.get())
     window = df.tail(include_recent)
     return {
         "hours_evaluated": hours,
@@ -75,14 +147,889 @@ def fetch_incident_digest() -> str:
     remediation planning can continue without production data.
     """
 
-    return fetch_recent_ticket(config=_ACTIVE_CONFIG)
+    return fetch_recent_ticket(config=_ACTIVE_CONFIG.get())
+
+
+def _describe_template(
+    template: LogTemplate, count: int, recent_count: int, severities: Dict[str, int]
+) -> Dict[str, Any]:
+    return {
+        "template_id": template.template_id,
+        "template": template.template,
+        "count": count,
+        "recent_count": recent_count,
+        "severities": dict(severities),
+        "first_seen": template.first_seen.isoformat() if template.first_seen else None,
+        "last_seen": template.last_seen.isoformat() if template.last_seen else None,
+    }
+
+
+# Streaming template miners per (logs dataset, server). Each call feeds only the
+# rows appended since the previous one; a rewritten dataset starts a new miner.
+_TEMPLATE_MINERS: Dict[Any, Dict[str, Any]] = {}
+_TEMPLATE_LOCK = threading.Lock()
+
+
+def _template_miner_for(config: DataConfig, server_id: str) -> Optional[LogTemplateMiner]:
+    """Return the server's persistent miner over the logs parquet, or None without on-disk rows."""
+    logs_path = _resolve_path(config.logs_path)
+    if logs_path is None or config.service_url:
+        return None
+    key = (str(logs_path.resolve()), server_id)
+    stamp = dataset_stamp(logs_path)
+    with _TEMPLATE_LOCK:
+        entry = _TEMPLATE_MINERS.get(key)
+        if entry is None or entry["stamp"] != stamp:
+            frame = read_frame(logs_path)
+            start = entry["rows"] if entry is not None and len(frame) >= entry["rows"] else 0
+            miner = entry["miner"] if start else LogTemplateMiner()
+            fresh = frame.iloc[start:]
+            fresh = fresh[fresh["server_id"].astype(str).eq(server_id)]
+            miner.add_text("\n".join(fresh["message"].astype(str)))
+            entry = _TEMPLATE_MINERS[key] = {"stamp": stamp, "rows": len(frame), "miner": miner}
+    return entry["miner"] if len(entry["miner"]) else None
+
+
+def fetch_log_templates(
+    server_id: str = "prod-app-01",
+    window_minutes: int = 240,
+    recent_minutes: int = 60,
+    top_n: int = 5,
+) -> Dict[str, Any]:
+    """Mine message templates from a server's logs and report top and novel patterns.
+
+    Use this to answer "which error patterns are new" or "what dominates the
+    logs" without reading raw lines. Each log message is assigned to a template
+    (variable parts shown as `<*>`); the response lists the `top_n` most
+    frequent templates with severity breakdowns and the templates first seen in
+    the last `recent_minutes` of the `window_minutes` lookback.
+    """
+
+    config = _ACTIVE_CONFIG.get()
+    miner = _template_miner_for(config, server_id)
+    streaming = miner is not None
+    if miner is None:
+        miner = LogTemplateMiner()
+        miner.add_text(fetch_logs(server_id, window_minutes=window_minutes, config=config))
+    last_seen = [t.last_seen for t in miner.templates if t.last_seen is not None]
+    newest = max(last_seen) if last_seen else None
+    since = newest - timedelta(minutes=recent_minutes) if newest is not None else None
+    # A streaming miner holds the server's whole history, so counts are cut to the window.
+    window_start = newest - timedelta(minutes=window_minutes) if streaming and newest is not None else None
+
+    def _describe(template: LogTemplate) -> Dict[str, Any]:
+        if window_start is None:
+            count, severities = template.count, template.severity_counts
+        else:
+            count = miner.count_since(template, window_start)
+            severities = miner.severities_since(template, window_start)
+        return _describe_template(template, count, miner.count_since(template, since) if since else count, severities)
+
+    if window_start is None:
+        in_window, top = len(miner), miner.top(top_n)
+    else:
+        in_window = len(miner.top(len(miner), since=window_start))
+        top = miner.top(top_n, since=window_start)
+    novel = miner.novel(since) if since is not None else []
+    return {
+        "server_id": server_id,
+        "window_minutes": window_minutes,
+        "template_count": in_window,
+        "top_templates": [_describe(t) for t in top],
+        "novel_templates": [_describe(t) for t in novel],
+    }
+
+
+def detect_metric_anomalies(
+    metric: str = "cpu_pct",
+    hours: int = 168,
+    detector: str = "zscore",
+    threshold: float = 3.0,
+    max_windows: int = 10,
+    server_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Find anomalous windows in a utilization metric over the last `hours`, per server.
+
+    Use this instead of eyeballing samples when asked whether CPU or memory
+    behaved abnormally. `metric` is `cpu_pct` or `memory_pct`; `detector` is
+    `zscore` (deviation from the trailing day), `ewma` (deviation from an
+    exponentially weighted baseline), or `seasonal` (deviation from the usual
+    value at that hour of day). Each server's series is scored separately;
+    pass `server_id` to check just one. Points scoring at least `threshold`
+    standard deviations are grouped into windows; the response lists up to
+    `max_windows` of the strongest across servers, each with its server,
+    start/end, peak time, peak value, and score.
+    """
+
+    import pandas as pd
+
+    from .anomalies import DETECTORS
+    from .anomalies import detect_anomalies
+
+    if detector not in DETECTORS:
+        return {"error": f"Unknown detector {detector!r}", "detectors": list(DETECTORS)}
+    df = summarize_metrics(hours=hours, config=_ACTIVE_CONFIG.get())
+    if metric not in df.columns:
+        numeric = [name for name in df.columns if pd.api.types.is_numeric_dtype(df[name])]
+        return {"error": f"Unknown metric {metric!r}", "metrics": numeric}
+    if "server_id" in df.columns:
+        servers = df["server_id"].astype(str)
+        if server_id is not None:
+            if not servers.eq(server_id).any():
+                return {"error": f"No {metric} samples for server {server_id!r}", "servers": sorted(servers.unique())}
+            df, servers = df[servers.eq(server_id)], servers[servers.eq(server_id)]
+        series = list(df.groupby(servers, sort=True))
+    else:
+        series = [(None, df)]
+
+    found = []
+    per_server = []
+    points = 0
+    for name, frame in series:
+        frame = frame.assign(timestamp=pd.to_datetime(frame["timestamp"])).sort_values("timestamp")
+        timestamps = frame["timestamp"].to_numpy(dtype="datetime64[ns]")
+        values = frame[metric].to_numpy(dtype=float)
+        params: Dict[str, Any] = {}
+        if detector == "zscore":
+            params["window"] = min(24, max(2, len(values) // 4))
+        elif detector == "seasonal":
+            params["period"] = 24
+        windows = detect_anomalies(timestamps, values, detector=detector, threshold=threshold, **params)
+        found.extend((name, window) for window in windows)
+        points += len(values)
+        per_server.append(
+            {
+                "server_id": name,
+                "points_evaluated": int(len(values)),
+                "anomaly_count": len(windows),
+                "latest_value": round(float(values[-1]), 2) if len(values) else None,
+            }
+        )
+
+    strongest = sorted(found, key=lambda item: abs(item[1].peak_score), reverse=True)[:max_windows]
+    result = {
+        "metric": metric,
+        "detector": detector,
+        "threshold": threshold,
+        "points_evaluated": points,
+        "anomaly_count": len(found),
+        "windows": [
+            {"server_id": name, **window.to_dict()} if name is not None else window.to_dict()
+            for name, window in sorted(strongest, key=lambda item: item[1].start)
+        ],
+    }
+    if "server_id" in df.columns:
+        result["servers"] = per_server
+    else:
+        result["latest_value"] = per_server[0]["latest_value"]
+    return result
+
+
+def forecast_utilization(
+    metric: str = "cpu_pct",
+    horizon_hours: int = 24,
+    history_hours: int = 336,
+    model: str = "holt_winters",
+    capacity_threshold_pct: float = 85.0,
+    max_series: int = 5,
+) -> Dict[str, Any]:
+    """Project a utilization metric `horizon_hours` ahead for every server in the metrics store.
+
+    Use this for capacity planning questions ("will CPU breach 85% tomorrow?").
+    `model` is `holt_winters` (level, trend, and daily seasonality) or
+    `linear_seasonal` (linear trend plus hour-of-day offsets), fitted on the
+    last `history_hours` of hourly samples. The response reports the hold-out
+    MAPE of the same model on the most recent `horizon_hours` (scored when the
+    model was last fitted from scratch), and for the
+    `max_series` servers with the highest projected peak: the peak value and
+    time, hours above `capacity_threshold_pct`, and the hourly forecast.
+    """
+
+    import pandas as pd
+
+    from .forecasting import FLEET_FORECASTER
+    from .forecasting import MODELS
+    from .forecasting import holdout_mape
+
+    if model not in MODELS:
+        return {"error": f"Unknown model {model!r}", "models": list(MODELS)}
+    if horizon_hours < 1:
+        return {"error": "horizon_hours must be at least 1", "horizon_hours": horizon_hours}
+    config = _ACTIVE_CONFIG.get()
+    df = summarize_metrics(hours=history_hours, config=config)
+    if metric not in df.columns:
+        numeric = [name for name in df.columns if pd.api.types.is_numeric_dtype(df[name])]
+        return {"error": f"Unknown metric {metric!r}", "metrics": numeric}
+    df = df.assign(timestamp=pd.to_datetime(df["timestamp"]))
+    if "server_id" in df.columns:
+        table = df.pivot_table(index="timestamp", columns="server_id", values=metric).ffill().bfill()
+    else:
+        table = df.set_index("timestamp")[[metric]].rename(columns={metric: "default"})
+    table = table.sort_index()
+    timestamps = table.index.to_numpy(dtype="datetime64[ns]")
+    values = table.to_numpy(dtype=float).T
+    if values.shape[1] < 3 * 24:
+        return {"error": "Forecasting needs at least 72 hourly samples", "history_points": int(values.shape[1])}
+
+    # Cache fitted state only for on-disk datasets; synthetic fallbacks are regenerated per call.
+    metrics_path = _resolve_path(config.metrics_path)
+    holdout_horizon = min(horizon_hours, values.shape[1] // 4)
+    if metrics_path is not None:
+        key = (str(metrics_path), metric, model, history_hours)
+        fitted, fit_mode = FLEET_FORECASTER.fit(key, timestamps, values, model=model, labels=table.columns)
+        backtest = FLEET_FORECASTER.holdout(key, holdout_horizon)
+    else:
+        from .forecasting import make_model
+
+        fitted, fit_mode = make_model(model).fit(values), "full"
+        backtest = holdout_mape(values, model=model, horizon=holdout_horizon)
+    projection = fitted.forecast(horizon_hours)
+    step = pd.Timedelta(hours=1)
+    future = [pd.Timestamp(timestamps[-1]) + step * (hour + 1) for hour in range(horizon_hours)]
+
+    peaks = projection.max(axis=1)
+    servers = []
+    for row in peaks.argsort()[::-1][:max_series]:
+        peak_hour = int(projection[row].argmax())
+        servers.append(
+            {
+                "server_id": str(table.columns[row]),
+                "peak_pct": round(float(peaks[row]), 2),
+                "peak_at": future[peak_hour].isoformat(timespec="seconds"),
+                "hours_above_threshold": int((projection[row] >= capacity_threshold_pct).sum()),
+                "forecast_pct": [round(float(value), 1) for value in projection[row]],
+            }
+        )
+    return {
+        "metric": metric,
+        "model": model,
+        "fit_mode": fit_mode,
+        "history_points": int(values.shape[1]),
+        "series_forecast": int(values.shape[0]),
+        "horizon_hours": horizon_hours,
+        "forecast_start": future[0].isoformat(timespec="seconds") if future else None,
+        "holdout_mape_pct": backtest["mape_pct"],
+        "servers_at_risk": int((peaks >= capacity_threshold_pct).sum()),
+        "servers": servers,
+    }
+
+
+SYNTHETIC_TICKET_COUNT = 5000
+_TICKET_VECTOR_DIMS = 128
+_SNIPPET_CHARS = 240
+
+
+@functools.lru_cache(maxsize=1)
+def _synthetic_tickets() -> Any:
+    from .synthetic import generate_mock_tickets
+
+    return generate_mock_tickets(SYNTHETIC_TICKET_COUNT)
+
+
+def search_incident_tickets(query: str, k: int = 5, mode: str = "bm25") -> Dict[str, Any]:
+    """Find the `k` historical support tickets most relevant to `query`.
+
+    Use this to ground remediation plans in past incidents: pass the symptoms,
+    service, or error text you are investigating (for example "database
+    connection pool exhausted"). `mode` is `bm25` (keyword relevance, the
+    default), `vector` (similar wording via hashed n-gram vectors), or
+    `hybrid` (both, rank-fused). Each match includes the ticket subject,
+    severity, creation time, a body snippet, and its relevance score.
+    """
+
+    from .ticket_index import SEARCH_MODES
+    from .ticket_index import dataset_key
+    from .ticket_index import load_or_build
+
+    if mode not in SEARCH_MODES:
+        return {"error": f"Unknown mode {mode!r}", "modes": list(SEARCH_MODES)}
+    started = time.perf_counter()
+    tickets_path = _resolve_path(_ACTIVE_CONFIG.get().tickets_path)
+    frame = read_frame(tickets_path) if tickets_path is not None else _synthetic_tickets()
+    body_column = "body" if "body" in frame.columns else "message"
+    vector_dims = 0 if mode == "bm25" else _TICKET_VECTOR_DIMS
+
+    def _texts() -> List[str]:
+        subjects = frame["subject"].fillna("").astype(str) if "subject" in frame.columns else ""
+        return (subjects + " " + frame[body_column].fillna("").astype(str)).tolist()
+
+    key = dataset_key(tickets_path, vector_dims=vector_dims, synthetic_count=SYNTHETIC_TICKET_COUNT)
+    index = load_or_build(key, _texts, vector_dims=vector_dims)
+    matches = []
+    for rank, (position, score) in enumerate(index.search(query, k, mode=mode), start=1):
+        row = frame.iloc[position]
+        body = str(row.get(body_column, ""))
+        matches.append(
+            {
+                "rank": rank,
+                "ticket_id": str(row.get("ticket_id", position)),
+                "subject": str(row.get("subject", "")),
+                "severity": str(row.get("severity", "")) or None,
+                "created_at": str(row.get("created_at", "")) or None,
+                "snippet": body[:_SNIPPET_CHARS] + ("…" if len(body) > _SNIPPET_CHARS else ""),
+                "score": round(score, 4),
+            }
+        )
+    return {
+        "query": query,
+        "mode": mode,
+        "index_size": index.n_docs,
+        "took_ms": round((time.perf_counter() - started) * 1000, 2),
+        "matches": matches,
+    }
+
+
+SYNTHETIC_LOG_SERVERS = ("prod-app-01", "prod-app-02", "prod-db-01", "prod-edge-01")
+_SYNTHETIC_LOG_MINUTES = 3 * 24 * 60
+# Indexes built from a logs parquet are cached per source path (one directory
+# each under `$IT_OPS_CACHE_DIR/log_index`) and kept in step with it: new ingest-store
+# parts are appended, while a rewritten source replaces the whole index.
+_LOG_INDEXES: Dict[str, Any] = {}
+_LOG_INDEX_LOCK = threading.Lock()
+_LOG_INDEX_SOURCE = "source.json"
+
+
+def _sync_log_index(root: Path, source: Path) -> Any:
+    """Bring the cached index at `root` up to date with `source`, indexing only new parts."""
+    import pandas as pd
+
+    from .log_index import LogIndex
+    from .log_index import backfill_from_frame
+
+    stamp = json.loads(json.dumps(dataset_stamp(source)))
+    state_path = root / _LOG_INDEX_SOURCE
+    try:
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        state = {}
+    if state and state.get("stamp") == stamp:
+        return LogIndex(root)
+    parts: List[Any] = []
+    if source.is_dir():
+        parts = [[item.name, *dataset_stamp(item)] for item in sorted(source.glob("*.parquet"))]
+    indexed = state.get("parts", [])
+    if not (state and source.is_dir() and parts[: len(indexed)] == indexed):
+        shutil.rmtree(root, ignore_errors=True)
+        root.mkdir(parents=True)
+        indexed = []
+    index = LogIndex(root)
+    if source.is_dir():
+        for part in parts[len(indexed):]:
+            backfill_from_frame(index, pd.read_parquet(source / part[0]))
+            indexed.append(part)
+            # Recorded per part, so an interrupted sync resumes without re-indexing.
+            state_path.write_text(json.dumps({"stamp": None, "parts": indexed}), encoding="utf-8")
+    else:
+        backfill_from_frame(index, read_frame(source))
+    state_path.write_text(json.dumps({"stamp": stamp, "parts": parts}), encoding="utf-8")
+    return index
+
+
+def _log_index_for(config: DataConfig) -> Any:
+    """Open the configured log index, or build one from the logs parquet or synthetic logs."""
+    from .log_index import MANIFEST_NAME
+    from .log_index import LogIndex
+
+    index_path = _resolve_path(config.log_index_path)
+    logs_path = _resolve_path(config.logs_path)
+    if index_path is not None and (index_path / MANIFEST_NAME).exists():
+        key, source = str(index_path), None
+    elif logs_path is not None:
+        key, source = str(logs_path.resolve()), logs_path
+    else:
+        key, source = "synthetic", None
+    stamp = dataset_stamp(source) if source is not None else None
+    with _LOG_INDEX_LOCK:
+        cached = _LOG_INDEXES.get(key)
+        scratch = None
+        if cached is not None and cached[0] == stamp:
+            index, scratch = cached[1], cached[2]
+        elif key == "synthetic":
+            # Synthetic timestamps are relative to now, so never persist them: the
+            # directory lives as long as its cache entry and is removed at exit.
+            scratch = tempfile.TemporaryDirectory(prefix="it_ops_log_index_")
+            index = LogIndex(Path(scratch.name))
+            for offset, server_id in enumerate(SYNTHETIC_LOG_SERVERS):
+                index.append_text(
+                    server_id,
+                    generate_mock_logs(server_id, window_minutes=_SYNTHETIC_LOG_MINUTES, seed=42 + offset),
+                )
+        elif source is not None:
+            root = cache_dir("log_index") / hashlib.sha256(key.encode()).hexdigest()[:24]
+            index = _sync_log_index(root, source)
+        else:
+            index = LogIndex(index_path)
+        # Keyed by source, so a newer stamp replaces (evicts) the superseded index.
+        _LOG_INDEXES[key] = (stamp, index, scratch)
+    index.refresh()
+    return index
+
+
+def search_logs(
+    query: str,
+    servers: Optional[List[str]] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    limit: int = 20,
+    severities: Optional[List[str]] = None,
+    match: str = "all",
+) -> Dict[str, Any]:
+    """Full-text search across all servers' logs, with hit counts per server.
+
+    Use this for fleet-wide questions such as "which hosts logged 'circuit
+    breaker open' this week". `query` words are matched against log messages
+    (numbers and IDs are not indexed); `match` is `all` (every word, the
+    default) or `any`. Narrow with `servers`, ISO-8601 `start`/`end` times, and
+    `severities` (e.g. ["CRITICAL", "ERROR"]). The response gives the total hit
+    count, per-server counts with last-seen times, per-severity counts, and the
+    `limit` most recent matching lines.
+    """
+
+    if match not in ("all", "any"):
+        return {"error": f"Unknown match mode {match!r}", "match_modes": ["all", "any"]}
+    started = time.perf_counter()
+    index = _log_index_for(_ACTIVE_CONFIG.get())
+    result = index.search(
+        query, servers=servers, start=start, end=end, severities=severities, limit=limit, match=match
+    )
+    result["indexed_lines"] = index.line_count
+    result["took_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+CORRELATION_GROUPINGS = ("template", "severity")
+_MAX_LOG_SIGNALS = 50
+
+
+# Per-row log times of each logs dataset, keyed by path and validated against
+# `dataset_stamp`, so windowed reads skip the timestamp parse on repeat calls.
+_LOG_TIMES: Dict[Path, Any] = {}
+_LOG_TIMES_LOCK = threading.Lock()
+
+
+def _log_row_times(path: Path, frame: Any) -> Any:
+    """Return the timestamp of every row of a logs frame (its `timestamp` column, or each line's prefix)."""
+    import pandas as pd
+
+    stamp = dataset_stamp(path)
+    with _LOG_TIMES_LOCK:
+        cached = _LOG_TIMES.get(path)
+    if cached is not None and cached[0] == stamp and len(cached[1]) == len(frame):
+        return cached[1]
+    if "timestamp" in frame.columns:
+        raw = frame["timestamp"]
+    else:
+        raw = frame["message"].astype(str).str.split(" ", n=1).str[0]
+    times = pd.to_datetime(raw, utc=True, errors="coerce", format="ISO8601").dt.tz_convert(None)
+    times = times.to_numpy(dtype="datetime64[ns]")
+    with _LOG_TIMES_LOCK:
+        _LOG_TIMES[path] = (stamp, times)
+    return times
+
+
+def _fleet_log_lines(config: DataConfig, servers: Optional[List[str]], window_minutes: int) -> List[Any]:
+    """Return `(server_id, line)` pairs from the last `window_minutes` of the logs parquet, or synthetic logs.
+
+    On a logs parquet the window is cut with vectorized timestamps before any
+    line is parsed, so a short window costs O(window) rather than O(dataset).
+    """
+    import numpy as np
+
+    logs_path = _resolve_path(config.logs_path)
+    if logs_path is not None:
+        frame = read_frame(logs_path)
+        times = _log_row_times(logs_path, frame)
+        keep = ~np.isnat(times)
+        if keep.any():
+            keep &= times > times[keep].max() - np.timedelta64(window_minutes, "m")
+        if servers:
+            keep &= frame["server_id"].isin(servers).to_numpy()
+        frame = frame[keep]
+        return list(zip(frame["server_id"].astype(str), frame["message"].astype(str)))
+    pairs: List[Any] = []
+    for offset, server_id in enumerate(SYNTHETIC_LOG_SERVERS):
+        if servers and server_id not in servers:
+            continue
+        raw = generate_mock_logs(server_id, window_minutes=window_minutes, seed=42 + offset)
+        pairs.extend((server_id, line) for line in raw.splitlines())
+    return pairs
+
+
+def _parse_fleet_logs(pairs: List[Any]) -> Any:
+    """Parse `(server_id, line)` pairs into a `LogBatch`, per-row servers, times, and a valid-time mask."""
+    import numpy as np
+
+    from .log_records import MISSING_TIMESTAMP
+    from .log_records import LogBatch
+
+    batch = LogBatch()
+    line_servers: List[str] = []
+    for server_id, line in pairs:
+        if batch.append_line(line):
+            line_servers.append(server_id)
+    micros = np.frombuffer(batch.timestamps_us, dtype=np.int64)
+    valid = micros != MISSING_TIMESTAMP
+    times = (micros[valid] * 1000).astype("datetime64[ns]")
+    return batch, np.asarray(line_servers, dtype=object)[valid], times, valid
+
+
+def correlate_signals(
+    hours: int = 24,
+    bucket_minutes: int = 15,
+    max_lag_minutes: int = 60,
+    group_by: str = "template",
+    servers: Optional[List[str]] = None,
+    top_n: int = 10,
+) -> Dict[str, Any]:
+    """Rank log signals that move together with CPU/memory spikes, per server and fleet-wide.
+
+    Use this for root-cause questions ("are the database timeouts related to
+    the CPU peaks?") instead of comparing log and metric tool outputs by hand.
+    Log lines from the last `hours` are grouped by message template (or by
+    severity with `group_by="severity"`) and counted in `bucket_minutes`
+    buckets alongside the metrics. Each evidence pair reports the best
+    correlation within +/- `max_lag_minutes` (positive lag: logs lead the
+    metric), how many log bursts coincided with a metric spike (precision and
+    lift), and a combined score; the `top_n` strongest pairs are returned.
+    """
+
+    import numpy as np
+    import pandas as pd
+
+    from .correlation import TimeGrid
+    from .correlation import count_matrix
+    from .correlation import mean_matrix
+    from .correlation import rank_evidence
+    from .log_summary import to_template
+
+    if group_by not in CORRELATION_GROUPINGS:
+        return {"error": f"Unknown grouping {group_by!r}", "groupings": list(CORRELATION_GROUPINGS)}
+    if bucket_minutes <= 0 or hours * 60 < 4 * bucket_minutes:
+        return {"error": "The window must span at least four buckets", "hours": hours, "bucket_minutes": bucket_minutes}
+    started = time.perf_counter()
+    config = _ACTIVE_CONFIG.get()
+
+    batch, line_servers, log_times, valid = _parse_fleet_logs(_fleet_log_lines(config, servers, hours * 60))
+    level_codes = np.frombuffer(batch.codes("level"), dtype=np.int32)[valid]
+    level_names = batch.categories("level")
+    if group_by == "severity":
+        signal_codes, signal_labels = level_codes, level_names
+    else:
+        # Templates are computed once per distinct message, not once per line; the
+        # batch already split off the "<server>:" prefix, so templates match across hosts.
+        templates = [to_template(message) for message in batch.categories("message")]
+        message_codes = np.frombuffer(batch.codes("message"), dtype=np.int32)[valid]
+        pairs, inverse = np.unique(level_codes.astype(np.int64) * len(templates) + message_codes, return_inverse=True)
+        pair_labels = [f"{level_names[pair // len(templates)]}: {templates[pair % len(templates)]}" for pair in pairs]
+        label_codes, signal_labels = pd.factorize(pd.Series(pair_labels, dtype=object))
+        signal_codes = label_codes[inverse]
+
+    metrics = summarize_metrics(hours=hours, config=config)
+    metric_names = [
+        name for name in metrics.columns
+        if name not in ("timestamp", "server_id") and pd.api.types.is_numeric_dtype(metrics[name])
+    ]
+    metric_times = pd.to_datetime(metrics["timestamp"], utc=True).dt.tz_convert(None).to_numpy(dtype="datetime64[ns]")
+    if not metric_names or not len(metric_times) or not len(log_times):
+        return {"error": "Correlation needs both log lines and numeric metrics in the window"}
+
+    grid = TimeGrid.covering(max(log_times.max(), metric_times.max()), hours=hours, bucket_minutes=bucket_minutes)
+    max_lag = max(0, max_lag_minutes // bucket_minutes)
+    server_codes, server_labels = pd.factorize(pd.Series(line_servers, dtype=object))
+    n_signals = len(signal_labels)
+    # Keep the busiest signals so the pair matrix stays small on noisy fleets.
+    totals = np.bincount(signal_codes, minlength=n_signals)
+    keep = np.sort(np.argsort(-totals, kind="stable")[:_MAX_LOG_SIGNALS])
+    kept_labels = [str(signal_labels[code]) for code in keep]
+
+    metric_values = metrics[metric_names].to_numpy(dtype=float)
+    metric_codes = np.repeat(np.arange(len(metric_names))[np.newaxis, :], len(metrics), axis=0)
+
+    def _metric_means(rows: Any) -> np.ndarray:
+        return mean_matrix(
+            grid,
+            np.repeat(metric_times[rows], len(metric_names)),
+            metric_values[rows].ravel(),
+            metric_codes[rows].ravel(),
+            len(metric_names),
+        )
+
+    common = dict(bucket_minutes=bucket_minutes, max_lag=max_lag, tolerance=max(1, max_lag))
+    # Signal x server counts in one pass; the fleet view sums over servers.
+    counts = count_matrix(
+        grid, log_times, server_codes * n_signals + signal_codes, len(server_labels) * n_signals
+    ).reshape(len(server_labels), n_signals, grid.size)[:, keep]
+    pairs = rank_evidence(
+        kept_labels, metric_names, counts.sum(axis=0), _metric_means(slice(None)), scope="fleet", **common
+    )
+    if "server_id" in metrics.columns:
+        metric_servers = metrics["server_id"].astype(str).to_numpy()
+        for code, server_id in enumerate(server_labels):
+            rows = metric_servers == server_id
+            if rows.any():
+                pairs.extend(
+                    rank_evidence(kept_labels, metric_names, counts[code], _metric_means(rows), scope=server_id, **common)
+                )
+    pairs.sort(key=lambda pair: pair["score"], reverse=True)
+    return {
+        "window_start": pd.Timestamp(grid.start_ns).isoformat(timespec="seconds"),
+        "window_hours": hours,
+        "bucket_minutes": bucket_minutes,
+        "group_by": group_by,
+        "servers": [str(server) for server in server_labels],
+        "metrics": metric_names,
+        "log_signals": n_signals,
+        "log_lines": int(len(log_times)),
+        "pairs_scored": len(pairs),
+        "evidence": [pair for pair in pairs[:top_n] if pair["score"] > 0] or pairs[:top_n],
+        "took_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+_SLO_FEEDS: Dict[Any, Dict[str, Any]] = {}
+_SLO_LOCK = threading.Lock()
+
 
+def _ingest_slo_logs(engine: Any, pairs: List[Any]) -> None:
+    import numpy as np
+
+    batch, servers, times, valid = _parse_fleet_logs(pairs)
+    if len(times):
+        levels = np.asarray(batch.categories("level"), dtype=object)
+        engine.ingest_logs(times, levels[np.frombuffer(batch.codes("level"), dtype=np.int32)[valid]], servers)
+
+
+def _ingest_slo_metrics(engine: Any, frame: Any) -> None:
+    import pandas as pd
+
+    if frame.empty:
+        return
+    timestamps = pd.to_datetime(frame["timestamp"], utc=True).dt.tz_convert(None).to_numpy(dtype="datetime64[ns]")
+    columns = {
+        name: frame[name].to_numpy(dtype=float)
+        for name in frame.columns
+        if name not in ("timestamp", "server_id") and pd.api.types.is_numeric_dtype(frame[name])
+    }
+    servers = frame["server_id"].to_numpy() if "server_id" in frame.columns else None
+    engine.ingest_metrics(timestamps, columns, servers)
+
+
+def _feed_slo_engine(feed: Dict[str, Any], config: DataConfig) -> None:
+    """Ingest only the dataset rows the engine has not seen yet."""
+    from .slo import WINDOWS
+
+    engine, seen = feed["engine"], feed["seen"]
+    lookback_minutes = max(WINDOWS.values())
+    for source, path in (("logs", _resolve_path(config.logs_path)), ("metrics", _resolve_path(config.metrics_path))):
+        if path is None:
+            # Synthetic telemetry is a fixed snapshot, so it is ingested once.
+            if source in seen:
+                continue
+            seen[source] = None
+            if source == "logs":
+                _ingest_slo_logs(engine, _fleet_log_lines(config, None, lookback_minutes))
+            else:
+                _ingest_slo_metrics(engine, summarize_metrics(hours=lookback_minutes // 60, config=config))
+            continue
+        signature = dataset_stamp(path)
+        previous = seen.get(source)
+        if previous is not None and previous[0] == signature:
+            continue
+        frame = read_frame(path)
+        # Appended rows follow the consumed prefix, whatever their timestamps; a
+        # shorter (rewritten) dataset is recounted from scratch.
+        start = previous[1] if previous is not None and len(frame) >= previous[1] else 0
+        if start == 0 and previous is not None:
+            engine.reset(source)
+        seen[source] = (signature, len(frame))
+        fresh = frame.iloc[start:]
+        if source == "logs":
+            _ingest_slo_logs(engine, list(zip(fresh["server_id"].astype(str), fresh["message"].astype(str))))
+        else:
+            _ingest_slo_metrics(engine, fresh)
+
+
+def _slo_engine_for(config: DataConfig) -> Any:
+    from .slo import DEFAULT_SLOS
+    from .slo import SLOEngine
+    from .slo import load_slo_definitions
+
+    slo_path = _resolve_path(config.slo_path)
+    key = (str(config.logs_path), str(config.metrics_path), str(slo_path))
+    with _SLO_LOCK:
+        feed = _SLO_FEEDS.get(key)
+        if feed is None:
+            definitions = load_slo_definitions(slo_path) if slo_path is not None else DEFAULT_SLOS
+            feed = _SLO_FEEDS[key] = {"engine": SLOEngine(definitions), "seen": {}}
+        _feed_slo_engine(feed, config)
+    return feed["engine"]
+
+
+def check_slo_burn(slo: Optional[str] = None) -> Dict[str, Any]:
+    """Report error-budget burn rates and firing alerts for the service level objectives.
+
+    Use this to answer "are we burning error budget" or whether an incident
+    threatens an SLO. Each SLO (log error ratio, CPU and memory saturation by
+    default) reports burn rates over the 5m, 1h, 6h, and 3d windows (1.0
+    spends the budget exactly on schedule; None means no events in that
+    window), the budget left over the 3d window, and multi-window alerts:
+    `page` when both 1h and 5m (or 6h and 1h) burn fast, `ticket` when 3d and
+    6h exceed 1.0. Pass `slo` to report a single objective.
+    """
+
+    from .slo import WINDOWS
+
+    started = time.perf_counter()
+    try:
+        engine = _slo_engine_for(_ACTIVE_CONFIG.get())
+    except (OSError, ValueError) as exc:
+        return {"error": f"Could not load SLO state: {exc}"}
+    if slo is not None and slo not in engine.definitions:
+        return {"error": f"Unknown SLO {slo!r}", "slos": list(engine.definitions)}
+    statuses = engine.status(slo)
+    return {
+        "windows": list(WINDOWS),
+        "burning": [status["name"] for status in statuses if status["burning"]],
+        "slos": statuses,
+        "took_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+_QUERY_ENGINE: Any = None
+_SYNTHETIC_QUERY_SOURCES: Dict[Any, Any] = {}
+_QUERY_LOCK = threading.Lock()
+
+
+def _synthetic_query_table(config: DataConfig, dataset: str) -> Any:
+    import pyarrow as pa
+
+    if dataset == "logs":
+        pairs = _fleet_log_lines(config, None, _SYNTHETIC_LOG_MINUTES)
+        return pa.table(
+            {"server_id": [server for server, _ in pairs], "message": [line for _, line in pairs]}
+        )
+    if dataset == "metrics":
+        frame = summarize_metrics(hours=_SYNTHETIC_LOG_MINUTES // 60, config=config)
+    else:
+        frame = _synthetic_tickets()
+    return pa.Table.from_pandas(frame, preserve_index=False)
+
+
+def _query_source(config: DataConfig, dataset: str) -> Any:
+    """Open the configured parquet dataset, or a synthetic table generated once per process."""
+    from .analytics import QueryEngine
+
+    global _QUERY_ENGINE
+    with _QUERY_LOCK:
+        if _QUERY_ENGINE is None:
+            _QUERY_ENGINE = QueryEngine()
+    path = _resolve_path(
+        {"logs": config.logs_path, "metrics": config.metrics_path, "tickets": config.tickets_path}[dataset]
+    )
+    if path is not None:
+        return _QUERY_ENGINE.open_path(dataset, path)
+    key = (dataset, str(config))
+    with _QUERY_LOCK:
+        source = _SYNTHETIC_QUERY_SOURCES.get(key)
+        if source is None:
+            # Synthetic timestamps are relative to now, so the table is generated once and reused.
+            source = _SYNTHETIC_QUERY_SOURCES[key] = QueryEngine.from_table(
+                dataset, f"synthetic:{dataset}:{config}", _synthetic_query_table(config, dataset), ("synthetic",)
+            )
+    return source
+
+
+def query_telemetry(
+    dataset: str = "logs",
+    aggregates: Optional[List[str]] = None,
+    group_by: Optional[List[str]] = None,
+    filters: Optional[List[str]] = None,
+    since_hours: Optional[float] = None,
+    order_by: Optional[str] = None,
+    limit: int = 20,
+) -> Dict[str, Any]:
+    """Run a read-only aggregate query over the logs, metrics, or tickets dataset.
+
+    Use this for counts, rates, and percentiles the other tools do not report
+    directly, such as "error rate by server over the last 6 hours"
+    (`aggregates=["count", "rate:severity in ERROR,CRITICAL"]`,
+    `group_by=["server_id"]`, `since_hours=6`) or "p95 CPU per hour"
+    (`dataset="metrics"`, `aggregates=["p95:cpu_pct"]`, `group_by=["bucket:1h"]`).
+
+    `aggregates` entries are `count`, `rate:<filter>` (share of rows matching a
+    filter), or `<fn>:<column>` with fn in count_distinct, sum, mean, min, max,
+    stddev, p50, p90, p95, p99. `group_by` takes column names or a time bucket
+    (`bucket:15m`, `bucket:1h`, `bucket:1d`). `filters` are
+    `<column> <op> <value>` with op in =, !=, >, >=, <, <=, `in` (comma-separated
+    values), or `contains`. `since_hours` keeps rows within that many hours of
+    the newest row. Logs always offer server_id, message, timestamp, and
+    severity; metrics offer timestamp and numeric columns such as cpu_pct and
+    memory_pct. Rows are sorted by `order_by` (an output column, `-` prefix for
+    descending; default the first aggregate, descending) and capped at `limit`
+    (at most 200). Invalid queries return an `error` with the dataset's columns.
+    """
+
+    from .analytics import AggregateQuery
+    from .analytics import QueryError
+
+    config = _ACTIVE_CONFIG.get()
+    try:
+        query = AggregateQuery.parse(dataset, aggregates, group_by, filters, since_hours, order_by, limit)
+        source = _query_source(config, dataset)
+    except (QueryError, OSError, ValueError) as exc:
+        return {"error": str(exc)}
+    try:
+        return _QUERY_ENGINE.execute(query, source)
+    except QueryError as exc:
+        return {"error": str(exc), "columns": _QUERY_ENGINE.describe(source)}
+
+
+def _tool_cache_context() -> List[Any]:
+    config = _ACTIVE_CONFIG.get()
+    return [str(config), data_version(config)]
+
+
+def build_data_tools(
+    tracer: Optional[Tracer] = None,
+    config: Optional[DataConfig] = None,
+    result_cache: Optional[SharedCache] = None,
+    profiler: Optional[Profiler] = None,
+) -> List[FunctionTool]:
+    """Create `FunctionTool` instances for the observability data utilities.
+
+    When `config` is given, each tool is bound to it for the lifetime of the
+    returned list, independent of `set_data_config` or other agent trees in
+    the process. When a `result_cache` is given, results are shared across
+    processes, keyed by the arguments, the tools' configuration (bound or active),
+    and its data version. When a `tracer` is given, every tool function is wrapped so
+    each call records a span with its duration and request/response payload
+    sizes. A sample of computed (uncached) calls is profiled by `profiler`,
+    or by the `IT_OPS_PROFILE` environment profiler when none is given.
+    """
 
-def build_data_tools() -> List[FunctionTool]:
-    """Create `FunctionTool` instances for the observability data utilities."""
+    from google.adk.tools.function_tool import FunctionTool
 
-    return [
-        FunctionTool(fetch_server_logs),
-        FunctionTool(summarize_utilization),
-        FunctionTool(fetch_incident_digest),
+    functions = [
+        fetch_server_logs,
+        summarize_utilization,
+        fetch_incident_digest,
+        fetch_log_templates,
+        detect_metric_anomalies,
+        forecast_utilization,
+        search_incident_tickets,
+        search_logs,
+        correlate_signals,
+        check_slo_burn,
+        query_telemetry,
     ]
+    profiler = profiler or default_profiler()
+    if profiler is not None:
+        functions = [profiler.wrap(function) for function in functions]
+    if result_cache is not None:
+        functions = [result_cache.wrap_tool(function, context=_tool_cache_context) for function in functions]
+    # Bound outside the cache so its key is built from this tool set's configuration.
+    if config is not None:
+        functions = [_bind_config(function, config) for function in functions]
+    if tracer is not None:
+        functions = [tracer.wrap_tool(function) for function in functions]
+    return [FunctionTool(function) for function in functions]
@@ -0,0 +1,269 @@
+"""Lightweight span tracing for agent turns, model calls, and data tools.
+
+A `Tracer` collects spans for one supervisor run. `create_supervisor_agent`
+attaches its ADK callbacks to every agent (agent and model spans) and
+`build_data_tools` wraps each tool function (tool spans), so a single trace
+shows where a briefing's time goes. Spans export to OTLP/JSON, which the
+OpenTelemetry collector and most trace viewers can ingest directly.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from dataclasses import field
+import functools
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+
+SERVICE_NAME = "it-ops-observability"
+
+
+@dataclass
+class Span:
+    """A timed unit of work (agent turn, model call, or tool invocation)."""
+
+    name: str
+    kind: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        if self.end_ns is None:
+            return 0.0
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+def _payload_bytes(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return len(str(value))
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Tracer:
+    """Collect spans for one run; create a new tracer per runner or session."""
+
+    def __init__(self, trace_id: Optional[str] = None) -> None:
+        self.trace_id = trace_id or os.urandom(16).hex()
+        self._spans: List[Span] = []
+        self._stack: List[Span] = []
+        self._open: Dict[Tuple[str, str], Span] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def start_span(self, name: str, kind: str, **attributes: Any) -> Span:
+        """Open a span nested under the innermost open agent span."""
+        with self._lock:
+            parent = self._stack[-1].span_id if self._stack else None
+            span = Span(
+                name=name,
+                kind=kind,
+                span_id=os.urandom(8).hex(),
+                parent_id=parent,
+                start_ns=time.time_ns(),
+                attributes=dict(attributes),
+            )
+            self._spans.append(span)
+            if kind == "agent":
+                self._stack.append(span)
+            return span
+
+    def end_span(self, span: Span, **attributes: Any) -> None:
+        with self._lock:
+            span.end_ns = time.time_ns()
+            span.attributes.update(attributes)
+            if span in self._stack:
+                self._stack.remove(span)
+
+    def finish(self) -> None:
+        """Close spans left open, e.g. a parent agent whose turn ended via transfer.
+
+        ADK does not always fire `after_agent_callback` for an agent that hands
+        control to a sub-agent, so such spans are ended at the latest end time
+        recorded in the trace.
+        """
+        with self._lock:
+            ended = [span.end_ns for span in self._spans if span.end_ns is not None]
+            latest = max(ended) if ended else time.time_ns()
+            for span in self._spans:
+                if span.end_ns is None:
+                    span.end_ns = max(latest, span.start_ns)
+                    span.attributes["closed_by_tracer"] = True
+            self._stack.clear()
+            self._open.clear()
+
+    # -- Tool wrapping -----------------------------------------------------
+
+    def wrap_tool(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Return `func` wrapped in a tool span; the signature is preserved for FunctionTool."""
+
+        @functools.wraps(func)
+        def _traced(*args: Any, **kwargs: Any) -> Any:
+            span = self.start_span(
+                f"tool:{func.__name__}", "tool", request_bytes=_payload_bytes(kwargs or list(args))
+            )
+            try:
+                result = func(*args, **kwargs)
+            except Exception as exc:
+                self.end_span(span, error=type(exc).__name__)
+                raise
+            self.end_span(span, response_bytes=_payload_bytes(result))
+            return result
+
+        return _traced
+
+    # -- ADK callbacks -----------------------------------------------------
+
+    def agent_callbacks(self) -> Dict[str, Callable[..., Any]]:
+        """Return `Agent(...)` keyword arguments that record agent and model spans."""
+        return {
+            "before_agent_callback": self._before_agent,
+            "after_agent_callback": self._after_agent,
+            "before_model_callback": self._before_model,
+            "after_model_callback": self._after_model,
+        }
+
+    def _before_agent(self, callback_context: Any) -> None:
+        key = ("agent", f"{callback_context.invocation_id}:{callback_context.agent_name}")
+        self._open[key] = self.start_span(f"agent:{callback_context.agent_name}", "agent")
+        return None
+
+    def _after_agent(self, callback_context: Any) -> None:
+        key = ("agent", f"{callback_context.invocation_id}:{callback_context.agent_name}")
+        span = self._open.pop(key, None)
+        if span is not None:
+            self.end_span(span)
+        return None
+
+    def _before_model(self, callback_context: Any, llm_request: Any) -> None:
+        request_bytes = sum(
+            _payload_bytes(part.to_json_dict())
+            for content in llm_request.contents
+            for part in content.parts or []
+        )
+        key = ("model", f"{callback_context.invocation_id}:{callback_context.agent_name}")
+        self._open[key] = self.start_span(
+            f"model:{callback_context.agent_name}",
+            "model",
+            model=str(llm_request.model or ""),
+            request_bytes=request_bytes,
+        )
+        return None
+
+    def _after_model(self, callback_context: Any, llm_response: Any) -> None:
+        key = ("model", f"{callback_context.invocation_id}:{callback_context.agent_name}")
+        span = self._open.pop(key, None)
+        if span is None:
+            return None
+        attributes: Dict[str, Any] = {}
+        content = getattr(llm_response, "content", None)
+        if content is not None:
+            attributes["response_bytes"] = sum(
+                _payload_bytes(part.to_json_dict()) for part in content.parts or []
+            )
+        usage = getattr(llm_response, "usage_metadata", None)
+        if usage is not None:
+            attributes["prompt_tokens"] = usage.prompt_token_count or 0
+            attributes["output_tokens"] = usage.candidates_token_count or 0
+        self.end_span(span, **attributes)
+        return None
+
+    # -- Export ------------------------------------------------------------
+
+    def waterfall(self) -> List[Dict[str, Any]]:
+        """Return spans as rows with start offsets (ms) relative to the first span."""
+        self.finish()
+        spans = self.spans
+        if not spans:
+            return []
+        origin = min(span.start_ns for span in spans)
+        depths: Dict[str, int] = {}
+        rows: List[Dict[str, Any]] = []
+        for span in sorted(spans, key=lambda s: s.start_ns):
+            depth = depths.get(span.parent_id, -1) + 1 if span.parent_id else 0
+            depths[span.span_id] = depth
+            rows.append(
+                {
+                    "name": span.name,
+                    "kind": span.kind,
+                    "depth": depth,
+                    "start_ms": round((span.start_ns - origin) / 1e6, 3),
+                    "end_ms": round((span.end_ns - origin) / 1e6, 3),
+                    "duration_ms": round(span.duration_ms, 3),
+                    **span.attributes,
+                }
+            )
+        return rows
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Return the spans as an OTLP/JSON `ExportTraceServiceRequest`."""
+        self.finish()
+        otlp_spans = []
+        for span in self.spans:
+            entry: Dict[str, Any] = {
+                "traceId": self.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 1,  # SPAN_KIND_INTERNAL
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": [
+                    {"key": "it_ops.kind", "value": _otlp_value(span.kind)},
+                    *({"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()),
+                ],
+            }
+            if span.parent_id:
+                entry["parentSpanId"] = span.parent_id
+            otlp_spans.append(entry)
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {"key": "service.name", "value": {"stringValue": SERVICE_NAME}}
+                        ]
+                    },
+                    "scopeSpans": [
+                        {"scope": {"name": "it_ops_observability.tracing"}, "spans": otlp_spans}
+                    ],
+                }
+            ]
+        }
+
+    def export_json(self, path: Path) -> Path:
+        """Write the OTLP/JSON trace to `path`, creating parent directories."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_otlp(), indent=2), encoding="utf-8")
+        return path
@@ -0,0 +1,108 @@
+"""Optional warm-up hook that front-loads cold-start work at container start.
+
+The package defers `google.adk` and `pandas` until first use, which keeps
+lightweight imports fast but moves that cost onto the first request. Calling
+`warm_up` once when a server process starts pays it up front: the heavy
+modules are imported, configured datasets are parsed into the data-source frame
+cache, and a supervisor agent tree is built once so ADK/pydantic schema setup
+is done before the first user arrives.
+
+The container runs `ui/serve.py`, which calls `warm_up_once` when
+`IT_OPS_WARMUP=1` (the Dockerfile sets it) and then starts Streamlit in the
+same process, so the server does not accept connections until warm-up is done.
+The Streamlit app also calls `warm_up_once` for `streamlit run` launches; in
+the container that call returns the report from server start.
+
+Run `python -m it_ops_observability.warmup` to print the phase timings.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from importlib import import_module
+import json
+import os
+import threading
+import time
+from typing import TYPE_CHECKING
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from .data_sources import DEFAULT_CONFIG
+from .data_sources import preload_datasets
+
+if TYPE_CHECKING:
+    from .agent import AgentSettings
+
+
+WARMUP_ENV_VAR = "IT_OPS_WARMUP"
+
+
+@dataclass
+class WarmupReport:
+    """Per-phase durations (milliseconds) and the datasets loaded into the frame cache."""
+
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+    datasets: List[str] = field(default_factory=list)
+
+    @property
+    def total_ms(self) -> float:
+        return round(sum(self.timings_ms.values()), 3)
+
+
+def warmup_enabled() -> bool:
+    """Return True when `IT_OPS_WARMUP` requests a warm-up at process start."""
+    return os.environ.get(WARMUP_ENV_VAR, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def warm_up(settings: Optional[AgentSettings] = None, *, build_agent: bool = True) -> WarmupReport:
+    """Import heavy dependencies, preload datasets, and optionally build the agent tree once."""
+    report = WarmupReport()
+
+    def _timed(phase: str, started: float) -> None:
+        report.timings_ms[phase] = round((time.perf_counter() - started) * 1000, 3)
+
+    started = time.perf_counter()
+    import_module("pandas")
+    _timed("import_pandas", started)
+
+    started = time.perf_counter()
+    config = (settings.data_config if settings else None) or DEFAULT_CONFIG
+    report.datasets = [str(path) for path in preload_datasets(config)]
+    _timed("preload_datasets", started)
+
+    if build_agent:
+        started = time.perf_counter()
+        from .agent import AgentSettings
+        from .agent import create_supervisor_agent
+
+        _timed("import_adk", started)
+
+        started = time.perf_counter()
+        create_supervisor_agent(settings or AgentSettings())
+        _timed("build_agent", started)
+    return report
+
+
+_REPORT: Optional[WarmupReport] = None
+_REPORT_LOCK = threading.Lock()
+
+
+def warm_up_once() -> WarmupReport:
+    """Run `warm_up` the first time this is called in a process; later calls return that report."""
+    global _REPORT
+    with _REPORT_LOCK:
+        if _REPORT is None:
+            _REPORT = warm_up()
+        return _REPORT
+
+
+def main() -> None:
+    report = warm_up()
+    print(json.dumps({**asdict(report), "total_ms": report.total_ms}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
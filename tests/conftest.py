@@ -0,0 +1,14 @@
+"""Shared test fixtures."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep every on-disk cache (indexes, responses, profiles) out of the real `$HOME`."""
+    cache = tmp_path / "it_ops_cache"
+    monkeypatch.setenv("IT_OPS_CACHE_DIR", str(cache))
+    return cache
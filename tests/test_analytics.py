@@ -0,0 +1,84 @@
+"""Tests for the read-only aggregate query tool."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pyarrow.parquet as pq
+import pytest
+
+from it_ops_observability.analytics import AggregateQuery
+from it_ops_observability.analytics import QueryEngine
+from it_ops_observability.analytics import QueryError
+from it_ops_observability.benchmarks import write_fixtures
+from it_ops_observability.data_sources import DataConfig
+from it_ops_observability.storage import write_sorted_logs
+from it_ops_observability.tools import query_telemetry
+from it_ops_observability.tools import use_data_config
+
+
+def _error_counts(table) -> dict:
+    frame = table.to_pandas()
+    levels = frame["message"].str.split(" ", n=2).str[1]
+    return frame[levels.isin(["[ERROR]", "[CRITICAL]"])].groupby("server_id").size().to_dict()
+
+
+def test_raw_and_sorted_layouts_agree_with_pandas(tmp_path: Path) -> None:
+    fixture = write_fixtures(4_000, tmp_path)
+    raw = pq.read_table(fixture.config.logs_path)
+    sorted_path = write_sorted_logs(raw.to_pandas(), tmp_path / "sorted.parquet", row_group_rows=500)
+    expected = _error_counts(raw)
+    for logs_path in (fixture.config.logs_path, sorted_path):
+        with use_data_config(DataConfig(logs_path=logs_path, metrics_path=fixture.config.metrics_path)):
+            result = query_telemetry(
+                aggregates=["count"], group_by=["server_id"], filters=["severity in ERROR,CRITICAL"]
+            )
+        assert {row["server_id"]: row["count"] for row in result["rows"]} == expected
+        assert [row["count"] for row in result["rows"]] == sorted(expected.values(), reverse=True)
+
+    with use_data_config(DataConfig(logs_path=sorted_path)):
+        one_server = query_telemetry(filters=["server_id = prod-db-01"], aggregates=["rate:severity = ERROR"])
+    # The server filter is pushed into the scan, so only that server's rows reach the aggregation.
+    assert one_server["scanned_rows"] == raw["server_id"].to_pylist().count("prod-db-01")
+    assert 0 < one_server["rows"][0]["rate:severity = ERROR"] < 1
+
+    with use_data_config(fixture.config):
+        hourly = query_telemetry(
+            dataset="metrics", aggregates=["p95:cpu_pct", "max:cpu_pct"], group_by=["bucket:1h"],
+            since_hours=6, order_by="bucket",
+        )
+    # 12:39 through 18:39 touches seven hourly buckets.
+    assert hourly["groups"] == 7 and hourly["window"]["end"].startswith("2024-01-03T18:39")
+    assert all(row["p95:cpu_pct"] <= row["max:cpu_pct"] for row in hourly["rows"])
+
+
+def test_caches_are_keyed_by_data_version(tmp_path: Path) -> None:
+    fixture = write_fixtures(2_000, tmp_path)
+    with use_data_config(fixture.config):
+        first = query_telemetry(dataset="metrics", aggregates=["count"])
+        again = query_telemetry(dataset="metrics", aggregates=[" count "])
+        assert (first["cached"], again["cached"]) == (False, True)
+
+        write_fixtures(3_000, tmp_path)
+        os.replace(tmp_path / "metrics_3000.parquet", fixture.config.metrics_path)
+        fresh = query_telemetry(dataset="metrics", aggregates=["count"])
+    assert fresh["rows"] == [{"count": 3_000}]
+    assert fresh["cached"] is False and fresh["plan_cached"] is True
+
+
+def test_rejects_invalid_queries_and_enforces_limits(tmp_path: Path) -> None:
+    fixture = write_fixtures(2_000, tmp_path)
+    with use_data_config(fixture.config):
+        unknown = query_telemetry(aggregates=["mean:latency_ms"])
+        assert "latency_ms" in unknown["error"] and "severity" in unknown["columns"]
+        assert "error" in query_telemetry(filters=["severity ~ ERROR"])
+        assert "error" in query_telemetry(dataset="users")
+        capped = query_telemetry(group_by=["message"], limit=500)
+    assert len(capped["rows"]) == 200 and capped["truncated"]
+
+    engine = QueryEngine(max_result_bytes=1_000)
+    source = engine.open_path("logs", fixture.config.logs_path)
+    small = engine.execute(AggregateQuery.parse("logs", group_by=["message"], limit=50), source)
+    assert small["truncated"] and 0 < len(small["rows"]) < 50
+    with pytest.raises(QueryError, match="time limit"):
+        QueryEngine(timeout_s=0).execute(AggregateQuery.parse("logs"), source)
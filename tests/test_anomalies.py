@@ -0,0 +1,87 @@
+"""Tests for vectorized anomaly detection and NAB scoring."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from it_ops_observability.anomalies import _ewm_mean
+from it_ops_observability.anomalies import detect_anomalies
+from it_ops_observability.anomalies import nab_score
+from it_ops_observability.tools import detect_metric_anomalies
+
+
+def _series(points: int = 24 * 14):
+    rng = np.random.default_rng(3)
+    index = np.arange(points)
+    timestamps = np.datetime64("2024-01-01T00:00", "ns") + index.astype("timedelta64[h]")
+    values = 50 + 10 * np.sin(2 * np.pi * index / 24) + rng.normal(0, 1, points)
+    values[200:203] += 40
+    return timestamps, values
+
+
+def test_ewm_mean_matches_recurrence() -> None:
+    x = np.random.default_rng(0).normal(size=10_000)
+    expected = np.empty_like(x)
+    expected[0] = x[0]
+    for t in range(1, x.size):
+        expected[t] = 0.01 * x[t] + 0.99 * expected[t - 1]
+    assert np.allclose(_ewm_mean(x, 0.01), expected)
+
+
+@pytest.mark.parametrize("detector", ["zscore", "ewma", "seasonal"])
+def test_detectors_flag_injected_incident(detector: str) -> None:
+    timestamps, values = _series()
+    windows = detect_anomalies(timestamps, values, detector=detector, threshold=4.0)
+    assert any(window.start <= timestamps[200] <= window.end for window in windows)
+
+
+def test_nab_score_bounds() -> None:
+    timestamps, _ = _series()
+    labels = [(timestamps[200], timestamps[210])]
+    perfect = np.zeros(timestamps.size, dtype=bool)
+    perfect[200] = True
+    late = np.zeros(timestamps.size, dtype=bool)
+    late[209] = True
+    stray = np.zeros(timestamps.size, dtype=bool)
+    stray[50] = True
+
+    assert nab_score(timestamps, perfect, labels)["normalized_score"] == pytest.approx(100.0)
+    assert nab_score(timestamps, np.zeros_like(perfect), labels)["normalized_score"] == 0.0
+    assert 0 < nab_score(timestamps, late, labels)["normalized_score"] < 100
+    assert nab_score(timestamps, stray, labels)["false_positives"] == 1
+
+
+def test_detect_metric_anomalies_tool_shape() -> None:
+    result = detect_metric_anomalies(hours=72, detector="ewma", threshold=2.0)
+    assert result["points_evaluated"] == 72
+    assert result["anomaly_count"] >= len(result["windows"])
+    assert detect_metric_anomalies(detector="unknown")["detectors"] == ["zscore", "ewma", "seasonal"]
+
+
+def test_detect_metric_anomalies_scores_each_server(tmp_path) -> None:
+    import pandas as pd
+
+    from it_ops_observability.data_sources import DataConfig
+    from it_ops_observability.tools import use_data_config
+
+    timestamps, values = _series()
+    calm = 50 + 10 * np.sin(2 * np.pi * np.arange(len(values)) / 24) + np.random.default_rng(4).normal(0, 1, len(values))
+    frame = pd.concat(
+        [
+            pd.DataFrame({"timestamp": timestamps, "server_id": "prod-db-01", "cpu_pct": values}),
+            pd.DataFrame({"timestamp": timestamps, "server_id": "prod-app-01", "cpu_pct": calm}),
+        ]
+    ).sort_values("timestamp", kind="stable")
+    path = tmp_path / "metrics.parquet"
+    frame.to_parquet(path)
+    with use_data_config(DataConfig(metrics_path=path)):
+        fleet = detect_metric_anomalies(hours=168)
+        one = detect_metric_anomalies(hours=168, server_id="prod-app-01")
+        missing = detect_metric_anomalies(server_id="prod-web-09")
+
+    assert fleet["points_evaluated"] == 2 * 168
+    assert [server["server_id"] for server in fleet["servers"]] == ["prod-app-01", "prod-db-01"]
+    assert {window["server_id"] for window in fleet["windows"]} == {"prod-db-01"}
+    assert any(window["start"] <= str(timestamps[201])[:19] <= window["end"] for window in fleet["windows"])
+    assert one["points_evaluated"] == 168 and one["anomaly_count"] == 0
+    assert missing["servers"] == ["prod-app-01", "prod-db-01"]
@@ -0,0 +1,103 @@
+"""Tests for the rate-limit-aware batch evaluation harness."""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from it_ops_observability.batch_evaluation import Scenario
+from it_ops_observability.batch_evaluation import TokenBucket
+from it_ops_observability.batch_evaluation import load_scenarios
+from it_ops_observability.batch_evaluation import run_batch
+from it_ops_observability.stats import percentile
+
+
+class _ResourceExhaustedError(Exception):
+    """Stand-in with the same class name ADK uses for Gemini quota errors."""
+
+
+def test_token_bucket_throttles_to_rate() -> None:
+    async def _drain() -> float:
+        bucket = TokenBucket(rate_per_minute=600, capacity=1)  # 10 tokens/s
+        started = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(_drain())
+    assert 0.25 <= elapsed < 1.0
+
+
+def test_token_bucket_waits_for_requests_larger_than_capacity() -> None:
+    async def _drain() -> float:
+        bucket = TokenBucket(rate_per_minute=120)  # 2 tokens/s, default capacity 2
+        started = time.monotonic()
+        for _ in range(2):
+            await bucket.acquire(3)  # calls_per_prompt=3 exceeds the default burst
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(_drain())
+    assert 1.9 <= elapsed < 3.0
+
+
+def test_percentile_nearest_rank() -> None:
+    values = [0.1 * i for i in range(1, 21)]
+    assert percentile(values, 50) == values[9]
+    assert percentile(values, 95) == values[18]
+    assert percentile([], 50) is None
+
+
+def test_load_scenarios_formats(tmp_path: Path) -> None:
+    (tmp_path / "a.json").write_text(json.dumps(["one", "two"]))
+    (tmp_path / "b.json").write_text(json.dumps({"name": "named", "prompts": ["three"]}))
+    (tmp_path / "c.txt").write_text("four\n\nfive\n")
+
+    scenarios = load_scenarios([tmp_path])
+
+    assert [(s.name, s.prompts) for s in scenarios] == [
+        ("a", ["one", "two"]),
+        ("named", ["three"]),
+        ("c", ["four", "five"]),
+    ]
+
+
+def test_run_batch_retries_quota_errors_and_resumes(tmp_path: Path) -> None:
+    checkpoint = tmp_path / "checkpoint.jsonl"
+    scenarios = [Scenario(f"s{i}", ["p1", "p2"]) for i in range(4)]
+    calls: Dict[str, int] = {}
+
+    async def _execute(scenario: Scenario, bucket: TokenBucket) -> List[float]:
+        calls[scenario.name] = calls.get(scenario.name, 0) + 1
+        if scenario.name == "s1" and calls["s1"] == 1:
+            raise _ResourceExhaustedError("429 quota")
+        if scenario.name == "s3":
+            raise RuntimeError("boom")
+        for _ in scenario.prompts:
+            await bucket.acquire()
+        return [0.01, 0.02]
+
+    report = asyncio.run(
+        run_batch(
+            scenarios,
+            _execute,
+            requests_per_minute=60_000,
+            burst=10,
+            max_concurrency=2,
+            backoff_base_s=0.01,
+            checkpoint=checkpoint,
+        )
+    )
+
+    assert report["scenarios_ok"] == 3
+    assert report["scenarios_failed"] == 1
+    assert report["retries"] == 1
+    assert calls["s1"] == 2
+    assert report["prompt_p95_s"] == 0.02
+
+    calls.clear()
+    resumed = asyncio.run(run_batch(scenarios, _execute, requests_per_minute=60_000, checkpoint=checkpoint))
+
+    assert resumed["scenarios_resumed"] == 3
+    assert set(calls) == {"s3"}
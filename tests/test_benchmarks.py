@@ -0,0 +1,33 @@
+"""Tests for the hot-path benchmark suite and regression gate."""
+from __future__ import annotations
+
+import copy
+from pathlib import Path
+
+from it_ops_observability.benchmarks import compare
+from it_ops_observability.benchmarks import load_report
+from it_ops_observability.benchmarks import run_suite
+from it_ops_observability.benchmarks import save_report
+from it_ops_observability.benchmarks import write_fixtures
+from it_ops_observability.data_sources import fetch_logs
+
+
+def test_fixtures_feed_fetch_logs(tmp_path: Path) -> None:
+    fixture = write_fixtures(400, tmp_path)
+    raw = fetch_logs("prod-app-01", window_minutes=fixture.rows * 5, config=fixture.config)
+    assert raw == fixture.log_text
+    assert raw.splitlines()[0].endswith(("timeout", "95%", "Gateway", "open", "cluster", "increasing", "passed", "polling", "completed"))
+
+
+def test_suite_reports_percentiles_and_gates_regressions(tmp_path: Path) -> None:
+    report = run_suite(["10k"], cases=["parse_logs", "summarize_utilization"], repeat=2, workdir=tmp_path)
+    result = report["results"]["parse_logs@10k"]
+    assert result["p50_ms"] <= result["p99_ms"] and result["rows_per_s"] > 0 and result["peak_mb"] > 0
+
+    baseline = load_report(save_report(report, tmp_path / "baseline.json"))
+    assert compare(report, baseline) == []
+    slower = copy.deepcopy(report)
+    slower["results"]["parse_logs@10k"]["p50_ms"] *= 1.5
+    regressions = compare(slower, baseline, latency_threshold_pct=20)
+    assert [(r.case, r.measure) for r in regressions] == [("parse_logs@10k", "p50_ms")]
+    assert compare(slower, baseline, latency_threshold_pct=60) == []
@@ -0,0 +1,86 @@
+"""Import-time budget and warm-up tests for cold starts."""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+import pandas as pd
+
+from it_ops_observability import data_sources
+from it_ops_observability.data_sources import DataConfig
+from it_ops_observability.warmup import warm_up
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+# Lightweight imports must stay well under the cost of pandas or google.adk.
+IMPORT_BUDGET_S = 0.5
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "google.adk", "google.genai")
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import it_ops_observability
+import it_ops_observability.synthetic
+from it_ops_observability.dashboard import parse_logs
+from it_ops_observability.tools import fetch_server_logs
+elapsed = time.perf_counter() - started
+print(json.dumps({"elapsed_s": elapsed, "modules": sorted(m for m in sys.modules if m.startswith(tuple(sys.argv[1:])))}))
+"""
+
+
+def test_light_imports_skip_heavy_dependencies() -> None:
+    env = {**os.environ, "PYTHONPATH": str(PROJECT_ROOT / "src")}
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE, *HEAVY_MODULES],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=env,
+    ).stdout
+    result = json.loads(output)
+    assert result["modules"] == []
+    assert result["elapsed_s"] < IMPORT_BUDGET_S
+
+
+def test_frame_cache_reloads_only_when_file_changes(tmp_path: Path) -> None:
+    path = tmp_path / "metrics.parquet"
+    pd.DataFrame({"cpu_pct": [10.0], "memory_pct": [20.0]}).to_parquet(path)
+    first = data_sources.read_frame(path)
+    assert data_sources.read_frame(path) is first
+
+    pd.DataFrame({"cpu_pct": [10.0, 90.0], "memory_pct": [20.0, 80.0]}).to_parquet(path)
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000_000))
+    assert len(data_sources.read_frame(path)) == 2
+
+
+def test_warm_up_preloads_datasets(tmp_path: Path) -> None:
+    path = tmp_path / "tickets.parquet"
+    pd.DataFrame([{"subject": "Disk", "body": "full"}]).to_parquet(path)
+    from it_ops_observability.agent import AgentSettings
+
+    report = warm_up(AgentSettings(model_name="offline", data_config=DataConfig(tickets_path=path)))
+    assert report.datasets == [str(path)]
+    assert {"preload_datasets", "build_agent"} <= set(report.timings_ms)
+    assert path in data_sources._FRAME_CACHE
+
+
+def test_warm_up_once_runs_once_per_process(monkeypatch) -> None:
+    from it_ops_observability import warmup
+
+    calls = []
+    monkeypatch.setattr(warmup, "_REPORT", None)
+    monkeypatch.setattr(warmup, "warm_up", lambda: calls.append(1) or warmup.WarmupReport())
+    first = warmup.warm_up_once()
+    assert warmup.warm_up_once() is first and calls == [1]
+
+
+def test_benchmark_harnesses_skip_adk() -> None:
+    probe = (
+        "import sys, it_ops_observability.benchmarks, it_ops_observability.load_test;"
+        "print(any(m.startswith('google.adk') for m in sys.modules))"
+    )
+    env = {**os.environ, "PYTHONPATH": str(PROJECT_ROOT / "src")}
+    output = subprocess.run([sys.executable, "-c", probe], check=True, capture_output=True, text=True, env=env).stdout
+    assert output.strip() == "False"
@@ -0,0 +1,94 @@
+"""Tests for session history compaction."""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from google.adk.models.llm_request import LlmRequest
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from it_ops_observability import AgentSettings, create_supervisor_agent
+from it_ops_observability.compaction import SessionCompactor
+from it_ops_observability.streaming import stream_supervisor_items
+
+SCENARIO = [
+    "Investigate error spikes on prod-app-01 over the last 4 hours.",
+    "Summarize CPU and memory utilization trends for the past day.",
+    "Draft a mitigation plan and customer update.",
+    "What changed in the logs since the first prompt?",
+]
+LOG_TEXT = "\n".join(
+    f"2024-01-01T00:{minute:02d}:00Z [{'ERROR' if minute % 3 else 'INFO'}] prod-app-01: request {minute} timed out"
+    for minute in range(60)
+)
+
+
+def _prompt(text: str) -> types.Content:
+    return types.Content(role="user", parts=[types.Part.from_text(text=text)])
+
+
+def test_old_tool_output_is_digested_without_touching_the_session() -> None:
+    response = types.Part.from_function_response(name="fetch_server_logs", response={"result": LOG_TEXT})
+    contents = [
+        _prompt("Check prod-app-01 logs."),
+        types.Content(role="model", parts=[types.Part.from_function_call(name="fetch_server_logs", args={})]),
+        types.Content(role="user", parts=[response]),
+        types.Content(role="model", parts=[types.Part.from_text(text="Timeouts dominate.")]),
+        _prompt("Any change since then?"),
+    ]
+    request = LlmRequest(contents=list(contents))
+    compactor = SessionCompactor(threshold_tokens=200)
+    compactor.before_model(SimpleNamespace(agent_name="log_analyst", invocation_id="i-1"), request)
+
+    compacted = request.contents[2].parts[0].function_response.response
+    assert compacted["compacted"] and compacted["digest"]["lines"] == 60
+    assert compacted["digest"]["severity_counts"] == {"ERROR": 40, "INFO": 20}
+    assert contents[2].parts[0] is response and response.function_response.response == {"result": LOG_TEXT}
+    assert request.contents[-1] is contents[-1]
+
+    recalled = compactor.recall_tool_result(compacted["ref"])
+    assert recalled["tool"] == "fetch_server_logs" and recalled["result"] == {"result": LOG_TEXT}
+    assert "error" in compactor.recall_tool_result("tr-missing")
+    # Another session's compactor can neither list nor recall this output.
+    other = SessionCompactor(threshold_tokens=200)
+    assert other.recall_tool_result() == {"available": []}
+    assert "error" in other.recall_tool_result(compacted["ref"])
+    (record,) = compactor.records
+    assert record.turn == 2 and record.digested == 1 and record.tokens_after < record.tokens_before / 4
+
+
+def test_offline_scenario_reports_smaller_prompts_per_turn() -> None:
+    compactor = SessionCompactor(threshold_tokens=1_500)
+    requests = []
+
+    def _capture(callback_context, llm_request) -> None:
+        requests.append(list(llm_request.contents))
+
+    agent = create_supervisor_agent(AgentSettings(model_name="offline", compactor=compactor))
+    for node in [agent, *agent.sub_agents]:
+        node.before_model_callback = [*node.before_model_callback, _capture]
+    runner = InMemoryRunner(agent=agent)
+
+    async def _run() -> None:
+        try:
+            async for _ in stream_supervisor_items(runner, SCENARIO):
+                pass
+        finally:
+            await runner.close()
+
+    asyncio.run(_run())
+
+    report = compactor.turn_report()
+    assert [row["turn"] for row in report] == [1, 2, 3, 4]
+    assert report[0]["tokens_after"] == report[0]["tokens_before"]
+    for row in report[1:]:
+        assert row["tokens_after"] < row["tokens_before"] / 2
+    assert report[-1]["peak_tokens_after"] < report[-1]["peak_tokens_before"] / 2
+
+    summary = requests[-1][0].parts[0].text
+    assert summary.startswith("Summary of earlier turns") and SCENARIO[0] in summary
+    ref = summary.split("fetch_server_logs (ref ", 1)[1].split(")", 1)[0]
+    assert "[WARN]" in compactor.recall_tool_result(ref)["result"]["result"]
+    recall = next(tool for tool in agent.sub_agents[0].tools if getattr(tool, "name", "") == "recall_tool_result")
+    assert recall.func(ref) == compactor.recall_tool_result(ref)
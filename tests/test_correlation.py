@@ -0,0 +1,72 @@
+"""Tests for cross-signal correlation between log bursts and metric spikes."""
+from __future__ import annotations
+
+import numpy as np
+
+from it_ops_observability.correlation import TimeGrid
+from it_ops_observability.correlation import count_matrix
+from it_ops_observability.correlation import lagged_correlation
+from it_ops_observability.correlation import mean_matrix
+from it_ops_observability.correlation import rank_evidence
+from it_ops_observability.tools import correlate_signals
+
+
+def test_grid_buckets_and_fills_coarse_metrics() -> None:
+    grid = TimeGrid.covering(np.datetime64("2024-01-01T05:59"), hours=6, bucket_minutes=60)
+    stamps = np.array(["2024-01-01T00:10", "2024-01-01T00:20", "2024-01-01T03:00", "2023-12-31T23:00"], dtype="datetime64[ns]")
+    counts = count_matrix(grid, stamps, np.array([0, 0, 1, 0]), 2)
+    assert counts.tolist() == [[2, 0, 0, 0, 0, 0], [0, 0, 0, 1, 0, 0]]
+
+    means = mean_matrix(grid, stamps[1:3], np.array([10.0, 30.0]), np.array([0, 0]), 1)
+    assert means.tolist() == [[10.0, 10.0, 10.0, 30.0, 30.0, 30.0]]
+
+
+def test_lagged_correlation_finds_leading_signal() -> None:
+    rng = np.random.default_rng(1)
+    logs = rng.poisson(1.0, size=(2, 200)).astype(float)
+    metric = np.roll(logs[0], 2)[np.newaxis, :] * 10 + rng.normal(0, 0.5, 200)
+    corr, lag = lagged_correlation(logs, metric, max_lag=3)
+    assert lag[0, 0] == 2 and corr[0, 0] > 0.9
+    assert corr[1, 0] < 0.3
+
+
+def test_rank_evidence_puts_driving_signal_first() -> None:
+    rng = np.random.default_rng(2)
+    logs = rng.poisson(0.3, size=(3, 96)).astype(float)
+    logs[1] = 0
+    logs[1, [10, 40, 70]] = 8
+    metric = 40 + rng.normal(0, 1, size=(1, 96))
+    metric[0, [11, 41, 71]] += 30
+    pairs = rank_evidence(["a", "timeouts", "c"], ["cpu_pct"], logs, metric, bucket_minutes=15, max_lag=2)
+    top = pairs[0]
+    assert top["log_signal"] == "timeouts"
+    assert top["lag_minutes"] == 15 and top["co_occurrences"] == 3 and top["precision"] == 1.0
+
+
+def test_correlate_signals_tool_returns_ranked_pairs() -> None:
+    result = correlate_signals(hours=24, bucket_minutes=30, top_n=5)
+    assert result["metrics"] and result["servers"]
+    scores = [pair["score"] for pair in result["evidence"]]
+    assert 0 < len(scores) <= 5 and scores == sorted(scores, reverse=True)
+    assert "error" in correlate_signals(group_by="host")
+
+
+def test_fleet_log_lines_cut_the_window_before_parsing(tmp_path) -> None:
+    import pandas as pd
+
+    from it_ops_observability.data_sources import DataConfig
+    from it_ops_observability.tools import _fleet_log_lines
+
+    stamps = pd.date_range("2024-01-01", periods=48 * 12, freq="5min")
+    servers = ["prod-app-01", "prod-db-01"] * (len(stamps) // 2)
+    lines = [f"{stamp:%Y-%m-%dT%H:%M:%S}Z [INFO] {server}: ok" for stamp, server in zip(stamps, servers)]
+    path = tmp_path / "logs.parquet"
+    pd.DataFrame({"server_id": servers, "message": lines}).to_parquet(path)
+    config = DataConfig(logs_path=path)
+
+    recent = _fleet_log_lines(config, None, 60)
+    assert [line for _, line in recent] == lines[-12:]
+    assert {server for server, _ in _fleet_log_lines(config, ["prod-db-01"], 60)} == {"prod-db-01"}
+
+    pd.DataFrame({"timestamp": stamps, "server_id": servers, "message": ["ok"] * len(stamps)}).to_parquet(path)
+    assert len(_fleet_log_lines(config, None, 120)) == 24
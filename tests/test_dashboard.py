@@ -74,3 +74,23 @@ def test_build_dashboard_snapshot_aggregates_sources(monkeypatch: pytest.MonkeyP
     assert snapshot["digest"].startswith("Subject: Synthetic Incident")
     assert snapshot["severity_counts"] == {"ERROR": 1}
     assert snapshot["logs"][0]["level"] == "ERROR"
+
+
+def test_snapshot_honours_the_active_data_config(tmp_path) -> None:
+    import pandas as pd
+
+    from it_ops_observability.dashboard import snapshot_cache_key
+    from it_ops_observability.data_sources import DataConfig
+    from it_ops_observability.tools import use_data_config
+
+    logs = tmp_path / "logs.parquet"
+    line = "2025-11-29T16:30:00Z [ERROR] prod-app-01: Custom dataset line"
+    pd.DataFrame({"server_id": ["prod-app-01"], "message": [line]}).to_parquet(logs)
+    custom = DataConfig(logs_path=logs)
+
+    default_key = snapshot_cache_key("prod-app-01", 240)
+    with use_data_config(custom):
+        snapshot = build_dashboard_snapshot("prod-app-01", 240)
+        assert snapshot_cache_key("prod-app-01", 240) == snapshot_cache_key("prod-app-01", 240, custom)
+        assert snapshot_cache_key("prod-app-01", 240) != default_key
+    assert [row["message"] for row in cast(Any, snapshot["logs"])] == ["Custom dataset line"]
@@ -0,0 +1,50 @@
+"""Tests for context-scoped data configuration."""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from it_ops_observability.data_sources import DEFAULT_CONFIG
+from it_ops_observability.data_sources import DataConfig
+from it_ops_observability.tools import _ACTIVE_CONFIG
+from it_ops_observability.tools import build_data_tools
+from it_ops_observability.tools import set_data_config
+from it_ops_observability.tools import use_data_config
+
+
+def _ticket_config(tmp_path: Path, subject: str) -> DataConfig:
+    path = tmp_path / f"{subject}.parquet"
+    pd.DataFrame([{"subject": subject, "body": "details"}]).to_parquet(path)
+    return DataConfig(tickets_path=path)
+
+
+def test_bound_tools_do_not_leak_between_threads(tmp_path: Path) -> None:
+    configs = {name: _ticket_config(tmp_path, name) for name in ("tenant-a", "tenant-b")}
+    ticket_tools = {name: build_data_tools(config=config)[2].func for name, config in configs.items()}
+
+    def _call(name: str) -> str:
+        return ticket_tools[name]()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        names = ["tenant-a", "tenant-b"] * 20
+        results = list(pool.map(_call, names))
+
+    for name, result in zip(names, results):
+        assert result.startswith(f"Subject: {name}")
+    assert _ACTIVE_CONFIG.get() is DEFAULT_CONFIG
+
+
+def test_use_data_config_restores_previous(tmp_path: Path) -> None:
+    config = _ticket_config(tmp_path, "scoped")
+    with use_data_config(config) as active:
+        assert active is config
+    assert _ACTIVE_CONFIG.get() is DEFAULT_CONFIG
+
+
+def test_set_data_config_is_thread_local(tmp_path: Path) -> None:
+    config = _ticket_config(tmp_path, "worker")
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pool.submit(set_data_config, config).result()
+    assert _ACTIVE_CONFIG.get() is DEFAULT_CONFIG
@@ -0,0 +1,119 @@
+"""Tests for batched capacity forecasting."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from it_ops_observability.data_sources import DataConfig
+from it_ops_observability.forecasting import FLEET_FORECASTER
+from it_ops_observability.forecasting import HoltWintersModel
+from it_ops_observability.forecasting import LinearSeasonalModel
+from it_ops_observability.forecasting import holdout_mape
+from it_ops_observability.tools import forecast_utilization
+from it_ops_observability.tools import use_data_config
+
+
+def _fleet(servers: int = 50, hours: int = 24 * 10) -> np.ndarray:
+    rng = np.random.default_rng(5)
+    t = np.arange(hours)
+    return 50 + 15 * np.sin(2 * np.pi * t / 24 + rng.uniform(0, 6, (servers, 1))) + rng.normal(0, 1, (servers, hours))
+
+
+@pytest.mark.parametrize("model", ["holt_winters", "linear_seasonal"])
+def test_holdout_mape_meets_target_on_seasonal_fleet(model: str) -> None:
+    assert holdout_mape(_fleet(), model=model)["mape_pct"] < 15.0
+
+
+def test_incremental_update_matches_full_fit() -> None:
+    values = _fleet()
+    incremental = LinearSeasonalModel().fit(values[:, :200]).update(values[:, 200:])
+    assert np.allclose(incremental.forecast(), LinearSeasonalModel().fit(values).forecast())
+
+    hw = HoltWintersModel().fit(values[:, :200])
+    params = hw.params.copy()
+    hw.update(values[:, 200:])
+    assert hw.n_obs == values.shape[1]
+    assert np.array_equal(hw.params, params)
+
+
+def test_forecast_tool_caches_and_updates(tmp_path: Path) -> None:
+    values = _fleet(servers=2, hours=24 * 6)
+    start = pd.Timestamp("2024-01-01")
+    rows = [
+        {"timestamp": start + pd.Timedelta(hours=hour), "server_id": f"srv-{server}", "cpu_pct": values[server, hour], "memory_pct": 40.0}
+        for hour in range(values.shape[1])
+        for server in range(2)
+    ]
+    path = tmp_path / "metrics.parquet"
+    FLEET_FORECASTER.clear()
+    with use_data_config(DataConfig(metrics_path=path)):
+        pd.DataFrame(rows[:-2]).to_parquet(path)
+        first = forecast_utilization(history_hours=len(rows))
+        again = forecast_utilization(history_hours=len(rows))
+        pd.DataFrame(rows).to_parquet(path)
+        updated = forecast_utilization(history_hours=len(rows))
+
+    assert (first["fit_mode"], again["fit_mode"], updated["fit_mode"]) == ("full", "cached", "incremental")
+    assert updated["series_forecast"] == 2
+    assert len(updated["servers"][0]["forecast_pct"]) == 24
+
+
+def test_forecast_history_is_a_time_window_per_server(tmp_path: Path) -> None:
+    hours = 24 * 20
+    stamps = pd.date_range("2024-01-01", periods=hours, freq="h", tz="UTC")
+    values = _fleet(servers=10, hours=hours)
+    frame = pd.DataFrame(
+        [
+            {"timestamp": stamps[hour], "server_id": f"srv-{server:02d}", "cpu_pct": values[server, hour]}
+            for hour in range(hours)
+            for server in range(10)
+        ]
+    )
+    path = tmp_path / "fleet.parquet"
+    frame.to_parquet(path)
+    FLEET_FORECASTER.clear()
+    with use_data_config(DataConfig(metrics_path=path)):
+        week = forecast_utilization(history_hours=168)
+        fortnight = forecast_utilization(history_hours=336)
+
+    assert (week["history_points"], week["series_forecast"]) == (168, 10)
+    assert fortnight["history_points"] == 336 and fortnight["fit_mode"] == "full"
+
+
+def test_forecast_tool_refits_rewritten_history_and_swapped_servers(tmp_path: Path, monkeypatch) -> None:
+    from it_ops_observability import forecasting
+
+    values = _fleet(servers=2, hours=24 * 6)
+    stamps = pd.date_range("2024-01-01", periods=values.shape[1], freq="h")
+
+    def _write(names: list, data: np.ndarray) -> None:
+        pd.DataFrame(
+            [
+                {"timestamp": stamps[hour], "server_id": names[server], "cpu_pct": data[server, hour]}
+                for hour in range(data.shape[1])
+                for server in range(len(names))
+            ]
+        ).to_parquet(path)
+
+    scored = []
+    monkeypatch.setattr(forecasting, "holdout_mape", lambda *a, **k: scored.append(k) or {"mape_pct": 1.0})
+    path = tmp_path / "metrics.parquet"
+    FLEET_FORECASTER.clear()
+    with use_data_config(DataConfig(metrics_path=path)):
+        _write(["srv-a", "srv-b"], values)
+        modes = [forecast_utilization(history_hours=1000)["fit_mode"] for _ in range(2)]
+        assert len(scored) == 1  # the hold-out score is computed once per full fit
+
+        edited = values.copy()
+        edited[0, 10] += 20.0
+        _write(["srv-a", "srv-b"], edited)
+        modes.append(forecast_utilization(history_hours=1000)["fit_mode"])
+        _write(["srv-a", "srv-c"], edited)
+        modes.append(forecast_utilization(history_hours=1000)["fit_mode"])
+        assert "error" in forecast_utilization(horizon_hours=0)
+
+    assert modes == ["full", "cached", "full", "full"]
+    assert len(scored) == 3
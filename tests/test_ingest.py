@@ -0,0 +1,72 @@
+"""Tests for the live log-directory ingester."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from it_ops_observability.data_sources import data_version
+from it_ops_observability.data_sources import fetch_logs
+from it_ops_observability.data_sources import read_frame
+from it_ops_observability.data_sources import summarize_metrics
+from it_ops_observability.ingest import DirectoryIngester
+from it_ops_observability.ingest import store_config
+
+
+def _line(minute: int, message: str) -> str:
+    return f"2024-01-01T00:{minute:02d}:00Z [INFO] prod-app-01: {message}\n"
+
+
+def test_tails_appends_rotation_and_truncation(tmp_path: Path) -> None:
+    source, store = tmp_path / "source", tmp_path / "store"
+    source.mkdir()
+    log = source / "prod-app-01.log"
+    log.write_text(_line(0, "a") + _line(5, "b") + "2024-01-01T00:10:00Z [INFO] prod-app-01: par")
+    (source / "host.csv").write_text("timestamp,cpu_pct,memory_pct\n2024-01-01T00:00:00Z,10,20\n")
+    ingester = DirectoryIngester(source, store, flush_interval_s=0, fsync=False)
+    config = store_config(store)
+
+    assert ingester.poll() == 3
+    assert fetch_logs("prod-app-01", config=config).splitlines() == [_line(0, "a").strip(), _line(5, "b").strip()]
+    version = data_version(config)
+    first = read_frame(config.logs_path)
+
+    # Finish the partial line, then rotate: the old inode is drained from `.1`.
+    with open(log, "a") as handle:
+        handle.write("tial\n")
+    os.replace(log, source / "prod-app-01.log.1")
+    log.write_text(_line(15, "c"))
+    assert ingester.poll() == 2
+    assert ingester.stats.rotations == 1
+    assert data_version(config) != version
+    lines = fetch_logs("prod-app-01", config=config).splitlines()
+    assert [line.rsplit(" ", 1)[-1] for line in lines] == ["a", "b", "partial", "c"]
+    assert read_frame(config.logs_path) is not first
+
+    # Same-size rewrite of the metrics file is still detected as a truncation.
+    (source / "host.csv").write_text("timestamp,cpu_pct,memory_pct\n2024-01-01T01:00:00Z,30,40\n")
+    assert ingester.poll() == 1
+    assert ingester.stats.truncations == 1
+    assert summarize_metrics(config=config)["cpu_pct"].tolist() == [10, 30]
+
+
+def test_recovers_unflushed_lines_without_duplicates(tmp_path: Path) -> None:
+    source, store = tmp_path / "source", tmp_path / "store"
+    source.mkdir()
+    log = source / "prod-app-01.log"
+    log.write_text(_line(0, "a"))
+    ingester = DirectoryIngester(source, store, flush_interval_s=0, fsync=False)
+    ingester.poll()
+
+    with open(log, "a") as handle:
+        handle.write(_line(5, "b"))
+    ingester.flush_interval_s = 3600
+    assert ingester.poll() == 1
+    ingester._wal.close()  # simulate a crash: the line is only in the write-ahead file
+
+    restarted = DirectoryIngester(source, store, fsync=False)
+    assert restarted.poll() == 0
+    restarted.close()
+    lines = fetch_logs("prod-app-01", config=store_config(store)).splitlines()
+    assert [line.rsplit(" ", 1)[-1] for line in lines] == ["a", "b"]
+    assert restarted.version == 2
+    assert not list((store / "_wal").iterdir())
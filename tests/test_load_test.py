@@ -0,0 +1,67 @@
+"""Tests for the dashboard load-test harness."""
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+import threading
+
+from it_ops_observability.benchmarks import write_fixtures
+from it_ops_observability.load_test import LoadTestConfig
+from it_ops_observability.load_test import http_target
+from it_ops_observability.load_test import process_usage
+from it_ops_observability.load_test import recommend_concurrency
+from it_ops_observability.load_test import run_load_test
+from it_ops_observability.load_test import snapshot_target
+from it_ops_observability.load_test import sweep
+from it_ops_observability.shared_cache import SharedCache
+
+
+def test_snapshot_sweep_reports_latency_resources_and_a_recommendation(tmp_path: Path) -> None:
+    fixture = write_fixtures(2_000, tmp_path)
+    target = snapshot_target(fixture.config, cache=SharedCache(tmp_path / "cache.sqlite"))
+    config = LoadTestConfig(duration_s=0.6, think_time_s=0.01, sample_interval_s=0.2, seed=7)
+    reports = sweep(target, [1, 3], config)
+
+    assert [report["users"] for report in reports] == [1, 3]
+    for report in reports:
+        assert report["requests"] > 0 and report["errors"] == {} and report["error_rate"] == 0
+        latency = report["latency_ms"]
+        assert 0 < latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["max"]
+        assert sum(window["requests"] for window in report["latency_ms_by_window"].values()) == report["requests"]
+        assert len(report["timeline"]) >= 3 and report["rss_mb_max"] > 0
+        assert sum(row["requests"] for row in report["timeline"]) == report["requests"]
+    assert recommend_concurrency(reports, p95_budget_ms=60_000) == 3
+    assert recommend_concurrency(reports, p95_budget_ms=0) is None
+
+
+def test_http_target_counts_failures_and_samples_another_process() -> None:
+    class _Handler(BaseHTTPRequestHandler):
+        calls = 0
+
+        def do_GET(self) -> None:
+            _Handler.calls += 1
+            self.send_response(500 if _Handler.calls % 2 else 200)
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/_stcore/health"
+        report = run_load_test(
+            http_target(url), LoadTestConfig(users=2, duration_s=0.4, think_time_s=0.02, sample_interval_s=0.1), label="http"
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert report["target"] == "http" and set(report["errors"]) == {"HTTPError"}
+    assert 0 < report["error_rate"] < 1
+    assert recommend_concurrency([report], p95_budget_ms=60_000) is None
+
+    cpu_s, rss_mb = process_usage(1)
+    assert cpu_s >= 0 and (rss_mb is None or rss_mb >= 0)
@@ -0,0 +1,124 @@
+"""Tests for the persistent log search index and tool."""
+from __future__ import annotations
+
+from pathlib import Path
+
+from it_ops_observability.data_sources import DataConfig
+from it_ops_observability.log_index import LogIndex
+from it_ops_observability.tools import search_logs
+from it_ops_observability.tools import use_data_config
+
+LINES = [
+    ("2024-03-01T10:00:00Z", "prod-app-01", "2024-03-01T10:00:00Z [ERROR] prod-app-01: Service mesh circuit breaker open"),
+    ("2024-03-01T11:00:00Z", "prod-app-02", "2024-03-01T11:00:00Z [ERROR] prod-app-02: Service mesh circuit breaker open"),
+    ("2024-03-02T09:00:00Z", "prod-app-01", "2024-03-02T09:00:00Z [CRITICAL] prod-app-01: Disk saturation beyond 95%"),
+    ("2024-03-03T08:00:00Z", "prod-db-01", "2024-03-03T08:00:00Z [INFO] prod-db-01: Health check passed in 12ms"),
+]
+
+
+def _index(root: Path) -> LogIndex:
+    index = LogIndex(root)
+    index.append(LINES)
+    return index
+
+
+def test_search_counts_and_latest_hits(tmp_path: Path) -> None:
+    index = _index(tmp_path)
+    assert index.segment_count == 3  # one per daily partition
+
+    result = index.search("circuit breaker open", limit=1)
+    assert result["total_hits"] == 2
+    assert {entry["server_id"] for entry in result["servers"]} == {"prod-app-01", "prod-app-02"}
+    assert result["hits"][0]["server_id"] == "prod-app-02"
+    assert index.search("breaker disk", match="any")["total_hits"] == 3
+    assert index.search("breaker disk")["total_hits"] == 0
+
+
+def test_search_filters_prune_segments(tmp_path: Path) -> None:
+    index = _index(tmp_path)
+    result = index.search("breaker", servers=["prod-app-01"], end="2024-03-01T23:59:59")
+    assert result["total_hits"] == 1
+    assert result["segments_scanned"] == 1
+    assert index.search("disk saturation", severities=["info"])["total_hits"] == 0
+    late = index.search("disk saturation", start="2024-03-03T00:00:00")
+    assert (late["total_hits"], late["segments_scanned"]) == (0, 1)
+
+
+def test_incremental_append_is_visible_after_refresh(tmp_path: Path) -> None:
+    reader = _index(tmp_path)
+    writer = LogIndex(tmp_path)
+    writer.append([("2024-03-03T09:00:00Z", "prod-db-01", "2024-03-03T09:00:00Z [ERROR] prod-db-01: Disk saturation beyond 99%")])
+    reader.refresh()
+    assert reader.search("disk saturation")["total_hits"] == 2
+    assert LogIndex(tmp_path).line_count == len(LINES) + 1
+
+
+def test_concurrent_writers_keep_each_others_segments(tmp_path: Path) -> None:
+    first, second = LogIndex(tmp_path), LogIndex(tmp_path)
+    first.append(LINES[:2])
+    second.append(LINES[2:])  # never refreshed: must not drop the first writer's segments
+    first.append([("2024-03-01T12:00:00Z", "prod-db-01", "2024-03-01T12:00:00Z [ERROR] prod-db-01: Disk saturation beyond 99%")])
+    merged = LogIndex(tmp_path)
+    assert merged.line_count == len(LINES) + 1
+    assert len({entry["path"] for entry in merged._entries}) == merged.segment_count == 4
+    assert merged.search("disk saturation")["total_hits"] == 2
+
+
+def test_search_logs_tool_uses_configured_index(tmp_path: Path) -> None:
+    _index(tmp_path / "index")
+    with use_data_config(DataConfig(log_index_path=tmp_path / "index")):
+        result = search_logs("circuit breaker open", servers=["prod-app-01"])
+    assert result["indexed_lines"] == len(LINES)
+    assert result["total_hits"] == 1
+    assert search_logs("breaker", match="fuzzy")["match_modes"] == ["all", "any"]
+
+
+def test_search_logs_appends_new_store_parts_to_one_cached_index(tmp_path: Path, monkeypatch) -> None:
+    import json
+
+    import pandas as pd
+
+    from it_ops_observability import tools
+
+    monkeypatch.setenv("IT_OPS_CACHE_DIR", str(tmp_path / "cache"))
+    logs = tmp_path / "store" / "logs"
+    logs.mkdir(parents=True)
+
+    def _flush(seq: int, rows: list) -> None:
+        frame = pd.DataFrame({"server_id": [row[1] for row in rows], "message": [row[2] for row in rows]})
+        frame.to_parquet(logs / f"part-{seq:08d}.parquet")
+        version[0] += 1
+        (logs.parent / "_version").write_text(json.dumps({"version": version[0]}), encoding="utf-8")
+
+    version = [0]
+    config = DataConfig(logs_path=logs)
+    _flush(0, LINES[:2])
+    with use_data_config(config):
+        assert search_logs("breaker")["total_hits"] == 2
+        first_segments = tools._log_index_for(config).segment_count
+        _flush(1, LINES[2:])
+        result = search_logs("disk saturation")
+        assert (result["total_hits"], result["indexed_lines"]) == (1, len(LINES))
+        # Only the new part was indexed: the first flush's segments were kept.
+        assert tools._log_index_for(config).segment_count == first_segments + 2
+
+        _flush(0, LINES[3:])  # history rewritten in place: rebuild rather than append
+        assert search_logs("breaker")["total_hits"] == 0
+        assert search_logs("disk saturation")["indexed_lines"] == 1 + len(LINES[2:])
+    assert len(list((tmp_path / "cache" / "log_index").iterdir())) == 1
+
+
+def test_synthetic_index_directory_is_removed_at_exit(tmp_path: Path) -> None:
+    import os
+    import subprocess
+    import sys
+
+    script = (
+        "from it_ops_observability import tools\n"
+        "tools.search_logs('timeout')\n"
+        "print(tools._LOG_INDEXES['synthetic'][1].root)\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(Path(__file__).resolve().parents[1] / "src"), "TMPDIR": str(tmp_path)}
+    output = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True)
+    root = Path(output.stdout.strip())
+    assert root.parent == tmp_path and not root.exists()
@@ -0,0 +1,55 @@
+"""Tests for the dictionary-encoded log batch."""
+from __future__ import annotations
+
+import pickle
+import sys
+
+from it_ops_observability.log_records import LogBatch
+from it_ops_observability.synthetic import generate_mock_logs
+
+
+def _dict_rows_bytes(rows) -> int:
+    return sum(sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row.values()) for row in rows)
+
+
+def test_rows_round_trip_source_text() -> None:
+    raw = "\n".join(
+        [
+            "2025-11-29T16:30:00Z [warn] prod-app-01: Replica lag increasing",
+            "2025-11-29T16:35:00.250000Z [ERROR] prod-db-01: Database connection timeout",
+            "2025-11-29T16:40:00+02:00 [INFO] Health check passed",
+            "not-a-time [INFO] prod-app-01: Health check passed",
+        ]
+    )
+    batch = LogBatch.from_text(raw)
+    assert [row["timestamp"] for row in batch] == [line.split(" [")[0] for line in raw.splitlines()]
+    assert batch[1] == {
+        "timestamp": "2025-11-29T16:35:00.250000Z",
+        "level": "ERROR",
+        "component": "prod-db-01",
+        "message": "Database connection timeout",
+    }
+    assert batch[-1]["component"] == "prod-app-01" and batch[1:3][1]["component"] == ""
+    assert batch.categories("message") == ["Replica lag increasing", "Database connection timeout", "Health check passed"]
+    assert batch.level_counts() == {"WARN": 1, "ERROR": 1, "INFO": 2}
+
+    restored = pickle.loads(pickle.dumps(batch))
+    assert restored.to_records() == batch.to_records()
+    assert pickle.loads(pickle.dumps(LogBatch())).to_records() == []
+
+
+def test_batch_is_much_smaller_than_row_dicts() -> None:
+    raw = "\n".join(generate_mock_logs(server, window_minutes=20_000) for server in ("prod-app-01", "prod-db-01"))
+    batch = LogBatch.from_text(raw)
+    assert len(batch) == 8000
+    assert _dict_rows_bytes(batch.to_records()) >= 10 * batch.nbytes
+
+
+def test_to_frame_uses_categorical_columns() -> None:
+    batch = LogBatch.from_text(generate_mock_logs("prod-app-01", window_minutes=600))
+    frame = batch.to_frame()
+    assert len(frame) == len(batch)
+    assert str(frame["level"].dtype) == "category"
+    assert str(frame["timestamp"].dtype) == "datetime64[ns, UTC]"
+    assert frame["message"].tolist() == batch.column("message")
+    assert frame["timestamp"].isna().sum() == 0
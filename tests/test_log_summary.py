@@ -0,0 +1,51 @@
+"""Tests for token-budgeted log summarization."""
+from __future__ import annotations
+
+from it_ops_observability.log_summary import collapse_log_lines
+from it_ops_observability.log_summary import estimate_tokens
+from it_ops_observability.log_summary import summarize_log_text
+from it_ops_observability.tools import fetch_server_logs
+
+
+def _line(minute: int, level: str, message: str) -> str:
+    return f"2025-11-29T16:{minute:02d}:00Z [{level}] prod-app-01: {message}"
+
+
+def test_collapse_groups_repeated_messages() -> None:
+    raw = "\n".join(
+        [
+            _line(0, "INFO", "Health check passed"),
+            _line(5, "ERROR", "Database connection timeout after 30s"),
+            _line(10, "INFO", "Health check passed"),
+            _line(15, "ERROR", "Database connection timeout after 45s"),
+        ]
+    )
+    rows = collapse_log_lines(raw)
+
+    assert [row.severity for row in rows] == ["ERROR", "INFO"]
+    error_row, info_row = rows
+    assert error_row.count == 2
+    assert error_row.template == "prod-app-01: Database connection timeout after <*>"
+    assert error_row.first_seen == "2025-11-29T16:05:00Z"
+    assert error_row.last_seen == "2025-11-29T16:15:00Z"
+    assert info_row.count == 2
+
+
+def test_summary_respects_budget_and_keeps_errors() -> None:
+    lines = [_line(minute % 60, "INFO", f"Background job {minute} variant {chr(65 + minute % 26)}") for minute in range(200)]
+    lines.append(_line(59, "CRITICAL", "Disk saturation beyond 95%"))
+    summary = summarize_log_text("\n".join(lines), token_budget=150)
+
+    assert estimate_tokens(summary) <= 160
+    assert "CRITICAL" in summary
+    assert _line(59, "CRITICAL", "Disk saturation beyond 95%") in summary
+    assert "omitted to fit the 150-token budget" in summary
+
+
+def test_fetch_server_logs_compact_mode_is_bounded() -> None:
+    raw = fetch_server_logs(server_id="test-123", window_minutes=720)
+    compact = fetch_server_logs(server_id="test-123", window_minutes=720, compact=True, token_budget=300)
+
+    assert "test-123" in compact
+    assert estimate_tokens(compact) <= 310
+    assert estimate_tokens(compact) < estimate_tokens(raw)
@@ -0,0 +1,79 @@
+"""Tests for the streaming log template miner."""
+from __future__ import annotations
+
+from datetime import datetime
+from datetime import timezone
+
+from it_ops_observability.log_templates import LogTemplateMiner
+from it_ops_observability.tools import fetch_log_templates
+
+
+def test_miner_merges_variable_tokens() -> None:
+    miner = LogTemplateMiner()
+    first = miner.add("Connection to db-7 refused by peer alpha", severity="ERROR")
+    second = miner.add("Connection to db-9 refused by peer beta", severity="ERROR")
+    other = miner.add("Health check passed", severity="INFO")
+
+    assert first is second
+    assert first.template == "Connection to <*> refused by peer <*>"
+    assert first.count == 2
+    assert first.severity_counts["ERROR"] == 2
+    assert other is not first
+    assert len(miner) == 2
+
+
+def test_miner_reports_novel_and_recent_counts() -> None:
+    raw = "\n".join(
+        [
+            "2025-11-29T16:00:00Z [INFO] prod-app-01: Health check passed",
+            "2025-11-29T16:30:00Z [INFO] prod-app-01: Health check passed",
+            "2025-11-29T16:55:00Z [ERROR] prod-app-01: Service mesh circuit breaker open",
+            "2025-11-29T16:55:00Z [INFO] prod-app-01: Health check passed",
+        ]
+    )
+    miner = LogTemplateMiner()
+    miner.add_text(raw)
+    since = datetime(2025, 11, 29, 16, 45, tzinfo=timezone.utc)
+
+    novel = miner.novel(since)
+    assert [t.template for t in novel] == ["prod-app-01: Service mesh circuit breaker open"]
+    health = miner.top(1)[0]
+    assert health.count == 3
+    assert miner.count_since(health, since) == 1
+
+
+def test_fetch_log_templates_shape() -> None:
+    result = fetch_log_templates(server_id="test-123", window_minutes=240, top_n=3)
+
+    assert result["server_id"] == "test-123"
+    assert 0 < len(result["top_templates"]) <= 3
+    assert result["template_count"] >= len(result["top_templates"])
+    assert {"template", "count", "recent_count", "severities"} <= set(result["top_templates"][0])
+
+
+def test_fetch_log_templates_streams_new_rows_into_one_miner(tmp_path) -> None:
+    import pandas as pd
+
+    from it_ops_observability import tools
+    from it_ops_observability.data_sources import DataConfig
+    from it_ops_observability.tools import use_data_config
+
+    def _line(minute: int, level: str, message: str) -> str:
+        stamp = pd.Timestamp("2025-11-29T12:00:00") + pd.Timedelta(minutes=minute)
+        return f"{stamp:%Y-%m-%dT%H:%M:%S}Z [{level}] prod-app-01: {message}"
+
+    rows = [_line(minute, "INFO", "Health check passed") for minute in range(0, 600, 5)]
+    path = tmp_path / "logs.parquet"
+    pd.DataFrame({"server_id": ["prod-app-01"] * len(rows), "message": rows}).to_parquet(path)
+    with use_data_config(DataConfig(logs_path=path)):
+        first = fetch_log_templates(window_minutes=60)
+        miner = tools._template_miner_for(DataConfig(logs_path=path), "prod-app-01")
+        rows.append(_line(600, "ERROR", "Service mesh circuit breaker open"))
+        pd.DataFrame({"server_id": ["prod-app-01"] * len(rows), "message": rows}).to_parquet(path)
+        second = fetch_log_templates(window_minutes=60)
+
+    assert first["top_templates"][0]["count"] == 13  # the window (both ends inclusive), not the whole history
+    assert tools._template_miner_for(DataConfig(logs_path=path), "prod-app-01") is miner
+    assert miner.top(1)[0].count == 120  # appended rows were mined once, not re-mined
+    assert [t["template"] for t in second["novel_templates"]] == ["prod-app-01: Service mesh circuit breaker open"]
+    assert second["novel_templates"][0]["severities"] == {"ERROR": 1}
@@ -0,0 +1,75 @@
+"""Tests for the offline scripted model backend."""
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+from google.adk.models.llm_request import LlmRequest
+from google.genai import types
+
+from it_ops_observability.offline_llm import ScriptedLlm
+from it_ops_observability.offline_llm import is_offline_model
+from it_ops_observability.offline_llm import load_script
+
+
+def _generate(llm: ScriptedLlm, request: LlmRequest) -> list:
+    async def _collect() -> list:
+        return [response async for response in llm.generate_content_async(request)]
+
+    return asyncio.run(_collect())
+
+
+def test_is_offline_model() -> None:
+    assert is_offline_model("offline")
+    assert is_offline_model("offline/bench")
+    assert not is_offline_model("gemini-2.5-flash-lite")
+
+
+def test_script_replay_wraps_and_reports_usage(tmp_path: Path) -> None:
+    script_path = tmp_path / "script.json"
+    script_path.write_text(
+        json.dumps(
+            {
+                "log_analyst": [
+                    {"tool_calls": [{"name": "fetch_server_logs", "args": {"compact": True}}]},
+                    {"text": "Disk saturation is the leading risk."},
+                ]
+            }
+        )
+    )
+    llm = ScriptedLlm(agent_name="log_analyst", script=load_script(script_path), latency_ms=1)
+    request = LlmRequest(
+        contents=[types.Content(role="user", parts=[types.Part.from_text(text="Check logs")])]
+    )
+
+    first, second, third = (_generate(llm, request)[0] for _ in range(3))
+
+    call = first.content.parts[0].function_call
+    assert call.name == "fetch_server_logs"
+    assert call.args == {"compact": True}
+    assert second.content.parts[0].text == "Disk saturation is the leading risk."
+    assert third.content.parts[0].function_call.name == "fetch_server_logs"
+    assert second.usage_metadata.prompt_token_count > 0
+    assert second.usage_metadata.candidates_token_count > 0
+
+
+def test_default_policy_fills_required_arguments() -> None:
+    from google.adk.tools.function_tool import FunctionTool
+
+    from it_ops_observability.tools import fetch_server_logs
+    from it_ops_observability.tools import search_logs
+
+    def needs_mapping(labels: dict) -> dict:
+        """Tool whose required argument the policy cannot invent."""
+        return labels
+
+    request = LlmRequest(
+        contents=[types.Content(role="user", parts=[types.Part.from_text(text="database timeout errors")])]
+    )
+    request.append_tools([FunctionTool(fetch_server_logs), FunctionTool(search_logs), FunctionTool(needs_mapping)])
+    (response,) = _generate(ScriptedLlm(agent_name="log_analyst"), request)
+
+    calls = {part.function_call.name: part.function_call.args for part in response.content.parts}
+    assert calls == {"fetch_server_logs": {}, "search_logs": {"query": "database timeout errors"}}
+    assert "error" not in search_logs(**calls["search_logs"])
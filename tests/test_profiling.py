@@ -0,0 +1,66 @@
+"""Tests for the sampled profiling hooks."""
+from __future__ import annotations
+
+import inspect
+from pathlib import Path
+import pstats
+
+from it_ops_observability import tools
+from it_ops_observability.dashboard import build_dashboard_snapshot
+from it_ops_observability.profiling import PROFILE_DIR_ENV_VAR
+from it_ops_observability.profiling import PROFILE_ENV_VAR
+from it_ops_observability.profiling import PROFILE_MEMORY_ENV_VAR
+from it_ops_observability.profiling import Profiler
+from it_ops_observability.profiling import default_profiler
+
+
+def _join_lines(count: int) -> str:
+    return "\n".join(f"line {index}" for index in range(count))
+
+
+def test_sampled_calls_write_profiles_and_allocation_reports(tmp_path: Path) -> None:
+    profiler = Profiler(tmp_path, memory=True, max_files=2)
+    wrapped = profiler.wrap(_join_lines)
+    assert inspect.signature(wrapped) == inspect.signature(_join_lines)
+    for _ in range(3):
+        assert wrapped(20_000).endswith("line 19999")
+
+    assert profiler.sampled == 3 and len(list(tmp_path.glob("*.prof"))) == 2
+    record = profiler.records[-1]
+    assert record.peak_alloc_kb > 100
+    report = record.report_path.read_text()
+    assert report.startswith("_join_lines(20000)") and "allocations: peak" in report
+    assert pstats.Stats(str(record.profile_path)).total_calls > 0
+
+    nothing = Profiler(tmp_path / "off", sample_rate=0.0)
+    assert nothing.wrap(_join_lines)(3) == "line 0\nline 1\nline 2"
+    assert nothing.sampled == 0 and not (tmp_path / "off").exists()
+
+    sampled = Profiler(tmp_path / "sampled", sample_rate=0.25, seed=3)
+    for _ in range(40):
+        sampled.call("join", _join_lines, 10)
+    assert 4 <= sampled.sampled <= 16
+
+
+def test_environment_enables_profiling_for_tools_and_snapshots(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.delenv(PROFILE_ENV_VAR, raising=False)
+    assert default_profiler() is None
+    monkeypatch.setenv(PROFILE_ENV_VAR, "on")
+    monkeypatch.setenv(PROFILE_MEMORY_ENV_VAR, "0")
+    monkeypatch.setenv(PROFILE_DIR_ENV_VAR, str(tmp_path))
+    profiler = default_profiler()
+    assert profiler is default_profiler() and profiler.sample_rate == 1.0 and not profiler.memory
+
+    build_dashboard_snapshot("prod-app-01", 120)
+    fetch_tool = tools.build_data_tools()[0]
+    fetch_tool.func(server_id="prod-db-01", window_minutes=60)
+    assert [record.name for record in profiler.records] == ["build_dashboard_snapshot", "fetch_server_logs"]
+    assert "fetch_server_logs(server_id='prod-db-01', window_minutes=60)" in profiler.records[1].report_path.read_text()
+
+
+def test_unwritable_directory_never_fails_the_call(tmp_path: Path) -> None:
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    profiler = Profiler(blocker / "profiles")
+    assert profiler.call("answer", lambda: 42) == 42
+    assert profiler.write_errors == 1 and profiler.records == []
@@ -0,0 +1,49 @@
+"""Tests for the shared telemetry query service."""
+from __future__ import annotations
+
+from pathlib import Path
+
+from it_ops_observability.benchmarks import write_fixtures
+from it_ops_observability.data_sources import DataConfig
+from it_ops_observability.data_sources import fetch_logs
+from it_ops_observability.data_sources import summarize_metrics
+from it_ops_observability.query_service import QueryClient
+from it_ops_observability.query_service import QueryService
+from it_ops_observability.query_service import client_for
+
+
+def test_service_answers_data_source_calls_through_pooled_client(tmp_path: Path) -> None:
+    fixture = write_fixtures(2_000, tmp_path)
+    service = QueryService(fixture.config, port=0)
+    url = service.start_in_thread()
+    try:
+        remote = DataConfig(service_url=url)
+        assert fetch_logs("prod-app-01", window_minutes=fixture.rows * 5, config=remote) == fixture.log_text
+        frame = summarize_metrics(hours=48, config=remote)
+        assert frame.equals(summarize_metrics(hours=48, config=fixture.config))
+
+        client = client_for(url)
+        for _ in range(5):
+            client.fetch_logs("prod-db-01")
+        assert len(client._idle) == 1  # sequential calls reuse one keep-alive connection
+        assert client.version()["requests"] == service.requests == 8
+    finally:
+        service.stop()
+        client_for(url).close()
+
+    # With the service gone, reads fall back to the in-process path.
+    offline = DataConfig(logs_path=fixture.config.logs_path, service_url=url)
+    assert fetch_logs("prod-app-01", window_minutes=fixture.rows * 5, config=offline) == fixture.log_text
+
+
+def test_unix_socket_transport(tmp_path: Path) -> None:
+    service = QueryService(DataConfig(), unix_path=tmp_path / "query.sock")
+    url = service.start_in_thread()
+    client = QueryClient(url)
+    try:
+        assert url.startswith("unix://")
+        assert client.fetch_recent_ticket().startswith("Subject:")
+        assert client.get("/healthz") == ("text/plain", b"ok")
+    finally:
+        client.close()
+        service.stop()
@@ -0,0 +1,93 @@
+"""Tests for the exact-match model response cache."""
+from __future__ import annotations
+
+import asyncio
+import os
+from pathlib import Path
+from typing import AsyncGenerator, List
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from it_ops_observability.data_sources import DataConfig
+from it_ops_observability.data_sources import data_version
+from it_ops_observability.response_cache import CachedLlm
+from it_ops_observability.response_cache import ResponseCache
+from it_ops_observability.response_cache import data_fingerprint
+
+
+class _CountingLlm(BaseLlm):
+    model: str = "counting"
+    calls: int = 0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part.from_text(text=f"answer {self.calls}")])
+        )
+
+
+def _request(prompt: str, call_id: str = "adk-1") -> LlmRequest:
+    return LlmRequest(
+        contents=[
+            types.Content(role="user", parts=[types.Part.from_text(text=prompt)]),
+            types.Content(
+                role="user",
+                parts=[
+                    types.Part(
+                        function_response=types.FunctionResponse(
+                            id=call_id, name="fetch_incident_digest", response={"result": "SEV2"}
+                        )
+                    )
+                ],
+            ),
+        ]
+    )
+
+
+def _texts(llm: CachedLlm, request: LlmRequest) -> List[str]:
+    async def _collect() -> List[str]:
+        return [r.content.parts[0].text async for r in llm.generate_content_async(request)]
+
+    return asyncio.run(_collect())
+
+
+def test_repeated_request_is_served_from_disk(tmp_path: Path) -> None:
+    data_file = tmp_path / "tickets.parquet"
+    data_file.write_bytes(b"v1")
+    inner = _CountingLlm()
+    cache = ResponseCache(tmp_path / "cache")
+    llm = CachedLlm(model=inner.model, inner=inner, cache=cache, data_config=DataConfig(tickets_path=data_file))
+
+    assert _texts(llm, _request("Give me an ops briefing")) == ["answer 1"]
+    # Different random call IDs still hit: only the content matters.
+    assert _texts(llm, _request("Give me an ops briefing", call_id="adk-2")) == ["answer 1"]
+    assert inner.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    assert _texts(llm, _request("Another question")) == ["answer 2"]
+
+    data_file.write_bytes(b"version-2")
+    os.utime(data_file, ns=(1, 1))
+    assert _texts(llm, _request("Give me an ops briefing")) == ["answer 3"]
+    # Same signal as the tool-result and snapshot caches.
+    assert data_fingerprint(llm.data_config)[1] == list(data_version(llm.data_config))
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path, max_bytes=400)
+    payload = {"content": {"parts": [{"text": "x" * 80}]}}
+    for index, key in enumerate(["a", "b", "c"]):
+        cache.put(key, payload)
+        os.utime(tmp_path / f"{key}.json", ns=(index + 1, index + 1))
+    cache.get("a")  # refreshes "a" so "b" is now the oldest
+    cache.put("d", payload)
+
+    remaining = {path.stem for path in tmp_path.glob("*.json")}
+    assert "b" not in remaining
+    assert {"a", "d"} <= remaining
+    assert cache.size_bytes() <= 400
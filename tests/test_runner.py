@@ -73,3 +73,43 @@ def test_supervisor_runner_outputs_summary(monkeypatch) -> None:
     assert len(normalized) > 300, "Narrative is unexpectedly short"
     for keyword in ("prod-app-01", "disk", "database", "risk", "leadership"):
         assert keyword in normalized, f"Missing keyword '{keyword}' in narrative"
+
+
+def test_offline_backend_runs_full_tree_without_credentials() -> None:
+    """The scripted backend drives delegation and tool calls with no Gemini access."""
+    from it_ops_observability import AgentSettings, create_supervisor_agent
+    from google.adk.runners import InMemoryRunner
+
+    agent = create_supervisor_agent(AgentSettings(model_name="offline", offline_latency_ms=5))
+    runner = InMemoryRunner(agent=agent)
+    prompts = [
+        "Investigate prod-app-01 with the default window and summarize key log anomalies.",
+        "Draft the leadership summary and actions.",
+    ]
+
+    loop = asyncio.new_event_loop()
+    try:
+        events = loop.run_until_complete(runner.run_debug(prompts, quiet=True))
+    finally:
+        loop.run_until_complete(runner.close())
+        loop.close()
+
+    authors = {event.author for event in events}
+    assert {"it_ops_supervisor", "log_analyst"} <= authors
+    tool_calls = [
+        part.function_call.name
+        for event in events
+        if event.content and event.content.parts
+        for part in event.content.parts
+        if part.function_call
+    ]
+    assert "transfer_to_agent" in tool_calls
+    assert "fetch_server_logs" in tool_calls
+    texts = [
+        part.text
+        for event in events
+        if event.content and event.content.parts
+        for part in event.content.parts
+        if part.text
+    ]
+    assert any("Offline summary" in text for text in texts)
@@ -0,0 +1,122 @@
+"""Tests for the cross-process snapshot and tool-result cache."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import subprocess
+import sys
+import time
+
+import pandas as pd
+
+from it_ops_observability import tools
+from it_ops_observability.dashboard import build_dashboard_snapshot
+from it_ops_observability.data_sources import DataConfig
+from it_ops_observability.log_records import LogBatch
+from it_ops_observability.shared_cache import SharedCache
+from it_ops_observability.tools import summarize_utilization
+from it_ops_observability.tools import use_data_config
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def test_snapshot_round_trips_with_log_batch(tmp_path: Path) -> None:
+    cache = SharedCache(tmp_path / "cache.sqlite3")
+    first = build_dashboard_snapshot("prod-app-01", 240, cache=cache)
+    second = build_dashboard_snapshot("prod-app-01", 240, cache=cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert isinstance(second["logs"], LogBatch)
+    assert second["logs"].to_records() == first["logs"].to_records()
+    assert {key: second[key] for key in ("summary", "digest", "severity_counts", "slo")} == {
+        key: first[key] for key in ("summary", "digest", "severity_counts", "slo")
+    }
+
+
+def test_entries_are_shared_across_processes(tmp_path: Path) -> None:
+    path = tmp_path / "cache.sqlite3"
+    script = (
+        "from pathlib import Path; from it_ops_observability.shared_cache import SharedCache;"
+        f"SharedCache(Path({str(path)!r})).put('k', {{'rows': [1, 2.5, None, 'x']}})"
+    )
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    subprocess.run([sys.executable, "-c", script], check=True, env=env)
+    assert SharedCache(path).get("k") == {"rows": [1, 2.5, None, "x"]}
+
+
+def test_ttl_size_cap_and_unencodable_values(tmp_path: Path) -> None:
+    cache = SharedCache(tmp_path / "cache.sqlite3", max_bytes=2_000)
+    assert cache.put("short", "x", ttl_s=0.05)
+    time.sleep(0.1)
+    assert cache.get("short") is None and len(cache) == 0
+
+    for index in range(5):
+        assert cache.put(f"k{index}", "v" * 600)
+        time.sleep(0.01)
+    assert cache.size_bytes() <= 2_000
+    assert cache.get("k0") is None and cache.get("k4") == "v" * 600
+    assert not cache.put("object", object())
+
+
+def test_tool_results_are_keyed_by_data_version(tmp_path: Path) -> None:
+    metrics = tmp_path / "metrics.parquet"
+    stamps = pd.to_datetime(["2024-01-01T00:00:00Z", "2024-01-01T01:00:00Z"])
+    pd.DataFrame({"timestamp": stamps, "cpu_pct": [10.0, 20.0], "memory_pct": [30.0, 40.0]}).to_parquet(metrics)
+    cache = SharedCache(tmp_path / "cache.sqlite3")
+    cached = cache.wrap_tool(summarize_utilization, context=tools._tool_cache_context)
+    with use_data_config(DataConfig(metrics_path=metrics)):
+        assert cached(hours=2)["peak_cpu_pct"] == 20.0
+        assert cached(hours=2)["peak_cpu_pct"] == 20.0
+        assert cache.hits == 1
+        pd.DataFrame({"timestamp": stamps, "cpu_pct": [10.0, 90.0], "memory_pct": [30.0, 40.0]}).to_parquet(metrics)
+        os.utime(metrics, ns=(metrics.stat().st_atime_ns, metrics.stat().st_mtime_ns + 1_000_000))
+        assert cached(hours=2)["peak_cpu_pct"] == 90.0
+
+
+def test_tool_sets_bound_to_different_configs_do_not_share_results(tmp_path: Path) -> None:
+    configs = []
+    for name, peak in (("a", 20.0), ("b", 80.0)):
+        metrics = tmp_path / f"metrics_{name}.parquet"
+        stamps = pd.to_datetime(["2024-01-01T00:00:00Z", "2024-01-01T01:00:00Z"])
+        pd.DataFrame({"timestamp": stamps, "cpu_pct": [10.0, peak], "memory_pct": [30.0, 40.0]}).to_parquet(metrics)
+        configs.append(DataConfig(metrics_path=metrics))
+    cache = SharedCache(tmp_path / "cache.sqlite3")
+    peaks = []
+    for config in configs:
+        tool = next(
+            tool for tool in tools.build_data_tools(config=config, result_cache=cache)
+            if tool.name == "summarize_utilization"
+        )
+        peaks.append(tool.func(hours=2)["peak_cpu_pct"])
+    assert peaks == [20.0, 80.0] and cache.misses == 2
+
+
+def test_cached_results_follow_ticket_and_service_data(tmp_path: Path) -> None:
+    from it_ops_observability.benchmarks import write_fixtures
+    from it_ops_observability.data_sources import data_version
+    from it_ops_observability.query_service import QueryService
+    from it_ops_observability.query_service import client_for
+
+    tickets = tmp_path / "tickets.parquet"
+    pd.DataFrame({"subject": ["Disk full on db"], "body": ["Purged archives."]}).to_parquet(tickets)
+    cache = SharedCache(tmp_path / "cache.sqlite3")
+    search = next(
+        tool.func for tool in tools.build_data_tools(config=DataConfig(tickets_path=tickets), result_cache=cache)
+        if tool.name == "search_incident_tickets"
+    )
+    assert search(query="disk")["matches"][0]["subject"] == "Disk full on db"
+    pd.DataFrame({"subject": ["Disk latency on edge"], "body": ["Moved volume."]}).to_parquet(tickets)
+    os.utime(tickets, ns=(tickets.stat().st_atime_ns, tickets.stat().st_mtime_ns + 1_000_000))
+    assert search(query="disk")["matches"][0]["subject"] == "Disk latency on edge"
+
+    fixture = write_fixtures(1_000, tmp_path / "served")
+    service = QueryService(fixture.config, port=0)
+    url = service.start_in_thread()
+    try:
+        remote = DataConfig(service_url=url)
+        before = data_version(remote)
+        metrics = fixture.config.metrics_path
+        os.utime(metrics, ns=(metrics.stat().st_atime_ns, metrics.stat().st_mtime_ns + 1_000_000))
+        assert data_version(remote) != before
+    finally:
+        service.stop()
+        client_for(url).close()
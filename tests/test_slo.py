@@ -0,0 +1,118 @@
+"""Tests for SLO definitions and incremental burn-rate tracking."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from it_ops_observability.data_sources import DataConfig
+from it_ops_observability.slo import BurnRateTracker
+from it_ops_observability.slo import SLODefinition
+from it_ops_observability.slo import SLOEngine
+from it_ops_observability.tools import check_slo_burn
+from it_ops_observability.tools import use_data_config
+
+_START = np.datetime64("2024-01-01T00:00", "ns")
+
+
+def _minutes(*offsets: int) -> np.ndarray:
+    return _START + np.asarray(offsets).astype("timedelta64[m]")
+
+
+def test_incremental_tracker_matches_full_recount() -> None:
+    rng = np.random.default_rng(0)
+    offsets = np.sort(rng.integers(0, 5 * 24 * 60, size=5000))
+    bad = rng.random(offsets.size) < 0.05
+    windows = {"5m": 5, "1h": 60, "3d": 4320}
+    tracker = BurnRateTracker(0.99, windows)
+    for chunk in np.array_split(np.arange(offsets.size), 37):
+        tracker.observe(_minutes(*offsets[chunk]), bad[chunk])
+
+    head = offsets.max()
+    for name, span in windows.items():
+        in_window = offsets > head - span
+        assert tracker.counts()[name] == (int(in_window.sum()), int((in_window & bad).sum()))
+
+
+def test_late_events_within_window_are_counted() -> None:
+    tracker = BurnRateTracker(0.9, {"5m": 5, "1h": 60})
+    tracker.observe(_minutes(100), [False])
+    tracker.observe(_minutes(98, 50), [True, True])
+    assert tracker.counts() == {"5m": (2, 1), "1h": (3, 2)}
+    assert tracker.burn_rates()["5m"] == pytest.approx(5.0)
+
+
+def test_engine_precomputes_multiwindow_alerts() -> None:
+    engine = SLOEngine([SLODefinition("errors", "logs", objective=0.99)])
+    offsets = np.arange(0, 6 * 60)
+    severities = np.where(offsets >= 6 * 60 - 30, "ERROR", "INFO")
+    assert engine.ingest_logs(_minutes(*offsets), severities) == offsets.size
+    status = engine.status("errors")[0]
+    assert status["burning"]
+    assert [alert["windows"][0] for alert in status["alerts"]] == ["1h", "6h", "3d"]
+    # Once the burst is over an hour old only the slow-burn ticket stays open.
+    engine.ingest_logs(_minutes(6 * 60 + 90), ["INFO"])
+    assert [alert["severity"] for alert in engine.status("errors")[0]["alerts"]] == ["ticket"]
+    # Late lines are still counted in the windows they fall into.
+    assert engine.ingest_logs(_minutes(6 * 60 + 88), ["ERROR"]) == 1
+    assert engine.status("errors")[0]["events"]["5m"] == {"total": 2, "bad": 1}
+    engine.reset("logs")
+    assert engine.status("errors")[0]["events"]["3d"] == {"total": 0, "bad": 0}
+
+
+def test_slo_definitions_validate_fields() -> None:
+    with pytest.raises(ValueError):
+        SLODefinition.from_dict({"name": "cpu", "source": "metrics", "objective": 0.9})
+    with pytest.raises(ValueError):
+        SLODefinition.from_dict({"name": "x", "source": "logs", "latency": 3})
+
+
+def test_check_slo_burn_reads_appended_rows_only(tmp_path: Path) -> None:
+    slo_path = tmp_path / "slos.json"
+    slo_path.write_text(json.dumps([{"name": "cpu", "source": "metrics", "objective": 0.9, "metric": "cpu_pct", "threshold": 80}]))
+    metrics_path = tmp_path / "metrics.parquet"
+    stamps = pd.date_range("2024-01-01", periods=12, freq="5min")
+    pd.DataFrame({"timestamp": stamps, "cpu_pct": [50.0] * 12}).to_parquet(metrics_path)
+    config = DataConfig(logs_path=tmp_path / "missing.parquet", metrics_path=metrics_path, slo_path=slo_path)
+    with use_data_config(config):
+        first = check_slo_burn()
+        assert first["slos"][0]["events"]["1h"]["total"] == 12 and not first["burning"]
+
+        more = pd.date_range(stamps[-1] + pd.Timedelta(minutes=5), periods=3, freq="5min")
+        pd.DataFrame({"timestamp": stamps.append(more), "cpu_pct": [50.0] * 12 + [95.0] * 3}).to_parquet(metrics_path)
+        second = check_slo_burn(slo="cpu")
+        assert second["slos"][0]["events"]["1h"] == {"total": 12, "bad": 3}
+        assert second["burning"] == ["cpu"]
+        assert "error" in check_slo_burn(slo="latency")
+
+
+def test_check_slo_burn_counts_interleaved_servers_once(tmp_path: Path) -> None:
+    slo_path = tmp_path / "slos.json"
+    slo_path.write_text(json.dumps([{"name": "cpu", "source": "metrics", "objective": 0.9, "metric": "cpu_pct", "threshold": 80}]))
+    metrics_path = tmp_path / "metrics.parquet"
+    config = DataConfig(logs_path=tmp_path / "missing.parquet", metrics_path=metrics_path, slo_path=slo_path)
+
+    def _rows(*samples: tuple) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "timestamp": [pd.Timestamp("2024-01-01 12:00") + pd.Timedelta(minutes=m) for _, m, _ in samples],
+                "server_id": [server for server, _, _ in samples],
+                "cpu_pct": [value for _, _, value in samples],
+            }
+        )
+
+    # prod-b reports a few minutes behind prod-a.
+    first = _rows(("prod-a", 0, 50.0), ("prod-b", -10, 50.0), ("prod-a", 10, 50.0), ("prod-b", -5, 50.0))
+    first.to_parquet(metrics_path)
+    with use_data_config(config):
+        assert check_slo_burn()["slos"][0]["events"]["1h"]["total"] == 4
+        # prod-b catches up with samples older than, and equal to, prod-a's newest one.
+        late = _rows(("prod-b", 0, 95.0), ("prod-b", 10, 95.0), ("prod-a", 15, 50.0))
+        pd.concat([first, late], ignore_index=True).to_parquet(metrics_path)
+        assert check_slo_burn()["slos"][0]["events"]["1h"] == {"total": 7, "bad": 2}
+        # A rewritten (shorter) file is recounted, not added on top.
+        late.to_parquet(metrics_path)
+        assert check_slo_burn()["slos"][0]["events"]["1h"] == {"total": 3, "bad": 2}
@@ -0,0 +1,50 @@
+"""Tests for the sorted, dictionary-encoded log layout."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pyarrow.parquet as pq
+
+from it_ops_observability.benchmarks import FIXTURE_SERVERS
+from it_ops_observability.benchmarks import write_fixtures
+from it_ops_observability.data_sources import DataConfig
+from it_ops_observability.data_sources import fetch_logs
+from it_ops_observability.storage import LAYOUT_KEY
+from it_ops_observability.storage import SORTED_LAYOUT
+from it_ops_observability.storage import log_layout
+from it_ops_observability.storage import read_server_tail
+from it_ops_observability.storage import write_sorted_logs
+
+
+def test_writer_sorts_and_records_layout(tmp_path: Path) -> None:
+    fixture = write_fixtures(20_000, tmp_path)
+    path = write_sorted_logs(pq.read_table(fixture.config.logs_path).to_pandas(), tmp_path / "sorted.parquet", row_group_rows=2_000)
+
+    metadata = pq.read_metadata(path)
+    assert metadata.metadata[LAYOUT_KEY] == SORTED_LAYOUT
+    assert metadata.num_row_groups == 10
+    assert metadata.row_group(0).sorting_columns[0].column_index == metadata.schema.names.index("server_id")
+    table = pq.read_table(path)
+    keys = list(zip(table["server_id"].to_pylist(), table["timestamp"].to_pylist()))
+    assert keys == sorted(keys)
+    templates = set(table["template"].to_pylist())
+    assert "Disk saturation beyond <*>" in templates and len(templates) < 10
+    encodings = metadata.row_group(0).column(metadata.schema.names.index("template")).encodings
+    assert any("DICTIONARY" in encoding for encoding in encodings)
+
+    layout = log_layout(path)
+    assert layout.sorted_by_server
+    assert layout.server_ranges[0][0] == min(FIXTURE_SERVERS) and layout.server_ranges[-1][1] == max(FIXTURE_SERVERS)
+
+
+def test_fetch_logs_reads_sorted_tail_like_naive_layout(tmp_path: Path) -> None:
+    fixture = write_fixtures(20_000, tmp_path)
+    path = write_sorted_logs(pq.read_table(fixture.config.logs_path).to_pandas(), tmp_path / "sorted.parquet", row_group_rows=2_000)
+    config = DataConfig(logs_path=path, metrics_path=None, tickets_path=None, log_index_path=None)
+
+    for server in FIXTURE_SERVERS:
+        for window in (240, 20_000, fixture.rows * 5):
+            expected = fetch_logs(server, window_minutes=window, config=fixture.config)
+            assert fetch_logs(server, window_minutes=window, config=config) == expected
+    assert read_server_tail(path, FIXTURE_SERVERS[0], 0) == []
+    assert "\n".join(read_server_tail(path, FIXTURE_SERVERS[0], fixture.rows)) == fixture.log_text
@@ -0,0 +1,40 @@
+"""Tests for incremental supervisor event streaming."""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import List, Tuple
+
+from google.adk.runners import InMemoryRunner
+
+from it_ops_observability import AgentSettings, create_supervisor_agent
+from it_ops_observability.streaming import StreamItem
+from it_ops_observability.streaming import stream_supervisor_items
+
+
+def test_items_arrive_before_the_run_finishes() -> None:
+    settings = AgentSettings(model_name="offline", offline_latency_ms=60)
+    runner = InMemoryRunner(agent=create_supervisor_agent(settings))
+    prompts = ["Investigate prod-app-01 log anomalies.", "Provide the utilization stats and risks."]
+
+    async def _collect() -> Tuple[List[Tuple[float, StreamItem]], float]:
+        started = time.perf_counter()
+        received: List[Tuple[float, StreamItem]] = []
+        try:
+            async for item in stream_supervisor_items(runner, prompts):
+                received.append((time.perf_counter() - started, item))
+        finally:
+            await runner.close()
+        return received, time.perf_counter() - started
+
+    received, total = asyncio.run(_collect())
+
+    first_at, first = received[0]
+    assert first.kind == "tool_call"
+    assert first.author == "it_ops_supervisor"
+    assert first_at < total / 3
+    kinds = {item.kind for _, item in received}
+    assert kinds == {"text", "tool_call", "tool_result"}
+    assert {item.prompt_index for _, item in received} == {0, 1}
+    texts = [item for _, item in received if item.kind == "text"]
+    assert texts[-1].author == "metric_analyst"
@@ -0,0 +1,51 @@
+"""Tests for the ticket search index and tool."""
+from __future__ import annotations
+
+from pathlib import Path
+
+from it_ops_observability.ticket_index import TicketIndex
+from it_ops_observability.ticket_index import load_or_build
+from it_ops_observability.tools import search_incident_tickets
+
+DOCS = [
+    "Database connection pool exhausted on primary",
+    "Disk usage above 95% on log volume",
+    "Checkout latency above SLO after deploy",
+    "Database replica lag growing on reporting cluster",
+]
+
+
+def test_bm25_ranks_matching_ticket_first() -> None:
+    index = TicketIndex.build(DOCS)
+    results = index.search("connection pool exhausted", k=2)
+    assert results[0][0] == 0
+    assert {doc for doc, _ in index.search("database", k=5)} == {0, 3}
+    assert index.search("nonexistent words", k=3) == []
+
+
+def test_vector_and_hybrid_modes(tmp_path: Path) -> None:
+    index = TicketIndex.build(DOCS, vector_dims=64)
+    assert index.search("log volume disk", k=1, mode="vector")[0][0] == 1
+    assert index.search("checkout latency", k=1, mode="hybrid")[0][0] == 2
+
+    loaded = TicketIndex.load(index.save(tmp_path / "tickets.npz"))
+    assert loaded.search("replica lag", k=1) == index.search("replica lag", k=1)
+    assert loaded.search("log volume disk", k=1, mode="vector") == index.search("log volume disk", k=1, mode="vector")
+
+
+def test_load_or_build_persists_index(tmp_path: Path) -> None:
+    built = load_or_build("unit-test", lambda: DOCS, index_dir=tmp_path)
+    assert (tmp_path / "unit-test.npz").exists()
+    assert built.n_docs == len(DOCS)
+
+
+def test_search_incident_tickets_tool(tmp_path: Path, monkeypatch) -> None:
+    from it_ops_observability import ticket_index
+
+    monkeypatch.setattr(ticket_index, "_INDEXES", {})
+    result = search_incident_tickets("database connection pool exhausted", k=3)
+    # The persisted index lands in the cache dir read at call time (the test's tmp_path).
+    assert list((tmp_path / "it_ops_cache" / "ticket_index").glob("*.npz"))
+    assert len(result["matches"]) == 3
+    assert "connection pool" in result["matches"][0]["subject"].lower()
+    assert search_incident_tickets("x", mode="fuzzy")["modes"] == ["bm25", "vector", "hybrid"]
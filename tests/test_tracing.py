@@ -0,0 +1,53 @@
+"""Tests for span tracing of tools, model calls, and agent turns."""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+from pathlib import Path
+
+from google.adk.runners import InMemoryRunner
+
+from it_ops_observability import AgentSettings, Tracer, create_supervisor_agent
+from it_ops_observability.tools import fetch_server_logs
+
+
+def test_wrap_tool_records_span_and_keeps_signature() -> None:
+    tracer = Tracer()
+    traced = tracer.wrap_tool(fetch_server_logs)
+
+    result = traced(server_id="test-123", window_minutes=60)
+
+    assert inspect.signature(traced) == inspect.signature(fetch_server_logs)
+    (span,) = tracer.spans
+    assert span.name == "tool:fetch_server_logs"
+    assert span.attributes["response_bytes"] == len(result)
+    assert span.attributes["request_bytes"] > 0
+    assert span.end_ns is not None and span.end_ns >= span.start_ns
+
+
+def test_offline_run_produces_nested_trace(tmp_path: Path) -> None:
+    tracer = Tracer()
+    agent = create_supervisor_agent(AgentSettings(model_name="offline", tracer=tracer))
+    runner = InMemoryRunner(agent=agent)
+
+    async def _run() -> None:
+        try:
+            await runner.run_debug(["Investigate prod-app-01 log anomalies."], quiet=True)
+        finally:
+            await runner.close()
+
+    asyncio.run(_run())
+
+    rows = tracer.waterfall()
+    kinds = {row["kind"] for row in rows}
+    assert kinds == {"agent", "model", "tool"}
+    tool_rows = [row for row in rows if row["kind"] == "tool"]
+    assert all(row["depth"] >= 1 for row in tool_rows)
+    model_rows = [row for row in rows if row["kind"] == "model"]
+    assert all("prompt_tokens" in row for row in model_rows)
+
+    exported = json.loads(tracer.export_json(tmp_path / "trace.json").read_text())
+    spans = exported["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert len(spans) == len(rows)
+    assert {span["traceId"] for span in spans} == {tracer.trace_id}
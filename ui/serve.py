@@ -0,0 +1,38 @@
+"""Container entrypoint: warm up, then serve the Streamlit app from the same process.
+
+`streamlit run` only executes the app script when the first visitor connects,
+so a warm-up inside the script lands on that visitor's page load. This
+launcher runs `warm_up_once()` first (when `IT_OPS_WARMUP=1`) and then starts
+the Streamlit server in this process. The server keeps the imported modules,
+the preloaded dataset frames, and the built ADK schemas, and only starts
+listening once they are ready.
+
+Usage (extra arguments are passed to `streamlit run`):
+
+    IT_OPS_WARMUP=1 PYTHONPATH=src python ui/serve.py --server.port=8080 --server.address=0.0.0.0
+"""
+from __future__ import annotations
+
+from dataclasses import asdict
+import json
+from pathlib import Path
+import sys
+
+from it_ops_observability.warmup import warm_up_once
+from it_ops_observability.warmup import warmup_enabled
+
+APP_PATH = Path(__file__).resolve().with_name("streamlit_app.py")
+
+
+def main() -> int:
+    if warmup_enabled():
+        report = warm_up_once()
+        print(json.dumps({"warmup": {**asdict(report), "total_ms": report.total_ms}}), flush=True)
+    from streamlit.web import cli as stcli
+
+    sys.argv = ["streamlit", "run", str(APP_PATH), *sys.argv[1:]]
+    return stcli.main()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
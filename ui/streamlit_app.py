@@ -2,10 +2,11 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List
+from typing import Any, Callable, Dict, List, Tuple
 
 import pandas as pd
 import streamlit as st
@@ -13,8 +14,14 @@ from dotenv import load_dotenv
 from google.adk.models.google_llm import _ResourceExhaustedError
 from google.adk.runners import InMemoryRunner
 
-from it_ops_observability import AgentSettings, create_supervisor_agent
-from it_ops_observability.dashboard import build_dashboard_snapshot
+from it_ops_observability import AgentSettings, ResponseCache, Tracer, create_supervisor_agent
+from it_ops_observability.agent import DEFAULT_MODEL
+from it_ops_observability.compaction import SessionCompactor
+from it_ops_observability.dashboard import build_dashboard_snapshot, snapshot_cache_key
+from it_ops_observability.offline_llm import is_offline_model
+from it_ops_observability.shared_cache import SharedCache
+from it_ops_observability.streaming import stream_supervisor_items
+from it_ops_observability.warmup import WarmupReport, warm_up_once, warmup_enabled
 
 load_dotenv(Path(__file__).resolve().parents[1] / ".env")
 
@@ -48,62 +55,103 @@ SEVERITY_EMOJI = {
 class TranscriptTurn:
     speaker: str
     text: str
+    kind: str = "text"
 
 
-def _merge_text(parts: Iterable[object]) -> str:
-    chunks: List[str] = []
-    for part in parts:
-        text = getattr(part, "text", None)
-        if text:
-            chunks.append(text)
-    return "\n\n".join(chunks)
+def _resolve_sender(author: str) -> str:
+    if author in FRIENDLY_SENDER_NAMES:
+        return FRIENDLY_SENDER_NAMES[author]
+    return author.replace("_", " ").title()
 
 
-def _extract_turns(events: Iterable[object]) -> List[TranscriptTurn]:
-    turns: List[TranscriptTurn] = []
-    for event in events:
-        content = getattr(event, "content", None)
-        if not content:
-            continue
-        parts = getattr(content, "parts", None)
-        if not parts:
-            continue
-        text = _merge_text(parts)
-        if not text.strip():
-            continue
-        sender = _resolve_sender(event)
-        turns.append(TranscriptTurn(speaker=sender, text=text))
-    return turns
-
-
-def _resolve_sender(event: object) -> str:
-    raw = getattr(event, "author", None)
-    if raw is None:
-        raw = getattr(event, "sender", None)
-    agent_obj = getattr(event, "agent", None)
-    if agent_obj is not None:
-        raw = getattr(agent_obj, "name", raw) or getattr(agent_obj, "id", raw)
-    if raw is None:
-        raw = "agent"
-    raw_str = str(raw)
-    if raw_str in FRIENDLY_SENDER_NAMES:
-        return FRIENDLY_SENDER_NAMES[raw_str]
-    return raw_str.replace("_", " ").title()
-@st.cache_data(show_spinner=False)
-def _load_dashboard_snapshot(server_id: str, window_minutes: int) -> dict:
-    return build_dashboard_snapshot(server_id, window_minutes)
+def _render_turn(idx: int, turn: TranscriptTurn) -> None:
+    if turn.kind == "text":
+        st.markdown(f"### {idx}. {turn.speaker}")
+        st.write(turn.text)
+    elif turn.kind == "tool_call":
+        st.caption(f"🔧 {turn.speaker} called `{turn.text}`")
+    else:
+        st.caption(f"📦 {turn.text}")
+
+
+@st.cache_resource(show_spinner=False)
+def _warm_up() -> WarmupReport:
+    # Already done at server start when launched through ui/serve.py.
+    return warm_up_once()
+
+
+@st.cache_resource(show_spinner=False)
+def _response_cache() -> ResponseCache:
+    return ResponseCache()
+
+
+@st.cache_resource(show_spinner=False)
+def _shared_cache() -> SharedCache:
+    return SharedCache()
 
 
-def _run_supervisor(prompts: List[str], verbose: bool) -> List[TranscriptTurn]:
-    async def _inner() -> List[TranscriptTurn]:
-        runner = InMemoryRunner(agent=create_supervisor_agent(AgentSettings()))
+def _load_dashboard_snapshot(server_id: str, window_minutes: int) -> dict:
+    # Shared across Streamlit workers and instances on this host, unlike st.cache_data.
+    return build_dashboard_snapshot(server_id, window_minutes, cache=_shared_cache())
+
+
+def _run_supervisor(
+    prompts: List[str],
+    verbose: bool,
+    settings: AgentSettings,
+    on_turn: Callable[[TranscriptTurn], None],
+) -> Tuple[List[TranscriptTurn], Tracer]:
+    """Stream the run, handing each agent turn (and tool call when verbose) to `on_turn`."""
+    tracer = Tracer()
+    settings.tracer = tracer
+    turns: List[TranscriptTurn] = []
+
+    async def _inner() -> None:
+        runner = InMemoryRunner(agent=create_supervisor_agent(settings))
         try:
-            events = await runner.run_debug(prompts, verbose=verbose, quiet=True)
+            async for item in stream_supervisor_items(runner, prompts):
+                if item.kind != "text" and not verbose:
+                    continue
+                turn = TranscriptTurn(
+                    speaker=_resolve_sender(item.author), text=item.text, kind=item.kind
+                )
+                turns.append(turn)
+                on_turn(turn)
         finally:
             await runner.close()
-        return _extract_turns(events)
 
-    return asyncio.run(_inner())
+    asyncio.run(_inner())
+    return turns, tracer
+
+
+def _render_waterfall(rows: List[Dict[str, Any]]) -> None:
+    """Draw one horizontal bar per span, ordered by start time."""
+    chart_rows = [
+        {**row, "label": f"{idx:02d} {'  ' * row['depth']}{row['name']}"}
+        for idx, row in enumerate(rows, start=1)
+    ]
+    st.vega_lite_chart(
+        {
+            "data": {"values": chart_rows},
+            "mark": {"type": "bar", "cornerRadius": 2},
+            "encoding": {
+                "y": {"field": "label", "type": "nominal", "sort": None, "title": None},
+                "x": {"field": "start_ms", "type": "quantitative", "title": "ms since run start"},
+                "x2": {"field": "end_ms"},
+                "color": {"field": "kind", "type": "nominal"},
+                "tooltip": [
+                    {"field": "name"},
+                    {"field": "duration_ms", "title": "duration (ms)"},
+                    {"field": "prompt_tokens"},
+                    {"field": "output_tokens"},
+                    {"field": "request_bytes"},
+                    {"field": "response_bytes"},
+                ],
+            },
+            "height": max(120, 22 * len(chart_rows)),
+        },
+        width="stretch",
+    )
 
 
 st.set_page_config(
@@ -112,6 +160,9 @@ st.set_page_config(
     layout="wide",
 )
 
+if warmup_enabled():
+    _warm_up()
+
 st.title("Enterprise IT Operations Supervisor")
 st.markdown(
     """
@@ -128,6 +179,26 @@ with st.sidebar:
     st.header("Run Settings")
     use_defaults = st.button("Reset to default prompts")
     verbose = st.checkbox("Verbose tool tracing", value=True)
+    model_name = st.text_input(
+        "Model",
+        value=st.session_state.get("model_name", DEFAULT_MODEL),
+        help="Use 'offline' to run the scripted stand-in backend without Gemini.",
+    ).strip() or DEFAULT_MODEL
+    offline_latency_ms = 0.0
+    if is_offline_model(model_name):
+        offline_latency_ms = float(
+            st.number_input("Offline latency per call (ms)", min_value=0, value=250, step=50)
+        )
+    use_response_cache = st.checkbox(
+        "Reuse cached responses",
+        value=True,
+        help="Answer repeated prompts over unchanged telemetry from the on-disk model cache.",
+    )
+    compact_history = st.checkbox(
+        "Compact session history",
+        value=True,
+        help="Digest earlier tool outputs and summarize earlier prompts once a request grows large.",
+    )
     st.caption(
         "Set GOOGLE_API_KEY in your environment before running. Each run spins up\n"
         "a fresh InMemoryRunner so you get isolated transcripts."
@@ -151,10 +222,11 @@ if use_defaults:
     st.session_state.prompt_block = "\n".join(DEFAULT_SCENARIO)
 
 st.session_state["dashboard_server"] = server_id
+st.session_state["model_name"] = model_name
 st.session_state["dashboard_window"] = window_minutes
 
 if refresh_dashboard:
-    _load_dashboard_snapshot.clear()
+    _shared_cache().delete(snapshot_cache_key(server_id, window_minutes))
     st.rerun()
 
 prompt_block = st.text_area(
@@ -164,19 +236,42 @@ prompt_block = st.text_area(
 )
 run_clicked = st.button("Run supervisor", type="primary")
 
+# Tabs are created before the run so turns can stream into the transcript tab.
+overview_tab, transcript_tab = st.tabs(["Ops Dashboard", "Supervisor Transcript"])
+rendered_live = False
+
 if run_clicked:
     prompts = [line.strip() for line in prompt_block.splitlines() if line.strip()]
     st.session_state.prompt_block = prompt_block
     if not prompts:
         st.warning("Please provide at least one prompt before running the supervisor.")
-    elif not os.environ.get("GOOGLE_API_KEY"):
+    elif not is_offline_model(model_name) and not os.environ.get("GOOGLE_API_KEY"):
         st.error(
             "GOOGLE_API_KEY is not set. Update your .env file or export the variable before running."
         )
     else:
+        with transcript_tab:
+            live_area = st.container()
+        streamed: List[TranscriptTurn] = []
+
+        def _render_live(turn: TranscriptTurn) -> None:
+            streamed.append(turn)
+            with live_area:
+                _render_turn(len(streamed), turn)
+
+        rendered_live = True
         with st.spinner("Contacting supervisor and agents..."):
             try:
-                turns = _run_supervisor(prompts, verbose=verbose)
+                settings = AgentSettings(
+                    model_name=model_name,
+                    offline_latency_ms=offline_latency_ms,
+                    response_cache=_response_cache() if use_response_cache else None,
+                    tool_cache=_shared_cache(),
+                    compactor=SessionCompactor() if compact_history else None,
+                )
+                turns, tracer = _run_supervisor(
+                    prompts, verbose=verbose, settings=settings, on_turn=_render_live
+                )
             except _ResourceExhaustedError as exc:  # pragma: no cover - quota guard
                 st.error(
                     "Gemini quota exhausted. Please retry later or switch to a different "
@@ -193,9 +288,15 @@ if run_clicked:
                 st.session_state.latest_transcript = None
             else:
                 st.session_state.latest_transcript = turns
+                st.session_state.latest_trace = tracer.waterfall()
+                st.session_state.latest_trace_otlp = json.dumps(tracer.to_otlp(), indent=2)
+                st.session_state.latest_compaction = (
+                    settings.compactor.turn_report() if settings.compactor else None
+                )
                 st.session_state.last_prompts = prompts
                 st.session_state.last_verbose = verbose
-                st.success("Run complete. Transcript captured below.")
+                st.session_state.last_model = model_name
+                st.success("Run complete. Transcript streamed to the Supervisor Transcript tab.")
 
 turns: List[TranscriptTurn] | None = st.session_state.get("latest_transcript")
 
@@ -206,8 +307,6 @@ try:
 except Exception as exc:  # pragma: no cover - defensive catch
     dashboard_error = exc
 
-overview_tab, transcript_tab = st.tabs(["Ops Dashboard", "Supervisor Transcript"])
-
 with overview_tab:
     if dashboard_error:
         st.error(f"Unable to load dashboard data: {dashboard_error}")
@@ -247,6 +346,38 @@ with overview_tab:
         else:
             st.info("No recent utilization samples available for charting.")
 
+        slo_rows = snapshot.get("slo") or []
+        if slo_rows:
+            st.subheader("Error Budget Burn")
+            slo_cols = st.columns(len(slo_rows))
+            for col, slo in zip(slo_cols, slo_rows):
+                long_burn = slo["burn_rates"].get("1h")
+                badge = "🔥" if slo["burning"] else "✅"
+                col.metric(
+                    f"{badge} {slo['name']}",
+                    f"{long_burn:.1f}x" if long_burn is not None else "n/a",
+                    delta=f"{slo['budget_remaining_pct']}% budget left ({slo['budget_window']})"
+                    if slo["budget_remaining_pct"] is not None
+                    else None,
+                    help=slo["description"],
+                )
+            st.dataframe(
+                pd.DataFrame(
+                    [
+                        {
+                            "slo": slo["name"],
+                            **{f"burn {window}": rate for window, rate in slo["burn_rates"].items()},
+                            "alerts": ", ".join(
+                                f"{alert['severity']} ({'/'.join(alert['windows'])})" for alert in slo["alerts"]
+                            ),
+                        }
+                        for slo in slo_rows
+                    ]
+                ),
+                width="stretch",
+                hide_index=True,
+            )
+
         st.subheader(f"Log Signals · {server_id} (last {window_minutes} min)")
         severity_counts = snapshot["severity_counts"]
         severity_cols = st.columns(len(SEVERITY_ORDER))
@@ -254,12 +385,15 @@ with overview_tab:
             emoji = SEVERITY_EMOJI.get(level, "")
             col.metric(f"{emoji} {level.title()}", severity_counts.get(level, 0))
 
-        logs_df = pd.DataFrame(snapshot["logs"])
+        logs = snapshot["logs"]
+        # `LogBatch` builds categorical columns from its codes; plain row lists still work.
+        logs_df = logs.to_frame() if hasattr(logs, "to_frame") else pd.DataFrame(logs)
         if not logs_df.empty:
             logs_df["timestamp"] = pd.to_datetime(
                 logs_df["timestamp"], errors="coerce"
             )
-            display_df = logs_df.sort_values("timestamp", ascending=False).copy()
+            # Only the newest rows are shown, so decode categories for those alone.
+            display_df = logs_df.sort_values("timestamp", ascending=False).head(12).copy()
             display_df["level"] = (
                 display_df["level"].fillna("INFO").astype(str).str.upper()
             )
@@ -287,11 +421,10 @@ with overview_tab:
         st.code(digest_text, language="text")
 
 with transcript_tab:
-    if turns:
+    if turns and not rendered_live:
         for idx, turn in enumerate(turns, start=1):
-            st.markdown(f"### {idx}. {turn.speaker}")
-            st.write(turn.text)
-    elif turns is not None:
+            _render_turn(idx, turn)
+    elif turns is not None and not turns:
         st.info("No transcript text returned. Check verbose logs for tool output.")
 
     with st.expander("Execution details"):
@@ -300,5 +433,20 @@ with transcript_tab:
                 "default_prompts": DEFAULT_SCENARIO,
                 "last_prompts": st.session_state.get("last_prompts"),
                 "verbose": st.session_state.get("last_verbose"),
+                "model": st.session_state.get("last_model"),
             }
-        )
\ No newline at end of file
+        )
+        trace_rows = st.session_state.get("latest_trace")
+        if trace_rows:
+            st.markdown("**Timing waterfall** (agent turns, model calls, tool calls)")
+            _render_waterfall(trace_rows)
+            st.download_button(
+                "Download trace (OTLP JSON)",
+                data=st.session_state.get("latest_trace_otlp") or "{}",
+                file_name="supervisor_trace.json",
+                mime="application/json",
+            )
+        compaction_rows = st.session_state.get("latest_compaction")
+        if compaction_rows:
+            st.markdown("**Prompt size per turn** (estimated tokens before/after compaction)")
+            st.dataframe(pd.DataFrame(compaction_rows), hide_index=True)